@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+# Load generator for the VXI-11 server.
+#
+# Run from the top directory with:
+#   python -m bench.bench_load [--clients N] [--duration SECONDS] [--mix query:70,stb:20,block:10]
+#
+# A vxi11_core_srv with a loopback adapter is started, and N simulated
+# clients, each with its own connection and link, run operations picked at
+# random from the mix until the duration is up:
+#
+#   query  device_write of a short command, then a device_read of the echo
+#   stb    device_readstb, as when polling for a result
+#   block  device_write of a --block-size block, then reading it back
+#
+# With --memory, clients connect over in-memory connections rather than
+# TCP, which leaves out the kernel socket overhead.
+#
+# Clients and server run in the same process, so the CPU time per call
+# covers both ends. It is still the number to watch for regressions in
+# rpc_srv and the generated packers.
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Dict, List, Tuple
+
+from vxi11aio import vxi11_srv, vxi11_client, adapter_loopback, rpc_srv
+from vxi11aio.vxi11_srv import vxi11_deviceFlags, vxi11_errorCodes
+from vxi11aio.vxi11_adapter import DEFAULT_MAX_RECV_SIZE
+
+OPS = ["query", "stb", "block"]
+QUERY = b"MEAS:VOLT:DC?\n"
+
+class stats():
+    def __init__(self) -> None:
+        # op => latencies in seconds
+        self.latency: Dict[str,List[float]] = {op: [] for op in OPS}
+        self.calls = 0
+        self.bytes = 0
+
+def percentile(values: List[float], p: float) -> float:
+    """values must be sorted"""
+    if(len(values) == 0):
+        return float('nan')
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+def parse_mix(mix: str) -> Tuple[List[str],List[float]]:
+    ops = []
+    weights = []
+    for item in mix.split(","):
+        (op, weight) = item.split(":")
+        if(op not in OPS):
+            raise ValueError(f"Unknown operation {op}, expected one of {OPS}")
+        ops.append(op)
+        weights.append(float(weight))
+    return (ops, weights)
+
+async def run_client(srv: vxi11_srv.vxi11_core_srv, memory: bool, ops: List[str], weights: List[float], block: bytes,
+                     end_time: float, seed: int, st: stats) -> None:
+    rnd = random.Random(seed)
+    cl = vxi11_client.vxi11_client()
+    if(memory):
+        await cl.connect_memory(srv)
+    else:
+        await cl.connect("127.0.0.1", srv.actual_port)
+    (err, link) = await cl.create_link(b"inst0")
+    assert(err == vxi11_errorCodes.NO_ERROR and link is not None)
+    # Whole blocks are read back in a single device_read
+    block_calls = (len(block) + link.maxRecvSize - 1) // link.maxRecvSize + 1
+    loop = asyncio.get_event_loop()
+    while loop.time() < end_time:
+        op = rnd.choices(ops, weights)[0]
+        start = time.perf_counter()
+        if(op == "stb"):
+            (err, _) = await link.read_stb(flags=vxi11_deviceFlags(0), lock_timeout=0, io_timeout=1000)
+            calls = 1
+            size = 0
+        else:
+            data = QUERY if op == "query" else block
+            (err, _) = await link.write(io_timeout=1000, lock_timeout=0, flags=vxi11_deviceFlags.END, data=data)
+            assert(err == vxi11_errorCodes.NO_ERROR)
+            (err, _, rsp) = await link.read(requestSize=len(data), io_timeout=1000, lock_timeout=0,
+                                            flags=vxi11_deviceFlags(0), termChar=0)
+            assert(len(rsp) == len(data))
+            calls = 2 if op == "query" else block_calls
+            size = 2*len(data)
+        st.latency[op].append(time.perf_counter() - start)
+        assert(err == vxi11_errorCodes.NO_ERROR)
+        st.calls += calls
+        st.bytes += size
+    await link.destroy()
+    await cl.close()
+
+async def main(args: argparse.Namespace) -> None:
+    # Printing every call would dominate the measurement
+    rpc_srv.rpc_conn.trace_calls = False
+    (ops, weights) = parse_mix(args.mix)
+    adapter = adapter_loopback.adapter(delay=args.delay, max_recv_size=args.max_recv_size)
+    srv = vxi11_srv.vxi11_core_srv(port=0, adapters=[adapter])
+    srv.abort_port = 0
+    await srv.open()
+    
+    st = stats()
+    block = bytes(args.block_size)
+    end_time = asyncio.get_event_loop().time() + args.duration
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    await asyncio.gather(*[run_client(srv, args.memory, ops, weights, block, end_time, seed, st)
+                           for seed in range(args.clients)])
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    # Let the server side of the connections wind down before closing
+    await asyncio.sleep(0.1)
+    await srv.close()
+    
+    transport = "memory" if args.memory else "TCP"
+    print(f"{args.clients} clients over {transport}, {elapsed:.1f} s, mix {args.mix}, block {args.block_size} bytes")
+    print(f"{'op':>8} {'count':>8} {'ops/s':>10} {'p50 ms':>10} {'p99 ms':>10}")
+    for op in OPS:
+        lat = sorted(st.latency[op])
+        if(len(lat) == 0):
+            continue
+        print(f"{op:>8} {len(lat):>8} {len(lat)/elapsed:>10.1f} "
+              f"{percentile(lat, 0.5)*1e3:>10.3f} {percentile(lat, 0.99)*1e3:>10.3f}")
+    print(f"RPC calls/s:   {st.calls/elapsed:.1f}")
+    print(f"MB/s:          {st.bytes/elapsed/1e6:.2f}")
+    print(f"CPU us/call:   {cpu/max(st.calls, 1)*1e6:.1f}")
+
+if  __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load generator for the VXI-11 server")
+    parser.add_argument("--clients", type=int, default=8, help="Number of simulated clients")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds to run for")
+    parser.add_argument("--mix", default="query:70,stb:20,block:10", help="Operations and their weights")
+    parser.add_argument("--block-size", type=int, default=1024*1024, help="Bytes per block transfer")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds the adapter takes per write and read")
+    parser.add_argument("--max-recv-size", type=int, default=DEFAULT_MAX_RECV_SIZE, help="maxRecvSize of the adapter")
+    parser.add_argument("--memory", action="store_true", help="Connect over in-memory connections instead of TCP")
+    args = parser.parse_args()
+    asyncio.run(main(args))
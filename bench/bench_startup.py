@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+# Startup time of the server, from starting main.py to it listening.
+#
+# Run from the top directory with:
+#   python -m bench.bench_startup [--runs N] [--top N] [--save] [--baseline FILE]
+#
+# Each run starts "python -X importtime main.py", and times how long it
+# takes to print its first "Serving ..." line, which it does once the core
+# channel listens. The process is then killed. The import times of the run
+# with the median time to listen are broken down by module, to show where
+# the time goes.
+#
+# Python must be able to write bytecode (PYTHONDONTWRITEBYTECODE unset), or
+# every run includes compiling the large generated modules in vxi11aio/xdr.
+#
+# As with bench_xdr, results are compared against the baseline file, if it
+# exists, and --save replaces it with the current results.
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+TOP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(os.path.dirname(__file__), "startup_baseline.json")
+
+# A slowdown beyond this, relative to the baseline, is flagged
+THRESHOLD = 1.10
+
+# (self, cumulative, name) of each import, in us
+importType = Tuple[int,int,str]
+
+def start(timeout: float) -> Tuple[float,List[importType]]:
+    """Time to first listen, in seconds, and the imports of one run"""
+    with tempfile.TemporaryFile() as err:
+        t0 = time.perf_counter()
+        proc = subprocess.Popen([sys.executable, "-X", "importtime", "-u", "main.py"], cwd=TOP,
+                                stdout=subprocess.PIPE, stderr=err)
+        try:
+            assert(proc.stdout is not None)
+            deadline = t0 + timeout
+            while True:
+                line = proc.stdout.readline()
+                if(line.startswith(b"Serving ")):
+                    t = time.perf_counter() - t0
+                    break
+                if(line == b"" or time.perf_counter() > deadline):
+                    raise RuntimeError("main.py exited, or took too long, before listening")
+        finally:
+            proc.kill()
+            proc.wait()
+        err.seek(0)
+        imports = []
+        for l in err.read().decode().splitlines():
+            if(not l.startswith("import time:") or "self [us]" in l):
+                continue
+            (self_us, cumulative_us, name) = l[len("import time:"):].split("|")
+            # The name is indented by one space, and two more per level
+            imports.append((int(self_us), int(cumulative_us), name[1:].rstrip()))
+        return (t, imports)
+
+def main(args: argparse.Namespace) -> None:
+    baseline: Dict[str,float] = dict()
+    if(os.path.exists(args.baseline)):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    runs = sorted([start(args.timeout) for i in range(args.runs)], key=lambda r: r[0])
+    (t, imports) = runs[len(runs)//2]
+    # Imports at the top level (not indented) are those the cumulative
+    # times add up over
+    top_level = [i for i in imports if not i[2].startswith(" ")]
+    results = {"first listen": statistics.median([r[0] for r in runs]),
+               "imports": sum([i[1] for i in top_level])/1e6,
+               "vxi11aio imports": sum([i[0] for i in imports if i[2].strip().startswith("vxi11aio")])/1e6}
+    slower = []
+    for (key, value) in results.items():
+        base = baseline.get(key)
+        if(base is None):
+            ratio = "-"
+        else:
+            ratio = f"{value/base:.2f}x"
+            if(value/base > THRESHOLD):
+                slower.append(key)
+        print(f"{key:<16} {value*1e3:9.2f} ms {ratio:>8}")
+    print(f"First listen, best {runs[0][0]*1e3:.2f} ms, worst {runs[-1][0]*1e3:.2f} ms, of {len(runs)} runs")
+    print(f"Slowest imports of the median run, by own time:")
+    for (self_us, cumulative_us, name) in sorted(imports, reverse=True)[:args.top]:
+        print(f"  {self_us/1e3:7.2f} ms ({cumulative_us/1e3:7.2f} ms with its imports) {name.strip()}")
+    if(len(slower) > 0):
+        print(f"Slower than the baseline by over {(THRESHOLD-1)*100:.0f}%: {', '.join(slower)}")
+    if(args.save):
+        with open(args.baseline, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "results": results}, f, indent=1, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+
+if  __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Startup time of the server, from starting main.py to it listening")
+    parser.add_argument("--runs", type=int, default=5, help="Times to start the server")
+    parser.add_argument("--top", type=int, default=15, help="Number of imports to list")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Seconds to wait for it to listen")
+    parser.add_argument("--save", action="store_true", help="Save the results as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE, help="Baseline file to compare against")
+    args = parser.parse_args()
+    main(args)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+# Measures device_write throughput as a function of maxRecvSize.
+#
+# Run from the top directory with:
+#   python -m bench.bench_write_size [--total MBYTES]
+#
+# For each maxRecvSize, a server is started with a loopback adapter that
+# discards its input, and a fixed amount of data is written split into
+# maxRecvSize sized device_write calls, as a VISA client would.
+
+import argparse
+import asyncio
+import time
+from typing import List
+
+from vxi11aio import vxi11_srv, adapter_loopback, rpc_client, rpc_srv
+from vxi11aio.vxi11_srv import vxi11_deviceFlags, vxi11_errorCodes
+from vxi11aio.xdr import vxi11_const, vxi11_type
+from vxi11aio.xdr.vxi11_pack import VXI11Packer, VXI11Unpacker
+
+SIZES = [1024, 4096, 16*1024, 64*1024, 256*1024, 1024*1024, 4*1024*1024, 16*1024*1024]
+
+async def run_one(max_recv_size: int, total: int) -> float:
+    """Returns throughput in bytes/second"""
+    adapter = adapter_loopback.adapter(echo=False, max_recv_size=max_recv_size)
+    srv = vxi11_srv.vxi11_core_srv(port=0, adapters=[adapter])
+    srv.abort_port = 0
+    await srv.open()
+    cl = rpc_client.rpc_client()
+    await cl.connect("127.0.0.1", srv.actual_port)
+    
+    p = VXI11Packer()
+    p.pack_Create_LinkParms(vxi11_type.Create_LinkParms(clientId=0, lockDevice=False,
+                                                        lock_timeout=0, device=b"inst0"))
+    rsp, _ = await cl.call(vxi11_const.DEVICE_CORE, vxi11_const.DEVICE_CORE_VERSION,
+                           vxi11_const.create_link, p.get_buffer())
+    link = VXI11Unpacker(rsp).unpack_Create_LinkResp()
+    chunk = bytes(link.maxRecvSize)
+    
+    start = time.perf_counter()
+    written = 0
+    while written < total:
+        data = chunk[:total - written]
+        flags = vxi11_deviceFlags.END if written + len(data) == total else 0
+        p = VXI11Packer()
+        p.pack_Device_WriteParms(vxi11_type.Device_WriteParms(lid=link.lid, io_timeout=10000,
+                                 lock_timeout=0, flags=flags, data=data))
+        rsp, _ = await cl.call(vxi11_const.DEVICE_CORE, vxi11_const.DEVICE_CORE_VERSION,
+                               vxi11_const.device_write, p.get_buffer())
+        wr = VXI11Unpacker(rsp).unpack_Device_WriteResp()
+        assert(wr.error == vxi11_errorCodes.NO_ERROR)
+        written += wr.size
+    elapsed = time.perf_counter() - start
+    
+    await cl.close()
+    # Let the server side of the connection wind down before closing
+    await asyncio.sleep(0.1)
+    await srv.close()
+    return total / elapsed
+
+async def main(total: int, sizes: List[int]) -> None:
+    # Printing every call would dominate the measurement
+    rpc_srv.rpc_conn.trace_calls = False
+    print(f"{'maxRecvSize':>12} {'calls':>8} {'MB/s':>10}")
+    for size in sizes:
+        rate = await run_one(size, total)
+        calls = (total + size - 1) // size
+        print(f"{size:>12} {calls:>8} {rate/1e6:>10.1f}")
+
+if  __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measures device_write throughput as a function of maxRecvSize")
+    parser.add_argument("--total", type=int, default=64, help="MBytes written per maxRecvSize")
+    parser.add_argument("--sizes", type=int, nargs="*", default=SIZES, help="maxRecvSize values to test")
+    args = parser.parse_args()
+    asyncio.run(main(args.total*1024*1024, args.sizes))
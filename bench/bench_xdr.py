@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+# Microbenchmarks for the generated XDR pack/unpack code.
+#
+# Run from the top directory with:
+#   python -m bench.bench_xdr [--save] [--baseline FILE] [--max-size BYTES] [--filter TEXT]
+#
+# Each case encodes a value with the generated packer, and decodes the
+# result with the generated unpacker. Types with a variable length opaque
+# are timed at payload sizes from 0 bytes to 16 MiB. The time per
+# operation is the best of several timeit runs.
+#
+# Results are compared against the baseline file, if it exists, and --save
+# replaces it with the current results. Baselines are only comparable when
+# taken on the same machine and Python version, so the stored one is for
+# judging changes (such as a new xdrgen backend), not absolute numbers.
+
+import argparse
+import json
+import os
+import platform
+import timeit
+from typing import Any, Callable, Dict, List, Tuple, Type
+
+import xdrlib
+
+from vxi11aio.xdr import vxi11_type, rpc_type, rpc_const, portmap_type, portmap_const
+from vxi11aio.xdr.vxi11_pack import VXI11Packer, VXI11Unpacker
+from vxi11aio.xdr.rpc_pack import RPCPacker, RPCUnpacker
+from vxi11aio.xdr.portmap_pack import PORTMAPPacker, PORTMAPUnpacker
+
+BASELINE = os.path.join(os.path.dirname(__file__), "xdr_baseline.json")
+
+SIZES = [0, 64, 4096, 256*1024, 16*1024*1024]
+
+# A slowdown beyond this, relative to the baseline, is flagged
+THRESHOLD = 1.10
+
+# (name, packer, unpacker, type name, value)
+case = Tuple[str, Type[xdrlib.Packer], Type[xdrlib.Unpacker], str, Any]
+
+def rpc_call(xid: int) -> rpc_type.rpc_msg:
+    auth = rpc_type.opaque_auth(flavor=rpc_const.AUTH_NONE, body=b'')
+    return rpc_type.rpc_msg(xid=xid, body=rpc_type.rpc_msg_body(
+            mtype=rpc_const.CALL, cbody=rpc_type.call_body(
+                    rpcvers=2, prog=0x0607AF, vers=1, proc=11, cred=auth, verf=auth)))
+
+def rpc_reply(xid: int) -> rpc_type.rpc_msg:
+    return rpc_type.rpc_msg(xid=xid, body=rpc_type.rpc_msg_body(
+            mtype=rpc_const.REPLY, rbody=rpc_type.reply_body(
+                    stat=rpc_const.MSG_ACCEPTED, areply=rpc_type.accepted_reply(
+                            verf=rpc_type.opaque_auth(flavor=rpc_const.AUTH_NONE, body=b''),
+                            reply_data=rpc_type.rpc_reply_data(stat=rpc_const.SUCCESS, results=b'')))))
+
+def cases(max_size: int) -> List[case]:
+    c: List[case] = [
+        ("Create_LinkParms", VXI11Packer, VXI11Unpacker, "Create_LinkParms",
+         vxi11_type.Create_LinkParms(clientId=1, lockDevice=False, lock_timeout=0, device=b"inst0")),
+        ("Create_LinkResp", VXI11Packer, VXI11Unpacker, "Create_LinkResp",
+         vxi11_type.Create_LinkResp(error=0, lid=1, abortPort=1234, maxRecvSize=4*1024*1024)),
+        ("Device_ReadParms", VXI11Packer, VXI11Unpacker, "Device_ReadParms",
+         vxi11_type.Device_ReadParms(lid=1, requestSize=1024, io_timeout=1000, lock_timeout=0, flags=0, termChar=0)),
+        ("Device_GenericParms", VXI11Packer, VXI11Unpacker, "Device_GenericParms",
+         vxi11_type.Device_GenericParms(lid=1, flags=0, lock_timeout=0, io_timeout=1000)),
+        ("Device_ReadStbResp", VXI11Packer, VXI11Unpacker, "Device_ReadStbResp",
+         vxi11_type.Device_ReadStbResp(error=0, stb=0x10)),
+        ("Device_Error", VXI11Packer, VXI11Unpacker, "Device_Error",
+         vxi11_type.Device_Error(error=0)),
+        ("rpc_msg call", RPCPacker, RPCUnpacker, "rpc_msg", rpc_call(1)),
+        ("rpc_msg reply", RPCPacker, RPCUnpacker, "rpc_msg", rpc_reply(1)),
+        ("authsys_parms", RPCPacker, RPCUnpacker, "authsys_parms",
+         rpc_type.authsys_parms(stamp=1, machinename=b"localhost", uid=1000, gid=1000, gids=list(range(16)))),
+        ("mapping", PORTMAPPacker, PORTMAPUnpacker, "mapping",
+         portmap_type.mapping(prog=0x0607AF, vers=1, prot=portmap_const.IPPROTO_TCP, port=1234)),
+    ]
+    for size in SIZES:
+        if(size > max_size):
+            continue
+        data = bytes(size)
+        c += [
+            (f"Device_WriteParms[{size}]", VXI11Packer, VXI11Unpacker, "Device_WriteParms",
+             vxi11_type.Device_WriteParms(lid=1, io_timeout=1000, lock_timeout=0, flags=8, data=data)),
+            (f"Device_ReadResp[{size}]", VXI11Packer, VXI11Unpacker, "Device_ReadResp",
+             vxi11_type.Device_ReadResp(error=0, reason=4, data=data)),
+            (f"call_args[{size}]", PORTMAPPacker, PORTMAPUnpacker, "call_args",
+             portmap_type.call_args(prog=0x0607AF, vers=1, proc=11, args=data)),
+        ]
+    return c
+
+def best_time(func: Callable[[], Any], repeat: int) -> float:
+    """Seconds per call, the best of repeat runs"""
+    t = timeit.Timer(func)
+    (number, _) = t.autorange()
+    return min(t.repeat(repeat=repeat, number=number)) / number
+
+def run(c: case, repeat: int) -> Tuple[float,float]:
+    """Returns (encode, decode) seconds per operation"""
+    (name, packer, unpacker, type_name, value) = c
+    pack = getattr(packer, "pack_" + type_name)
+    unpack = getattr(unpacker, "unpack_" + type_name)
+    def encode() -> bytes:
+        p = packer()
+        pack(p, value)
+        return p.get_buffer()
+    buf = encode()
+    def decode() -> Any:
+        return unpack(unpacker(buf))
+    return (best_time(encode, repeat), best_time(decode, repeat))
+
+def fmt_time(t: float) -> str:
+    if(t < 1e-3):
+        return f"{t*1e6:9.2f} us"
+    return f"{t*1e3:9.2f} ms"
+
+def main(args: argparse.Namespace) -> None:
+    baseline: Dict[str,float] = dict()
+    if(os.path.exists(args.baseline)):
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+    results: Dict[str,float] = dict()
+    slower = []
+    print(f"{'case':<34} {'encode':>12} {'vs base':>8} {'decode':>12} {'vs base':>8}")
+    for c in cases(args.max_size):
+        if(args.filter is not None and args.filter not in c[0]):
+            continue
+        (enc, dec) = run(c, args.repeat)
+        line = f"{c[0]:<34}"
+        for (op, t) in [("encode", enc), ("decode", dec)]:
+            key = f"{c[0]} {op}"
+            results[key] = t
+            base = baseline.get(key)
+            if(base is None):
+                ratio = "-"
+            else:
+                ratio = f"{t/base:.2f}x"
+                if(t/base > THRESHOLD):
+                    slower.append(key)
+            line += f" {fmt_time(t):>12} {ratio:>8}"
+        print(line)
+    if(len(slower) > 0):
+        print(f"Slower than the baseline by over {(THRESHOLD-1)*100:.0f}%: {', '.join(slower)}")
+    if(args.save):
+        with open(args.baseline, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "results": results}, f, indent=1, sort_keys=True)
+        print(f"Saved baseline to {args.baseline}")
+
+if  __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Microbenchmarks for the generated XDR pack/unpack code")
+    parser.add_argument("--save", action="store_true", help="Save the results as the new baseline")
+    parser.add_argument("--baseline", default=BASELINE, help="Baseline file to compare against")
+    parser.add_argument("--max-size", type=int, default=max(SIZES), help="Largest opaque payload to test")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing runs per case, the best is used")
+    parser.add_argument("--filter", default=None, help="Only run cases whose name contains this")
+    args = parser.parse_args()
+    main(args)
@@ -38,58 +38,97 @@
 # 2. Attempt to connect to 127.0.0.1:111
 # 3. Attempt to create our own static portmapper
 
+# Where /var/run is writable, the core channel also listens on a UNIX socket,
+# which is advertised using rpcbind with netid "local". The static
+# portmapper listens on /var/run/rpcbind.sock then, as rpcbind does, and
+# keeps its registrations in /var/run, so that they survive a restart.
+
 import sys
 import asyncio
 import os
-from typing import Type
+from typing import Optional, Type
 
-from vxi11aio import vxi11_srv, adapter_time, portmap_srv, rpc_client, portmap_client
+from vxi11aio import rpc_srv, vxi11_srv, adapter_time, portmap_srv, portmap_registry, rpc_client, portmap_client
 
 from vxi11aio.xdr import vxi11_const, portmap_const
 
+RUN_DIR = "/var/run"
+CORE_UNIX_PATH = os.path.join(RUN_DIR, "vxi11aio_core.sock")
+RPCBIND_UNIX_PATH = os.path.join(RUN_DIR, "rpcbind.sock")
+REGISTRY_PATH = os.path.join(RUN_DIR, "vxi11aio_portmap")
+
 async def main() -> None:
     
+    unix_path: Optional[str] = None
+    if(os.access(RUN_DIR, os.W_OK)):
+        unix_path = CORE_UNIX_PATH
     vxi11_core_srv = vxi11_srv.vxi11_core_srv(port=0,adapters=[adapter_time.adapter()])
-    vxi11_async_srv = vxi11_srv.vxi11_async_srv(port=0)
+    vxi11_async_srv = vxi11_srv.vxi11_async_srv(port=0,core_srv=vxi11_core_srv)
+    # The core and abort channels share a single port
+    host = rpc_srv.rpc_host(port=0, max_record_size=vxi11_core_srv.max_record_size,
+                            unix_path=unix_path, cache_replies=True)
+    host.register(vxi11_srv.vxi11_core_conn, vxi11_core_srv.create_conn)
+    host.register(vxi11_srv.vxi11_abort_conn, vxi11_async_srv.create_conn)
     
-    # Open sockets so that we can get the actual port numbers
-    await asyncio.gather(vxi11_core_srv.open(),vxi11_async_srv.open())
+    # Open sockets so that we can get the actual port number
+    await host.open()
     
-    cl = None
-    if (os.path.exists(b"/var/run/rpcbind.sock")):
-        cl = rpc_client.rpc_client()
-        await cl.connect_unix(path="/var/run/rpcbind.sock")
-    else:
-        try:
-            cl = rpc_client.rpc_client()
-            await cl.connect(host="127.0.0.1",port=111)
-        except ConnectionRefusedError:
-            print("Could not connect to portmapper.... attempting to start our own")
-            cl = None
-    tasks = [asyncio.create_task(vxi11_core_srv.main()),
-             asyncio.create_task(vxi11_async_srv.main()),
-             ]   
-    if (cl is not None):
+    pm: Optional[portmap_client.portmap_client] = portmap_client.portmap_client(unix_path=RPCBIND_UNIX_PATH)
+    try:
+        await pm.connect()
+    except ConnectionRefusedError:
+        print("Could not connect to portmapper.... attempting to start our own")
+        pm = None
+    tasks = [asyncio.create_task(host.main())]
+    if (pm is not None):
         print("Requesting RPC mapping")
-        await portmap_client.map(cl,vxi11_const.DEVICE_CORE,vxi11_const.DEVICE_CORE_VERSION, port = vxi11_core_srv.actual_port)
-        await portmap_client.map(cl,vxi11_const.DEVICE_ASYNC,vxi11_const.DEVICE_ASYNC_VERSION, port = vxi11_async_srv.actual_port)
-        await cl.close()
+        results = await pm.set_many([
+                (vxi11_const.DEVICE_CORE,vxi11_const.DEVICE_CORE_VERSION,portmap_const.IPPROTO_TCP,host.actual_port),
+                (vxi11_const.DEVICE_ASYNC,vxi11_const.DEVICE_ASYNC_VERSION,portmap_const.IPPROTO_TCP,host.actual_port)])
+        if (not all(results)):
+            raise Exception("Request to map the VXI-11 ports failed.")
+        if (unix_path is not None):
+            try:
+                await pm.rpcb_set(vxi11_const.DEVICE_CORE,vxi11_const.DEVICE_CORE_VERSION,
+                                  netid=b"local", addr=unix_path.encode())
+            except Exception as e:
+                # A portmapper without rpcbind support, so the socket is only
+                # usable by clients that already know the path.
+                print(f"Could not advertise UNIX socket: {e}")
+        await pm.close()
     else:
         print("Starting static portmapper")
         mapper = portmap_srv.portmapper()
+        reg = None
+        if (os.access(RUN_DIR, os.W_OK)):
+            # Registrations of other services from before a restart. Ours
+            # are replaced below.
+            reg = portmap_registry.registry(REGISTRY_PATH)
+            reg.attach(mapper)
         # although spec only specifies that core channel needs to be mapped, KeySight IO libraries want both mapped
         mapper.mapping[(vxi11_const.DEVICE_CORE,vxi11_const.DEVICE_CORE_VERSION,
-                        portmap_const.IPPROTO_TCP)] = vxi11_core_srv.actual_port
+                        portmap_const.IPPROTO_TCP)] = host.actual_port
         mapper.mapping[(vxi11_const.DEVICE_ASYNC,vxi11_const.DEVICE_ASYNC_VERSION,
-                        portmap_const.IPPROTO_TCP)] = vxi11_async_srv.actual_port
+                        portmap_const.IPPROTO_TCP)] = host.actual_port
+        pm_unix_path = None
+        if (unix_path is not None):
+            mapper.addresses[(vxi11_const.DEVICE_CORE,vxi11_const.DEVICE_CORE_VERSION,
+                              b"local")] = (unix_path.encode(), b"vxi11aio")
+            pm_unix_path = RPCBIND_UNIX_PATH
         
-        pm_srv = portmap_srv.portmap_srv(mapper=mapper,port=111)
+        pm_srv = portmap_srv.portmap_srv(mapper=mapper,port=111,unix_path=pm_unix_path,udp_port=111)
         pm_task = asyncio.create_task(pm_srv.main())
         tasks = tasks + [pm_task]
-    vxi11_core_srv.abort_port = vxi11_async_srv.actual_port
+        if (reg is not None):
+            tasks = tasks + [asyncio.create_task(reg.probe()), asyncio.create_task(reg.main())]
+    vxi11_core_srv.abort_port = host.actual_port
     await asyncio.gather(*tasks, return_exceptions=True)
     
 if  __name__ == "__main__":
+    if not sys.warnoptions:
+        import warnings
+        warnings.simplefilter("default") # Change the filter in this process
+        os.environ["PYTHONWARNINGS"] = "default" # Also affect subprocesses
     if(sys.hexversion >= 0x03070000):
         asyncio.run(main())
     else:
@@ -2,11 +2,59 @@
 
 import io
 import os
+import sys
+import importlib.util
 import setuptools
+from setuptools.command.build_py import build_py
+
+here = os.path.dirname(os.path.abspath(__file__))
+
+# The .x files vxi11aio/xdr is generated from, and the options xdrgen.run()
+# is given for each
+xdr_sources = [("vxi11aio/xdr/rpc.x", {}),
+               ("vxi11aio/xdr/portmap.x", {}),
+               ("vxi11aio/xdr/vxi11.x", {"views": ["Device_WriteParms", "Device_DocmdParms"]})]
+
+class build_xdr(setuptools.Command):
+    """Regenerates the modules in vxi11aio/xdr from the .x files which, or
+    whose generator, changed."""
+    description = "generate the XDR packers, server skeletons and client stubs"
+    user_options = [("force", "f", "regenerate even if up to date")]
+    boolean_options = ["force"]
+    
+    def initialize_options(self) -> None:
+        self.force = 0
+    
+    def finalize_options(self) -> None:
+        pass
+    
+    def run(self) -> None:
+        try:
+            import ply
+        except ImportError:
+            print("ply is not installed, so the generated XDR modules are used as they are")
+            return
+        spec = importlib.util.spec_from_file_location("xdrgen", os.path.join(here, "vxi11aio", "xdrgen.py"))
+        xdrgen = importlib.util.module_from_spec(spec)
+        # PLY reads the grammar from the module's source
+        sys.modules["xdrgen"] = xdrgen
+        spec.loader.exec_module(xdrgen) # type: ignore
+        for (x, options) in xdr_sources:
+            x = os.path.join(here, x)
+            if xdrgen.run(x, outdir=os.path.dirname(x), force=bool(self.force), **options):
+                raise RuntimeError("xdrgen failed on %s" % x)
+
+class build_py_xdr(build_py):
+    """build_py, after generating the XDR modules"""
+    def run(self) -> None:
+        self.run_command("build_xdr")
+        super().run()
 
 setuptools.setup(
     name='vxi11aio',
     version='0.0.1',
     python_requires='>=3.7',
+    packages=['vxi11aio', 'vxi11aio.xdr'],
     install_requires=['aioserial'],
+    cmdclass={"build_xdr": build_xdr, "build_py": build_py_xdr},
 )
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+import unittest
+import asyncio
+import os
+import pty
+import select
+import threading
+import tty
+from typing import Dict, List, Optional, Tuple
+
+from vxi11aio import adapter_prologix
+from vxi11aio.vxi11_srv import vxi11_errorCodes, vxi11_deviceFlags, vxi11_readReason
+
+class fake_prologix(threading.Thread):
+    """A Prologix controller with SCPI-like instruments behind it, on a pty.
+    
+    Each instrument answers *IDN? with its address, DATA? <n> with n
+    digits, and BIN? with a binary block holding line feeds. Once JUNK is
+    received, the controller sends some data unasked. Other messages are
+    recorded in received."""
+    def __init__(self) -> None:
+        super().__init__(daemon=True)
+        (self.master, self.slave) = pty.openpty()
+        tty.setraw(self.master)
+        tty.setraw(self.slave)
+        self.port = os.ttyname(self.slave)
+        self.stop = False
+        self.commands: List[bytes] = []
+        self.addr: Optional[Tuple[int,Optional[int]]] = None
+        self.eoi = True
+        self.eot: Optional[bytes] = None # Appended to responses ending with EOI
+        self.eot_enable = False
+        self.received: Dict[Tuple[int,Optional[int]],List[bytes]] = dict()
+        self._input: Dict[Tuple[int,Optional[int]],bytes] = dict()
+        self._output: Dict[Tuple[int,Optional[int]],bytes] = dict()
+        
+    def addr_commands(self) -> int:
+        return sum(1 for c in self.commands if c.startswith(b"++addr"))
+    
+    def run(self) -> None:
+        line = bytearray()
+        is_data = False # An escaped character at the start makes it data
+        esc = False
+        while not self.stop:
+            (r,_,_) = select.select([self.master],[],[],0.02)
+            if(len(r) == 0):
+                continue
+            for b in os.read(self.master, 4096):
+                if(esc):
+                    esc = False
+                    if(len(line) == 0):
+                        is_data = True
+                    line.append(b)
+                elif(b == 0x1b):
+                    esc = True
+                elif(b in b"\r\n"):
+                    if(len(line) > 0):
+                        self.handle(bytes(line), is_data)
+                    line = bytearray()
+                    is_data = False
+                else:
+                    line.append(b)
+    
+    def handle(self, line: bytes, is_data: bool) -> None:
+        if(not is_data and line.startswith(b"++")):
+            self.commands.append(line)
+            args = line[2:].split()
+            if(args[0] == b"addr"):
+                self.addr = (int(args[1]), int(args[2]) - 96 if len(args) > 2 else None)
+            elif(args[0] == b"eoi"):
+                self.eoi = args[1] == b"1"
+            elif(args[0] == b"eot_enable"):
+                self.eot_enable = args[1] == b"1"
+            elif(args[0] == b"eot_char"):
+                self.eot = bytes([int(args[1])])
+            elif(args[0] == b"read"):
+                out = self._output.pop(self.addr, b"")
+                if(args[1] != b"eoi" and int(args[1]) in out):
+                    ix = out.index(int(args[1])) + 1
+                    (out, self._output[self.addr]) = (out[:ix], out[ix:])
+                if(len(out) > 0 and len(self._output.get(self.addr, b"")) == 0 and
+                   self.eot_enable and self.eot is not None):
+                    # The last byte came with EOI
+                    out += self.eot
+                os.write(self.master, out)
+            elif(args[0] == b"spoll"):
+                stb = 0x10 if len(self._output.get(self.addr, b"")) > 0 else 0
+                os.write(self.master, b"%d\n" % stb)
+            return
+        msg = self._input.get(self.addr, b"") + line
+        if(not self.eoi):
+            self._input[self.addr] = msg
+            return
+        self._input[self.addr] = b""
+        if(msg == b"*IDN?"):
+            self._output[self.addr] = b"FAKE,GPIB,%d,0\n" % (self.addr[0],)
+        elif(msg == b"BIN?"):
+            self._output[self.addr] = b"#16\n\x00\r\n\xff\n\n"
+        elif(msg == b"JUNK"):
+            os.write(self.master, b"junk\n")
+        elif(msg.startswith(b"DATA? ")):
+            n = int(msg[6:])
+            self._output[self.addr] = bytes(b"0123456789"[i % 10] for i in range(n)) + b"\n"
+        else:
+            self.received.setdefault(self.addr, []).append(msg)
+            
+    def close(self) -> None:
+        self.stop = True
+        self.join()
+        os.close(self.master)
+        os.close(self.slave)
+
+class TestBusScheduler(unittest.TestCase):
+    def test_order(self):
+        async def test(max_batch: int) -> List[str]:
+            bus = adapter_prologix.bus_scheduler(max_batch=max_batch)
+            order: List[str] = []
+            async def op(name: str, addr: int) -> None:
+                await bus.acquire((addr, None))
+                order.append(name)
+                await asyncio.sleep(0)
+                bus.release()
+            await bus.acquire((1, None))
+            tasks = [asyncio.ensure_future(op(name, addr)) for (name, addr) in
+                     [("B1",2),("A2",1),("A3",1),("B2",2),("A4",1)]]
+            await asyncio.sleep(0)
+            bus.release()
+            await asyncio.gather(*tasks)
+            return order
+        loop = asyncio.new_event_loop()
+        try:
+            self.assertEqual(loop.run_until_complete(test(8)), ["A2","A3","A4","B1","B2"])
+            self.assertEqual(loop.run_until_complete(test(2)), ["A2","B1","B2","A3","A4"])
+        finally:
+            loop.close()
+            
+    def test_cancel(self):
+        async def test():
+            bus = adapter_prologix.bus_scheduler()
+            await bus.acquire((1, None))
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(bus.acquire((2, None)), timeout=0.01)
+            bus.release()
+            self.assertFalse(bus.busy)
+            await asyncio.wait_for(bus.acquire((2, None)), timeout=0.01)
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(test())
+        finally:
+            loop.close()
+
+class TestAdapterPrologix(unittest.TestCase):
+    
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.ctrl = fake_prologix()
+        self.ctrl.start()
+        self.adapter = adapter_prologix.adapter(self.ctrl.port)
+    
+    def tearDown(self):
+        self.adapter.close()
+        self.ctrl.close()
+        self.loop.close()
+        asyncio.set_event_loop(None)
+        
+    async def create_link(self, lid: int, device: bytes) -> adapter_prologix.link:
+        (err, link) = await self.adapter.create_link(clientId=0, lockDevice=False, lock_timeout=0,
+                                                     device=device, link_id=lid, conn=None)
+        self.assertEqual(err, vxi11_errorCodes.NO_ERROR)
+        return link
+    
+    async def write(self, link: adapter_prologix.link, data: bytes,
+                    flags: vxi11_deviceFlags = vxi11_deviceFlags.END) -> vxi11_errorCodes:
+        (err, size) = await link.write(io_timeout=1000, lock_timeout=0, flags=flags, data=data)
+        if(err == vxi11_errorCodes.NO_ERROR):
+            self.assertEqual(size, len(data))
+        return err
+    
+    async def read(self, link: adapter_prologix.link, requestSize: int = 1024,
+                   flags: vxi11_deviceFlags = vxi11_deviceFlags(0), termChar: int = 0):
+        return await link.read(requestSize=requestSize, io_timeout=1000, lock_timeout=0,
+                               flags=flags, termChar=termChar)
+        
+    def test_addressing(self):
+        async def test():
+            (err, _) = await self.adapter.create_link(clientId=0, lockDevice=False, lock_timeout=0,
+                                                      device=b"inst0", link_id=1, conn=None)
+            self.assertEqual(err, vxi11_errorCodes.INVALID_ADDRESS)
+            (err, _) = await self.adapter.create_link(clientId=0, lockDevice=False, lock_timeout=0,
+                                                      device=b"gpib1,5", link_id=1, conn=None)
+            self.assertEqual(err, vxi11_errorCodes.INVALID_ADDRESS)
+            
+            link5 = await self.create_link(1, b"gpib0,5")
+            link7 = await self.create_link(2, b"gpib0,7,2")
+            for (link, expected) in [(link5, b"FAKE,GPIB,5,0\n"), (link5, b"FAKE,GPIB,5,0\n"),
+                                     (link7, b"FAKE,GPIB,7,0\n")]:
+                self.assertEqual(await self.write(link, b"*IDN?"), vxi11_errorCodes.NO_ERROR)
+                self.assertEqual(await self.read(link),
+                                 (vxi11_errorCodes.NO_ERROR, vxi11_readReason.END, expected))
+            # The address is only sent when it changes
+            self.assertEqual([c for c in self.ctrl.commands if c.startswith(b"++addr")],
+                             [b"++addr 5", b"++addr 7 98"])
+        self.loop.run_until_complete(test())
+    
+    def test_write_escaping(self):
+        async def test():
+            link = await self.create_link(1, b"gpib0,5")
+            data = b"++addr 1\n\r\x1b+\x00\xff"
+            self.assertEqual(await self.write(link, data[:4], vxi11_deviceFlags(0)), vxi11_errorCodes.NO_ERROR)
+            self.assertEqual(await self.write(link, data[4:]), vxi11_errorCodes.NO_ERROR)
+            self.assertEqual(await self.write(link, b"*RST"), vxi11_errorCodes.NO_ERROR)
+            self.assertEqual(await link.read_stb(flags=vxi11_deviceFlags(0), lock_timeout=0, io_timeout=1000),
+                             (vxi11_errorCodes.NO_ERROR, 0))
+            self.assertEqual(self.ctrl.received[(5, None)], [data, b"*RST"])
+            self.assertEqual([c for c in self.ctrl.commands if c.startswith(b"++eoi")],
+                             [b"++eoi 0", b"++eoi 1"])
+        self.loop.run_until_complete(test())
+        
+    def test_read(self):
+        async def test():
+            link = await self.create_link(1, b"gpib0,5")
+            size = 5000
+            expected = bytes(b"0123456789"[i % 10] for i in range(size)) + b"\n"
+            await self.write(link, b"DATA? %d" % size)
+            received = b""
+            reason = vxi11_readReason.REQCNT
+            while reason == vxi11_readReason.REQCNT:
+                (err, reason, data) = await self.read(link, requestSize=1000)
+                self.assertEqual(err, vxi11_errorCodes.NO_ERROR)
+                received += data
+            self.assertEqual(reason, vxi11_readReason.END)
+            self.assertEqual(received, expected)
+            
+            # Stop at a termination character
+            await self.write(link, b"DATA? 20")
+            self.assertEqual(await self.read(link, flags=vxi11_deviceFlags.TERMCHRSET, termChar=ord('5')),
+                             (vxi11_errorCodes.NO_ERROR, vxi11_readReason.CHR, b"012345"))
+            self.assertEqual(await self.read(link),
+                             (vxi11_errorCodes.NO_ERROR, vxi11_readReason.END, b"67890123456789\n"))
+            
+            # Line feeds don't end a response before EOI
+            await self.write(link, b"BIN?")
+            self.assertEqual(await self.read(link),
+                             (vxi11_errorCodes.NO_ERROR, vxi11_readReason.END, b"#16\n\x00\r\n\xff\n\n"))
+            
+            # Data which wasn't asked for isn't taken as the next response
+            await self.write(link, b"JUNK")
+            await asyncio.sleep(0.1)
+            await self.write(link, b"*IDN?")
+            self.assertEqual(await self.read(link),
+                             (vxi11_errorCodes.NO_ERROR, vxi11_readReason.END, b"FAKE,GPIB,5,0\n"))
+            
+            # Nothing to read
+            self.assertEqual(await link.read(requestSize=100, io_timeout=100, lock_timeout=0,
+                                             flags=vxi11_deviceFlags(0), termChar=0),
+                             (vxi11_errorCodes.IO_TIMEOUT, 0, b''))
+        self.loop.run_until_complete(test())
+        
+    def test_device_locks(self):
+        async def test():
+            link5a = await self.create_link(1, b"gpib0,5")
+            link5b = await self.create_link(2, b"gpib0,5")
+            link7 = await self.create_link(3, b"gpib0,7")
+            self.assertEqual(await link5a.device_lock(flags=vxi11_deviceFlags(0), lock_timeout=0),
+                             vxi11_errorCodes.NO_ERROR)
+            self.assertEqual(await self.write(link5b, b"*RST"), vxi11_errorCodes.IO_TIMEOUT)
+            self.assertEqual(await self.write(link7, b"*RST"), vxi11_errorCodes.NO_ERROR)
+            self.assertEqual(await self.write(link5a, b"*RST"), vxi11_errorCodes.NO_ERROR)
+            await link5a.destroy()
+            self.assertEqual(await self.write(link5b, b"*RST"), vxi11_errorCodes.NO_ERROR)
+            
+            # Nor is the rest of a response already read
+            self.assertEqual(await self.write(link5b, b"*IDN?"), vxi11_errorCodes.NO_ERROR)
+            self.assertEqual(await self.read(link5b, requestSize=4),
+                             (vxi11_errorCodes.NO_ERROR, vxi11_readReason.REQCNT, b"FAKE"))
+            link5c = await self.create_link(4, b"gpib0,5")
+            self.assertEqual(await link5c.device_lock(flags=vxi11_deviceFlags(0), lock_timeout=0),
+                             vxi11_errorCodes.NO_ERROR)
+            self.assertEqual((await self.read(link5b))[0], vxi11_errorCodes.IO_TIMEOUT)
+            self.assertEqual(await self.read(link5c),
+                             (vxi11_errorCodes.NO_ERROR, vxi11_readReason.END, b",GPIB,5,0\n"))
+        self.loop.run_until_complete(test())
+    
+    def test_shared_bus(self):
+        async def test():
+            links = [await self.create_link(i, b"gpib0,%d" % (5 + i % 2,)) for i in range(4)]
+            async def writes(link: adapter_prologix.link) -> None:
+                for i in range(10):
+                    self.assertEqual(await self.write(link, b"CMD %d" % i), vxi11_errorCodes.NO_ERROR)
+            await asyncio.gather(*[writes(link) for link in links])
+            # Wait for the fake controller to catch up
+            await links[0].read_stb(flags=vxi11_deviceFlags(0), lock_timeout=0, io_timeout=1000)
+            for addr in [5, 6]:
+                self.assertEqual(len(self.ctrl.received[(addr, None)]), 20)
+            # Alternating between the devices would take 40
+            self.assertLess(self.ctrl.addr_commands(), 20)
+        self.loop.run_until_complete(test())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+import unittest
+import asyncio
+
+from vxi11aio import adapter_socket
+from vxi11aio.vxi11_srv import vxi11_errorCodes, vxi11_deviceFlags, vxi11_readReason
+
+class fake_scpi_srv():
+    """Minimal SCPI instrument on a raw socket.
+    
+    *IDN? returns an identification string, DATA? <n> returns n bytes of
+    data followed by a newline, and anything else is remembered and can be
+    read back with LAST?. After STALL, nothing more is read from the
+    connection, which is closed once resume is set."""
+    def __init__(self) -> None:
+        self.connections = 0
+        self.last = b''
+        self.resume = asyncio.Event()
+        self._server = None
+        
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                line = await reader.readline()
+                if(len(line) == 0):
+                    break
+                cmd = line.strip()
+                if(cmd == b"*IDN?"):
+                    writer.write(b"FAKE,SCPI,0,1.0\n")
+                elif(cmd.startswith(b"DATA? ")):
+                    n = int(cmd[6:])
+                    writer.write(bytes(b"0123456789"[i % 10] for i in range(n)) + b"\n")
+                elif(cmd == b"LAST?"):
+                    writer.write(self.last + b"\n")
+                elif(cmd == b"STALL"):
+                    await self.resume.wait()
+                    break
+                else:
+                    self.last = cmd
+                await writer.drain()
+        finally:
+            writer.close()
+            
+    async def open(self) -> None:
+        self._server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.port = self._server.sockets[0].getsockname()[1]
+        
+    async def close(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+class TestAdapterSocket(unittest.TestCase):
+    
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.inst = fake_scpi_srv()
+        self.loop.run_until_complete(self.inst.open())
+        self.loop.run_until_complete(self.create_adapter())
+        
+    async def create_adapter(self):
+        self.adapter = adapter_socket.adapter("127.0.0.1", self.inst.port)
+    
+    def tearDown(self):
+        self.loop.run_until_complete(self.adapter.disconnect())
+        self.loop.run_until_complete(self.inst.close())
+        self.loop.close()
+        asyncio.set_event_loop(None)
+        
+    async def create_link(self, lid: int) -> adapter_socket.link:
+        (err, link) = await self.adapter.create_link(clientId=0, lockDevice=False, lock_timeout=0,
+                                                     device=b"inst0", link_id=lid, conn=None)
+        self.assertEqual(err, vxi11_errorCodes.NO_ERROR)
+        return link
+    
+    async def query(self, link: adapter_socket.link, cmd: bytes, requestSize: int = 1024,
+                    flags: vxi11_deviceFlags = vxi11_deviceFlags(0), termChar: int = 0):
+        (err, size) = await link.write(io_timeout=1000, lock_timeout=0, flags=vxi11_deviceFlags.END, data=cmd)
+        self.assertEqual((err, size), (vxi11_errorCodes.NO_ERROR, len(cmd)))
+        return await link.read(requestSize=requestSize, io_timeout=1000, lock_timeout=0,
+                               flags=flags, termChar=termChar)
+        
+    def test_query(self):
+        async def test():
+            link = await self.create_link(1)
+            self.assertEqual(await self.query(link, b"*IDN?"),
+                             (vxi11_errorCodes.NO_ERROR, vxi11_readReason.END, b"FAKE,SCPI,0,1.0\n"))
+            # Termination is only appended when missing
+            self.assertEqual(await self.query(link, b"*IDN?\n"),
+                             (vxi11_errorCodes.NO_ERROR, vxi11_readReason.END, b"FAKE,SCPI,0,1.0\n"))
+            # Writes without END are passed through as is
+            await link.write(io_timeout=1000, lock_timeout=0, flags=vxi11_deviceFlags(0), data=b"CONF:")
+            await link.write(io_timeout=1000, lock_timeout=0, flags=vxi11_deviceFlags.END, data=b"VOLT")
+            self.assertEqual((await self.query(link, b"LAST?"))[2], b"CONF:VOLT\n")
+            # A response which has arrived is read even without waiting
+            await link.write(io_timeout=0, lock_timeout=0, flags=vxi11_deviceFlags.END, data=b"*IDN?")
+            await asyncio.sleep(0.1)
+            self.assertEqual(await link.read(requestSize=100, io_timeout=0, lock_timeout=0,
+                                             flags=vxi11_deviceFlags(0), termChar=0),
+                             (vxi11_errorCodes.NO_ERROR, vxi11_readReason.END, b"FAKE,SCPI,0,1.0\n"))
+            # Nothing to read
+            self.assertEqual(await link.read(requestSize=100, io_timeout=0, lock_timeout=0,
+                                             flags=vxi11_deviceFlags(0), termChar=0),
+                             (vxi11_errorCodes.IO_TIMEOUT, 0, b''))
+            self.assertEqual(await link.read(requestSize=100, io_timeout=50, lock_timeout=0,
+                                             flags=vxi11_deviceFlags(0), termChar=0),
+                             (vxi11_errorCodes.IO_TIMEOUT, 0, b''))
+        self.loop.run_until_complete(test())
+    
+    def test_streaming_read(self):
+        async def test():
+            link = await self.create_link(1)
+            size = 300000
+            expected = bytes(b"0123456789"[i % 10] for i in range(size)) + b"\n"
+            (err, reason, data) = await self.query(link, b"DATA? %d" % size, requestSize=100000)
+            self.assertEqual((err, reason), (vxi11_errorCodes.NO_ERROR, vxi11_readReason.REQCNT))
+            received = data
+            while reason == vxi11_readReason.REQCNT:
+                (err, reason, data) = await link.read(requestSize=100000, io_timeout=1000, lock_timeout=0,
+                                                      flags=vxi11_deviceFlags(0), termChar=0)
+                self.assertEqual(err, vxi11_errorCodes.NO_ERROR)
+                received += data
+            self.assertEqual(reason, vxi11_readReason.END)
+            self.assertEqual(received, expected)
+            
+            # Stop at a termination character
+            (err, reason, data) = await self.query(link, b"DATA? 20", flags=vxi11_deviceFlags.TERMCHRSET, termChar=ord('5'))
+            self.assertEqual((err, reason, data), (vxi11_errorCodes.NO_ERROR, vxi11_readReason.CHR, b"012345"))
+            (err, reason, data) = await link.read(requestSize=100, io_timeout=1000, lock_timeout=0,
+                                                  flags=vxi11_deviceFlags(0), termChar=0)
+            self.assertEqual((err, reason, data), (vxi11_errorCodes.NO_ERROR, vxi11_readReason.END,
+                                                   b"67890123456789\n"))
+        self.loop.run_until_complete(test())
+        
+    def test_connection_reuse(self):
+        async def test():
+            for lid in range(3):
+                link = await self.create_link(lid)
+                self.assertEqual((await self.query(link, b"*IDN?"))[0], vxi11_errorCodes.NO_ERROR)
+                await link.destroy()
+            self.assertEqual(self.inst.connections, 1)
+            # A clear drops the connection, and it is reopened as needed
+            self.assertEqual(await link.clear(flags=vxi11_deviceFlags(0), lock_timeout=0, io_timeout=1000),
+                             vxi11_errorCodes.NO_ERROR)
+            self.assertEqual((await self.query(link, b"*IDN?"))[0], vxi11_errorCodes.NO_ERROR)
+            self.assertEqual(self.inst.connections, 2)
+        self.loop.run_until_complete(test())
+    
+    def test_write_timeout(self):
+        async def test():
+            link = await self.create_link(1)
+            (err, size) = await link.write(io_timeout=1000, lock_timeout=0, flags=vxi11_deviceFlags.END, data=b"STALL")
+            self.assertEqual(err, vxi11_errorCodes.NO_ERROR)
+            # More than the socket buffers hold
+            (err, size) = await link.write(io_timeout=100, lock_timeout=0, flags=vxi11_deviceFlags.END,
+                                           data=bytes(32*1024*1024))
+            self.assertEqual((err, size), (vxi11_errorCodes.IO_TIMEOUT, 0))
+            # The connection is dropped, and reopened by the next operation
+            self.assertIsNone(self.adapter._writer)
+            self.inst.resume.set()
+            self.assertEqual(await self.query(link, b"*IDN?"),
+                             (vxi11_errorCodes.NO_ERROR, vxi11_readReason.END, b"FAKE,SCPI,0,1.0\n"))
+            self.assertEqual(self.inst.connections, 2)
+        self.loop.run_until_complete(test())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+import unittest
+import asyncio
+import concurrent.futures
+from typing import Any, List, Tuple
+from unittest import mock
+
+try:
+    from vxi11aio import adapter_usbtmc
+except ImportError: # pyvisa isn't installed
+    adapter_usbtmc = None # type: ignore
+from vxi11aio.vxi11_srv import vxi11_errorCodes, vxi11_deviceFlags, vxi11_readReason
+
+class fake_inst():
+    """Stands in for a pyvisa MessageBasedResource, recording the calls made"""
+    def __init__(self) -> None:
+        self.send_end = True
+        self.session = 1
+        self.calls: List[Tuple[Any,...]] = []
+        self.response = b"FAKE,USBTMC,0,0\n"
+        self.visalib = self
+    
+    def write_raw(self, data: bytes) -> Tuple[int,Any]:
+        self.calls.append(("write", bytes(data), self.send_end))
+        return (len(data), adapter_usbtmc.pyvisa.constants.StatusCode.success)
+    
+    def read_raw(self, size: int) -> bytes:
+        self.calls.append(("read", size))
+        return self.response
+    
+    def clear(self, session: int) -> Any:
+        self.calls.append(("clear",))
+        return adapter_usbtmc.pyvisa.constants.StatusCode.success
+
+class sync_executor(concurrent.futures.Executor):
+    """Runs the VISA calls right away, rather than in a thread"""
+    def submit(self, fn, *args, **kwargs):
+        fut: concurrent.futures.Future = concurrent.futures.Future()
+        try:
+            fut.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            fut.set_exception(e)
+        return fut
+
+@unittest.skipIf(adapter_usbtmc is None, "pyvisa is not installed")
+class TestAdapterUSBTMC(unittest.TestCase):
+    
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.inst = fake_inst()
+        rm = mock.Mock()
+        rm.open_resource.return_value = self.inst
+        with mock.patch.object(adapter_usbtmc.pyvisa, "ResourceManager", return_value=rm):
+            self.adapter = adapter_usbtmc.adapter("USB0::1::2::3::INSTR", write_buffer_size=8)
+        self.adapter._exec.shutdown()
+        self.adapter._exec = sync_executor()
+        self.link = self.loop.run_until_complete(self.create_link(0))
+    
+    def tearDown(self):
+        self.loop.close()
+        asyncio.set_event_loop(None)
+    
+    async def create_link(self, lid: int) -> 'adapter_usbtmc.link':
+        (err, link) = await self.adapter.create_link(clientId=0, lockDevice=False, lock_timeout=0,
+                                                     device=b"inst0", link_id=lid, conn=None)
+        self.assertEqual(err, vxi11_errorCodes.NO_ERROR)
+        return link
+    
+    def write(self, data: bytes, end: bool) -> None:
+        flags = vxi11_deviceFlags.END if end else vxi11_deviceFlags(0)
+        rsp = self.loop.run_until_complete(self.link.write(io_timeout=1000, lock_timeout=0, flags=flags, data=data))
+        self.assertEqual(rsp, (vxi11_errorCodes.NO_ERROR, len(data)))
+    
+    def test_buffered_write(self):
+        self.write(b"*ID", end=False)
+        self.write(b"N", end=False)
+        # Nothing is sent before END
+        self.assertEqual(self.inst.calls, [])
+        self.write(b"?", end=True)
+        self.assertEqual(self.inst.calls, [("write", b"*IDN?", True)])
+    
+    def test_overflow(self):
+        self.write(b"123456", end=False)
+        # Doesn't fit in the 8 byte buffer, so the buffer is sent first
+        self.write(b"789012", end=False)
+        self.assertEqual(self.inst.calls, [("write", b"123456", False), ("write", b"789012", False)])
+        self.write(b"3", end=True)
+        self.assertEqual(self.inst.calls[2:], [("write", b"3", True)])
+    
+    def test_flush_before_read(self):
+        self.write(b"*IDN?", end=False)
+        rsp = self.loop.run_until_complete(self.link.read(requestSize=100, io_timeout=1000, lock_timeout=0,
+                                                          flags=vxi11_deviceFlags(0), termChar=0))
+        self.assertEqual(rsp, (vxi11_errorCodes.NO_ERROR, vxi11_readReason.END, self.inst.response))
+        self.assertEqual(self.inst.calls, [("write", b"*IDN?", False), ("read", 100)])
+    
+    def test_clear(self):
+        self.write(b"*IDN", end=False)
+        err = self.loop.run_until_complete(self.link.clear(flags=vxi11_deviceFlags(0), lock_timeout=0, io_timeout=1000))
+        self.assertEqual(err, vxi11_errorCodes.NO_ERROR)
+        # The partial message is discarded
+        self.write(b"*CLS", end=True)
+        self.assertEqual(self.inst.calls, [("clear",), ("write", b"*CLS", True)])
+    
+    def test_destroy(self):
+        self.write(b"*RST", end=False)
+        self.assertEqual(self.loop.run_until_complete(self.link.destroy()), vxi11_errorCodes.NO_ERROR)
+        # Buffered data was reported as written, so it isn't dropped
+        self.assertEqual(self.inst.calls, [("write", b"*RST", False)])
+
+if __name__ == '__main__':
+    unittest.main()
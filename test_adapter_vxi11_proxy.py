@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+import unittest
+import asyncio
+import socket
+
+from vxi11aio import vxi11_srv, vxi11_client, adapter_loopback, adapter_vxi11_proxy
+from vxi11aio.vxi11_srv import vxi11_errorCodes, vxi11_deviceFlags, vxi11_readReason
+
+class TestAdapterVXI11Proxy(unittest.TestCase):
+    
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.servers = []
+        self.tasks = []
+        self.clients = []
+        async def start():
+            self.upstream_adapter = adapter_loopback.adapter()
+            self.upstream_srv = await self.start_srv(self.upstream_adapter)
+            self.proxy = adapter_vxi11_proxy.adapter("127.0.0.1", self.upstream_srv.actual_port)
+            self.proxy_srv = await self.start_srv(self.proxy)
+        self.loop.run_until_complete(start())
+        
+    async def start_srv(self, adapter) -> vxi11_srv.vxi11_core_srv:
+        srv = vxi11_srv.vxi11_core_srv(port=0, adapters=[adapter])
+        abort_srv = vxi11_srv.vxi11_async_srv(port=0, core_srv=srv)
+        await asyncio.gather(srv.open(), abort_srv.open())
+        srv.abort_port = abort_srv.actual_port
+        self.servers += [srv, abort_srv]
+        self.tasks += [asyncio.create_task(srv.main()), asyncio.create_task(abort_srv.main())]
+        return srv
+    
+    def tearDown(self):
+        async def stop():
+            for cl in self.clients:
+                await cl.close()
+            await asyncio.sleep(0.1)
+            await self.proxy.connection_lost()
+            await asyncio.sleep(0.1)
+            for srv in self.servers:
+                await srv.close()
+            for t in self.tasks:
+                t.cancel()
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.loop.run_until_complete(stop())
+        self.loop.close()
+        asyncio.set_event_loop(None)
+    
+    async def create_link(self, device: bytes = b"inst0") -> vxi11_client.vxi11_client_link:
+        cl = vxi11_client.vxi11_client()
+        await cl.connect("127.0.0.1", self.proxy_srv.actual_port)
+        self.clients.append(cl)
+        (err, link) = await cl.create_link(device)
+        self.assertEqual(err, vxi11_errorCodes.NO_ERROR)
+        return link
+    
+    def test_shared_upstream(self):
+        async def test():
+            links = [await self.create_link() for i in range(3)]
+            other = await self.create_link(b"inst1")
+            # One upstream connection, and one upstream link per device
+            self.assertEqual(len(self.upstream_adapter.links), 2)
+            
+            self.assertEqual(await links[0].write(io_timeout=1000, lock_timeout=0, flags=vxi11_deviceFlags.END, data=b"hello"),
+                             (vxi11_errorCodes.NO_ERROR, 5))
+            self.assertEqual(await links[0].read_stb(flags=vxi11_deviceFlags(0), lock_timeout=0, io_timeout=1000),
+                             (vxi11_errorCodes.NO_ERROR, 0x10))
+            self.assertEqual(await links[1].read(requestSize=100, io_timeout=1000, lock_timeout=0,
+                                                 flags=vxi11_deviceFlags(0), termChar=0),
+                             (vxi11_errorCodes.NO_ERROR, vxi11_readReason.END, b"hello"))
+            
+            # Locks are between the downstream links
+            self.assertEqual(await links[0].device_lock(flags=vxi11_deviceFlags(0), lock_timeout=0),
+                             vxi11_errorCodes.NO_ERROR)
+            self.assertEqual(await links[1].write(io_timeout=1000, lock_timeout=0, flags=vxi11_deviceFlags.END, data=b"x"),
+                             (vxi11_errorCodes.IO_TIMEOUT, 0))
+            self.assertEqual(await other.write(io_timeout=1000, lock_timeout=0, flags=vxi11_deviceFlags.END, data=b"x"),
+                             (vxi11_errorCodes.NO_ERROR, 1))
+            self.assertEqual(await links[0].abort(), vxi11_errorCodes.NO_ERROR)
+            
+            # The upstream link goes away with the last downstream link
+            for link in links:
+                self.assertEqual(await link.destroy(), vxi11_errorCodes.NO_ERROR)
+            self.assertEqual(len(self.upstream_adapter.links), 1)
+            self.assertEqual(list(self.proxy.upstream.keys()), [b"inst1"])
+        self.loop.run_until_complete(test())
+        
+    def test_abort(self):
+        async def test():
+            self.upstream_adapter.delay = 0.3
+            links = [await self.create_link() for i in range(2)]
+            (upstream_link,) = self.upstream_adapter.links.values()
+            aborts = []
+            async def abort():
+                aborts.append(True)
+                return vxi11_errorCodes.NO_ERROR
+            upstream_link.abort = abort
+            async def write(link):
+                return await link.write(io_timeout=1000, lock_timeout=0, flags=vxi11_deviceFlags.END, data=b"x")
+            # Aborting a link with no operation in progress leaves the
+            # operation of the other link running
+            task = asyncio.ensure_future(write(links[0]))
+            await asyncio.sleep(0.1)
+            self.assertEqual(await links[1].abort(), vxi11_errorCodes.NO_ERROR)
+            self.assertEqual(await task, (vxi11_errorCodes.NO_ERROR, 1))
+            self.assertEqual(aborts, [])
+            # Its own operation is aborted upstream
+            task = asyncio.ensure_future(write(links[0]))
+            await asyncio.sleep(0.1)
+            self.assertEqual(await links[0].abort(), vxi11_errorCodes.NO_ERROR)
+            self.assertEqual(aborts, [True])
+            await task
+        self.loop.run_until_complete(test())
+        
+    def test_srq_relay(self):
+        async def test():
+            links = [await self.create_link() for i in range(2)]
+            received = asyncio.Queue()
+            self.assertEqual(await links[1].enable_srq(received.put_nowait), vxi11_errorCodes.NO_ERROR)
+            (upstream_link,) = self.upstream_adapter.links.values()
+            self.assertIsNotNone(upstream_link.srq_handle)
+            upstream_link.conn.send_srq(upstream_link.srq_handle)
+            self.assertEqual(await asyncio.wait_for(received.get(), timeout=2), links[1].srq_handle)
+            self.assertTrue(received.empty())
+        self.loop.run_until_complete(test())
+        
+    def test_upstream_unreachable(self):
+        async def test():
+            # A port which nothing listens on
+            sock = socket.socket()
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+            sock.close()
+            proxy = adapter_vxi11_proxy.adapter("127.0.0.1", port)
+            (err, link) = await proxy.create_link(clientId=0, lockDevice=False, lock_timeout=0,
+                                                  device=b"inst0", link_id=1, conn=None)
+            self.assertEqual(err, vxi11_errorCodes.DEVICE_NOT_ACCESSIBLE)
+            self.assertIsNone(proxy.client)
+        self.loop.run_until_complete(test())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -31,42 +31,32 @@
 
 import unittest
 import asyncio
+import os
+import socket
 import struct
+import tempfile
 
 from vxi11aio import portmap_srv, rpc_client, portmap_client
 
-from vxi11aio.xdr import portmap_const, rpc_const, portmap_pack
+from vxi11aio.xdr import portmap_const, portmap_type, rpc_const, portmap_pack
 from vxi11aio import rpc_srv
 
 class TestPM_srv(unittest.TestCase):
     
-    async def mock_handle_setport(self,rpc_msg, buf, buf_ix):
-        arg_up = portmap_pack.PORTMAPUnpacker(buf)
-        arg_up.set_position(buf_ix)
-        arg = arg_up.unpack_mapping()
-        print(f"mapping = {arg}")
-        #port = self.mapper.mapping.get((arg.prog,arg.vers,arg.prot))
-        if(arg.port == 999):
-            # Special case of mapping failure
-            data = struct.pack(">I",0) # 1 for success
-            data = rpc_srv.rpc_srv.pack_success_data_msg(rpc_msg.xid,data)
-            return data
-        self.mapper.mapping[(arg.prog,arg.vers,arg.prot)] = arg.port
-        data = struct.pack(">I",1) # 1 for success
-        data = rpc_srv.rpc_srv.pack_success_data_msg(rpc_msg.xid,data)
-        return data
-    
     @classmethod
     def setUpClass(self):
-        self.loop = asyncio.get_event_loop()
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
         self.mapper = portmap_srv.portmapper()
         # although spec only specifies that core channel needs to be mapped, KeySight IO libraries want both mapped
         self.mapper.mapping[(5,  6, portmap_const.IPPROTO_TCP)] = 987
         self.mapper.mapping[(10,11, portmap_const.IPPROTO_TCP)] = 4932
         
-        self.pm_srv = portmap_srv.portmap_srv(mapper=self.mapper,port=0)
-        self.pm_srv_task = self.loop.create_task(self.pm_srv.main())
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.unix_path = os.path.join(self.tmpdir.name, "rpcbind.sock")
+        self.pm_srv = portmap_srv.portmap_srv(mapper=self.mapper,port=0,unix_path=self.unix_path)
         self.loop.run_until_complete(self.pm_srv.open())
+        self.pm_srv_task = self.loop.create_task(self.pm_srv.main())
     @classmethod
     def tearDownClass(self):
         self.loop.run_until_complete(self.pm_srv.close())
@@ -76,7 +66,9 @@ class TestPM_srv(unittest.TestCase):
         except asyncio.CancelledError:
             pass
         self.pm_srv = None
+        self.tmpdir.cleanup()
         self.loop.close()
+        asyncio.set_event_loop(None)
         
     def test_lookups(self):
         cl = rpc_client.rpc_client()
@@ -109,19 +101,256 @@ class TestPM_srv(unittest.TestCase):
         self.loop.run_until_complete(cl.close())
         
     def test_setport(self):
-        portmap_srv.portmap_conn.call_dispatch_table[(portmap_const.PMAP_PROG,portmap_const.PMAP_VERS)][portmap_const.PMAPPROC_SET] = TestPM_srv.mock_handle_setport
-        
         cl = rpc_client.rpc_client()
         self.loop.run_until_complete(cl.connect(host="127.0.0.1",port=self.pm_srv.actual_port))
         self.loop.run_until_complete(portmap_client.map(cl,100,102,103))
         self.assertEqual(self.loop.run_until_complete(portmap_client.getport(
                     client=cl,prog=100,vers=102)),103)
+        # Already mapped
+        with self.assertRaises(Exception):
+            self.loop.run_until_complete(portmap_client.map(cl,100,102,105))
+        self.assertTrue(self.loop.run_until_complete(portmap_client.unmap(cl,100,102)))
+        self.assertFalse(self.loop.run_until_complete(portmap_client.unmap(cl,100,102)))
         self.loop.run_until_complete(portmap_client.map(cl,100,102,105))
         self.assertEqual(self.loop.run_until_complete(portmap_client.getport(
                     client=cl,prog=100,vers=102)),105)
-        with self.assertRaises(Exception):
-            self.loop.run_until_complete(portmap_client.map(cl,100,102,999))
+        self.assertTrue(self.loop.run_until_complete(portmap_client.unmap(cl,100,102)))
         self.loop.run_until_complete(cl.close())
+    
+    def test_store_indexes(self):
+        store = portmap_srv.mapping_store()
+        store[(1,2,portmap_const.IPPROTO_TCP)] = 100
+        store[(1,2,portmap_const.IPPROTO_UDP)] = 100
+        store[(1,3,portmap_const.IPPROTO_TCP)] = 101
+        self.assertEqual(store.protocols(1,2),{portmap_const.IPPROTO_TCP,portmap_const.IPPROTO_UDP})
+        self.assertEqual(store.versions(1),{2,3})
+        self.assertEqual(store.port_keys(100),{(1,2,portmap_const.IPPROTO_TCP),(1,2,portmap_const.IPPROTO_UDP)})
+        # Remapping moves the entry to the new port
+        store[(1,3,portmap_const.IPPROTO_TCP)] = 100
+        self.assertEqual(store.port_keys(101),set())
+        self.assertEqual(store.unset_port(100),3)
+        self.assertEqual(len(store),0)
+        self.assertEqual(store.versions(1),set())
+    
+    def test_dump(self):
+        async def test():
+            cl = rpc_client.rpc_client()
+            await cl.connect(host="127.0.0.1",port=self.pm_srv.actual_port)
+            rsp, msg = await cl.call(portmap_const.PMAP_PROG,portmap_const.PMAP_VERS,portmap_const.PMAPPROC_NULL,b'')
+            self.assertEqual((rsp,msg.body.rbody.areply.reply_data.stat),(b'',rpc_const.SUCCESS))
+            
+            dump = await portmap_client.dump(cl)
+            self.assertEqual(dict(((m.prog,m.vers,m.prot),m.port) for m in dump),dict(self.mapper.mapping))
+            cached = self.mapper.dump_pmaplist()
+            self.assertIs(self.mapper.dump_pmaplist(),cached)
+            await portmap_client.map(cl,300,1,3000)
+            self.assertIsNot(self.mapper.dump_pmaplist(),cached)
+            dump = await portmap_client.dump(cl)
+            self.assertIn((300,1,portmap_const.IPPROTO_TCP,3000),[(m.prog,m.vers,m.prot,m.port) for m in dump])
+            
+            # The same mapping, seen through rpcbind
+            self.assertEqual(await portmap_client.rpcb_getaddr(cl,300,1,b"tcp"),b"127.0.0.1.11.184")
+            rsp, _ = await cl.call(portmap_const.RPCBPROG,portmap_const.RPCBVERS,portmap_const.RPCBPROC_DUMP,b'')
+            up = portmap_pack.PORTMAPUnpacker(rsp)
+            entries = []
+            while up.unpack_bool():
+                entries.append(up.unpack_rpcb())
+            self.assertIn((300,1,b"tcp",b"127.0.0.1.11.184"),[(e.r_prog,e.r_vers,e.r_netid,e.r_addr) for e in entries])
+            self.assertTrue(await portmap_client.unmap(cl,300,1))
+            await cl.close()
+            await asyncio.sleep(0.1)
+        self.loop.run_until_complete(test())
+    
+    def test_callit(self):
+        async def test():
+            # Another portmapper, on UDP, is the service that is called
+            other = portmap_srv.portmapper()
+            other.mapping[(400,1,portmap_const.IPPROTO_TCP)] = 4000
+            other_srv = portmap_srv.portmap_srv(port=0,mapper=other,udp_port=0)
+            await other_srv.open()
+            self.mapper.mapping[(portmap_const.PMAP_PROG,portmap_const.PMAP_VERS,portmap_const.IPPROTO_UDP)] = other_srv.actual_udp_port
+            cl = rpc_client.rpc_client()
+            await cl.connect(host="127.0.0.1",port=self.pm_srv.actual_port)
+            p = portmap_pack.PORTMAPPacker()
+            p.pack_mapping(portmap_type.mapping(prog=400,vers=1,prot=portmap_const.IPPROTO_TCP,port=0))
+            args = portmap_type.call_args(prog=portmap_const.PMAP_PROG,vers=portmap_const.PMAP_VERS,
+                                          proc=portmap_const.PMAPPROC_GETPORT,args=p.get_buffer())
+            p = portmap_pack.PORTMAPPacker()
+            p.pack_call_args(args)
+            rsp, _ = await asyncio.wait_for(cl.call(portmap_const.PMAP_PROG,portmap_const.PMAP_VERS,
+                                                    portmap_const.PMAPPROC_CALLIT,p.get_buffer()),timeout=2)
+            result = portmap_pack.PORTMAPUnpacker(rsp).unpack_call_result()
+            self.assertEqual(result.port,other_srv.actual_udp_port)
+            self.assertEqual(struct.unpack(">I",result.res)[0],4000)
+            del self.mapper.mapping[(portmap_const.PMAP_PROG,portmap_const.PMAP_VERS,portmap_const.IPPROTO_UDP)]
+            await cl.close()
+            await asyncio.sleep(0.1)
+            await other_srv.close()
+        self.loop.run_until_complete(test())
+        
+    def test_rpcbind(self):
+        async def test():
+            cl = rpc_client.rpc_client()
+            await cl.connect_unix(self.unix_path)
+            self.assertEqual(await portmap_client.rpcb_getaddr(cl,200,1,b"local"),b"")
+            self.assertTrue(await portmap_client.rpcb_set(cl,200,1,b"local",b"/tmp/a.sock"))
+            # Already registered
+            self.assertFalse(await portmap_client.rpcb_set(cl,200,1,b"local",b"/tmp/b.sock"))
+            self.assertEqual(await portmap_client.rpcb_getaddr(cl,200,1,b"local"),b"/tmp/a.sock")
+            self.assertEqual(await portmap_client.rpcb_getaddr(cl,200,1,b"local",
+                                                               rpcb_vers=portmap_const.RPCBVERS),b"/tmp/a.sock")
+            self.assertEqual(await portmap_client.rpcb_getaddr(cl,200,1,b"tcp"),b"")
+            
+            p = portmap_pack.PORTMAPPacker()
+            p.pack_rpcb(portmap_type.rpcb(r_prog=200,r_vers=1,r_netid=b"",r_addr=b"",r_owner=b""))
+            rsp, _ = await cl.call(portmap_const.RPCBPROG,portmap_const.RPCBVERS4,
+                                   portmap_const.RPCBPROC_UNSET,p.get_buffer())
+            self.assertTrue(portmap_pack.PORTMAPUnpacker(rsp).unpack_bool())
+            self.assertEqual(await portmap_client.rpcb_getaddr(cl,200,1,b"local"),b"")
+            await cl.close()
+            await asyncio.sleep(0.1)
+        self.loop.run_until_complete(test())
+        
+    def test_rpcb_addrlist_stat(self):
+        async def test():
+            TCP = portmap_const.IPPROTO_TCP
+            UDP = portmap_const.IPPROTO_UDP
+            cl = rpc_client.rpc_client()
+            await cl.connect(host="127.0.0.1",port=self.pm_srv.actual_port)
+            async def getaddrlist(prog, vers):
+                p = portmap_pack.PORTMAPPacker()
+                p.pack_rpcb(portmap_type.rpcb(r_prog=prog,r_vers=vers,r_netid=b"tcp",r_addr=b"",r_owner=b""))
+                rsp, _ = await cl.call(portmap_const.RPCBPROG,portmap_const.RPCBVERS4,
+                                       portmap_const.RPCBPROC_GETADDRLIST,p.get_buffer())
+                up = portmap_pack.PORTMAPUnpacker(rsp)
+                entries = []
+                while up.unpack_bool():
+                    e = up.unpack_rpcb_entry()
+                    entries.append((e.r_maddr,e.r_nc_netid,e.r_nc_semantics,e.r_nc_protofmly,e.r_nc_proto))
+                return sorted(entries)
+            async def getstat():
+                rsp, _ = await cl.call(portmap_const.RPCBPROG,portmap_const.RPCBVERS4,
+                                       portmap_const.RPCBPROC_GETSTAT,b'')
+                return portmap_pack.PORTMAPUnpacker(rsp).unpack_rpcb_stat_byvers()
+            def addrinfo(stat):
+                found = {}
+                node = stat.addrinfo
+                while len(node) > 0:
+                    node = node[0]
+                    found[(node.prog,node.vers,node.netid)] = (node.success,node.failure)
+                    node = node.next
+                return found
+            
+            self.mapper.mapping[(700,1,TCP)] = 7001
+            self.mapper.mapping[(700,1,UDP)] = 7002
+            self.mapper.addresses[(700,1,b"local")] = (b"/tmp/700.sock",b"owner")
+            self.assertEqual(await getaddrlist(700,1),[
+                    (b"/tmp/700.sock",b"local",portmap_const.NC_TPI_COTS_ORD,b"loopback",b"-"),
+                    (b"127.0.0.1.27.89",b"tcp",portmap_const.NC_TPI_COTS_ORD,b"inet",b"tcp"),
+                    (b"127.0.0.1.27.90",b"udp",portmap_const.NC_TPI_CLTS,b"inet",b"udp")])
+            self.assertEqual(await getaddrlist(700,2),[])
+            
+            before = await getstat()
+            self.assertEqual(len(before),portmap_const.RPCBVERS_STAT)
+            self.assertEqual(await portmap_client.getport(cl,700,1),7001)
+            self.assertEqual(await portmap_client.rpcb_getaddr(cl,700,1,b"udp"),b"127.0.0.1.27.90")
+            self.assertEqual(await portmap_client.rpcb_getaddr(cl,701,1,b"udp"),b"")
+            self.assertTrue(await portmap_client.rpcb_set(cl,701,1,b"local",b"/tmp/701.sock"))
+            after = await getstat()
+            v2 = portmap_const.RPCBVERS_2_STAT
+            v4 = portmap_const.RPCBVERS_4_STAT
+            self.assertEqual(after[v2].info[portmap_const.PMAPPROC_GETPORT] - before[v2].info[portmap_const.PMAPPROC_GETPORT],1)
+            self.assertEqual(after[v4].info[portmap_const.RPCBPROC_GETADDR] - before[v4].info[portmap_const.RPCBPROC_GETADDR],2)
+            # The GETSTAT giving before is counted
+            self.assertEqual(after[v4].info[portmap_const.RPCBPROC_GETSTAT] - before[v4].info[portmap_const.RPCBPROC_GETSTAT],1)
+            self.assertEqual(after[v4].setinfo - before[v4].setinfo,1)
+            self.assertEqual(addrinfo(after[v2])[(700,1,b"tcp")][0] - addrinfo(before[v2]).get((700,1,b"tcp"),(0,0))[0],1)
+            self.assertEqual(addrinfo(after[v4])[(700,1,b"udp")],(1,0))
+            self.assertEqual(addrinfo(after[v4])[(701,1,b"udp")],(0,1))
+            
+            self.mapper.mapping.unset(700,1)
+            del self.mapper.addresses[(700,1,b"local")]
+            del self.mapper.addresses[(701,1,b"local")]
+            await cl.close()
+            await asyncio.sleep(0.1)
+        self.loop.run_until_complete(test())
+        
+    def test_rpcb_taddr(self):
+        async def test():
+            cl = rpc_client.rpc_client()
+            await cl.connect(host="127.0.0.1",port=self.pm_srv.actual_port)
+            async def uaddr2taddr(uaddr):
+                p = portmap_pack.PORTMAPPacker()
+                p.pack_rpcb_string(uaddr)
+                rsp, _ = await cl.call(portmap_const.RPCBPROG,portmap_const.RPCBVERS,
+                                       portmap_const.RPCBPROC_UADDR2TADDR,p.get_buffer())
+                netbuf = portmap_pack.PORTMAPUnpacker(rsp).unpack_netbuf()
+                self.assertEqual(netbuf.maxlen,len(netbuf.buf))
+                return netbuf.buf
+            async def taddr2uaddr(taddr):
+                p = portmap_pack.PORTMAPPacker()
+                p.pack_netbuf(portmap_type.netbuf(maxlen=len(taddr),buf=taddr))
+                rsp, _ = await cl.call(portmap_const.RPCBPROG,portmap_const.RPCBVERS4,
+                                       portmap_const.RPCBPROC_TADDR2UADDR,p.get_buffer())
+                return portmap_pack.PORTMAPUnpacker(rsp).unpack_rpcb_string()
+            
+            taddr = await uaddr2taddr(b"127.0.0.1.11.184")
+            self.assertEqual(len(taddr),16)
+            self.assertEqual(struct.unpack("=H",taddr[0:2])[0],socket.AF_INET)
+            self.assertEqual(taddr[2:8],struct.pack(">H",3000) + bytes([127,0,0,1]))
+            self.assertEqual(await taddr2uaddr(taddr),b"127.0.0.1.11.184")
+            taddr = await uaddr2taddr(b"::1.0.111")
+            self.assertEqual(len(taddr),28)
+            self.assertEqual(await taddr2uaddr(taddr),b"::1.0.111")
+            # Not IP addresses
+            self.assertEqual(await uaddr2taddr(b"/tmp/a.sock"),b"")
+            self.assertEqual(await uaddr2taddr(b"host.0.111"),b"")
+            self.assertEqual(await taddr2uaddr(b"\xff"),b"")
+            await cl.close()
+            await asyncio.sleep(0.1)
+        self.loop.run_until_complete(test())
+        
+    def test_rpcb_remote_calls(self):
+        async def test():
+            # CALLIT of version 3, and BCAST and INDIRECT of version 4, are refused
+            cl = rpc_client.rpc_client()
+            await cl.connect(host="127.0.0.1",port=self.pm_srv.actual_port)
+            p = portmap_pack.PORTMAPPacker()
+            p.pack_call_args(portmap_type.call_args(prog=portmap_const.PMAP_PROG,vers=portmap_const.PMAP_VERS,
+                                                    proc=portmap_const.PMAPPROC_NULL,args=b''))
+            for vers, proc in [(portmap_const.RPCBVERS,portmap_const.RPCBPROC_CALLIT),
+                               (portmap_const.RPCBVERS4,portmap_const.RPCBPROC_BCAST),
+                               (portmap_const.RPCBVERS4,portmap_const.RPCBPROC_INDIRECT)]:
+                rsp, msg = await cl.call(portmap_const.RPCBPROG,vers,proc,p.get_buffer())
+                self.assertEqual(msg.body.rbody.areply.reply_data.stat,rpc_const.PROC_UNAVAIL)
+            await cl.close()
+            await asyncio.sleep(0.1)
+        self.loop.run_until_complete(test())
+        
+    def test_client(self):
+        async def test():
+            pm = portmap_client.portmap_client(port=self.pm_srv.actual_port, unix_path=self.unix_path)
+            TCP = portmap_const.IPPROTO_TCP
+            self.assertEqual(await pm.set_many([(600,1,TCP,6001),(600,2,TCP,6002),(601,1,TCP,6011)]),
+                             [True,True,True])
+            self.assertEqual(await pm.set_many([(600,1,TCP,6001)]),[False])
+            self.assertEqual(self.mapper.mapping[(600,2,TCP)],6002)
+            self.assertEqual(await pm.getport(600,2),6002)
+            # Served from the cache
+            self.mapper.mapping[(600,2,TCP)] = 7002
+            self.assertEqual(await pm.getport(600,2),6002)
+            pm.ttl = 0
+            self.assertEqual(await pm.getport(600,2),7002)
+            
+            # Reconnects once the connection is gone
+            await pm._client.close()
+            self.assertEqual(await pm.getport(601,1),6011)
+            
+            self.assertEqual(await pm.unset_many([(600,1),(600,2),(601,1)]),[True,True,True])
+            self.assertEqual(await pm.getport(600,1),0)
+            await pm.close()
+            await asyncio.sleep(0.1)
+        self.loop.run_until_complete(test())
         
     def test_3(self):
         pass
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+import unittest
+import asyncio
+import os
+import tempfile
+
+from vxi11aio import portmap_srv, portmap_registry, rpc_client, portmap_client
+from vxi11aio.xdr import portmap_const
+
+TCP = portmap_const.IPPROTO_TCP
+UDP = portmap_const.IPPROTO_UDP
+
+class TestPortmapRegistry(unittest.TestCase):
+    
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "portmap")
+        
+    def tearDown(self):
+        self.tmpdir.cleanup()
+        self.loop.close()
+        asyncio.set_event_loop(None)
+    
+    def restart(self, reg=None):
+        """A new portmapper, loaded from the registry"""
+        if(reg is not None):
+            reg.close()
+        mapper = portmap_srv.portmapper()
+        reg = portmap_registry.registry(self.path, sync=False)
+        reg.attach(mapper)
+        return mapper, reg
+    
+    def test_restart(self):
+        mapper, reg = self.restart()
+        mapper.mapping[(1,2,TCP)] = 1000
+        mapper.mapping[(1,2,UDP)] = 1001
+        mapper.mapping[(3,4,TCP)] = 1002
+        mapper.addresses[(5,6,b"local")] = (b"/tmp/x.sock", b"me")
+        mapper.mapping.unset(1,2)
+        
+        mapper, reg = self.restart(reg)
+        self.assertEqual(dict(mapper.mapping), {(3,4,TCP): 1002})
+        self.assertEqual(dict(mapper.addresses), {(5,6,b"local"): (b"/tmp/x.sock", b"me")})
+        
+        reg.compact()
+        self.assertEqual(os.path.getsize(reg.log_path), 0)
+        mapper.mapping[(7,8,TCP)] = 1003
+        del mapper.addresses[(5,6,b"local")]
+        mapper, reg = self.restart(reg)
+        self.assertEqual(dict(mapper.mapping), {(3,4,TCP): 1002, (7,8,TCP): 1003})
+        self.assertEqual(len(mapper.addresses), 0)
+        reg.close()
+    
+    def test_torn_record(self):
+        mapper, reg = self.restart()
+        mapper.mapping[(1,2,TCP)] = 1000
+        reg.close()
+        # A crash part way through writing a record
+        with open(reg.log_path, "a") as f:
+            f.write('{"set": [3, 4, 6], "po')
+        mapper, reg = self.restart()
+        self.assertEqual(dict(mapper.mapping), {(1,2,TCP): 1000})
+        reg.close()
+    
+    def test_compact_after_records(self):
+        mapper, reg = self.restart()
+        reg.COMPACT_RECORDS = 10
+        for i in range(25):
+            mapper.mapping[(i,1,TCP)] = 2000 + i
+        self.assertEqual(reg._log_records, 5)
+        mapper, reg = self.restart(reg)
+        self.assertEqual(len(mapper.mapping), 25)
+        reg.close()
+    
+    def test_probe(self):
+        async def test():
+            # A live service, and one that went away
+            live = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+            dead = await asyncio.start_server(lambda r, w: w.close(), "127.0.0.1", 0)
+            live_port = live.sockets[0].getsockname()[1]
+            dead_port = dead.sockets[0].getsockname()[1]
+            dead.close()
+            await dead.wait_closed()
+            
+            mapper, reg = self.restart()
+            mapper.mapping[(1,1,TCP)] = live_port
+            mapper.mapping[(2,1,TCP)] = dead_port
+            mapper.mapping[(3,1,TCP)] = dead_port
+            mapper.addresses[(4,1,b"local")] = (os.path.join(self.tmpdir.name, "gone.sock").encode(), b"")
+            
+            # The registrations are served before probing finishes
+            mapper, reg = self.restart(reg)
+            srv = portmap_srv.portmap_srv(port=0, mapper=mapper)
+            await srv.open()
+            cl = rpc_client.rpc_client()
+            await cl.connect("127.0.0.1", srv.actual_port)
+            self.assertEqual(await portmap_client.getport(cl, 2, 1), dead_port)
+            
+            self.assertEqual(await reg.probe(timeout=0.5), 3)
+            self.assertEqual(dict(mapper.mapping), {(1,1,TCP): live_port})
+            self.assertEqual(len(mapper.addresses), 0)
+            self.assertEqual(await portmap_client.getport(cl, 2, 1), 0)
+            await cl.close()
+            await asyncio.sleep(0.1)
+            await srv.close()
+            live.close()
+            await live.wait_closed()
+            
+            # The removals were logged too
+            mapper, reg = self.restart(reg)
+            self.assertEqual(dict(mapper.mapping), {(1,1,TCP): live_port})
+            reg.close()
+        self.loop.run_until_complete(test())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+import unittest
+import asyncio
+
+from vxi11aio import portmap_srv, portmap_client, rpc_client, vxi11_srv, vxi11_client, adapter_loopback
+from vxi11aio.vxi11_srv import vxi11_errorCodes, vxi11_deviceFlags, vxi11_readReason
+from vxi11aio.xdr import portmap_const, rpc_const
+
+class TestRPC_memory(unittest.TestCase):
+    
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+    
+    def tearDown(self):
+        self.loop.close()
+        asyncio.set_event_loop(None)
+    
+    def test_portmap(self):
+        async def test():
+            mapper = portmap_srv.portmapper()
+            mapper.mapping[(5, 6, portmap_const.IPPROTO_TCP)] = 987
+            # Never opened, so there is no socket
+            srv = portmap_srv.portmap_srv(mapper=mapper, port=0)
+            cl = rpc_client.rpc_client()
+            await cl.connect_memory(srv)
+            self.assertEqual(await portmap_client.getport(client=cl, prog=5, vers=6), 987)
+            self.assertEqual(await portmap_client.getport(client=cl, prog=5, vers=7), 0)
+            rsp, msg = await cl.call(9, 8, 7, b'')
+            self.assertEqual(msg.body.rbody.areply.reply_data.stat, rpc_const.PROG_UNAVAIL)
+            await cl.close()
+            # Let the server end finish closing
+            await asyncio.sleep(0.01)
+        self.loop.run_until_complete(test())
+        
+    def test_vxi11(self):
+        async def test():
+            adapter = adapter_loopback.adapter()
+            srv = vxi11_srv.vxi11_core_srv(port=0, adapters=[adapter])
+            srv.abort_port = 0
+            cl = vxi11_client.vxi11_client()
+            await cl.connect_memory(srv)
+            (err, link) = await cl.create_link(b"inst0")
+            self.assertEqual(err, vxi11_errorCodes.NO_ERROR)
+            # Large enough for flow control to kick in
+            data = bytes(range(256)) * 12*1024
+            self.assertEqual(await link.write(io_timeout=1000, lock_timeout=0, flags=vxi11_deviceFlags.END, data=data),
+                             (vxi11_errorCodes.NO_ERROR, len(data)))
+            self.assertEqual(await link.read(requestSize=len(data), io_timeout=1000, lock_timeout=0,
+                                             flags=vxi11_deviceFlags(0), termChar=0),
+                             (vxi11_errorCodes.NO_ERROR, vxi11_readReason.END, data))
+            # Closing the connection destroys the link, as with TCP
+            await cl.close()
+            for i in range(100):
+                if(len(adapter.links) == 0):
+                    break
+                await asyncio.sleep(0.01)
+            self.assertEqual(len(adapter.links), 0)
+            await asyncio.sleep(0.01)
+        self.loop.run_until_complete(test())
+
+if __name__ == '__main__':
+    unittest.main()
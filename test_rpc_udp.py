@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+import unittest
+import asyncio
+import contextlib
+import io
+import socket
+
+from vxi11aio import portmap_srv, portmap_client, rpc_client, rpc_srv, rpc_udp
+from vxi11aio.xdr import portmap_const, portmap_type
+from vxi11aio.xdr.portmap_pack import PORTMAPPacker, PORTMAPUnpacker
+from vxi11aio.xdr.rpc_pack import RPCUnpacker
+
+class TestReplyCache(unittest.TestCase):
+    
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        
+    def tearDown(self):
+        self.loop.close()
+        asyncio.set_event_loop(None)
+    
+    def test_duplicates(self):
+        cache = rpc_srv.reply_cache(max_entries=2)
+        self.assertTrue(cache.start("a"))
+        self.assertFalse(cache.start("a"))
+        # Still in progress
+        self.assertIsNone(cache.get("a"))
+        cache.put("a", b"reply")
+        self.assertEqual(cache.get("a"), b"reply")
+        self.assertTrue(cache.start("b"))
+        # The oldest entry makes room
+        self.assertTrue(cache.start("c"))
+        self.assertTrue(cache.start("a"))
+    
+    def test_max_bytes(self):
+        cache = rpc_srv.reply_cache(max_bytes=10)
+        self.assertTrue(cache.start("a"))
+        cache.put("a", b"123456")
+        self.assertTrue(cache.start("b"))
+        cache.put("b", b"123456")
+        # a is evicted to make room for b
+        self.assertTrue(cache.start("a"))
+        self.assertEqual(cache.get("b"), b"123456")
+        # Too large to keep at all
+        self.assertTrue(cache.start("c"))
+        cache.put("c", b"12345678901")
+        self.assertTrue(cache.start("c"))
+        # Forgotten, as when the call failed
+        cache.discard("c")
+        self.assertTrue(cache.start("c"))
+    
+    def test_wait(self):
+        cache = rpc_srv.reply_cache()
+        async def test():
+            self.assertTrue(cache.start("a"))
+            self.assertFalse(cache.start("a"))
+            # Retransmissions of a call in progress get its reply once it is done
+            waiters = [asyncio.ensure_future(cache.wait("a")) for _ in range(2)]
+            await asyncio.sleep(0)
+            self.assertFalse(any(w.done() for w in waiters))
+            cache.put("a", b"reply")
+            self.assertEqual(await asyncio.gather(*waiters), [b"reply", b"reply"])
+            self.assertEqual(await cache.wait("a"), b"reply")
+            # Nothing, if the call fails
+            self.assertTrue(cache.start("b"))
+            waiter = asyncio.ensure_future(cache.wait("b"))
+            await asyncio.sleep(0)
+            cache.discard("b")
+            self.assertIsNone(await waiter)
+        self.loop.run_until_complete(test())
+    
+    def test_ttl(self):
+        cache = rpc_srv.reply_cache(ttl=0)
+        self.assertTrue(cache.start("a"))
+        cache.put("a", b"reply")
+        self.assertTrue(cache.start("a"))
+
+class TestRPC_udp(unittest.TestCase):
+    
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.mapper = portmap_srv.portmapper()
+        self.mapper.mapping[(5, 6, portmap_const.IPPROTO_TCP)] = 987
+        self.srv = portmap_srv.portmap_srv(port=0, mapper=self.mapper, udp_port=0)
+        self.loop.run_until_complete(self.srv.open())
+        
+    def tearDown(self):
+        self.loop.run_until_complete(self.srv.close())
+        self.loop.close()
+        asyncio.set_event_loop(None)
+    
+    def test_getport(self):
+        async def test():
+            cl = rpc_udp.rpc_udp_client()
+            await cl.connect("127.0.0.1", self.srv.actual_udp_port)
+            self.assertEqual(await portmap_client.getport(cl, 5, 6), 987)
+            self.assertEqual(await portmap_client.getport(cl, 5, 7), 0)
+            # TCP still works alongside
+            tcp = rpc_client.rpc_client()
+            await tcp.connect("127.0.0.1", self.srv.actual_port)
+            self.assertEqual(await portmap_client.getport(tcp, 5, 6), 987)
+            await tcp.close()
+            await cl.close()
+            await asyncio.sleep(0.1)
+        self.loop.run_until_complete(test())
+    
+    def test_retransmission(self):
+        async def test():
+            p = PORTMAPPacker()
+            p.pack_rpcb(portmap_type.rpcb(r_prog=200, r_vers=1, r_netid=b"local",
+                                          r_addr=b"/tmp/a.sock", r_owner=b""))
+            call = rpc_client.rpc_client.pack_call(1234, portmap_const.RPCBPROG,
+                                                   portmap_const.RPCBVERS4,
+                                                   portmap_const.RPCBPROC_SET) + p.get_buffer()
+            loop = asyncio.get_event_loop()
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                sock.setblocking(False)
+                sock.connect(("127.0.0.1", self.srv.actual_udp_port))
+                replies = []
+                for i in range(2):
+                    await loop.sock_sendall(sock, call)
+                    replies.append(await asyncio.wait_for(loop.sock_recv(sock, 65536), timeout=2))
+            # A second SET would fail, so the retransmission must have been
+            # answered from the cache
+            self.assertEqual(replies[0], replies[1])
+            msg_up = RPCUnpacker(replies[0])
+            msg = msg_up.unpack_rpc_msg()
+            self.assertEqual(msg.xid, 1234)
+            self.assertTrue(PORTMAPUnpacker(replies[0][msg_up.get_position():]).unpack_bool())
+            self.assertEqual(self.mapper.addresses[(200, 1, b"local")][0], b"/tmp/a.sock")
+        self.loop.run_until_complete(test())
+    
+    def test_bad_datagrams(self):
+        async def test():
+            loop = asyncio.get_event_loop()
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                sock.setblocking(False)
+                sock.connect(("127.0.0.1", self.srv.actual_udp_port))
+                # Dropped without a reply
+                await loop.sock_sendall(sock, b"\x00\x01")
+                with self.assertRaises(asyncio.TimeoutError):
+                    await asyncio.wait_for(loop.sock_recv(sock, 65536), timeout=0.1)
+            cl = rpc_udp.rpc_udp_client()
+            await cl.connect("127.0.0.1", self.srv.actual_udp_port)
+            self.assertEqual(await portmap_client.getport(cl, 5, 6), 987)
+            await cl.close()
+            
+            # An error in a handler is no bad datagram, and is logged in full
+            async def handler(data, addr):
+                raise ValueError("handler bug")
+            protocol = rpc_udp.rpc_datagram_protocol(handler)
+            err = io.StringIO()
+            with contextlib.redirect_stderr(err):
+                await protocol._handle(b"", ("127.0.0.1", 1))
+            self.assertIn("Traceback", err.getvalue())
+            self.assertIn("handler bug", err.getvalue())
+        self.loop.run_until_complete(test())
+    
+    def test_timeout(self):
+        async def test():
+            # Nothing answers here
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+                sock.bind(("127.0.0.1", 0))
+                cl = rpc_udp.rpc_udp_client(timeout=0.05, retries=2)
+                await cl.connect("127.0.0.1", sock.getsockname()[1])
+                with self.assertRaises(asyncio.TimeoutError):
+                    await portmap_client.getport(cl, 5, 6)
+                await cl.close()
+        self.loop.run_until_complete(test())
+
+if __name__ == '__main__':
+    unittest.main()
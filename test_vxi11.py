@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+import unittest
+import asyncio
+import os
+import tempfile
+
+from vxi11aio import vxi11_srv, adapter_time, adapter_loopback, rpc_client, rpc_srv, portmap_srv, portmap_client, vxi11_adapter
+from vxi11aio.vxi11_srv import vxi11_errorCodes, vxi11_deviceFlags, vxi11_readReason
+
+from vxi11aio.xdr import portmap_const, rpc_const, vxi11_clnt, vxi11_const, vxi11_svc, vxi11_type
+from vxi11aio.xdr.vxi11_pack import VXI11Packer, VXI11Unpacker
+
+async def vxi11_call(cl: rpc_client.rpc_client, proc: int, pack_func, arg, unpack_func):
+    p = VXI11Packer()
+    if(pack_func is not None):
+        pack_func(p, arg)
+    rsp, msg = await cl.call(vxi11_const.DEVICE_CORE, vxi11_const.DEVICE_CORE_VERSION, proc, p.get_buffer())
+    return unpack_func(VXI11Unpacker(rsp))
+
+async def create_link(cl: rpc_client.rpc_client, device: bytes = b"inst0") -> vxi11_type.Create_LinkResp:
+    arg = vxi11_type.Create_LinkParms(clientId=1, lockDevice=False, lock_timeout=0, device=device)
+    return await vxi11_call(cl, vxi11_const.create_link, VXI11Packer.pack_Create_LinkParms,
+                            arg, VXI11Unpacker.unpack_Create_LinkResp)
+
+async def device_lock(cl: rpc_client.rpc_client, lid: int) -> int:
+    arg = vxi11_type.Device_LockParms(lid=lid, flags=0, lock_timeout=0)
+    rsp = await vxi11_call(cl, vxi11_const.device_lock, VXI11Packer.pack_Device_LockParms,
+                           arg, VXI11Unpacker.unpack_Device_Error)
+    return rsp.error
+
+async def device_write(cl: rpc_client.rpc_client, lid: int, data: bytes,
+                       flags: int = vxi11_deviceFlags.END) -> vxi11_type.Device_WriteResp:
+    arg = vxi11_type.Device_WriteParms(lid=lid, io_timeout=1000, lock_timeout=0, flags=flags, data=data)
+    return await vxi11_call(cl, vxi11_const.device_write, VXI11Packer.pack_Device_WriteParms,
+                            arg, VXI11Unpacker.unpack_Device_WriteResp)
+
+async def device_read(cl: rpc_client.rpc_client, lid: int, requestSize: int) -> vxi11_type.Device_ReadResp:
+    arg = vxi11_type.Device_ReadParms(lid=lid, requestSize=requestSize, io_timeout=1000,
+                                      lock_timeout=0, flags=0, termChar=0)
+    return await vxi11_call(cl, vxi11_const.device_read, VXI11Packer.pack_Device_ReadParms,
+                            arg, VXI11Unpacker.unpack_Device_ReadResp)
+
+async def device_unlock(cl: rpc_client.rpc_client, lid: int) -> int:
+    rsp = await vxi11_call(cl, vxi11_const.device_unlock, VXI11Packer.pack_Device_Link,
+                           lid, VXI11Unpacker.unpack_Device_Error)
+    return rsp.error
+
+async def destroy_link(cl: rpc_client.rpc_client, lid: int) -> int:
+    rsp = await vxi11_call(cl, vxi11_const.destroy_link, VXI11Packer.pack_Device_Link,
+                           lid, VXI11Unpacker.unpack_Device_Error)
+    return rsp.error
+
+class TestVXI11_link_lifecycle(unittest.TestCase):
+    
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.adapter = None
+        self.srv = None
+        self.srv_task = None
+        
+    def tearDown(self):
+        if(self.srv is not None):
+            self.loop.run_until_complete(self.srv.close())
+            self.srv_task.cancel()
+            try:
+                self.loop.run_until_complete(self.srv_task)
+            except asyncio.CancelledError:
+                pass
+        self.loop.close()
+        asyncio.set_event_loop(None)
+    
+    def start_srv(self, adapter_class=adapter_time.adapter, adapter_args={}, **kwargs):
+        async def start():
+            # Locks must be created on the loop that the server runs on
+            self.adapter = adapter_class(**adapter_args)
+            self.srv = vxi11_srv.vxi11_core_srv(port=0, adapters=[self.adapter], **kwargs)
+            self.srv.abort_port = 0
+            await self.srv.open()
+            self.srv_task = asyncio.create_task(self.srv.main())
+        self.loop.run_until_complete(start())
+    
+    async def connect(self) -> rpc_client.rpc_client:
+        cl = rpc_client.rpc_client()
+        await cl.connect(host="127.0.0.1",port=self.srv.actual_port)
+        return cl
+    
+    async def wait_for(self, cond, timeout: float = 2.0) -> None:
+        end = asyncio.get_event_loop().time() + timeout
+        while not cond():
+            self.assertLess(asyncio.get_event_loop().time(), end)
+            await asyncio.sleep(0.01)
+    
+    def test_disconnect_destroys_links(self):
+        self.start_srv()
+        async def test():
+            cl = await self.connect()
+            rsp = await create_link(cl)
+            self.assertEqual(rsp.error, vxi11_errorCodes.NO_ERROR)
+            self.assertEqual(await device_lock(cl, rsp.lid), vxi11_errorCodes.NO_ERROR)
+            link = self.adapter.links[rsp.lid]
+            self.assertIs(self.adapter.adapter_excl_lock_owner, link)
+            # Drop the connection without destroy_link
+            await cl.close()
+            await self.wait_for(lambda: len(self.adapter.links) == 0)
+            self.assertIsNone(self.adapter.adapter_excl_lock_owner)
+            self.assertFalse(self.adapter.adapter_excl_lock.locked())
+            self.assertIsNone(link.th)
+            
+            # Another client can now get the lock
+            cl = await self.connect()
+            rsp = await create_link(cl)
+            self.assertEqual(await device_lock(cl, rsp.lid), vxi11_errorCodes.NO_ERROR)
+            self.assertEqual(await destroy_link(cl, rsp.lid), vxi11_errorCodes.NO_ERROR)
+            self.assertEqual(await destroy_link(cl, rsp.lid), vxi11_errorCodes.INVALID_LINK_IDENTIFIER)
+            await cl.close()
+        self.loop.run_until_complete(test())
+        
+    def test_failed_destroy(self):
+        self.start_srv()
+        async def test():
+            cl = await self.connect()
+            lids = [(await create_link(cl)).lid for _ in range(2)]
+            self.assertEqual(await device_lock(cl, lids[0]), vxi11_errorCodes.NO_ERROR)
+            links = [self.adapter.links[lid] for lid in lids]
+            async def destroy():
+                raise OSError("Instrument unplugged")
+            links[0].destroy = destroy
+            await cl.close()
+            # The other link is still destroyed, and the lock released
+            await self.wait_for(lambda: len(self.adapter.links) == 0)
+            self.assertIsNone(links[1].th)
+            self.assertIsNone(self.adapter.adapter_excl_lock_owner)
+            self.assertFalse(self.adapter.adapter_excl_lock.locked())
+        self.loop.run_until_complete(test())
+        
+    def test_idle_reaping(self):
+        self.start_srv(link_idle_timeout=0.2)
+        async def test():
+            cl = await self.connect()
+            idle = await create_link(cl)
+            busy = await create_link(cl)
+            self.assertEqual(await device_lock(cl, idle.lid), vxi11_errorCodes.NO_ERROR)
+            for _ in range(6):
+                await asyncio.sleep(0.1)
+                # Keep the other link busy
+                self.assertEqual(await device_unlock(cl, busy.lid), vxi11_errorCodes.NO_LOCK_HELD_BY_THIS_LINK)
+            self.assertNotIn(idle.lid, self.adapter.links)
+            self.assertIn(busy.lid, self.adapter.links)
+            self.assertIsNone(self.adapter.adapter_excl_lock_owner)
+            self.assertEqual(await device_lock(cl, busy.lid), vxi11_errorCodes.NO_ERROR)
+            self.assertEqual(await destroy_link(cl, idle.lid), vxi11_errorCodes.INVALID_LINK_IDENTIFIER)
+            await cl.close()
+        self.loop.run_until_complete(test())
+        
+    def test_link_limits(self):
+        self.start_srv(max_links_per_conn=2, adapter_args={"max_links": 3})
+        async def test():
+            cl1 = await self.connect()
+            cl2 = await self.connect()
+            self.assertEqual((await create_link(cl1)).error, vxi11_errorCodes.NO_ERROR)
+            self.assertEqual((await create_link(cl1)).error, vxi11_errorCodes.NO_ERROR)
+            self.assertEqual((await create_link(cl1)).error, vxi11_errorCodes.OUT_OF_RESOURCES)
+            rsp = await create_link(cl2)
+            self.assertEqual(rsp.error, vxi11_errorCodes.NO_ERROR)
+            self.assertEqual((await create_link(cl2)).error, vxi11_errorCodes.OUT_OF_RESOURCES)
+            await destroy_link(cl2, rsp.lid)
+            self.assertEqual((await create_link(cl2)).error, vxi11_errorCodes.NO_ERROR)
+            await cl1.close()
+            await cl2.close()
+            await self.wait_for(lambda: len(self.adapter.links) == 0)
+        self.loop.run_until_complete(test())
+    def test_max_recv_size(self):
+        self.start_srv(adapter_class=adapter_loopback.adapter,
+                       adapter_args={"max_recv_size": 3*1024*1024})
+        async def test():
+            cl = await self.connect()
+            link = await create_link(cl)
+            self.assertEqual(link.maxRecvSize, 3*1024*1024)
+            
+            data = bytes(range(256)) * (3*1024*4)
+            rsp = await device_write(cl, link.lid, data)
+            self.assertEqual((rsp.error, rsp.size), (vxi11_errorCodes.NO_ERROR, len(data)))
+            rsp = await device_write(cl, link.lid, data + b'x')
+            self.assertEqual((rsp.error, rsp.size), (vxi11_errorCodes.PARAMETER_ERROR, 0))
+            
+            rsp = await device_read(cl, link.lid, 1024*1024)
+            self.assertEqual((rsp.error, rsp.reason), (vxi11_errorCodes.NO_ERROR, vxi11_readReason.REQCNT))
+            self.assertEqual(rsp.data, data[:1024*1024])
+            rsp = await device_read(cl, link.lid, len(data))
+            self.assertEqual((rsp.error, rsp.reason), (vxi11_errorCodes.NO_ERROR, vxi11_readReason.END))
+            self.assertEqual(rsp.data, data[1024*1024:])
+            await cl.close()
+        self.loop.run_until_complete(test())
+    
+    def test_no_adapters(self):
+        srv = vxi11_srv.vxi11_core_srv(port=0, adapters=[])
+        self.assertEqual(srv.max_record_size,
+                         2*vxi11_adapter.DEFAULT_MAX_RECV_SIZE + vxi11_srv.vxi11_core_srv.RECORD_OVERHEAD)
+    
+    def test_oversized_record(self):
+        self.start_srv(adapter_class=adapter_loopback.adapter,
+                       adapter_args={"max_recv_size": 1024})
+        async def test():
+            cl = await self.connect()
+            link = await create_link(cl)
+            self.assertEqual(link.maxRecvSize, 1024)
+            # Far beyond what the server will accept, so the connection is dropped
+            with self.assertRaises(Exception):
+                await device_write(cl, link.lid, b'x' * 65536)
+            await self.wait_for(lambda: len(self.adapter.links) == 0)
+        self.loop.run_until_complete(test())
+    
+    def test_unix_socket(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "core.sock")
+            # A socket left over from an earlier run is replaced
+            self.loop.run_until_complete(asyncio.start_unix_server(lambda r, w: None, path)).close()
+            self.start_srv(adapter_class=adapter_loopback.adapter, unix_path=path)
+            async def test():
+                cl = rpc_client.rpc_client()
+                await cl.connect_unix(path)
+                link = await create_link(cl)
+                self.assertEqual(link.error, vxi11_errorCodes.NO_ERROR)
+                rsp = await device_write(cl, link.lid, b"*IDN?")
+                self.assertEqual((rsp.error, rsp.size), (vxi11_errorCodes.NO_ERROR, 5))
+                rsp = await device_read(cl, link.lid, 1024)
+                self.assertEqual(rsp.data, b"*IDN?")
+                # TCP still works alongside
+                cl2 = await self.connect()
+                self.assertEqual((await create_link(cl2)).error, vxi11_errorCodes.NO_ERROR)
+                await cl.close()
+                await cl2.close()
+                await asyncio.sleep(0.1)
+            self.loop.run_until_complete(test())
+            self.loop.run_until_complete(self.srv.close())
+            self.assertFalse(os.path.exists(path))
+            self.srv_task.cancel()
+            try:
+                self.loop.run_until_complete(self.srv_task)
+            except asyncio.CancelledError:
+                pass
+            self.srv = None
+    
+    def test_dispatch(self):
+        self.start_srv()
+        async def test():
+            cl = await self.connect()
+            # Only version 1 of DEVICE_CORE exists
+            rsp, msg = await cl.call(vxi11_const.DEVICE_CORE, 2, vxi11_const.create_link, b'')
+            reply_data = msg.body.rbody.areply.reply_data
+            self.assertEqual(reply_data.stat, rpc_const.PROG_MISMATCH)
+            self.assertEqual((reply_data.mismatch_info.low, reply_data.mismatch_info.high), (1, 1))
+            # Procedures 21 (device_abort is on the abort channel) and 27 don't exist
+            for proc in [21, 27]:
+                rsp, msg = await cl.call(vxi11_const.DEVICE_CORE, vxi11_const.DEVICE_CORE_VERSION, proc, b'')
+                self.assertEqual(msg.body.rbody.areply.reply_data.stat, rpc_const.PROC_UNAVAIL)
+            rsp, msg = await cl.call(vxi11_const.DEVICE_ASYNC, vxi11_const.DEVICE_ASYNC_VERSION, vxi11_const.device_abort, b'')
+            self.assertEqual(msg.body.rbody.areply.reply_data.stat, rpc_const.PROG_UNAVAIL)
+            self.assertEqual((await create_link(cl)).error, vxi11_errorCodes.NO_ERROR)
+            await cl.close()
+        self.loop.run_until_complete(test())
+
+    def test_duplicate_calls(self):
+        self.start_srv(adapter_class=adapter_loopback.adapter, cache_replies=True)
+        async def test():
+            cl = await self.connect()
+            link_xid = cl._xid
+            lid = (await create_link(cl)).lid
+            xid = cl._xid
+            self.assertEqual((await device_write(cl, lid, b"abc")).size, 3)
+            # A retransmission, with the same xid, is answered from the cache
+            cl._xid = xid
+            self.assertEqual((await device_write(cl, lid, b"abc")).size, 3)
+            # Calls with another xid, or other arguments, are executed
+            self.assertEqual((await device_write(cl, lid, b"abc")).size, 3)
+            cl._xid = xid
+            self.assertEqual((await device_write(cl, lid, b"def")).size, 3)
+            self.assertEqual((await device_read(cl, lid, 100)).data, b"abcabcdef")
+            await cl.close()
+            # Also when retransmitted after reconnecting, from another port,
+            # although the link has gone with the old connection
+            await self.wait_for(lambda: len(self.adapter.links) == 0)
+            cl = await self.connect()
+            cl._xid = xid
+            rsp = await device_write(cl, lid, b"abc")
+            self.assertEqual((rsp.error, rsp.size), (vxi11_errorCodes.NO_ERROR, 3))
+            self.assertEqual((await device_write(cl, lid, b"xyz")).error,
+                             vxi11_errorCodes.INVALID_LINK_IDENTIFIER)
+            # The link of a retransmitted create_link would be gone, so it
+            # is created again
+            cl._xid = link_xid
+            link = await create_link(cl)
+            self.assertEqual(link.error, vxi11_errorCodes.NO_ERROR)
+            self.assertNotEqual(link.lid, lid)
+            self.assertEqual((await device_write(cl, link.lid, b"abc")).error, vxi11_errorCodes.NO_ERROR)
+            await cl.close()
+        self.loop.run_until_complete(test())
+
+    def test_duplicate_calls_clients(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "core.sock")
+            self.start_srv(adapter_class=adapter_loopback.adapter, cache_replies=True, unix_path=path)
+            async def test():
+                # Clients on one host, over TCP and UNIX sockets, making the
+                # same calls with the same xids
+                for unix in [False, True]:
+                    clients = []
+                    for _ in range(2):
+                        cl = rpc_client.rpc_client()
+                        if(unix):
+                            await cl.connect_unix(path)
+                        else:
+                            await cl.connect(host="127.0.0.1", port=self.srv.actual_port)
+                        cl._xid = 100
+                        clients.append(cl)
+                    links = [await create_link(cl) for cl in clients]
+                    self.assertNotEqual(links[0].lid, links[1].lid)
+                    for cl, link in zip(clients, links):
+                        cl._xid = 200
+                        rsp = await device_write(cl, link.lid, b"abc")
+                        self.assertEqual((rsp.error, rsp.size), (vxi11_errorCodes.NO_ERROR, 3))
+                        self.assertEqual((await device_read(cl, link.lid, 100)).data, b"abc")
+                    for cl in clients:
+                        await cl.close()
+                await self.wait_for(lambda: len(self.adapter.links) == 0)
+            self.loop.run_until_complete(test())
+            self.loop.run_until_complete(self.srv.close())
+            self.srv_task.cancel()
+            try:
+                self.loop.run_until_complete(self.srv_task)
+            except asyncio.CancelledError:
+                pass
+            self.srv = None
+
+    def test_host(self):
+        async def start():
+            self.adapter = adapter_loopback.adapter()
+            core_srv = vxi11_srv.vxi11_core_srv(port=0, adapters=[self.adapter])
+            async_srv = vxi11_srv.vxi11_async_srv(port=0, core_srv=core_srv)
+            pm_srv = portmap_srv.portmap_srv(port=0, mapper=portmap_srv.portmapper())
+            # Core, abort and portmap channels on one port
+            self.srv = rpc_srv.rpc_host(port=0, max_record_size=core_srv.max_record_size)
+            self.srv.register(vxi11_srv.vxi11_core_conn, core_srv.create_conn)
+            self.srv.register(vxi11_srv.vxi11_abort_conn, async_srv.create_conn)
+            self.srv.register(portmap_srv.portmap_conn, pm_srv.create_conn)
+            with self.assertRaises(ValueError):
+                self.srv.register(vxi11_srv.vxi11_abort_conn, async_srv.create_conn)
+            # Links are only valid on their own connection
+            conn = self.srv.create_conn()
+            core = (vxi11_const.DEVICE_CORE, vxi11_const.DEVICE_CORE_VERSION)
+            self.assertFalse(conn.cache_reply(*core, vxi11_const.create_link))
+            self.assertTrue(conn.cache_reply(*core, vxi11_const.device_write))
+            await self.srv.open()
+            core_srv.abort_port = self.srv.actual_port
+            pm_srv.mapper.mapping[(vxi11_const.DEVICE_CORE, vxi11_const.DEVICE_CORE_VERSION,
+                                   portmap_const.IPPROTO_TCP)] = self.srv.actual_port
+            self.srv_task = asyncio.create_task(self.srv.main())
+        self.loop.run_until_complete(start())
+        async def test():
+            cl = await self.connect()
+            port = await portmap_client.getport(client=cl, prog=vxi11_const.DEVICE_CORE,
+                                                vers=vxi11_const.DEVICE_CORE_VERSION)
+            self.assertEqual(port, self.srv.actual_port)
+            # The NULL procedure is answered, without an abort connection object
+            rsp, msg = await cl.call(vxi11_const.DEVICE_ASYNC, vxi11_const.DEVICE_ASYNC_VERSION, rpc_srv.NULLPROC, b'')
+            self.assertEqual((rsp, msg.body.rbody.areply.reply_data.stat), (b'', rpc_const.SUCCESS))
+            link = await create_link(cl)
+            self.assertEqual((link.error, link.abortPort), (vxi11_errorCodes.NO_ERROR, self.srv.actual_port))
+            self.assertEqual((await device_write(cl, link.lid, b"abc")).size, 3)
+            self.assertEqual((await device_read(cl, link.lid, 100)).data, b"abc")
+            # Versions 2 to 4 of the portmapper are served
+            rsp, msg = await cl.call(portmap_const.PMAP_PROG, 1, portmap_const.PMAPPROC_NULL, b'')
+            reply_data = msg.body.rbody.areply.reply_data
+            self.assertEqual(reply_data.stat, rpc_const.PROG_MISMATCH)
+            self.assertEqual((reply_data.mismatch_info.low, reply_data.mismatch_info.high),
+                             (portmap_const.PMAP_VERS, portmap_const.RPCBVERS4))
+            rsp, msg = await cl.call(vxi11_const.DEVICE_INTR, vxi11_const.DEVICE_INTR_VERSION, rpc_srv.NULLPROC, b'')
+            self.assertEqual(msg.body.rbody.areply.reply_data.stat, rpc_const.PROG_UNAVAIL)
+            # The abort channel
+            abort_cl = await self.connect()
+            p = VXI11Packer()
+            p.pack_Device_Link(link.lid + 1)
+            rsp, msg = await abort_cl.call(vxi11_const.DEVICE_ASYNC, vxi11_const.DEVICE_ASYNC_VERSION,
+                                           vxi11_const.device_abort, p.get_buffer())
+            self.assertEqual(VXI11Unpacker(rsp).unpack_Device_Error().error,
+                             vxi11_errorCodes.INVALID_LINK_IDENTIFIER)
+            await abort_cl.close()
+            await cl.close()
+            # Links go with the connection, as they do without the host
+            await self.wait_for(lambda: len(self.adapter.links) == 0)
+        self.loop.run_until_complete(test())
+
+    def test_client_stubs(self):
+        self.start_srv(adapter_class=adapter_loopback.adapter)
+        async def test():
+            cl = await self.connect()
+            stubs = vxi11_clnt.DEVICE_CORE_1_clnt(cl)
+            link = await stubs.create_link(vxi11_type.Create_LinkParms(
+                    clientId=1, lockDevice=False, lock_timeout=0, device=b"inst0"))
+            self.assertEqual(link.error, vxi11_errorCodes.NO_ERROR)
+            rsp = await stubs.device_write(vxi11_type.Device_WriteParms(
+                    lid=link.lid, io_timeout=1000, lock_timeout=0, flags=vxi11_deviceFlags.END, data=b"*IDN?"))
+            self.assertEqual((rsp.error, rsp.size), (vxi11_errorCodes.NO_ERROR, 5))
+            # The stubs share a packer, which concurrent calls mustn't trip over
+            rsps = await asyncio.gather(*[stubs.device_unlock(link.lid) for _ in range(5)])
+            self.assertEqual([r.error for r in rsps], [vxi11_errorCodes.NO_LOCK_HELD_BY_THIS_LINK]*5)
+            self.assertEqual((await stubs.destroy_link(link.lid)).error, vxi11_errorCodes.NO_ERROR)
+            # Calls that aren't accepted raise
+            with self.assertRaises(Exception):
+                await vxi11_clnt.DEVICE_CORE_1_clnt(cl, vers=2).destroy_link(link.lid)
+            await cl.close()
+        self.loop.run_until_complete(test())
+
+class TestVXI11_svc(unittest.TestCase):
+    
+    def test_skeleton(self):
+        class partial_conn(vxi11_svc.DEVICE_CORE_1_svc):
+            async def handle_device_trigger(self, rpc_msg, arg):
+                return vxi11_type.Device_Error(error=vxi11_errorCodes.NO_ERROR)
+        # Only procedures with a handler are dispatched
+        handlers = partial_conn._dispatch[(vxi11_const.DEVICE_CORE, vxi11_const.DEVICE_CORE_VERSION)]
+        self.assertEqual(len(handlers), vxi11_const.device_trigger + 1)
+        self.assertIs(handlers[vxi11_const.device_trigger], vxi11_svc.DEVICE_CORE_1_svc._dispatch_device_trigger)
+        self.assertEqual(len([h for h in handlers if h is not None]), 1)
+        self.assertEqual(partial_conn._versions, {vxi11_const.DEVICE_CORE: (1, 1)})
+        # A skeleton without handlers serves nothing
+        self.assertEqual(vxi11_svc.DEVICE_CORE_1_svc._dispatch, {})
+        
+        core_handlers = vxi11_srv.vxi11_core_conn._dispatch[(vxi11_const.DEVICE_CORE, vxi11_const.DEVICE_CORE_VERSION)]
+        self.assertEqual(len([h for h in core_handlers if h is not None]),
+                         len(vxi11_svc.DEVICE_CORE_1_svc.rpc_procedures))
+
+    def test_register_handler(self):
+        async def handle_trigger(self, rpc_msg, buf, buf_ix):
+            return b''
+        key = (vxi11_const.DEVICE_CORE, vxi11_const.DEVICE_CORE_VERSION)
+        conn = vxi11_svc.DEVICE_CORE_1_svc()
+        other = vxi11_svc.DEVICE_CORE_1_svc()
+        conn.register_handler(*key, vxi11_const.device_trigger, handle_trigger)
+        self.assertIs(conn._dispatch[key][vxi11_const.device_trigger], handle_trigger)
+        self.assertEqual(conn._versions, {vxi11_const.DEVICE_CORE: (1, 1)})
+        # Neither the class nor its other instances are changed
+        self.assertEqual(other._dispatch, {})
+        self.assertEqual(vxi11_svc.DEVICE_CORE_1_svc._dispatch, {})
+        self.assertEqual(vxi11_svc.DEVICE_CORE_1_svc._versions, {})
+        with self.assertRaises(TypeError):
+            rpc_srv.rpc_conn.call_dispatch_table[key] = {}
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+import unittest
+import asyncio
+
+from vxi11aio import vxi11_srv, vxi11_client, adapter_loopback
+from vxi11aio.vxi11_srv import vxi11_errorCodes, vxi11_deviceFlags, vxi11_readReason
+
+class TestVXI11_client(unittest.TestCase):
+    
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        async def start():
+            self.adapter = adapter_loopback.adapter(max_recv_size=1024)
+            self.srv = vxi11_srv.vxi11_core_srv(port=0, adapters=[self.adapter])
+            self.abort_srv = vxi11_srv.vxi11_async_srv(port=0, core_srv=self.srv)
+            await asyncio.gather(self.srv.open(), self.abort_srv.open())
+            self.srv.abort_port = self.abort_srv.actual_port
+            self.tasks = [asyncio.create_task(self.srv.main()), asyncio.create_task(self.abort_srv.main())]
+            self.client = vxi11_client.vxi11_client()
+            await self.client.connect("127.0.0.1", self.srv.actual_port)
+        self.loop.run_until_complete(start())
+        
+    def tearDown(self):
+        async def stop():
+            await self.client.close()
+            # Let the server notice that the connections are gone
+            await asyncio.sleep(0.1)
+            await self.srv.close()
+            await self.abort_srv.close()
+            for t in self.tasks:
+                t.cancel()
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.loop.run_until_complete(stop())
+        self.loop.close()
+        asyncio.set_event_loop(None)
+    
+    async def create_link(self) -> vxi11_client.vxi11_client_link:
+        (err, link) = await self.client.create_link(b"inst0")
+        self.assertEqual(err, vxi11_errorCodes.NO_ERROR)
+        self.assertEqual(link.maxRecvSize, 1024)
+        return link
+        
+    def test_write_read(self):
+        async def test():
+            link = await self.create_link()
+            data = bytes(range(256)) * 40
+            # Split into device_writes of maxRecvSize
+            self.assertEqual(await link.write(io_timeout=1000, lock_timeout=0, flags=vxi11_deviceFlags.END, data=data),
+                             (vxi11_errorCodes.NO_ERROR, len(data)))
+            # Limited by requestSize
+            (err, reason, rsp) = await link.read(requestSize=3000, io_timeout=1000, lock_timeout=0,
+                                                 flags=vxi11_deviceFlags(0), termChar=0)
+            self.assertEqual((err, reason, rsp), (vxi11_errorCodes.NO_ERROR, vxi11_readReason.REQCNT, data[:3000]))
+            # Read the rest, until END
+            (err, reason, rsp) = await link.read(requestSize=2**20, io_timeout=1000, lock_timeout=0,
+                                                 flags=vxi11_deviceFlags(0), termChar=0)
+            self.assertEqual((err, reason, rsp), (vxi11_errorCodes.NO_ERROR, vxi11_readReason.END, data[3000:]))
+            self.assertEqual(await link.read(requestSize=100, io_timeout=1000, lock_timeout=0,
+                                             flags=vxi11_deviceFlags(0), termChar=0),
+                             (vxi11_errorCodes.IO_TIMEOUT, 0, b''))
+            self.assertEqual(await link.destroy(), vxi11_errorCodes.NO_ERROR)
+            self.assertEqual(len(self.adapter.links), 0)
+        self.loop.run_until_complete(test())
+    
+    def test_generic_calls(self):
+        async def test():
+            link = await self.create_link()
+            other = await self.create_link()
+            await link.write(io_timeout=1000, lock_timeout=0, flags=vxi11_deviceFlags.END, data=b"*IDN?")
+            self.assertEqual(await link.read_stb(flags=vxi11_deviceFlags(0), lock_timeout=0, io_timeout=1000),
+                             (vxi11_errorCodes.NO_ERROR, 0x10))
+            self.assertEqual(await link.trigger(flags=vxi11_deviceFlags(0), lock_timeout=0, io_timeout=1000),
+                             vxi11_errorCodes.OPERATION_NOT_SUPPORTED)
+            self.assertEqual(await link.device_lock(flags=vxi11_deviceFlags(0), lock_timeout=0),
+                             vxi11_errorCodes.NO_ERROR)
+            self.assertEqual(await other.write(io_timeout=1000, lock_timeout=0, flags=vxi11_deviceFlags.END, data=b"x"),
+                             (vxi11_errorCodes.IO_TIMEOUT, 0))
+            self.assertEqual(await link.device_unlock(), vxi11_errorCodes.NO_ERROR)
+            self.assertEqual(await link.device_unlock(), vxi11_errorCodes.NO_LOCK_HELD_BY_THIS_LINK)
+            self.assertEqual(await link.clear(flags=vxi11_deviceFlags(0), lock_timeout=0, io_timeout=1000),
+                             vxi11_errorCodes.NO_ERROR)
+            self.assertEqual(await link.abort(), vxi11_errorCodes.NO_ERROR)
+            await link.destroy()
+            self.assertEqual(await link.abort(), vxi11_errorCodes.INVALID_LINK_IDENTIFIER)
+        self.loop.run_until_complete(test())
+    
+    def test_pipelined(self):
+        async def test():
+            self.adapter.delay = 0.05
+            links = [await self.create_link() for i in range(4)]
+            async def query(link: vxi11_client.vxi11_client_link, i: int):
+                data = b"link %d" % (i,)
+                await link.write(io_timeout=1000, lock_timeout=0, flags=vxi11_deviceFlags.END, data=data)
+                return await link.read(requestSize=100, io_timeout=1000, lock_timeout=0,
+                                       flags=vxi11_deviceFlags(0), termChar=0)
+            rsps = await asyncio.gather(*[query(link, i) for (i, link) in enumerate(links)])
+            self.assertEqual(rsps, [(vxi11_errorCodes.NO_ERROR, vxi11_readReason.END, b"link %d" % (i,))
+                                    for i in range(4)])
+        self.loop.run_until_complete(test())
+        
+    def test_srq(self):
+        async def test():
+            link = await self.create_link()
+            received = asyncio.Queue()
+            self.assertEqual(await link.enable_srq(received.put_nowait), vxi11_errorCodes.NO_ERROR)
+            srv_link = self.adapter.links[link.lid]
+            self.assertEqual(srv_link.srq_handle, link.srq_handle)
+            srv_link.conn.send_srq(srv_link.srq_handle)
+            self.assertEqual(await asyncio.wait_for(received.get(), timeout=2), link.srq_handle)
+            
+            self.assertEqual(await link.enable_srq(None), vxi11_errorCodes.NO_ERROR)
+            self.assertIsNone(srv_link.srq_handle)
+            self.assertEqual(len(self.client.intr_srv.handlers), 0)
+        self.loop.run_until_complete(test())
+    
+    def test_unknown_error_code(self):
+        async def test():
+            link = await self.create_link()
+            srv_link = self.adapter.links[link.lid]
+            async def trigger(flags, lock_timeout, io_timeout):
+                return 99
+            async def write(io_timeout, lock_timeout, flags, data):
+                return (99, 0)
+            srv_link.trigger = trigger
+            srv_link.write = write
+            self.assertEqual(await link.trigger(flags=vxi11_deviceFlags(0), lock_timeout=0, io_timeout=1000),
+                             vxi11_errorCodes.IO_ERROR)
+            self.assertEqual(await link.write(io_timeout=1000, lock_timeout=0, flags=vxi11_deviceFlags.END, data=b"x"),
+                             (vxi11_errorCodes.IO_ERROR, 0))
+        self.loop.run_until_complete(test())
+    
+    def test_concurrent_intr_chan(self):
+        async def test():
+            calls = []
+            stub = self.client.core_clnt.create_intr_chan
+            async def create_intr_chan(arg):
+                calls.append(arg)
+                return await stub(arg)
+            self.client.core_clnt.create_intr_chan = create_intr_chan
+            await asyncio.gather(*[self.client.create_intr_chan() for i in range(3)])
+            self.assertEqual(len(calls), 1)
+            self.assertIsNotNone(self.client.intr_srv)
+        self.loop.run_until_complete(test())
+    
+    def test_srq_udp(self):
+        async def test():
+            await self.client.close()
+            self.client = vxi11_client.vxi11_client(udp_intr=True)
+            await self.client.connect("127.0.0.1", self.srv.actual_port)
+            link = await self.create_link()
+            received = asyncio.Queue()
+            self.assertEqual(await link.enable_srq(received.put_nowait), vxi11_errorCodes.NO_ERROR)
+            srv_link = self.adapter.links[link.lid]
+            self.assertIsInstance(srv_link.conn._intr_exec._intr_client, vxi11_srv.vxi11_intr_udp_client)
+            for i in range(3):
+                srv_link.conn.send_srq(srv_link.srq_handle)
+                self.assertEqual(await asyncio.wait_for(received.get(), timeout=2), link.srq_handle)
+        self.loop.run_until_complete(test())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+import os
+import unittest
+import struct
+import subprocess
+import sys
+import tempfile
+
+from vxi11aio import rpc_record, xdr_numpy
+from vxi11aio.rpc_srv import rpc_srv
+from vxi11aio.xdr import portmap_type, rpc_const, vxi11_type
+from vxi11aio.xdr.portmap_pack import PORTMAPPacker, PORTMAPSizePacker, PORTMAPIntoPacker
+from vxi11aio.xdr.rpc_pack import RPCPacker, RPCUnpacker
+from vxi11aio.xdr.vxi11_pack import VXI11Packer, VXI11SizePacker, VXI11IntoPacker, VXI11Unpacker
+from vxi11aio.xdr.vxi11_pack import Device_WriteParms_view, Device_DocmdParms_view
+from xdrlib import Error as XDRError
+
+class TestXDR_into(unittest.TestCase):
+    
+    def check(self, packer, size_packer, into_packer, name, data):
+        """Encoding in place gives the same bytes as the Packer"""
+        p = packer()
+        getattr(p, "pack_" + name)(data)
+        expected = p.get_buffer()
+        s = size_packer()
+        getattr(s, "pack_" + name)(data)
+        self.assertEqual(s.size, len(expected))
+        # Offset into a reused buffer, with stale data where the padding goes
+        buf = bytearray(b'\xff' * (s.size + 8))
+        i = into_packer(buf, 4)
+        getattr(i, "pack_" + name)(data)
+        self.assertEqual(i.offset, 4 + s.size)
+        self.assertEqual(bytes(buf[4:i.offset]), expected)
+        self.assertEqual(bytes(buf[i.offset:]), b'\xff' * 4)
+    
+    def test_vxi11(self):
+        self.check(VXI11Packer, VXI11SizePacker, VXI11IntoPacker, "Device_ReadResp",
+                   vxi11_type.Device_ReadResp(error=0, reason=4, data=b"abcde"))
+        self.check(VXI11Packer, VXI11SizePacker, VXI11IntoPacker, "Device_DocmdParms",
+                   vxi11_type.Device_DocmdParms(lid=1, flags=0, io_timeout=2, lock_timeout=3, cmd=4,
+                                                network_order=True, datasize=2, data_in=b"xyz"))
+        self.check(VXI11Packer, VXI11SizePacker, VXI11IntoPacker, "Device_Link", 7)
+    
+    def test_portmap(self):
+        m = portmap_type.mapping(prog=100000, vers=2, prot=6, port=111)
+        self.check(PORTMAPPacker, PORTMAPSizePacker, PORTMAPIntoPacker, "pmaplist_ptr",
+                   [portmap_type.pmaplist(map=m, next=[portmap_type.pmaplist(map=m, next=[])])])
+        self.check(PORTMAPPacker, PORTMAPSizePacker, PORTMAPIntoPacker, "rpcb",
+                   portmap_type.rpcb(r_prog=1, r_vers=2, r_netid=b"tcp", r_addr=b"127.0.0.1.0.111", r_owner=b""))
+    
+    def test_checks(self):
+        with self.assertRaises(XDRError):
+            VXI11SizePacker().pack_Device_AddrFamily(5)
+        with self.assertRaises(XDRError):
+            VXI11IntoPacker(bytearray(4)).pack_Device_AddrFamily(5)
+        # Too small a buffer is not grown
+        buf = bytearray(8)
+        with self.assertRaises(XDRError):
+            VXI11IntoPacker(buf).pack_opaque(b"12345")
+        self.assertEqual(len(buf), 8)
+        # Enums, and union arms
+        with self.assertRaises(XDRError):
+            RPCPacker().pack_auth_stat(99)
+        p = RPCPacker(check_enum=False)
+        p.pack_auth_stat(99)
+        self.assertEqual(p.get_buffer(), struct.pack(">i", 99))
+        with self.assertRaises(XDRError):
+            RPCUnpacker(struct.pack(">I", 7)).unpack_rpc_msg_body()
+        with self.assertRaises(XDRError) as cm:
+            RPCUnpacker(struct.pack(">I", 7), check_enum=False).unpack_rpc_msg_body()
+        self.assertIn("bad switch", str(cm.exception))
+        for (stat, buf) in [(rpc_const.PROG_MISMATCH, rpc_srv.pack_reply_msg_prog_mismatch(5, 1, 3)),
+                            (rpc_const.PROC_UNAVAIL, rpc_srv.pack_reply_msg_unsupported(5, rpc_const.PROC_UNAVAIL))]:
+            msg = RPCUnpacker(buf).unpack_rpc_msg()
+            self.assertEqual(msg.body.rbody.areply.reply_data.stat, stat)
+            p = RPCPacker()
+            p.pack_rpc_msg(msg)
+            self.assertEqual(p.get_buffer(), buf)
+    
+    def test_reply_record(self):
+        (record, offset) = rpc_srv.success_reply_record(1234, 8)
+        self.assertIsInstance(record, rpc_record.marked_record)
+        self.assertEqual(struct.unpack(">I", record[:4])[0], rpc_record.LAST_FRAGMENT | (len(record) - 4))
+        self.assertEqual(len(record), offset + 8)
+        VXI11IntoPacker(record, offset).pack_Device_WriteResp(vxi11_type.Device_WriteResp(error=0, size=5))
+        up = RPCUnpacker(bytes(record.payload()))
+        msg = up.unpack_rpc_msg()
+        self.assertEqual(msg.xid, 1234)
+        self.assertEqual(msg.body.rbody.areply.reply_data.stat, rpc_const.SUCCESS)
+        self.assertEqual(record[offset:], struct.pack(">iI", 0, 5))
+        self.assertEqual(rpc_srv.pack_success_data_msg(1234, bytes(record[offset:])), record)
+    
+    def test_views(self):
+        p = VXI11Packer()
+        p.pack_uint(0xdeadbeef) # something before the struct
+        p.pack_Device_WriteParms(vxi11_type.Device_WriteParms(lid=3, io_timeout=1000,
+                lock_timeout=2000, flags=8, data=b"*IDN?\n"))
+        buf = p.get_buffer()
+        up = VXI11Unpacker(buf)
+        up.set_position(4)
+        ref = up.unpack_Device_WriteParms()
+        view = Device_WriteParms_view(buf, 4)
+        self.assertEqual(view.end, len(buf))
+        for f in ("lid", "io_timeout", "lock_timeout", "flags"):
+            self.assertEqual(getattr(view, f), getattr(ref, f))
+        self.assertIsInstance(view.data, memoryview)
+        self.assertEqual(bytes(view.data), ref.data)
+        with self.assertRaises(EOFError):
+            Device_WriteParms_view(buf[:-4], 4)
+        
+        p.reset()
+        p.pack_Device_DocmdParms(vxi11_type.Device_DocmdParms(lid=1, flags=0, io_timeout=1,
+                lock_timeout=2, cmd=0x20000, network_order=True, datasize=1, data_in=b"abcde"))
+        view = Device_DocmdParms_view(p.get_buffer())
+        self.assertEqual(view.network_order, True)
+        self.assertEqual(view.cmd, 0x20000)
+        self.assertEqual(bytes(view.data_in), b"abcde")
+    
+    def check_numpy(self):
+        data = [0, 1, 0xffffffff, 1234]
+        p = VXI11Packer()
+        xdr_numpy.pack_array(p, data, '>u4', p.pack_uint)
+        xdr_numpy.pack_farray(p, 2, [-1.5, 2.25], '>f8', p.pack_double)
+        ref = VXI11Packer()
+        ref.pack_array(data, ref.pack_uint)
+        ref.pack_farray(2, [-1.5, 2.25], ref.pack_double)
+        self.assertEqual(p.get_buffer(), ref.get_buffer())
+        s = VXI11SizePacker()
+        xdr_numpy.pack_array(s, data, '>u4', s.pack_uint)
+        xdr_numpy.pack_farray(s, 2, [-1.5, 2.25], '>f8', s.pack_double)
+        self.assertEqual(s.size, len(ref.get_buffer()))
+        buf = bytearray(s.size)
+        i = VXI11IntoPacker(buf)
+        xdr_numpy.pack_array(i, data, '>u4', i.pack_uint)
+        xdr_numpy.pack_farray(i, 2, [-1.5, 2.25], '>f8', i.pack_double)
+        self.assertEqual(buf, ref.get_buffer())
+        up = VXI11Unpacker(ref.get_buffer())
+        self.assertEqual(list(xdr_numpy.unpack_array(up, '>u4', up.unpack_uint)), data)
+        self.assertEqual(list(xdr_numpy.unpack_farray(up, 2, '>f8', up.unpack_double)), [-1.5, 2.25])
+        up.done()
+        with self.assertRaises(ValueError):
+            xdr_numpy.pack_farray(p, 3, [1, 2], '>i4', p.pack_int)
+        with self.assertRaises(EOFError):
+            up = VXI11Unpacker(ref.get_buffer()[:12])
+            xdr_numpy.unpack_array(up, '>u4', up.unpack_uint)
+    
+    def test_numpy_fallback(self):
+        numpy = xdr_numpy.numpy
+        xdr_numpy.numpy = None
+        try:
+            self.check_numpy()
+        finally:
+            xdr_numpy.numpy = numpy
+    
+    @unittest.skipIf(xdr_numpy.numpy is None, "NumPy is not installed")
+    def test_numpy(self):
+        self.check_numpy()
+        up = VXI11Unpacker(struct.pack(">Iii", 2, -5, 7))
+        a = xdr_numpy.unpack_array(up, '>i4', up.unpack_int)
+        self.assertEqual(a.dtype, xdr_numpy.numpy.dtype('>i4'))
+        self.assertEqual(a.tolist(), [-5, 7])
+    
+    def test_xdrgen(self):
+        from vxi11aio import xdrgen
+        xdr = os.path.join(os.path.dirname(xdrgen.__file__), "xdr")
+        with tempfile.TemporaryDirectory() as d:
+            self.assertEqual(xdrgen.run(os.path.join(xdr, "rpc.x"), outdir=d), 0)
+            # Deterministic, so the same as the generated modules in the tree
+            for name in ["rpc_const.py", "rpc_type.py", "rpc_pack.py"]:
+                with open(os.path.join(d, name)) as f, open(os.path.join(xdr, name)) as g:
+                    self.assertEqual(f.read(), g.read())
+            mtime = os.stat(os.path.join(d, "rpc_pack.py")).st_mtime_ns
+            self.assertEqual(xdrgen.run(os.path.join(xdr, "rpc.x"), outdir=d), 0)
+            self.assertEqual(os.stat(os.path.join(d, "rpc_pack.py")).st_mtime_ns, mtime)
+    
+    def test_import(self):
+        # Without side effects, and without importing asyncio or adapters
+        script = ("import sys\n"
+                  "path = list(sys.path)\n"
+                  "import vxi11aio, vxi11aio.xdr.vxi11_pack, vxi11aio.xdr.rpc_type\n"
+                  "assert sys.path == path\n"
+                  "assert 'asyncio' not in sys.modules\n"
+                  "assert 'vxi11aio.adapter_time' not in sys.modules\n"
+                  "assert vxi11aio.adapter_time.adapter is not None\n")
+        subprocess.run([sys.executable, "-c", script], check=True,
+                       cwd=os.path.dirname(os.path.abspath(__file__)))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+# This implements a loopback adapter, which echos back whatever is written
+# to it. It is meant for testing and benchmarking the server without
+# any instrument attached.
+
+import asyncio
+from typing import Optional, Tuple
+
+from .vxi11_srv import vxi11_errorCodes, vxi11_deviceFlags, vxi11_readReason, vxi11_core_conn
+from .vxi11_adapter import vxi11_link, vxi11_adapter, DEFAULT_MAX_RECV_SIZE
+
+
+class link(vxi11_link):
+    def __init__(self, link_id: int, device: bytes, adapter: 'adapter', conn: vxi11_core_conn):
+        self.outBuf = bytearray()
+        self.device_name = device
+        super().__init__(link_id=link_id, adapter=adapter, conn=conn)
+        self.adapter: 'adapter' = adapter
+        
+    async def write(self, io_timeout: int, lock_timeout: int, flags: vxi11_deviceFlags, data: bytes) -> Tuple[vxi11_errorCodes,int]:
+        """Return (errorCode, size)
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, PARAMETER_ERROR,
+        DEVICE_LOCKED_BY_ANOTHER_LINK, IO_TIMEOUT, IO_ERROR, or abort
+        """
+        if (not await self.acquire_io_lock(flags,lock_timeout=lock_timeout, io_timeout=io_timeout)):
+            return (vxi11_errorCodes.IO_TIMEOUT,0)
+        try:
+            if(self.adapter.delay > 0):
+                await asyncio.sleep(self.adapter.delay)
+            if(self.adapter.echo):
+                self.outBuf += data
+        finally:
+            self.release_io_lock()
+        return (vxi11_errorCodes.NO_ERROR,len(data))
+        
+    async def read(self, requestSize: int, io_timeout: int, lock_timeout: int, flags: vxi11_deviceFlags, termChar: int) -> Tuple[vxi11_errorCodes,int,bytes]:
+        """Return (errorCode, vxi11_readReason, data: bytes)
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, DEVICE_LOCKED_BY_ANOTHER_LINK,
+        IO_TIMEOUT, IO_ERROR, or abort
+        """
+        if(len(self.outBuf) == 0):
+            return (vxi11_errorCodes.IO_TIMEOUT,0,b'')
+        if (not await self.acquire_io_lock(flags,lock_timeout=lock_timeout, io_timeout=io_timeout)):
+            return (vxi11_errorCodes.IO_TIMEOUT,0,b'')
+        try:
+            if(self.adapter.delay > 0):
+                await asyncio.sleep(self.adapter.delay)
+            data = bytes(self.outBuf[:requestSize])
+            del self.outBuf[:requestSize]
+        finally:
+            self.release_io_lock()
+        reason = vxi11_readReason.END if len(self.outBuf) == 0 else vxi11_readReason.REQCNT
+        return (vxi11_errorCodes.NO_ERROR,reason,data)
+        
+    async def read_stb(self, flags: vxi11_deviceFlags, lock_timeout: int, io_timeout: int) -> Tuple[vxi11_errorCodes,int]:
+        """Return (errorCode, stb)
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, OPERATION_NOT_SUPPORTED,
+        DEVICE_LOCKED_BY_ANOTHER_LINK, IO_TIMEOUT, IO_ERROR, or abort
+        """
+        # MAV (message available) is bit 4
+        stb = 0x10 if len(self.outBuf) > 0 else 0x00
+        return (vxi11_errorCodes.NO_ERROR,stb)
+    
+    async def clear(self, flags: vxi11_deviceFlags, lock_timeout: int,
+                    io_timeout: int) -> vxi11_errorCodes:
+        """Return (errorCode)
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, OPERATION_NOT_SUPPORTED,
+        DEVICE_LOCKED_BY_ANOTHER_LINK, IO_TIMEOUT, IO_ERROR, or ABORT
+        """
+        self.outBuf.clear()
+        return vxi11_errorCodes.NO_ERROR
+        
+class adapter(vxi11_adapter):
+    def __init__(self, echo: bool = True, delay: float = 0.0, max_links: Optional[int] = None,
+                 max_recv_size: int = DEFAULT_MAX_RECV_SIZE) -> None:
+        """If echo is False, writes are discarded. delay is the time in
+        seconds that each read and write takes, to imitate a slow instrument."""
+        self.echo = echo
+        self.delay = delay
+        super().__init__(max_links=max_links, max_recv_size=max_recv_size)
+        
+    async def create_link(self, clientId: int, lockDevice: bool,
+                          lock_timeout: int, device: bytes, link_id: int, conn:vxi11_core_conn) -> Tuple[vxi11_errorCodes,link]:
+        """ Returns (errorcode,link)"""
+        # Errorcode may be NO_ERROR, SYNTAX_ERROR, DEVICE_NOT_ACCESSIBLE,
+        #    OUT_OF_RESOURCES, DEVICE_LOCKED_BY_ANOTHER_LINK, INVALID_ADDRESS
+        l = link(link_id=link_id,device=device,adapter=self, conn=conn)
+        return (vxi11_errorCodes.NO_ERROR,l)
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+# This implements an adapter for a Prologix GPIB-USB (or GPIB-ETHERNET in
+# serial mode) controller.
+#
+# A single adapter owns the serial port, and so the whole GPIB bus. Links
+# are created with device names of the form "gpib0,<pad>" or
+# "gpib0,<pad>,<sad>", and each link talks to that GPIB address. Device
+# locks apply to a single GPIB address, so locking one instrument doesn't
+# lock out the rest of the bus.
+#
+# The controller is run with ++auto 0 and ++eos 3, so that the bytes that
+# are written go to the instrument unchanged, and responses are requested
+# with ++read. Data bytes which the controller would interpret (CR, LF, ESC
+# and '+') are escaped. The controller appends an EOT character to a
+# response once the instrument asserts EOI (++eot_enable), which marks the
+# end of the response. Line feeds in binary data don't end it, as long as
+# the data doesn't contain the EOT character. Anything still left from
+# an earlier response is discarded when a new one is requested, so that it
+# can't be mistaken for the response of another instrument.
+#
+# Only one operation can use the bus at a time. Rather than a plain lock,
+# operations wait on a bus_scheduler, which prefers operations for the
+# currently addressed device. This saves ++addr commands, which each cost a
+# serial round trip and GPIB addressing, when several links are busy.
+
+import asyncio
+import collections
+import re
+from typing import Any, Deque, Dict, Optional, Tuple
+
+import aioserial
+
+from .vxi11_srv import vxi11_errorCodes, vxi11_deviceFlags, vxi11_readReason, vxi11_core_conn
+from .vxi11_adapter import vxi11_link, vxi11_adapter, DEFAULT_MAX_RECV_SIZE
+
+# A GPIB address, as (primary address, secondary address or None)
+gpib_address = Tuple[int, Optional[int]]
+
+_device_re = re.compile(rb"^gpib(\d+),(\d+)(?:,(\d+))?$", re.IGNORECASE)
+
+def parse_device(device: bytes) -> Optional[Tuple[int,gpib_address]]:
+    """Parse a VXI-11 device name like b"gpib0,5" or b"gpib0,5,2".
+    Returns (board, (pad, sad)) or None if the name is not valid."""
+    m = _device_re.match(device.strip())
+    if(m is None):
+        return None
+    board = int(m.group(1))
+    pad = int(m.group(2))
+    sad = int(m.group(3)) if m.group(3) is not None else None
+    if(pad > 30 or (sad is not None and sad > 30)):
+        return None
+    return (board, (pad, sad))
+
+_escape_re = re.compile(rb"([\r\n\x1b+])")
+
+def escape(data: bytes) -> bytes:
+    """Escape data bytes that the controller would otherwise interpret"""
+    return _escape_re.sub(b"\x1b\\1", data)
+
+class bus_scheduler():
+    """Grants the bus to one operation at a time.
+    
+    When the bus is released, waiters for the address which is currently
+    selected are preferred, to avoid switching addresses. To keep other
+    devices from starving, at most max_batch consecutive grants go to the
+    same address while others are waiting. Otherwise, waiters are served in
+    order of arrival."""
+    def __init__(self, max_batch: int = 8) -> None:
+        self.max_batch = max_batch
+        self.current: Optional[gpib_address] = None
+        self.busy = False
+        self._batch = 0
+        self._waiters: Deque[Tuple[gpib_address, asyncio.Future]] = collections.deque()
+        
+    def _grant(self, addr: gpib_address) -> None:
+        self.busy = True
+        if(addr == self.current):
+            self._batch += 1
+        else:
+            self.current = addr
+            self._batch = 1
+    
+    async def acquire(self, addr: gpib_address) -> None:
+        if(not self.busy and len(self._waiters) == 0):
+            self._grant(addr)
+            return
+        fut = asyncio.get_event_loop().create_future()
+        entry = (addr, fut)
+        self._waiters.append(entry)
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if(fut.done() and not fut.cancelled()):
+                # The bus was granted just as we gave up on it
+                self.release()
+            else:
+                self._waiters.remove(entry)
+            raise
+        
+    def release(self) -> None:
+        self.busy = False
+        if(len(self._waiters) == 0):
+            return
+        chosen = self._waiters[0]
+        if(self._batch < self.max_batch):
+            for w in self._waiters:
+                if(w[0] == self.current):
+                    chosen = w
+                    break
+        self._waiters.remove(chosen)
+        self._grant(chosen[0])
+        chosen[1].set_result(None)
+
+class gpib_device():
+    """State shared by all links to one GPIB address"""
+    def __init__(self, addr: gpib_address) -> None:
+        self.addr = addr
+        # Used as the lock_scope of the links, see vxi11_link
+        self.adapter_excl_lock = asyncio.Lock()
+        self.adapter_excl_lock_owner: Optional[vxi11_link] = None
+        # Response data which has been read from the instrument, but not
+        # yet returned by a device_read
+        self.rxBuf = bytearray()
+        # rxBuf ends with the end of a response
+        self.rx_end = False
+        # rxBuf ends with the term char of the read which requested it
+        self.rx_chr = False
+        self.link_count = 0
+        
+class link(vxi11_link):
+    def __init__(self, link_id: int, device: bytes, dev: gpib_device, adapter: 'adapter', conn: vxi11_core_conn):
+        self.device_name = device
+        super().__init__(link_id=link_id, adapter=adapter, conn=conn)
+        self.adapter: 'adapter' = adapter
+        self.dev = dev
+        self.lock_scope = dev
+        dev.link_count += 1
+        
+    async def acquire_io_lock(self, flags: vxi11_deviceFlags, lock_timeout: int, io_timeout: int) -> bool:
+        """Returns true if the bus is acquired"""
+        if(not await self.wait_excl_lock(flags, lock_timeout=lock_timeout)):
+            return False
+        try:
+            await asyncio.wait_for(self.adapter.bus.acquire(self.dev.addr), timeout=(1+io_timeout)/1000.0)
+        except asyncio.TimeoutError:
+            return False
+        return True
+    
+    def release_io_lock(self) -> None:
+        self.adapter.bus.release()
+        
+    async def write(self, io_timeout: int, lock_timeout: int, flags: vxi11_deviceFlags, data: bytes) -> Tuple[vxi11_errorCodes,int]:
+        """Return (errorCode, size)
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, PARAMETER_ERROR,
+        DEVICE_LOCKED_BY_ANOTHER_LINK, IO_TIMEOUT, IO_ERROR, or abort
+        """
+        if (not await self.acquire_io_lock(flags,lock_timeout=lock_timeout, io_timeout=io_timeout)):
+            return (vxi11_errorCodes.IO_TIMEOUT,0)
+        try:
+            # A new command makes any unread response stale
+            self.dev.rxBuf = bytearray()
+            await self.adapter.select(self.dev.addr)
+            await self.adapter.set_eoi(bool(flags & vxi11_deviceFlags.END))
+            await self.adapter.send(escape(data) + b"\n")
+        except OSError as e:
+            print(f"Prologix write failed: {e!r}")
+            return (vxi11_errorCodes.IO_ERROR,0)
+        finally:
+            self.release_io_lock()
+        return (vxi11_errorCodes.NO_ERROR,len(data))
+    
+    async def read(self, requestSize: int, io_timeout: int, lock_timeout: int, flags: vxi11_deviceFlags, termChar: int) -> Tuple[vxi11_errorCodes,int,bytes]:
+        """Return (errorCode, vxi11_readReason, data: bytes)
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, DEVICE_LOCKED_BY_ANOTHER_LINK,
+        IO_TIMEOUT, IO_ERROR, or abort
+        """
+        dev = self.dev
+        if(len(dev.rxBuf) > 0):
+            # Buffered data is not handed out while another link holds the lock
+            if(not await self.wait_excl_lock(flags, lock_timeout=lock_timeout)):
+                return (vxi11_errorCodes.IO_TIMEOUT,0,b'')
+        else:
+            if (not await self.acquire_io_lock(flags,lock_timeout=lock_timeout, io_timeout=io_timeout)):
+                return (vxi11_errorCodes.IO_TIMEOUT,0,b'')
+            try:
+                term = termChar if (flags & vxi11_deviceFlags.TERMCHRSET) else None
+                await self.adapter.select(dev.addr)
+                (err, reason, data) = await self.adapter.read_response(term, timeout=io_timeout/1000.0)
+            except OSError as e:
+                print(f"Prologix read failed: {e!r}")
+                return (vxi11_errorCodes.IO_ERROR,0,b'')
+            finally:
+                self.release_io_lock()
+            if(err != vxi11_errorCodes.NO_ERROR):
+                return (err,0,b'')
+            dev.rxBuf = bytearray(data)
+            dev.rx_end = bool(reason & vxi11_readReason.END)
+            dev.rx_chr = bool(reason & vxi11_readReason.CHR)
+        
+        # The whole response is buffered, hand it out requestSize at a time
+        if(len(dev.rxBuf) > requestSize):
+            data = bytes(dev.rxBuf[:requestSize])
+            del dev.rxBuf[:requestSize]
+            return (vxi11_errorCodes.NO_ERROR,vxi11_readReason.REQCNT,data)
+        data = bytes(dev.rxBuf)
+        dev.rxBuf = bytearray()
+        reason = 0
+        if(dev.rx_end):
+            reason |= vxi11_readReason.END
+        if(dev.rx_chr):
+            reason |= vxi11_readReason.CHR
+        return (vxi11_errorCodes.NO_ERROR,reason,data)
+    
+    async def _command(self, flags: vxi11_deviceFlags, lock_timeout: int, io_timeout: int,
+                       cmd: bytes) -> vxi11_errorCodes:
+        """Send a controller command addressed to this device"""
+        if (not await self.acquire_io_lock(flags,lock_timeout=lock_timeout, io_timeout=io_timeout)):
+            return (vxi11_errorCodes.IO_TIMEOUT)
+        try:
+            await self.adapter.select(self.dev.addr)
+            await self.adapter.send(cmd)
+        except OSError as e:
+            print(f"Prologix {cmd!r} failed: {e!r}")
+            return (vxi11_errorCodes.IO_ERROR)
+        finally:
+            self.release_io_lock()
+        return (vxi11_errorCodes.NO_ERROR)
+    
+    async def read_stb(self, flags: vxi11_deviceFlags, lock_timeout: int, io_timeout: int) -> Tuple[vxi11_errorCodes,int]:
+        """Return (errorCode, stb)
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, OPERATION_NOT_SUPPORTED,
+        DEVICE_LOCKED_BY_ANOTHER_LINK, IO_TIMEOUT, IO_ERROR, or abort
+        """
+        if (not await self.acquire_io_lock(flags,lock_timeout=lock_timeout, io_timeout=io_timeout)):
+            return (vxi11_errorCodes.IO_TIMEOUT,0)
+        try:
+            await self.adapter.select(self.dev.addr)
+            self.adapter.discard_input()
+            await self.adapter.send(b"++spoll\n")
+            (err,_,data) = await self.adapter.read_line(timeout=io_timeout/1000.0)
+        except OSError as e:
+            print(f"Prologix serial poll failed: {e!r}")
+            return (vxi11_errorCodes.IO_ERROR,0)
+        finally:
+            self.release_io_lock()
+        if(err != vxi11_errorCodes.NO_ERROR):
+            return (err,0)
+        try:
+            return (vxi11_errorCodes.NO_ERROR,int(data.strip()))
+        except ValueError:
+            return (vxi11_errorCodes.IO_ERROR,0)
+    
+    async def trigger(self, flags: vxi11_deviceFlags, lock_timeout: int,
+                      io_timeout: int) -> vxi11_errorCodes:
+        """Return (errorCode)
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, OPERATION_NOT_SUPPORTED,
+        DEVICE_LOCKED_BY_ANOTHER_LINK, IO_TIMEOUT, IO_ERROR, or ABORT
+        """
+        return await self._command(flags, lock_timeout, io_timeout, b"++trg\n")
+    
+    async def clear(self, flags: vxi11_deviceFlags, lock_timeout: int,
+                    io_timeout: int) -> vxi11_errorCodes:
+        """Return (errorCode)
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, OPERATION_NOT_SUPPORTED,
+        DEVICE_LOCKED_BY_ANOTHER_LINK, IO_TIMEOUT, IO_ERROR, or ABORT
+        """
+        self.dev.rxBuf = bytearray()
+        return await self._command(flags, lock_timeout, io_timeout, b"++clr\n")
+    
+    async def local(self, flags: vxi11_deviceFlags,
+                    lock_timeout: int, io_timeout: int) -> vxi11_errorCodes:
+        """Return (errorCode)
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, OPERATION_NOT_SUPPORTED,
+        DEVICE_LOCKED_BY_ANOTHER_LINK, IO_TIMEOUT, IO_ERROR, or ABORT
+        """
+        return await self._command(flags, lock_timeout, io_timeout, b"++loc\n")
+    
+    async def destroy(self) -> vxi11_errorCodes:
+        """If it got here, link must exist. NO_ERROR is only valid response"""
+        self.dev.link_count -= 1
+        if(self.dev.link_count == 0):
+            self.adapter.devices.pop(self.dev.addr, None)
+        return await super().destroy()
+        
+class adapter(vxi11_adapter):
+    def __init__(self, port: str, baudrate: int = 115200, board: int = 0,
+                 eot_char: int = 0x04, read_tmo_ms: int = 500,
+                 max_batch: int = 8, max_links: Optional[int] = None,
+                 max_recv_size: int = DEFAULT_MAX_RECV_SIZE) -> None:
+        """port is the serial port of the controller. Links are accepted for
+        device names on GPIB board number board.
+        
+        A read ends with END once the instrument asserts EOI. The
+        controller marks that with eot_char, which must not occur in the
+        responses of the instruments, or they are cut short.
+        read_tmo_ms is the controller's inter-character timeout for reads.
+        
+        max_batch limits how many operations in a row go to one address
+        while operations for other addresses are waiting."""
+        self.port = port
+        self.baudrate = baudrate
+        self.board = board
+        self.eot_char = eot_char
+        self.read_tmo_ms = read_tmo_ms
+        self.bus = bus_scheduler(max_batch=max_batch)
+        self.devices: Dict[gpib_address, gpib_device] = dict()
+        self.serial: Optional[aioserial.AioSerial] = None
+        # Controller state, to avoid resending commands. None is unknown.
+        self.addr: Optional[gpib_address] = None
+        self.eoi: Optional[bool] = None
+        # Data received from the controller, but not yet consumed
+        self._rxBuf = bytearray()
+        super().__init__(max_links=max_links, max_recv_size=max_recv_size)
+        
+    async def create_link(self, clientId: int, lockDevice: bool,
+                          lock_timeout: int, device: bytes, link_id: int, conn:vxi11_core_conn) -> Tuple[vxi11_errorCodes,Optional[link]]:
+        """ Returns (errorcode,link)"""
+        # Errorcode may be NO_ERROR, SYNTAX_ERROR, DEVICE_NOT_ACCESSIBLE,
+        #    OUT_OF_RESOURCES, DEVICE_LOCKED_BY_ANOTHER_LINK, INVALID_ADDRESS
+        parsed = parse_device(device)
+        if(parsed is None or parsed[0] != self.board):
+            return (vxi11_errorCodes.INVALID_ADDRESS,None)
+        try:
+            await self.open()
+        except OSError as e:
+            print(f"Unable to open Prologix controller on {self.port}: {e!r}")
+            return (vxi11_errorCodes.DEVICE_NOT_ACCESSIBLE,None)
+        addr = parsed[1]
+        dev = self.devices.get(addr)
+        if(dev is None):
+            dev = gpib_device(addr)
+            self.devices[addr] = dev
+        l = link(link_id=link_id,device=device,dev=dev,adapter=self, conn=conn)
+        return (vxi11_errorCodes.NO_ERROR,l)
+    
+    async def open(self) -> None:
+        """Open and configure the controller, if not done already"""
+        if(self.serial is not None):
+            return
+        # The short timeout lets reads poll, rather than leaving a blocked
+        # read behind in the executor when they time out
+        self.serial = aioserial.AioSerial(port=self.port, baudrate=self.baudrate, timeout=0.05)
+        self.addr = None
+        self.eoi = None
+        self._rxBuf = bytearray()
+        await self.send(b"++savecfg 0\n++mode 1\n++auto 0\n++eos 3\n" +
+                        b"++eot_enable 1\n++eot_char %d\n" % (self.eot_char,) +
+                        b"++read_tmo_ms %d\n" % (self.read_tmo_ms,))
+    
+    def close(self) -> None:
+        if(self.serial is not None):
+            self.serial.close()
+            self.serial = None
+    
+    async def send(self, data: bytes) -> None:
+        """Send data to the controller. The bus must be held."""
+        if(self.serial is None):
+            raise ConnectionError("Prologix controller is not open")
+        await self.serial.write_async(data)
+        
+    async def select(self, addr: gpib_address) -> None:
+        """Address the instrument at addr, unless it already is.
+        The bus must be held."""
+        if(self.addr == addr):
+            return
+        # Forget the cached address until the command has gone out
+        self.addr = None
+        (pad, sad) = addr
+        if(sad is None):
+            await self.send(b"++addr %d\n" % (pad,))
+        else:
+            await self.send(b"++addr %d %d\n" % (pad, 96 + sad))
+        self.addr = addr
+    
+    async def set_eoi(self, eoi: bool) -> None:
+        """Set whether EOI is asserted with the last byte written.
+        The bus must be held."""
+        if(self.eoi == eoi):
+            return
+        self.eoi = None
+        await self.send(b"++eoi %d\n" % (int(eoi),))
+        self.eoi = eoi
+    
+    async def _receive(self, deadline: float) -> bool:
+        """Append data from the controller to _rxBuf.
+        Returns false if nothing arrived before the deadline."""
+        loop = asyncio.get_event_loop()
+        while loop.time() < deadline:
+            chunk = await self.serial.read_async(1)
+            if(len(chunk) > 0):
+                waiting = self.serial.in_waiting
+                if(waiting > 0):
+                    chunk += await self.serial.read_async(waiting)
+                self._rxBuf += chunk
+                return True
+        return False
+    
+    async def read_response(self, term_char: Optional[int], timeout: float) -> Tuple[vxi11_errorCodes,int,bytes]:
+        """Ask the addressed instrument to talk, and read its response.
+        Returns (errorCode, vxi11_readReason, data). The bus must be held."""
+        self.discard_input()
+        if(term_char is None):
+            await self.send(b"++read eoi\n")
+        else:
+            await self.send(b"++read %d\n" % (term_char,))
+        return await self._read_until(bytes([self.eot_char]), term_char, timeout, keep_term=False)
+    
+    async def read_line(self, timeout: float) -> Tuple[vxi11_errorCodes,int,bytes]:
+        """Read a line of output from a controller command. The bus must be held."""
+        return await self._read_until(b"\n", None, timeout)
+    
+    def discard_input(self) -> None:
+        """Drop whatever is left of earlier responses. The bus must be held."""
+        self._rxBuf = bytearray()
+        if(self.serial is not None):
+            self.serial.reset_input_buffer()
+    
+    async def _read_until(self, term: bytes, term_char: Optional[int], timeout: float,
+                          keep_term: bool = True) -> Tuple[vxi11_errorCodes,int,bytes]:
+        """Read up to term, which marks END, or term_char. Unless keep_term
+        is set, term is dropped from the data, and term right after term_char
+        marks END as well."""
+        if(self.serial is None):
+            raise ConnectionError("Prologix controller is not open")
+        deadline = asyncio.get_event_loop().time() + timeout
+        scanned = 0 # Data before this offset has been searched for terminators
+        while True:
+            buf = self._rxBuf
+            end_ix = buf.find(term, max(0, scanned - len(term) + 1))
+            chr_ix = buf.find(term_char, scanned) if term_char is not None else -1
+            if(end_ix >= 0 or chr_ix >= 0):
+                # Stop at whichever terminator comes first
+                end_size = end_ix + len(term) if end_ix >= 0 else len(buf) + 1
+                chr_size = chr_ix + 1 if chr_ix >= 0 else len(buf) + 1
+                size = min(end_size, chr_size)
+                consumed = size
+                reason = 0
+                if(chr_size == size):
+                    reason |= vxi11_readReason.CHR
+                if(end_size == size):
+                    reason |= vxi11_readReason.END
+                    if(not keep_term):
+                        size = end_ix
+                elif(not keep_term and buf.startswith(term, size)):
+                    # The termination character came with EOI
+                    reason |= vxi11_readReason.END
+                    consumed += len(term)
+                data = bytes(buf[:size])
+                del buf[:consumed]
+                return (vxi11_errorCodes.NO_ERROR,reason,data)
+            scanned = len(buf)
+            if(not await self._receive(deadline)):
+                # The rest of the response may still arrive later, so don't
+                # let it be mistaken for the next one
+                self.discard_input()
+                return (vxi11_errorCodes.IO_TIMEOUT,0,b'')
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+# This implements an adapter for instruments which accept SCPI over a raw
+# TCP socket, usually on port 5025.
+#
+# Unlike the USBTMC adapter, everything runs on the event loop. The
+# connection to the instrument is opened when it is first needed, and then
+# shared by all links to the adapter, since the IO lock already serializes
+# their access. It is only closed after an error or a device clear, so
+# links coming and going don't cost a TCP connection setup each time.
+
+import asyncio
+from typing import Optional, Tuple
+
+from .vxi11_srv import vxi11_errorCodes, vxi11_deviceFlags, vxi11_readReason, vxi11_core_conn
+from .vxi11_adapter import vxi11_link, vxi11_adapter, DEFAULT_MAX_RECV_SIZE
+
+# Time in seconds that the socket is polled for, even once the io_timeout
+# has passed, such as for an io_timeout of 0
+MIN_POLL_TIME = 0.001
+
+class link(vxi11_link):
+    def __init__(self, link_id: int, device: bytes, adapter: 'adapter', conn: vxi11_core_conn):
+        self.device_name = device
+        super().__init__(link_id=link_id, adapter=adapter, conn=conn)
+        self.adapter: 'adapter' = adapter
+        
+    async def write(self, io_timeout: int, lock_timeout: int, flags: vxi11_deviceFlags, data: bytes) -> Tuple[vxi11_errorCodes,int]:
+        """Return (errorCode, size)
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, PARAMETER_ERROR,
+        DEVICE_LOCKED_BY_ANOTHER_LINK, IO_TIMEOUT, IO_ERROR, or abort
+        """
+        if (not await self.acquire_io_lock(flags,lock_timeout=lock_timeout, io_timeout=io_timeout)):
+            return (vxi11_errorCodes.IO_TIMEOUT,0)
+        try:
+            return await self.adapter.write(data, end=bool(flags & vxi11_deviceFlags.END),
+                                            timeout=io_timeout/1000.0)
+        finally:
+            self.release_io_lock()
+        
+    async def read(self, requestSize: int, io_timeout: int, lock_timeout: int, flags: vxi11_deviceFlags, termChar: int) -> Tuple[vxi11_errorCodes,int,bytes]:
+        """Return (errorCode, vxi11_readReason, data: bytes)
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, DEVICE_LOCKED_BY_ANOTHER_LINK,
+        IO_TIMEOUT, IO_ERROR, or abort
+        """
+        if (not await self.acquire_io_lock(flags,lock_timeout=lock_timeout, io_timeout=io_timeout)):
+            return (vxi11_errorCodes.IO_TIMEOUT,0,b'')
+        try:
+            term = termChar if (flags & vxi11_deviceFlags.TERMCHRSET) else None
+            return await self.adapter.read(requestSize, term_char=term, timeout=io_timeout/1000.0)
+        finally:
+            self.release_io_lock()
+    
+    async def clear(self, flags: vxi11_deviceFlags, lock_timeout: int,
+                    io_timeout: int) -> vxi11_errorCodes:
+        """Return (errorCode)
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, OPERATION_NOT_SUPPORTED,
+        DEVICE_LOCKED_BY_ANOTHER_LINK, IO_TIMEOUT, IO_ERROR, or ABORT
+        """
+        if (not await self.acquire_io_lock(flags,lock_timeout=lock_timeout, io_timeout=io_timeout)):
+            return (vxi11_errorCodes.IO_TIMEOUT)
+        try:
+            # There is no device clear on a raw socket. Dropping the
+            # connection at least discards any unread response.
+            await self.adapter.disconnect()
+        finally:
+            self.release_io_lock()
+        return (vxi11_errorCodes.NO_ERROR)
+        
+class adapter(vxi11_adapter):
+    def __init__(self, host: str, port: int = 5025,
+                 write_termination: bytes = b'\n', read_termination: bytes = b'\n',
+                 connect_timeout: float = 5.0, max_links: Optional[int] = None,
+                 max_recv_size: int = DEFAULT_MAX_RECV_SIZE) -> None:
+        """write_termination is appended to writes with END, unless already
+        present. A read ends with END once read_termination is received."""
+        self.host = host
+        self.port = port
+        self.write_termination = write_termination
+        self.read_termination = read_termination
+        self.connect_timeout = connect_timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        # Received data which has not yet been returned by a read
+        self._rxBuf = bytearray()
+        super().__init__(max_links=max_links, max_recv_size=max_recv_size)
+        
+    async def create_link(self, clientId: int, lockDevice: bool,
+                          lock_timeout: int, device: bytes, link_id: int, conn:vxi11_core_conn) -> Tuple[vxi11_errorCodes,link]:
+        """ Returns (errorcode,link)"""
+        # Errorcode may be NO_ERROR, SYNTAX_ERROR, DEVICE_NOT_ACCESSIBLE,
+        #    OUT_OF_RESOURCES, DEVICE_LOCKED_BY_ANOTHER_LINK, INVALID_ADDRESS
+        l = link(link_id=link_id,device=device,adapter=self, conn=conn)
+        return (vxi11_errorCodes.NO_ERROR,l)
+    
+    async def connect(self) -> Tuple[asyncio.StreamReader,asyncio.StreamWriter]:
+        """Returns the connection to the instrument, opening it if needed"""
+        if(self._reader is None or self._writer is None):
+            print(f"Connecting to instrument at {self.host}:{self.port}")
+            self._reader, self._writer = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port), timeout=self.connect_timeout)
+            self._rxBuf = bytearray()
+        return (self._reader, self._writer)
+    
+    async def disconnect(self) -> None:
+        writer = self._writer
+        self._reader = None
+        self._writer = None
+        self._rxBuf = bytearray()
+        if(writer is not None):
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+    
+    async def write(self, data: bytes, end: bool, timeout: float) -> Tuple[vxi11_errorCodes,int]:
+        """Return (errorCode, size). The IO lock must be held."""
+        size = len(data)
+        if(end and not data.endswith(self.write_termination)):
+            data = data + self.write_termination
+        try:
+            (_,writer) = await self.connect()
+            writer.write(data)
+            await asyncio.wait_for(writer.drain(), timeout=max(timeout, MIN_POLL_TIME))
+        except asyncio.TimeoutError:
+            # The instrument isn't reading. What is left of the data would
+            # be sent ahead of the next write, so the connection is dropped,
+            # without waiting to send it, and reopened by the next operation.
+            print(f"Write to {self.host}:{self.port} timed out, disconnecting")
+            writer.transport.abort()
+            await self.disconnect()
+            return (vxi11_errorCodes.IO_TIMEOUT,0)
+        except OSError as e:
+            print(f"Write to {self.host}:{self.port} failed: {e!r}")
+            await self.disconnect()
+            return (vxi11_errorCodes.IO_ERROR,0)
+        return (vxi11_errorCodes.NO_ERROR,size)
+    
+    async def read(self, requestSize: int, term_char: Optional[int],
+                   timeout: float) -> Tuple[vxi11_errorCodes,int,bytes]:
+        """Return (errorCode, vxi11_readReason, data: bytes). The IO lock must be held.
+        
+        Data beyond what is returned stays buffered for the next read."""
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + timeout
+        term = self.read_termination
+        scanned = 0 # Data before this offset has been searched for terminators
+        polled = False
+        while True:
+            buf = self._rxBuf
+            limit = min(len(buf), requestSize)
+            end_ix = buf.find(term, max(0, scanned - len(term) + 1), limit) if len(term) > 0 else -1
+            chr_ix = buf.find(term_char, scanned, limit) if term_char is not None else -1
+            if(end_ix >= 0 or chr_ix >= 0):
+                # Stop at whichever terminator comes first
+                end_size = end_ix + len(term) if end_ix >= 0 else len(buf) + 1
+                chr_size = chr_ix + 1 if chr_ix >= 0 else len(buf) + 1
+                size = min(end_size, chr_size)
+                reason = 0
+                if(end_size == size):
+                    reason |= vxi11_readReason.END
+                if(chr_size == size):
+                    reason |= vxi11_readReason.CHR
+                return self._take(size, reason)
+            if(len(buf) >= requestSize):
+                return self._take(requestSize, vxi11_readReason.REQCNT)
+            scanned = len(buf)
+            
+            try:
+                (reader,_) = await self.connect()
+                remaining = deadline - loop.time()
+                if(remaining <= 0 and polled):
+                    raise asyncio.TimeoutError()
+                # Data which has arrived is returned, however short the timeout
+                polled = True
+                chunk = await asyncio.wait_for(reader.read(max(2**16, requestSize - len(buf))),
+                                               timeout=max(remaining, MIN_POLL_TIME))
+            except asyncio.TimeoutError:
+                return (vxi11_errorCodes.IO_TIMEOUT,0,b'')
+            except OSError as e:
+                print(f"Read from {self.host}:{self.port} failed: {e!r}")
+                await self.disconnect()
+                return (vxi11_errorCodes.IO_ERROR,0,b'')
+            if(len(chunk) == 0):
+                print(f"Instrument at {self.host}:{self.port} closed the connection")
+                await self.disconnect()
+                return (vxi11_errorCodes.IO_ERROR,0,b'')
+            self._rxBuf += chunk
+    
+    def _take(self, size: int, reason: int) -> Tuple[vxi11_errorCodes,int,bytes]:
+        data = bytes(self._rxBuf[:size])
+        del self._rxBuf[:size]
+        return (vxi11_errorCodes.NO_ERROR,reason,data)
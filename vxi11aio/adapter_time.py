@@ -37,13 +37,14 @@ import time
 from typing import Any, Type, Dict, Tuple, Callable, Optional, Awaitable, Coroutine
 
 from .vxi11_srv import vxi11_errorCodes, vxi11_deviceFlags, vxi11_readReason, vxi11_core_conn
-from .vxi11_adapter import vxi11_link, vxi11_adapter
+from .vxi11_adapter import vxi11_link, vxi11_adapter, DEFAULT_MAX_RECV_SIZE
 
 
 class link(vxi11_link):
     def __init__(self, link_id: int, device: bytes, adapter: 'adapter', conn: vxi11_core_conn):
         self.outBuf: Optional[bytes] = None
         self.device_name = device
+        self.th: Optional[asyncio.TimerHandle] = None
         super().__init__(link_id=link_id, adapter=adapter, conn=conn)
         
     async def write(self, io_timeout: int, lock_timeout: int, flags: vxi11_deviceFlags, data: bytes) -> Tuple[vxi11_errorCodes,int]:
@@ -90,10 +91,17 @@ class link(vxi11_link):
         self.th = asyncio.get_running_loop().call_later(delay=6, callback=self.timeout_cb)
         if(self.srq_handle is not None):
             self.conn.send_srq(self.srq_handle)
+    
+    async def destroy(self) -> vxi11_errorCodes:
+        if(self.th is not None):
+            self.th.cancel()
+            self.th = None
+        return await super().destroy()
         
 class adapter(vxi11_adapter):
-    def __init__(self) -> None:
-        super().__init__()
+    def __init__(self, max_links: Optional[int] = None,
+                 max_recv_size: int = DEFAULT_MAX_RECV_SIZE) -> None:
+        super().__init__(max_links=max_links, max_recv_size=max_recv_size)
         
     async def create_link(self, clientId: int, lockDevice: bool,
                           lock_timeout: int, device: bytes, link_id: int, conn:vxi11_core_conn) -> Tuple[vxi11_errorCodes,link]:
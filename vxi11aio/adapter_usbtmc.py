@@ -41,7 +41,7 @@ import time
 from typing import Any, Type, Dict, Tuple, Callable, Optional, Awaitable, Coroutine
 
 from .vxi11_srv import vxi11_errorCodes, vxi11_deviceFlags, vxi11_readReason, vxi11_core_conn
-from .vxi11_adapter import vxi11_link, vxi11_adapter
+from .vxi11_adapter import vxi11_link, vxi11_adapter, DEFAULT_MAX_RECV_SIZE
 
 import pyvisa
 
@@ -50,23 +50,67 @@ class link(vxi11_link):
     def __init__(self, link_id: int, device: bytes, adapter: 'adapter', conn: vxi11_core_conn):
         self.outBuf: Optional[bytes] = None
         self.device_name = device
+        # Data from device_write calls without END, not yet sent to the instrument
+        self.writeBuf = bytearray()
         super().__init__(link_id=link_id, adapter=adapter, conn=conn)
+        self.adapter: 'adapter' = adapter
+    
+    async def _write_inst(self, data: bytes, end: bool) -> bool:
+        """Send data to the instrument. The IO lock must be held.
+        Returns true if all of it was written."""
+        def f(inst: pyvisa.resources.MessageBasedResource, data: bytes, end: bool, adapter: 'adapter') -> int:
+            if(adapter.send_end != end):
+                inst.send_end = end
+                adapter.send_end = end
+            (l,_) = inst.write_raw(data)
+            return l
+        l = await asyncio.get_event_loop().run_in_executor(self.adapter._exec, f, self.adapter.inst, data, end, self.adapter)
+        print(l)
+        return l == len(data)
+    
+    async def _flush(self) -> bool:
+        """Send any buffered write data to the instrument, without END.
+        The IO lock must be held."""
+        if(len(self.writeBuf) == 0):
+            return True
+        data = self.writeBuf
+        self.writeBuf = bytearray()
+        return await self._write_inst(data, end=False)
         
     async def write(self, io_timeout: int, lock_timeout: int, flags: vxi11_deviceFlags, data: bytes) -> Tuple[vxi11_errorCodes,int]:
         """Return (errorCode, size)
         
         Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, PARAMETER_ERROR,
         DEVICE_LOCKED_BY_ANOTHER_LINK, IO_TIMEOUT, IO_ERROR, or abort
+        
+        Writes without END are buffered, and sent to the instrument together
+        with the write which has END, or once the buffer would overflow.
         """
+        end = bool(flags & vxi11_deviceFlags.END)
+        if(not end and len(self.writeBuf) + len(data) <= self.adapter.write_buffer_size):
+            # Nothing goes to the instrument, but the client still shouldn't
+            # be able to write while another link holds the exclusive lock
+            if (not await self.wait_excl_lock(flags,lock_timeout=lock_timeout)):
+                return (vxi11_errorCodes.IO_TIMEOUT,0)
+            self.writeBuf += data
+            return (vxi11_errorCodes.NO_ERROR,len(data))
+        
         if (not await self.acquire_io_lock(flags,lock_timeout=lock_timeout, io_timeout=io_timeout)):
             return (vxi11_errorCodes.IO_TIMEOUT,0)
-        def f(inst: pyvisa.resources.MessageBasedResource, data: bytes) -> Tuple[int,pyvisa.constants.StatusCode]:
-            l = inst.write_raw(data)
-            return l
-        (l,_) = await asyncio.get_event_loop().run_in_executor(self.adapter._exec, f, self.adapter.inst, data)
-        self.release_io_lock()
-        print(l)
-        return (vxi11_errorCodes.NO_ERROR,l)
+        try:
+            if(len(self.writeBuf) + len(data) <= self.adapter.write_buffer_size):
+                # Send everything in a single transfer
+                self.writeBuf += data
+                buf = self.writeBuf
+                self.writeBuf = bytearray()
+                ok = await self._write_inst(buf, end=end)
+            else:
+                ok = await self._flush() and await self._write_inst(data, end=end)
+        finally:
+            self.release_io_lock()
+        if(not ok):
+            return (vxi11_errorCodes.IO_ERROR,0)
+        return (vxi11_errorCodes.NO_ERROR,len(data))
         
     async def read(self, requestSize: int, io_timeout: int, lock_timeout: int, flags: vxi11_deviceFlags, termChar: int) -> Tuple[vxi11_errorCodes,int,bytes]:
         """Return (errorCode, vxi11_readReason, data: bytes)
@@ -80,8 +124,12 @@ class link(vxi11_link):
         def f(inst: pyvisa.resources.MessageBasedResource, requestSize: int) -> bytes:
             return inst.read_raw(requestSize)
             #return inst.read()
-        data = await asyncio.get_event_loop().run_in_executor(self.adapter._exec, f, self.adapter.inst, requestSize)
-        self.release_io_lock()
+        try:
+            if(not await self._flush()):
+                return (vxi11_errorCodes.IO_ERROR,0,b'')
+            data = await asyncio.get_event_loop().run_in_executor(self.adapter._exec, f, self.adapter.inst, requestSize)
+        finally:
+            self.release_io_lock()
         print(f"{data!r}")
         return (vxi11_errorCodes.NO_ERROR,vxi11_readReason.END,data)
         
@@ -108,6 +156,8 @@ class link(vxi11_link):
         """
         if (not await self.acquire_io_lock(flags,lock_timeout=lock_timeout, io_timeout=io_timeout)):
             return (vxi11_errorCodes.IO_TIMEOUT)
+        # A device clear discards partially sent messages
+        self.writeBuf = bytearray()
         def f(inst: pyvisa.resources.MessageBasedResource) -> pyvisa.constants.StatusCode:
             # Pyvisa discards the return value of the call to viClear, so lets call it directly
             return inst.visalib.clear(inst.session)
@@ -119,13 +169,31 @@ class link(vxi11_link):
                 }
         return (scMap.get(sc, vxi11_errorCodes.IO_ERROR))
     
+    async def destroy(self) -> vxi11_errorCodes:
+        """If it got here, link must exist. NO_ERROR is only valid response
+        
+        Data still buffered from writes without END was reported to the
+        client as written, so it is sent to the instrument first."""
+        if(len(self.writeBuf) > 0):
+            async with self.lock_scope.adapter_io_lock:
+                if(not await self._flush()):
+                    print(f"Link {self.link_id}: buffered write data was not all sent")
+        return await super().destroy()
+    
 class adapter(vxi11_adapter):
-    def __init__(self, visaAddress: str, visa_library:str='') -> None:
+    def __init__(self, visaAddress: str, visa_library:str='', max_links: Optional[int] = None,
+                 max_recv_size: int = DEFAULT_MAX_RECV_SIZE,
+                 write_buffer_size: int = DEFAULT_MAX_RECV_SIZE) -> None:
+        """write_buffer_size is the most data each link will buffer from
+        device_write calls without END before sending it to the instrument"""
         self.visaAddress: str = visaAddress
+        self.write_buffer_size = write_buffer_size
         rm = pyvisa.ResourceManager(visa_library=visa_library)
         self.inst: pyvisa.resources.MessageBasedResource = rm.open_resource(visaAddress)
+        # Cached state of inst.send_end, as reading it is a VISA call
+        self.send_end: bool = self.inst.send_end
         self._exec = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="visa_")
-        super().__init__()
+        super().__init__(max_links=max_links, max_recv_size=max_recv_size)
         
     async def create_link(self, clientId: int, lockDevice: bool,
                           lock_timeout: int, device: bytes, link_id: int, conn:vxi11_core_conn) -> Tuple[vxi11_errorCodes,link]:
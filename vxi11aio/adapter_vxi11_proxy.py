@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+# This implements an adapter which forwards links to an upstream VXI-11
+# instrument (or another VXI-11 server), so that this server can arbitrate
+# access to instruments which are already on the network.
+#
+# The adapter holds a single core channel connection to the upstream
+# server. Downstream links to the same device share one upstream link, which
+# is created when the first of them is, and destroyed along with the last.
+# Locking is done here, between the downstream links, so the upstream link
+# never has to wait on upstream locks. Aborts go out over the shared
+# upstream abort channel, and SRQs from the upstream link are relayed to
+# each downstream link which has SRQs enabled.
+
+import asyncio
+from typing import Any, Awaitable, Dict, Optional, Set, Tuple, TypeVar
+
+from .vxi11_srv import vxi11_errorCodes, vxi11_deviceFlags, vxi11_core_conn
+from .vxi11_adapter import vxi11_link, vxi11_adapter, DEFAULT_MAX_RECV_SIZE
+from .vxi11_client import vxi11_client, vxi11_client_link
+
+resultType = TypeVar('resultType')
+
+class upstream_link():
+    """An upstream link, shared by the downstream links to one device"""
+    def __init__(self, device: bytes, client_link: vxi11_client_link) -> None:
+        self.device = device
+        self.client_link = client_link
+        # Used as the lock_scope of the downstream links, see vxi11_link
+        self.adapter_io_lock = asyncio.Lock()
+        self.adapter_excl_lock = asyncio.Lock()
+        self.adapter_excl_lock_owner: Optional[vxi11_link] = None
+        # The downstream link holding the IO lock, whose operation is the
+        # one in progress upstream
+        self.io_owner: Optional['link'] = None
+        self.links: Set['link'] = set()
+        self.srq_enabled = False
+        # Set once the upstream connection has been lost
+        self.lost = False
+        
+    def srq_received(self, handle: bytes) -> None:
+        for l in self.links:
+            if(l.srq_handle is not None):
+                l.conn.send_srq(l.srq_handle)
+
+class link(vxi11_link):
+    def __init__(self, link_id: int, device: bytes, upstream: upstream_link,
+                 adapter: 'adapter', conn: vxi11_core_conn):
+        self.device_name = device
+        super().__init__(link_id=link_id, adapter=adapter, conn=conn)
+        self.adapter: 'adapter' = adapter
+        self.upstream = upstream
+        self.lock_scope = upstream
+        
+    async def acquire_io_lock(self, flags: vxi11_deviceFlags, lock_timeout: int, io_timeout: int) -> bool:
+        if(not await super().acquire_io_lock(flags, lock_timeout=lock_timeout, io_timeout=io_timeout)):
+            return False
+        self.upstream.io_owner = self
+        return True
+    
+    def release_io_lock(self) -> None:
+        self.upstream.io_owner = None
+        super().release_io_lock()
+    
+    async def _forward(self, call: Awaitable[resultType], failed: resultType) -> resultType:
+        """Await a call on the upstream link, returning failed if the
+        upstream connection is gone"""
+        if(self.upstream.lost):
+            # Don't leave the call un-awaited
+            call.close() # type: ignore
+            return failed
+        try:
+            return await call
+        except (ConnectionError, OSError) as e:
+            print(f"Upstream connection lost: {e!r}")
+            await self.adapter.connection_lost()
+            return failed
+    
+    async def write(self, io_timeout: int, lock_timeout: int, flags: vxi11_deviceFlags, data: bytes) -> Tuple[vxi11_errorCodes,int]:
+        """Return (errorCode, size)
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, PARAMETER_ERROR,
+        DEVICE_LOCKED_BY_ANOTHER_LINK, IO_TIMEOUT, IO_ERROR, or abort
+        """
+        if (not await self.acquire_io_lock(flags,lock_timeout=lock_timeout, io_timeout=io_timeout)):
+            return (vxi11_errorCodes.IO_TIMEOUT,0)
+        try:
+            return await self._forward(self.upstream.client_link.write(
+                    io_timeout=io_timeout, lock_timeout=0, flags=flags & ~vxi11_deviceFlags.WAITLOCK, data=data),
+                    (vxi11_errorCodes.IO_ERROR,0))
+        finally:
+            self.release_io_lock()
+    
+    async def read(self, requestSize: int, io_timeout: int, lock_timeout: int, flags: vxi11_deviceFlags, termChar: int) -> Tuple[vxi11_errorCodes,int,bytes]:
+        """Return (errorCode, vxi11_readReason, data: bytes)
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, DEVICE_LOCKED_BY_ANOTHER_LINK,
+        IO_TIMEOUT, IO_ERROR, or abort
+        """
+        if (not await self.acquire_io_lock(flags,lock_timeout=lock_timeout, io_timeout=io_timeout)):
+            return (vxi11_errorCodes.IO_TIMEOUT,0,b'')
+        try:
+            return await self._forward(self.upstream.client_link.read(
+                    requestSize=requestSize, io_timeout=io_timeout, lock_timeout=0,
+                    flags=flags & ~vxi11_deviceFlags.WAITLOCK, termChar=termChar),
+                    (vxi11_errorCodes.IO_ERROR,0,b''))
+        finally:
+            self.release_io_lock()
+    
+    async def read_stb(self, flags: vxi11_deviceFlags, lock_timeout: int, io_timeout: int) -> Tuple[vxi11_errorCodes,int]:
+        """Return (errorCode, stb)
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, OPERATION_NOT_SUPPORTED,
+        DEVICE_LOCKED_BY_ANOTHER_LINK, IO_TIMEOUT, IO_ERROR, or abort
+        """
+        if (not await self.acquire_io_lock(flags,lock_timeout=lock_timeout, io_timeout=io_timeout)):
+            return (vxi11_errorCodes.IO_TIMEOUT,0)
+        try:
+            return await self._forward(self.upstream.client_link.read_stb(
+                    flags=flags & ~vxi11_deviceFlags.WAITLOCK, lock_timeout=0, io_timeout=io_timeout),
+                    (vxi11_errorCodes.IO_ERROR,0))
+        finally:
+            self.release_io_lock()
+    
+    async def _generic(self, name: str, flags: vxi11_deviceFlags, lock_timeout: int,
+                       io_timeout: int) -> vxi11_errorCodes:
+        if (not await self.acquire_io_lock(flags,lock_timeout=lock_timeout, io_timeout=io_timeout)):
+            return (vxi11_errorCodes.IO_TIMEOUT)
+        try:
+            func = getattr(self.upstream.client_link, name)
+            return await self._forward(func(flags=flags & ~vxi11_deviceFlags.WAITLOCK,
+                                            lock_timeout=0, io_timeout=io_timeout),
+                                       vxi11_errorCodes.IO_ERROR)
+        finally:
+            self.release_io_lock()
+    
+    async def trigger(self, flags: vxi11_deviceFlags, lock_timeout: int,
+                      io_timeout: int) -> vxi11_errorCodes:
+        """Return (errorCode)
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, OPERATION_NOT_SUPPORTED,
+        DEVICE_LOCKED_BY_ANOTHER_LINK, IO_TIMEOUT, IO_ERROR, or ABORT
+        """
+        return await self._generic("trigger", flags, lock_timeout, io_timeout)
+    
+    async def clear(self, flags: vxi11_deviceFlags, lock_timeout: int,
+                    io_timeout: int) -> vxi11_errorCodes:
+        """Return (errorCode)
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, OPERATION_NOT_SUPPORTED,
+        DEVICE_LOCKED_BY_ANOTHER_LINK, IO_TIMEOUT, IO_ERROR, or ABORT
+        """
+        return await self._generic("clear", flags, lock_timeout, io_timeout)
+    
+    async def local(self, flags: vxi11_deviceFlags,
+                    lock_timeout: int, io_timeout: int) -> vxi11_errorCodes:
+        """Return (errorCode)
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, OPERATION_NOT_SUPPORTED,
+        DEVICE_LOCKED_BY_ANOTHER_LINK, IO_TIMEOUT, IO_ERROR, or ABORT
+        """
+        return await self._generic("local", flags, lock_timeout, io_timeout)
+    
+    async def remote(self, flags: vxi11_deviceFlags,
+                     lock_timeout: int, io_timeout: int) -> vxi11_errorCodes:
+        """Return (errorCode)
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, OPERATION_NOT_SUPPORTED,
+        DEVICE_LOCKED_BY_ANOTHER_LINK, IO_TIMEOUT, IO_ERROR, or ABORT
+        """
+        return await self._generic("remote", flags, lock_timeout, io_timeout)
+    
+    async def docmd(self, flags: vxi11_deviceFlags, io_timeout: int, lock_timeout: int,
+                    cmd: int, network_order: bool, datasize: int,
+                    data_in: bytes)  -> Tuple[vxi11_errorCodes, bytes]:
+        """Return (errorCode,data_out)
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, OPERATION_NOT_SUPPORTED,
+        DEVICE_LOCKED_BY_ANOTHER_LINK, IO_TIMEOUT, IO_ERROR, or ABORT
+        """
+        if (not await self.acquire_io_lock(flags,lock_timeout=lock_timeout, io_timeout=io_timeout)):
+            return (vxi11_errorCodes.IO_TIMEOUT,b'')
+        try:
+            return await self._forward(self.upstream.client_link.docmd(
+                    flags=flags & ~vxi11_deviceFlags.WAITLOCK, io_timeout=io_timeout, lock_timeout=0,
+                    cmd=cmd, network_order=network_order, datasize=datasize, data_in=data_in),
+                    (vxi11_errorCodes.IO_ERROR,b''))
+        finally:
+            self.release_io_lock()
+    
+    async def enable_srq(self, handle: Optional[bytes]) -> vxi11_errorCodes:
+        """Enable SRQs, sent with handle, or disable them if handle is None
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, OPERATION_NOT_SUPPORTED
+        """
+        up = self.upstream
+        if(handle is not None and not up.srq_enabled):
+            # SRQs stay enabled upstream, and are only relayed to links
+            # which want them
+            err = await self._forward(up.client_link.enable_srq(up.srq_received), vxi11_errorCodes.IO_ERROR)
+            if(err != vxi11_errorCodes.NO_ERROR):
+                return err
+            up.srq_enabled = True
+        self.srq_handle = handle
+        return vxi11_errorCodes.NO_ERROR
+    
+    async def abort(self) -> vxi11_errorCodes:
+        """Abort an operation in progress on this link. Called from the
+        abort channel, while the operation may still be running.
+        
+        Errorcode may be NO_ERROR or INVALID_LINK_IDENTIFIER
+        """
+        # The upstream link is shared, so only abort the operation in
+        # progress if it is one of this link's
+        if(self.upstream.io_owner is not self):
+            return vxi11_errorCodes.NO_ERROR
+        err = await self._forward(self.upstream.client_link.abort(), vxi11_errorCodes.NO_ERROR)
+        if(err == vxi11_errorCodes.INVALID_LINK_IDENTIFIER):
+            # That is an upstream problem, not a problem with this link
+            return vxi11_errorCodes.NO_ERROR
+        return err
+    
+    async def destroy(self) -> vxi11_errorCodes:
+        """If it got here, link must exist. NO_ERROR is only valid response"""
+        err = await super().destroy()
+        await self.adapter.release_upstream(self)
+        return err
+        
+class adapter(vxi11_adapter):
+    def __init__(self, host: str, port: Optional[int] = None, device: Optional[bytes] = None,
+                 max_links: Optional[int] = None, max_recv_size: int = DEFAULT_MAX_RECV_SIZE) -> None:
+        """host and port are the upstream VXI-11 server. Without a port, it
+        is looked up with the portmapper on host.
+        
+        If device is set, all links go to that upstream device. Otherwise,
+        the device name of each link is passed on unchanged."""
+        self.host = host
+        self.port = port
+        self.device = device
+        self.client: Optional[vxi11_client] = None
+        # device => shared upstream link
+        self.upstream: Dict[bytes,upstream_link] = dict()
+        self._upstream_lock = asyncio.Lock()
+        super().__init__(max_links=max_links, max_recv_size=max_recv_size)
+        
+    async def create_link(self, clientId: int, lockDevice: bool,
+                          lock_timeout: int, device: bytes, link_id: int, conn:vxi11_core_conn) -> Tuple[vxi11_errorCodes,Optional[link]]:
+        """ Returns (errorcode,link)"""
+        # Errorcode may be NO_ERROR, SYNTAX_ERROR, DEVICE_NOT_ACCESSIBLE,
+        #    OUT_OF_RESOURCES, DEVICE_LOCKED_BY_ANOTHER_LINK, INVALID_ADDRESS
+        name = self.device if self.device is not None else device
+        async with self._upstream_lock:
+            up = self.upstream.get(name)
+            if(up is None):
+                try:
+                    if(self.client is None):
+                        client = vxi11_client()
+                        await client.connect(self.host, self.port)
+                        self.client = client
+                    (err, client_link) = await self.client.create_link(name, clientId=clientId)
+                except (ConnectionError, OSError) as e:
+                    print(f"Unable to reach upstream {self.host}: {e!r}")
+                    await self._close_client()
+                    return (vxi11_errorCodes.DEVICE_NOT_ACCESSIBLE,None)
+                if(err != vxi11_errorCodes.NO_ERROR or client_link is None):
+                    return (err,None)
+                up = upstream_link(name, client_link)
+                self.upstream[name] = up
+            l = link(link_id=link_id,device=device,upstream=up,adapter=self, conn=conn)
+            up.links.add(l)
+        return (vxi11_errorCodes.NO_ERROR,l)
+    
+    async def release_upstream(self, l: link) -> None:
+        """Called as a downstream link is destroyed. Destroys the upstream
+        link once no downstream link uses it."""
+        up = l.upstream
+        async with self._upstream_lock:
+            up.links.discard(l)
+            if(len(up.links) > 0):
+                return
+            if(self.upstream.get(up.device) is up):
+                del self.upstream[up.device]
+            if(up.lost):
+                return
+            try:
+                await up.client_link.destroy()
+            except (ConnectionError, OSError) as e:
+                print(f"Unable to destroy upstream link: {e!r}")
+                
+    async def connection_lost(self) -> None:
+        """Forget the upstream connection, and all links on it. Downstream
+        links on it fail from now on, until the client creates new ones."""
+        for up in self.upstream.values():
+            up.lost = True
+        self.upstream = dict()
+        await self._close_client()
+        
+    async def _close_client(self) -> None:
+        client = self.client
+        self.client = None
+        if(client is not None):
+            try:
+                await client.close()
+            except (ConnectionError, OSError):
+                pass
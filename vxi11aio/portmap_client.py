@@ -32,42 +32,174 @@
 
 # Connect to TCPIP0::127.0.0.1::INSTR
 
+import os
 import sys
 import asyncio
-import struct
-from typing import cast
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, TypeVar, Union, cast
 from abc import ABC, abstractmethod
 
-from .xdr import rpc_const, portmap_type, portmap_const
-from .xdr.portmap_pack import PORTMAPPacker, PORTMAPUnpacker
-from . import rpc_client
+from .xdr import portmap_clnt, portmap_type, portmap_const
+from .xdr.portmap_pack import PORTMAPUnpacker
+from . import rpc_client, rpc_udp
 
-async def map(client: rpc_client.rpc_client, prog: int, vers: int, port: int) -> None:
-    mapping = portmap_type.mapping(prog=prog, vers=vers, prot=portmap_const.IPPROTO_TCP, port=port)
-    p = PORTMAPPacker()
-    p.pack_mapping(mapping)
-    rsp, msg = await client.call( portmap_const.PMAP_PROG, vers=portmap_const.PMAP_VERS,
-                  proc=portmap_const.PMAPPROC_SET, data = p.get_buffer())
-    assert (rsp is not None)
-    rsp = struct.unpack(">I",rsp)[0]
-    if((msg.body.rbody.stat != rpc_const.MSG_ACCEPTED) or (msg.body.rbody.areply.reply_data.stat != rpc_const.SUCCESS)):
-        raise Exception(f"Request to RPC portmapper map port {port} for prog {prog}.{vers} not supported: {msg}.")
-    if(rsp == 0):
+# The lookups are small, so they can be made over UDP, without setting up a
+# connection.
+clientType = Union[rpc_client.rpc_client, rpc_udp.rpc_udp_client]
+
+RPCBIND_UNIX_PATH = "/var/run/rpcbind.sock"
+
+resultType = TypeVar('resultType')
+
+async def setport(client: clientType, prog: int, vers: int, port: int,
+                  prot: int = portmap_const.IPPROTO_TCP) -> bool:
+    """Map prog.vers to port. Returns False if the portmapper refused,
+    usually because prog.vers is mapped already."""
+    mapping = portmap_type.mapping(prog=prog, vers=vers, prot=prot, port=port)
+    return await portmap_clnt.PMAP_PROG_2_clnt(client).PMAPPROC_SET(mapping)
+
+async def map(client: clientType, prog: int, vers: int, port: int) -> None:
+    if(not await setport(client, prog, vers, port)):
         raise Exception(f"Request to map port {port} for prog {prog}.{vers} failed.")
-    print("Mapping done?")
     
-async def getport(client: rpc_client.rpc_client, prog: int, vers: int) -> int:
-    mapping = portmap_type.mapping(prog=prog, vers=vers, prot=portmap_const.IPPROTO_TCP, port=0)
-    p = PORTMAPPacker()
-    p.pack_mapping(mapping)
+async def getport(client: clientType, prog: int, vers: int,
+                  prot: int = portmap_const.IPPROTO_TCP) -> int:
+    mapping = portmap_type.mapping(prog=prog, vers=vers, prot=prot, port=0)
+    return await portmap_clnt.PMAP_PROG_2_clnt(client).PMAPPROC_GETPORT(mapping)
+
+async def unmap(client: clientType, prog: int, vers: int) -> bool:
+    """Remove the mappings of prog.vers, on all protocols. Returns False if
+    there were none."""
+    mapping = portmap_type.mapping(prog=prog, vers=vers, prot=0, port=0)
+    return await portmap_clnt.PMAP_PROG_2_clnt(client).PMAPPROC_UNSET(mapping)
+
+async def dump(client: clientType) -> List[portmap_type.mapping]:
+    """All mappings of the portmapper"""
     rsp, msg = await client.call( portmap_const.PMAP_PROG, vers=portmap_const.PMAP_VERS,
-                  proc=portmap_const.PMAPPROC_GETPORT, data = p.get_buffer())
-    if((msg.body.rbody.stat != rpc_const.MSG_ACCEPTED) or (msg.body.rbody.areply.reply_data.stat != rpc_const.SUCCESS)):
-        raise Exception(f"Request to RPC portmapper to get port for prog {prog}.{vers} not supported: {msg}.")
+                  proc=portmap_const.PMAPPROC_DUMP, data = b'')
+    rpc_client.check_reply(msg)
     assert(rsp is not None)
-    rspVal = struct.unpack(">I",rsp)[0]
-    print(f"rsp = {rspVal}")
-    return rspVal
+    # Not using the generated stub: unpacked iteratively, as the generated
+    # unpacker recurses for each entry
+    up = PORTMAPUnpacker(rsp)
+    mappings: List[portmap_type.mapping] = []
+    while up.unpack_bool():
+        mappings.append(up.unpack_mapping())
+    return mappings
+
+async def rpcb_set(client: clientType, prog: int, vers: int, netid: bytes,
+                   addr: bytes, owner: bytes = b'', rpcb_vers: int = portmap_const.RPCBVERS4) -> bool:
+    """Register a universal address with rpcbind. This is needed for
+    transports other than TCP and UDP, for example netid b"local" with the
+    path of a UNIX socket as the address. Returns False if rpcbind already
+    has a registration for (prog,vers,netid)."""
+    rpcb = portmap_type.rpcb(r_prog=prog, r_vers=vers, r_netid=netid, r_addr=addr, r_owner=owner)
+    return await portmap_clnt.RPCBPROG_3_clnt(client, vers=rpcb_vers).RPCBPROC_SET(rpcb)
+
+async def rpcb_getaddr(client: clientType, prog: int, vers: int, netid: bytes,
+                       rpcb_vers: int = portmap_const.RPCBVERS4) -> bytes:
+    """Look up the universal address of a program on netid. Returns b''
+    if it isn't registered."""
+    rpcb = portmap_type.rpcb(r_prog=prog, r_vers=vers, r_netid=netid, r_addr=b'', r_owner=b'')
+    return await portmap_clnt.RPCBPROG_3_clnt(client, vers=rpcb_vers).RPCBPROC_GETADDR(rpcb)
+
+class portmap_client():
+    """A connection to the local portmapper that is kept open, for services
+    which make many lookups or registrations.
+    
+    The connection is made on first use, to the rpcbind UNIX socket if
+    there is one, and to TCP port 111 otherwise. If it breaks, the next call
+    reconnects. Ports found by getport() are cached for ttl seconds, except
+    for those that aren't mapped. Registrations made through this client
+    update the cache.
+    
+    Calls are pipelined, so the set_many() and unset_many() registrations
+    all go out at once rather than waiting for each other's replies."""
+    def __init__(self, host: str = "127.0.0.1", port: int = portmap_const.PMAP_PORT,
+                 unix_path: Optional[str] = RPCBIND_UNIX_PATH, ttl: float = 30.0) -> None:
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.ttl = ttl
+        self._client: Optional[rpc_client.rpc_client] = None
+        self._connect_lock: Optional[asyncio.Lock] = None
+        # (prog,vers,prot) => (time looked up, port)
+        self._cache: Dict[Tuple[int,int,int],Tuple[float,int]] = dict()
+    
+    async def connect(self) -> rpc_client.rpc_client:
+        if(self._connect_lock is None):
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if(self._client is None):
+                cl = rpc_client.rpc_client()
+                if(self.unix_path is not None and os.path.exists(self.unix_path)):
+                    await cl.connect_unix(self.unix_path)
+                else:
+                    await cl.connect(self.host, self.port)
+                self._client = cl
+            return self._client
+    
+    async def _drop(self, cl: rpc_client.rpc_client) -> None:
+        if(self._client is cl):
+            self._client = None
+            try:
+                await cl.close()
+            except ConnectionError:
+                pass
+    
+    async def _call(self, func: Callable[[rpc_client.rpc_client],Awaitable[resultType]]) -> resultType:
+        """func(client), retried once on a new connection if the connection
+        has gone away, such as when the portmapper was restarted"""
+        cl = await self.connect()
+        try:
+            return await func(cl)
+        except ConnectionError:
+            await self._drop(cl)
+        return await func(await self.connect())
+    
+    async def close(self) -> None:
+        if(self._client is not None):
+            await self._drop(self._client)
+    
+    async def getport(self, prog: int, vers: int, prot: int = portmap_const.IPPROTO_TCP) -> int:
+        """The port of prog.vers, or 0 if it isn't mapped"""
+        key = (prog,vers,prot)
+        now = asyncio.get_event_loop().time()
+        entry = self._cache.get(key)
+        if(entry is not None and now - entry[0] < self.ttl):
+            return entry[1]
+        port = await self._call(lambda cl: getport(cl, prog, vers, prot))
+        if(port != 0):
+            self._cache[key] = (now, port)
+        else:
+            self._cache.pop(key, None)
+        return port
+    
+    async def set(self, prog: int, vers: int, port: int, prot: int = portmap_const.IPPROTO_TCP) -> bool:
+        ok = await self._call(lambda cl: setport(cl, prog, vers, port, prot))
+        if(ok):
+            self._cache[(prog,vers,prot)] = (asyncio.get_event_loop().time(), port)
+        return ok
+    
+    async def unset(self, prog: int, vers: int) -> bool:
+        """Unmap prog.vers on all protocols"""
+        for key in [k for k in self._cache if k[0:2] == (prog,vers)]:
+            del self._cache[key]
+        return await self._call(lambda cl: unmap(cl, prog, vers))
+    
+    async def set_many(self, mappings: Iterable[Tuple[int,int,int,int]]) -> List[bool]:
+        """Register (prog,vers,prot,port) mappings concurrently, returning
+        the result of each"""
+        await self.connect()
+        return list(await asyncio.gather(*[self.set(prog, vers, port, prot)
+                                           for prog,vers,prot,port in mappings]))
+    
+    async def unset_many(self, programs: Iterable[Tuple[int,int]]) -> List[bool]:
+        """Unmap (prog,vers) programs concurrently"""
+        await self.connect()
+        return list(await asyncio.gather(*[self.unset(prog, vers) for prog,vers in programs]))
+    
+    async def rpcb_set(self, prog: int, vers: int, netid: bytes, addr: bytes, owner: bytes = b'') -> bool:
+        return await self._call(lambda cl: rpcb_set(cl, prog, vers, netid, addr, owner))
 
 async def main() -> None:
     cl = rpc_client.rpc_client()
@@ -77,12 +209,9 @@ async def main() -> None:
     prog=9876
     ver=1
     mapping = portmap_type.mapping(prog=prog, vers=ver, prot=portmap_const.IPPROTO_TCP, port=5000)
-    p = PORTMAPPacker()
-    p.pack_mapping(mapping)
-    rsp, _ = await cl.call( portmap_const.PMAP_PROG, vers=portmap_const.PMAP_VERS,
-                  proc=portmap_const.PMAPPROC_GETPORT, data = p.get_buffer())
-    rsp, msg = await cl.call( portmap_const.PMAP_PROG, vers=portmap_const.PMAP_VERS,
-                  proc=portmap_const.PMAPPROC_SET, data = p.get_buffer())
+    pm = portmap_clnt.PMAP_PROG_2_clnt(cl)
+    await pm.PMAPPROC_GETPORT(mapping)
+    await pm.PMAPPROC_SET(mapping)
     await cl.close()
     
 if  __name__ == "__main__":
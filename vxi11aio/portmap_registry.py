@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+# An on-disk registry for a portmapper, so that a restarted portmapper can
+# answer lookups right away, rather than returning port 0 until every
+# service has registered itself again.
+#
+# The registry is two files: a snapshot of all registrations, and a log
+# which each change is appended to. On start, the snapshot is read and the
+# log replayed over it. Now and then, the snapshot is rewritten and the log
+# emptied. The snapshot is replaced atomically, and records are idempotent,
+# so a crash at any point loses at most the change being written. A partly
+# written last record is ignored.
+#
+# Services may have gone away while the portmapper was down, so after
+# loading, probe() checks that something still listens on each registered
+# port, and removes the registrations of those that don't answer.
+
+import asyncio
+import json
+import os
+from typing import Any, Dict, IO, List, Optional, Tuple
+
+from . import rpc_udp
+from .portmap_srv import portmapper
+from .xdr import portmap_const
+
+class registry():
+    # The log is folded into the snapshot once it has this many records
+    COMPACT_RECORDS = 1000
+    
+    def __init__(self, path: str, sync: bool = True) -> None:
+        """The files are path + ".snapshot" and path + ".log". With sync,
+        each change is flushed to disk before the portmapper carries on."""
+        self.snapshot_path = path + ".snapshot"
+        self.log_path = path + ".log"
+        self.sync = sync
+        self.mapper: Optional[portmapper] = None
+        self._log: Optional[IO[str]] = None
+        self._log_records = 0
+    
+    def attach(self, mapper: portmapper) -> None:
+        """Load the registrations into mapper, and record its changes from
+        now on"""
+        assert (self.mapper is None)
+        self.mapper = mapper
+        self._load()
+        self._log = open(self.log_path, "a")
+        mapper.mapping.listeners.append(self._mapping_changed)
+        mapper.addresses.listeners.append(self._address_changed)
+    
+    def close(self) -> None:
+        if(self.mapper is not None):
+            self.mapper.mapping.listeners.remove(self._mapping_changed)
+            self.mapper.addresses.listeners.remove(self._address_changed)
+            self.mapper = None
+        if(self._log is not None):
+            self._log.close()
+            self._log = None
+    
+    def _apply(self, record: Dict[str,Any]) -> None:
+        assert (self.mapper is not None)
+        if("set" in record):
+            self.mapper.mapping[tuple(record["set"])] = record["port"] # type: ignore
+        elif("unset" in record):
+            self.mapper.mapping.pop(tuple(record["unset"]), None) # type: ignore
+        elif("set_addr" in record):
+            prog, vers, netid = record["set_addr"]
+            self.mapper.addresses[(prog,vers,netid.encode("latin-1"))] = (
+                    record["addr"].encode("latin-1"), record["owner"].encode("latin-1"))
+        elif("unset_addr" in record):
+            prog, vers, netid = record["unset_addr"]
+            self.mapper.addresses.pop((prog,vers,netid.encode("latin-1")), None)
+        else:
+            raise ValueError(f"Unknown registry record {record}")
+    
+    def _load(self) -> None:
+        assert (self.mapper is not None)
+        try:
+            with open(self.snapshot_path, "r") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            snapshot = {"mapping": [], "addresses": []}
+        for prog, vers, prot, port in snapshot["mapping"]:
+            self.mapper.mapping[(prog,vers,prot)] = port
+        for prog, vers, netid, addr, owner in snapshot["addresses"]:
+            self.mapper.addresses[(prog,vers,netid.encode("latin-1"))] = (
+                    addr.encode("latin-1"), owner.encode("latin-1"))
+        self._log_records = 0
+        try:
+            with open(self.log_path, "r") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # Cut short by a crash. Nothing after it was written.
+                        print(f"Ignoring incomplete registry record {line!r}")
+                        break
+                    self._apply(record)
+                    self._log_records += 1
+        except FileNotFoundError:
+            pass
+        print(f"Loaded {len(self.mapper.mapping) + len(self.mapper.addresses)} registrations from {self.snapshot_path}")
+    
+    def _append(self, record: Dict[str,Any]) -> None:
+        assert (self._log is not None)
+        self._log.write(json.dumps(record) + "\n")
+        self._log.flush()
+        if(self.sync):
+            os.fsync(self._log.fileno())
+        self._log_records += 1
+        if(self._log_records >= self.COMPACT_RECORDS):
+            self.compact()
+    
+    def _mapping_changed(self, key: Tuple[int,int,int], port: Optional[int]) -> None:
+        if(port is None):
+            self._append({"unset": list(key)})
+        else:
+            self._append({"set": list(key), "port": port})
+    
+    def _address_changed(self, key: Tuple[int,int,bytes], value: Optional[Tuple[bytes,bytes]]) -> None:
+        k = [key[0], key[1], key[2].decode("latin-1")]
+        if(value is None):
+            self._append({"unset_addr": k})
+        else:
+            self._append({"set_addr": k, "addr": value[0].decode("latin-1"),
+                          "owner": value[1].decode("latin-1")})
+    
+    def compact(self) -> None:
+        """Write a new snapshot, and empty the log"""
+        assert (self.mapper is not None)
+        assert (self._log is not None)
+        snapshot = {
+                "mapping": [[prog, vers, prot, port] for (prog,vers,prot),port in self.mapper.mapping.items()],
+                "addresses": [[prog, vers, netid.decode("latin-1"), addr.decode("latin-1"), owner.decode("latin-1")]
+                              for (prog,vers,netid),(addr,owner) in self.mapper.addresses.items()],
+                }
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(snapshot, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        # Should this crash before the log is emptied, replaying the log
+        # over the new snapshot gives the same result.
+        self._log.close()
+        self._log = open(self.log_path, "w")
+        self._log_records = 0
+    
+    async def main(self, interval: float = 60.0) -> None:
+        """Compact the log every interval seconds, if anything was logged"""
+        while True:
+            await asyncio.sleep(interval)
+            if(self._log_records > 0):
+                self.compact()
+    
+    async def _probe_tcp(self, port: int, timeout: float) -> bool:
+        assert (self.mapper is not None)
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_connection(self.mapper.host, port), timeout)
+        except (asyncio.TimeoutError, OSError):
+            return False
+        writer.close()
+        return True
+    
+    async def _probe_udp(self, prog: int, vers: int, port: int, timeout: float) -> bool:
+        assert (self.mapper is not None)
+        # There's no connection to make, so call the NULL procedure
+        cl = rpc_udp.rpc_udp_client(timeout=timeout, retries=1)
+        try:
+            await cl.connect(self.mapper.host, port)
+        except OSError:
+            return False
+        try:
+            await cl.call(prog, vers, 0, b'')
+        except (asyncio.TimeoutError, OSError):
+            return False
+        finally:
+            await cl.close()
+        return True
+    
+    async def _probe_unix(self, path: bytes, timeout: float) -> bool:
+        try:
+            _, writer = await asyncio.wait_for(asyncio.open_unix_connection(path.decode()), timeout)
+        except (asyncio.TimeoutError, OSError):
+            return False
+        writer.close()
+        return True
+    
+    async def probe(self, timeout: float = 1.0) -> int:
+        """Remove the registrations of services that no longer answer.
+        Returns the number removed."""
+        assert (self.mapper is not None)
+        mapping = self.mapper.mapping
+        addresses = self.mapper.addresses
+        # Each port is probed once, however many programs are on it
+        tcp_ports = list(set(port for (_,_,prot),port in mapping.items() if prot == portmap_const.IPPROTO_TCP))
+        udp_ports: Dict[int,Tuple[int,int]] = {}
+        for (prog,vers,prot),port in mapping.items():
+            if(prot == portmap_const.IPPROTO_UDP):
+                udp_ports[port] = (prog,vers)
+        local = [(k, v[0]) for k, v in addresses.items() if k[2] == b"local"]
+        
+        tcp_alive, udp_alive, local_alive = await asyncio.gather(
+                asyncio.gather(*[self._probe_tcp(port, timeout) for port in tcp_ports]),
+                asyncio.gather(*[self._probe_udp(prog, vers, port, timeout) for port,(prog,vers) in udp_ports.items()]),
+                asyncio.gather(*[self._probe_unix(path, timeout) for _,path in local]))
+        
+        removed = 0
+        for port, alive in zip(tcp_ports, tcp_alive):
+            if(not alive):
+                for key in mapping.port_keys(port):
+                    if(key[2] == portmap_const.IPPROTO_TCP):
+                        del mapping[key]
+                        removed += 1
+        for port, alive in zip(udp_ports, udp_alive):
+            if(not alive):
+                for key in mapping.port_keys(port):
+                    if(key[2] == portmap_const.IPPROTO_UDP):
+                        del mapping[key]
+                        removed += 1
+        for (key,_), alive in zip(local, local_alive):
+            if(not alive):
+                addresses.pop(key, None)
+                removed += 1
+        print(f"Removed {removed} stale registrations")
+        return removed
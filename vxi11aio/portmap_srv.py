@@ -32,35 +32,357 @@
 
 # Connect to TCPIP0::127.0.0.1::INSTR
 
-import sys
-if not sys.warnoptions:
-    import os, warnings
-    warnings.simplefilter("default") # Change the filter in this process
-    os.environ["PYTHONWARNINGS"] = "default" # Also affect subprocesses
-
 import asyncio
 #from enum import Enum
+import socket
 import struct
-from typing import Dict, Tuple, Type
+import time
+from typing import Any, Callable, Dict, Iterator, List, MutableMapping, Optional, Set, Tuple, Type, TypeVar
 #from pprint import pprint
 
-from .xdr import portmap_const, rpc_type
-#import portmap_type
+from .xdr import portmap_const, portmap_type, rpc_const, rpc_type
 from .xdr.portmap_pack import PORTMAPPacker, PORTMAPUnpacker
 
 from .xdr import vxi11_const
 
 from . import rpc_srv
+from . import rpc_udp
 from . import vxi11_srv
 
-class portmapper():
+keyType = TypeVar('keyType')
+valueType = TypeVar('valueType')
+
+class counted_dict(MutableMapping[keyType,valueType]):
+    """A dict which counts the changes made to it, so that things derived
+    from its contents can be cached until it changes. Subclasses keep
+    indexes up to date in _added() and _removed().
+    
+    Each listener is called with (key, value) after a change, with value
+    None if key was removed."""
+    def __init__(self) -> None:
+        self._map: Dict[keyType,valueType] = {}
+        self.changes = 0
+        self.listeners: List[Callable[[keyType,Optional[valueType]],None]] = []
+    
+    def _added(self, key: keyType, value: valueType) -> None:
+        pass
+    
+    def _removed(self, key: keyType, value: valueType) -> None:
+        pass
+    
+    def __getitem__(self, key: keyType) -> valueType:
+        return self._map[key]
+    
+    def __setitem__(self, key: keyType, value: valueType) -> None:
+        if(key in self._map):
+            self._removed(key, self._map[key])
+        self._map[key] = value
+        self._added(key, value)
+        self.changes += 1
+        for listener in self.listeners:
+            listener(key, value)
+    
+    def __delitem__(self, key: keyType) -> None:
+        value = self._map.pop(key)
+        self._removed(key, value)
+        self.changes += 1
+        for listener in self.listeners:
+            listener(key, None)
+    
+    def __iter__(self) -> Iterator[keyType]:
+        return iter(self._map)
+    
+    def __len__(self) -> int:
+        return len(self._map)
+    
+    def __contains__(self, key: object) -> bool:
+        return key in self._map
+
+class mapping_store(counted_dict[Tuple[int,int,int],int]):
+    """(prog,vers,prot) => port, also indexed by (prog,vers) and by port, so
+    that UNSET and cleaning up after a service that has gone away don't
+    have to search all mappings."""
+    def __init__(self) -> None:
+        super().__init__()
+        # (prog,vers) => {prot}
+        self._by_prog: Dict[Tuple[int,int],Set[int]] = {}
+        # port => {(prog,vers,prot)}
+        self._by_port: Dict[int,Set[Tuple[int,int,int]]] = {}
+    
+    def _added(self, key: Tuple[int,int,int], port: int) -> None:
+        self._by_prog.setdefault(key[0:2], set()).add(key[2])
+        self._by_port.setdefault(port, set()).add(key)
+    
+    def _removed(self, key: Tuple[int,int,int], port: int) -> None:
+        prots = self._by_prog[key[0:2]]
+        prots.discard(key[2])
+        if(len(prots) == 0):
+            del self._by_prog[key[0:2]]
+        keys = self._by_port[port]
+        keys.discard(key)
+        if(len(keys) == 0):
+            del self._by_port[port]
+    
+    def protocols(self, prog: int, vers: int) -> Set[int]:
+        """Protocols on which prog.vers is mapped"""
+        return set(self._by_prog.get((prog,vers), ()))
+    
+    def versions(self, prog: int) -> Set[int]:
+        return set(k[1] for k in self._by_prog if k[0] == prog)
+    
+    def port_keys(self, port: int) -> Set[Tuple[int,int,int]]:
+        """The (prog,vers,prot) mapped to port"""
+        return set(self._by_port.get(port, ()))
+    
+    def unset(self, prog: int, vers: int) -> bool:
+        """Remove prog.vers on all protocols. Returns False if it wasn't
+        mapped at all."""
+        prots = self.protocols(prog, vers)
+        for prot in prots:
+            del self[(prog,vers,prot)]
+        return len(prots) > 0
+    
+    def unset_port(self, port: int) -> int:
+        """Remove everything mapped to port, returning the number removed"""
+        keys = self.port_keys(port)
+        for key in keys:
+            del self[key]
+        return len(keys)
+
+class rpcb_stats():
+    """The statistics of one version of the protocol, as returned by
+    RPCBPROC_GETSTAT"""
     def __init__(self) -> None:
-        self.mapping: Dict[Tuple[int,int,int],int] = {}
+        # Calls of each procedure
+        self.info = [0] * portmap_const.RPCBSTAT_HIGHPROC
+        # Successful SETs and UNSETs
+        self.setinfo = 0
+        self.unsetinfo = 0
+        # (prog,vers,netid) looked up => [found, not found]
+        self.addrinfo: Dict[Tuple[int,int,bytes],List[int]] = {}
+        # (prog,vers,proc,netid) called through CALLIT => [succeeded, failed]
+        self.rmtinfo: Dict[Tuple[int,int,int,bytes],List[int]] = {}
+    
+    def lookup(self, prog: int, vers: int, netid: bytes, found: bool) -> None:
+        counts = self.addrinfo.setdefault((prog,vers,netid), [0, 0])
+        counts[0 if found else 1] += 1
+    
+    def remote_call(self, prog: int, vers: int, proc: int, netid: bytes, succeeded: bool) -> None:
+        counts = self.rmtinfo.setdefault((prog,vers,proc,netid), [0, 0])
+        counts[0 if succeeded else 1] += 1
+    
+    def pack(self, p: PORTMAPPacker) -> None:
+        """Pack as an rpcb_stat. The lists are packed iteratively, as for
+        DUMP."""
+        p.pack_rpcbs_proc(self.info)
+        p.pack_int(self.setinfo)
+        p.pack_int(self.unsetinfo)
+        for (prog,vers,netid),(success,failure) in self.addrinfo.items():
+            p.pack_bool(True)
+            p.pack_uint(prog)
+            p.pack_uint(vers)
+            p.pack_int(success)
+            p.pack_int(failure)
+            p.pack_string(netid)
+        p.pack_bool(False)
+        for (prog,vers,proc,netid),(success,failure) in self.rmtinfo.items():
+            p.pack_bool(True)
+            p.pack_uint(prog)
+            p.pack_uint(vers)
+            p.pack_uint(proc)
+            p.pack_int(success)
+            p.pack_int(failure)
+            p.pack_int(0) # indirect, INDIRECT isn't implemented
+            p.pack_string(netid)
+        p.pack_bool(False)
+
+class portmapper():
+    """The registrations of a portmapper.
+    
+    mapping holds the version 2 mappings, which are also the rpcbind
+    registrations with netids "tcp" and "udp". addresses holds rpcbind
+    registrations for other netids, such as "local" for UNIX sockets, as
+    (prog,vers,netid) => (universal address, owner).
+    
+    host is the address given in the universal addresses made from version
+    2 mappings."""
+    # rpcbind netid => version 2 protocol
+    NETID_PROTOCOLS = {b"tcp": portmap_const.IPPROTO_TCP, b"udp": portmap_const.IPPROTO_UDP}
+    PROTOCOL_NETIDS = {v: k for k, v in NETID_PROTOCOLS.items()}
+    # netid => (semantics, protocol family, protocol), for GETADDRLIST
+    NETID_CONFIGS = {
+            b"tcp": (portmap_const.NC_TPI_COTS_ORD, b"inet", b"tcp"),
+            b"udp": (portmap_const.NC_TPI_CLTS, b"inet", b"udp"),
+            b"tcp6": (portmap_const.NC_TPI_COTS_ORD, b"inet6", b"tcp"),
+            b"udp6": (portmap_const.NC_TPI_CLTS, b"inet6", b"udp"),
+            b"local": (portmap_const.NC_TPI_COTS_ORD, b"loopback", b"-"),
+            b"unix": (portmap_const.NC_TPI_COTS_ORD, b"loopback", b"-"),
+    }
+    # Of netids not in NETID_CONFIGS
+    UNKNOWN_NETID_CONFIG = (portmap_const.NC_TPI_RAW, b"-", b"-")
+    
+    def __init__(self, host: str = '127.0.0.1') -> None:
+        self.host = host
+        self.mapping = mapping_store()
+        self.addresses: counted_dict[Tuple[int,int,bytes],Tuple[bytes,bytes]] = counted_dict()
+        # Of versions 2, 3 and 4
+        self.stats = [rpcb_stats() for i in range(portmap_const.RPCBVERS_STAT)]
+        # (changes, encoding) of the DUMP results
+        self._pmap_dump: Optional[Tuple[int,bytes]] = None
+        self._rpcb_dump: Optional[Tuple[Tuple[int,int],bytes]] = None
+    
+    def uaddr(self, port: int) -> bytes:
+        """Universal address of port on host"""
+        return f"{self.host}.{port>>8}.{port&0xff}".encode()
+    
+    @staticmethod
+    def uaddr_port(uaddr: bytes) -> Optional[int]:
+        """The port of an IP universal address, None if it isn't one"""
+        parts = uaddr.rsplit(b'.', 2)
+        if(len(parts) != 3 or not parts[1].isdigit() or not parts[2].isdigit()):
+            return None
+        return (int(parts[1])<<8) | int(parts[2])
+    
+    @staticmethod
+    def uaddr2taddr(uaddr: bytes) -> bytes:
+        """The struct sockaddr_in or sockaddr_in6 of an IP universal
+        address, as the C library lays it out, with the address family in
+        native byte order. Empty if uaddr isn't an IP address."""
+        parts = uaddr.rsplit(b'.', 2)
+        port = portmapper.uaddr_port(uaddr)
+        if(port is None or port > 0xffff):
+            return b''
+        try:
+            host = parts[0].decode('ascii')
+            if(':' in host):
+                return (struct.pack("=H", socket.AF_INET6) + struct.pack(">HI", port, 0) +
+                        socket.inet_pton(socket.AF_INET6, host) + struct.pack("=I", 0))
+            return (struct.pack("=H", socket.AF_INET) + struct.pack(">H", port) +
+                    socket.inet_pton(socket.AF_INET, host) + bytes(8))
+        except (UnicodeDecodeError, OSError):
+            return b''
+    
+    @staticmethod
+    def taddr2uaddr(taddr: bytes) -> bytes:
+        """The universal address of a sockaddr from uaddr2taddr(). Empty
+        if it isn't one."""
+        if(len(taddr) < 2):
+            return b''
+        (family,) = struct.unpack_from("=H", taddr)
+        if(family == socket.AF_INET and len(taddr) >= 8):
+            host = socket.inet_ntop(socket.AF_INET, taddr[4:8])
+        elif(family == socket.AF_INET6 and len(taddr) >= 24):
+            host = socket.inet_ntop(socket.AF_INET6, taddr[8:24])
+        else:
+            return b''
+        (port,) = struct.unpack_from(">H", taddr, 2)
+        return f"{host}.{port>>8}.{port&0xff}".encode()
+    
+    def getaddr(self, prog: int, vers: int, netid: bytes) -> Optional[bytes]:
+        prot = self.NETID_PROTOCOLS.get(netid)
+        if(prot is not None):
+            port = self.mapping.get((prog,vers,prot))
+            return None if port is None else self.uaddr(port)
+        entry = self.addresses.get((prog,vers,netid))
+        return None if entry is None else entry[0]
+    
+    def addrlist(self, prog: int, vers: int) -> List[portmap_type.rpcb_entry]:
+        """The addresses of prog.vers, on all transports"""
+        entries = []
+        for netid, addr in ([(self.PROTOCOL_NETIDS[prot], self.uaddr(self.mapping[(prog,vers,prot)]))
+                             for prot in sorted(self.mapping.protocols(prog, vers))
+                             if prot in self.PROTOCOL_NETIDS] +
+                            [(k[2], a) for k, (a, owner) in self.addresses.items() if k[0:2] == (prog,vers)]):
+            (semantics, protofmly, proto) = self.NETID_CONFIGS.get(netid, self.UNKNOWN_NETID_CONFIG)
+            entries.append(portmap_type.rpcb_entry(r_maddr=addr, r_nc_netid=netid, r_nc_semantics=semantics,
+                                                   r_nc_protofmly=protofmly, r_nc_proto=proto))
+        return entries
+    
+    def dump_pmaplist(self) -> bytes:
+        """The encoded result of PMAPPROC_DUMP. It is encoded once, and
+        cached until the mappings change."""
+        if(self._pmap_dump is None or self._pmap_dump[0] != self.mapping.changes):
+            # An XDR optional list, packed iteratively rather than with the
+            # recursive generated packer, which long lists would overflow.
+            p = PORTMAPPacker()
+            for (prog,vers,prot),port in self.mapping.items():
+                p.pack_bool(True)
+                p.pack_mapping(portmap_type.mapping(prog=prog, vers=vers, prot=prot, port=port))
+            p.pack_bool(False)
+            self._pmap_dump = (self.mapping.changes, p.get_buffer())
+        return self._pmap_dump[1]
+    
+    def dump_rpcblist(self) -> bytes:
+        """The encoded result of RPCBPROC_DUMP, cached as for dump_pmaplist()"""
+        changes = (self.mapping.changes, self.addresses.changes)
+        if(self._rpcb_dump is None or self._rpcb_dump[0] != changes):
+            p = PORTMAPPacker()
+            for (prog,vers,prot),port in self.mapping.items():
+                netid = self.PROTOCOL_NETIDS.get(prot)
+                if(netid is None):
+                    continue
+                p.pack_bool(True)
+                p.pack_rpcb(portmap_type.rpcb(r_prog=prog, r_vers=vers, r_netid=netid,
+                                              r_addr=self.uaddr(port), r_owner=b"unknown"))
+            for (prog,vers,netid),(addr,owner) in self.addresses.items():
+                p.pack_bool(True)
+                p.pack_rpcb(portmap_type.rpcb(r_prog=prog, r_vers=vers, r_netid=netid,
+                                              r_addr=addr, r_owner=owner))
+            p.pack_bool(False)
+            self._rpcb_dump = (changes, p.get_buffer())
+        return self._rpcb_dump[1]
 
 class portmap_conn(rpc_srv.rpc_conn):
+    # How long CALLIT waits for the called service
+    CALLIT_TIMEOUT = 1.0
+    
     def __init__(self, mapper: portmapper) -> None:
         self.mapper = mapper
         super().__init__()
+    
+    def _stats(self, rpc_msg: rpc_type.rpc_msg) -> rpcb_stats:
+        """The statistics of the version called"""
+        return self.mapper.stats[rpc_msg.body.cbody.vers - portmap_const.PMAP_VERS]
+    
+    async def handleMsg(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> Optional[bytes]:
+        body = rpc_msg.body
+        if(body is not None and body.mtype == rpc_const.CALL):
+            cbody = body.cbody
+            assert (cbody is not None)
+            assert (cbody.vers is not None)
+            assert (cbody.proc is not None)
+            ix = cbody.vers - portmap_const.PMAP_VERS
+            if(cbody.prog == portmap_const.PMAP_PROG and 0 <= ix < portmap_const.RPCBVERS_STAT and
+                   cbody.proc < portmap_const.RPCBSTAT_HIGHPROC):
+                self.mapper.stats[ix].info[cbody.proc] += 1
+        return await super().handleMsg(rpc_msg, buf, buf_ix)
+    
+    async def handle_null(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        assert (rpc_msg.xid is not None)
+        return rpc_srv.rpc_srv.pack_success_data_msg(rpc_msg.xid,b'')
+    
+    @rpc_srv.rpc_conn.callHandler(PORTMAPUnpacker, PORTMAPUnpacker.unpack_mapping, PORTMAPPacker, PORTMAPPacker.pack_bool)
+    async def handle_set(self, rpc_msg: rpc_type.rpc_msg, arg: portmap_type.mapping) -> bool:
+        assert (arg.prog is not None)
+        assert (arg.vers is not None)
+        assert (arg.prot is not None)
+        assert (arg.port is not None)
+        key = (arg.prog,arg.vers,arg.prot)
+        if(key in self.mapper.mapping):
+            return False
+        self.mapper.mapping[key] = arg.port
+        self._stats(rpc_msg).setinfo += 1
+        return True
+    
+    @rpc_srv.rpc_conn.callHandler(PORTMAPUnpacker, PORTMAPUnpacker.unpack_mapping, PORTMAPPacker, PORTMAPPacker.pack_bool)
+    async def handle_unset(self, rpc_msg: rpc_type.rpc_msg, arg: portmap_type.mapping) -> bool:
+        """The prot and port are ignored"""
+        assert (arg.prog is not None)
+        assert (arg.vers is not None)
+        if(not self.mapper.mapping.unset(arg.prog,arg.vers)):
+            return False
+        self._stats(rpc_msg).unsetinfo += 1
+        return True
         
     async def handle_getPort(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
         arg_up = PORTMAPUnpacker(buf)
@@ -73,26 +395,234 @@ class portmap_conn(rpc_srv.rpc_conn):
         print(f"mapping = {arg}")
         port = self.mapper.mapping.get((arg.prog,arg.vers,arg.prot))
         print(f"port is {port}, xid={rpc_msg.xid}")
+        self._stats(rpc_msg).lookup(arg.prog, arg.vers, portmapper.PROTOCOL_NETIDS.get(arg.prot, b''),
+                                    port is not None)
         if (port is None):
             port = 0 # 0 signifies no result
         data = struct.pack(">I",port)
         data = rpc_srv.rpc_srv.pack_success_data_msg(rpc_msg.xid,data)
         return data
+    
+    async def handle_dump(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        assert (rpc_msg.xid is not None)
+        return rpc_srv.rpc_srv.pack_success_data_msg(rpc_msg.xid,self.mapper.dump_pmaplist())
+    
+    async def _callit(self, arg: portmap_type.call_args) -> Optional[Tuple[int,bytes]]:
+        """(port called, result), None if the call failed"""
+        assert (arg.prog is not None)
+        assert (arg.vers is not None)
+        assert (arg.proc is not None)
+        assert (arg.args is not None)
+        port = self.mapper.mapping.get((arg.prog,arg.vers,portmap_const.IPPROTO_UDP))
+        if(port is None):
+            return None
+        cl = rpc_udp.rpc_udp_client(timeout=self.CALLIT_TIMEOUT, retries=0)
+        try:
+            await cl.connect(self.mapper.host, port)
+        except OSError as e:
+            print(f"CALLIT to {arg.prog}.{arg.vers} failed: {e!r}")
+            return None
+        try:
+            rsp, msg = await cl.call(arg.prog, arg.vers, arg.proc, arg.args)
+        except (asyncio.TimeoutError, OSError) as e:
+            print(f"CALLIT to {arg.prog}.{arg.vers} failed: {e!r}")
+            return None
+        finally:
+            await cl.close()
+        if((msg.body.rbody.stat != rpc_const.MSG_ACCEPTED) or (msg.body.rbody.areply.reply_data.stat != rpc_const.SUCCESS)):
+            return None
+        return (port, rsp)
+    
+    async def handle_callit(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> Optional[bytes]:
+        """Call a procedure of a service registered on UDP, and return its
+        result. As in the RFC, nothing is sent back when the call fails."""
+        arg_up = PORTMAPUnpacker(buf)
+        arg_up.set_position(buf_ix)
+        arg = arg_up.unpack_call_args()
+        assert (arg.prog is not None)
+        assert (arg.vers is not None)
+        assert (arg.proc is not None)
+        assert (arg.args is not None)
+        assert (rpc_msg.xid is not None)
+        result = await self._callit(arg)
+        self._stats(rpc_msg).remote_call(arg.prog, arg.vers, arg.proc, b"udp", result is not None)
+        if(result is None):
+            return None
+        (port, rsp) = result
+        p = PORTMAPPacker()
+        p.pack_call_result(portmap_type.call_result(port=port, res=rsp))
+        return rpc_srv.rpc_srv.pack_success_data_msg(rpc_msg.xid,p.get_buffer())
+    
+    @rpc_srv.rpc_conn.callHandler(PORTMAPUnpacker, PORTMAPUnpacker.unpack_rpcb, PORTMAPPacker, PORTMAPPacker.pack_bool)
+    async def handle_rpcb_set(self, rpc_msg: rpc_type.rpc_msg, arg: portmap_type.rpcb) -> bool:
+        assert (arg.r_prog is not None)
+        assert (arg.r_vers is not None)
+        assert (arg.r_netid is not None)
+        assert (arg.r_addr is not None)
+        assert (arg.r_owner is not None)
+        prot = portmapper.NETID_PROTOCOLS.get(arg.r_netid)
+        if(prot is not None):
+            port = portmapper.uaddr_port(arg.r_addr)
+            key = (arg.r_prog,arg.r_vers,prot)
+            if(port is None or key in self.mapper.mapping):
+                return False
+            self.mapper.mapping[key] = port
+        else:
+            key2 = (arg.r_prog,arg.r_vers,arg.r_netid)
+            if(key2 in self.mapper.addresses):
+                return False
+            self.mapper.addresses[key2] = (arg.r_addr,arg.r_owner)
+        self._stats(rpc_msg).setinfo += 1
+        return True
+    
+    @rpc_srv.rpc_conn.callHandler(PORTMAPUnpacker, PORTMAPUnpacker.unpack_rpcb, PORTMAPPacker, PORTMAPPacker.pack_bool)
+    async def handle_rpcb_unset(self, rpc_msg: rpc_type.rpc_msg, arg: portmap_type.rpcb) -> bool:
+        found = self._rpcb_unset(arg)
+        if(found):
+            self._stats(rpc_msg).unsetinfo += 1
+        return found
+    
+    def _rpcb_unset(self, arg: portmap_type.rpcb) -> bool:
+        assert (arg.r_prog is not None)
+        assert (arg.r_vers is not None)
+        assert (arg.r_netid is not None)
+        if(len(arg.r_netid) == 0):
+            # An empty netid unsets the program on all transports
+            found = self.mapper.mapping.unset(arg.r_prog,arg.r_vers)
+            keys = [k for k in self.mapper.addresses if k[0:2] == (arg.r_prog,arg.r_vers)]
+            for k in keys:
+                del self.mapper.addresses[k]
+            return found or (len(keys) > 0)
+        prot = portmapper.NETID_PROTOCOLS.get(arg.r_netid)
+        if(prot is not None):
+            return self.mapper.mapping.pop((arg.r_prog,arg.r_vers,prot), None) is not None
+        return self.mapper.addresses.pop((arg.r_prog,arg.r_vers,arg.r_netid), None) is not None
+    
+    @rpc_srv.rpc_conn.callHandler(PORTMAPUnpacker, PORTMAPUnpacker.unpack_rpcb, PORTMAPPacker, PORTMAPPacker.pack_rpcb_string)
+    async def handle_rpcb_getaddr(self, rpc_msg: rpc_type.rpc_msg, arg: portmap_type.rpcb) -> bytes:
+        """If r_vers isn't registered, the address of another version of
+        the program is returned, as rpcbind does"""
+        assert (arg.r_prog is not None)
+        assert (arg.r_vers is not None)
+        assert (arg.r_netid is not None)
+        addr = self.mapper.getaddr(arg.r_prog,arg.r_vers,arg.r_netid)
+        if(addr is None):
+            for vers in sorted(self.mapper.mapping.versions(arg.r_prog) |
+                               set(k[1] for k in self.mapper.addresses if k[0] == arg.r_prog)):
+                addr = self.mapper.getaddr(arg.r_prog,vers,arg.r_netid)
+                if(addr is not None):
+                    break
+        self._stats(rpc_msg).lookup(arg.r_prog, arg.r_vers, arg.r_netid, addr is not None)
+        # An empty string signifies no result
+        return b'' if addr is None else addr
+    
+    @rpc_srv.rpc_conn.callHandler(PORTMAPUnpacker, PORTMAPUnpacker.unpack_rpcb, PORTMAPPacker, PORTMAPPacker.pack_rpcb_string)
+    async def handle_rpcb_getversaddr(self, rpc_msg: rpc_type.rpc_msg, arg: portmap_type.rpcb) -> bytes:
+        assert (arg.r_prog is not None)
+        assert (arg.r_vers is not None)
+        assert (arg.r_netid is not None)
+        addr = self.mapper.getaddr(arg.r_prog,arg.r_vers,arg.r_netid)
+        self._stats(rpc_msg).lookup(arg.r_prog, arg.r_vers, arg.r_netid, addr is not None)
+        return b'' if addr is None else addr
+    
+    async def handle_rpcb_getaddrlist(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        """All transports prog.vers is registered on are listed. r_netid
+        isn't used to select them, as the transport the call came in on
+        isn't known here."""
+        arg_up = PORTMAPUnpacker(buf)
+        arg_up.set_position(buf_ix)
+        arg = arg_up.unpack_rpcb()
+        assert (arg.r_prog is not None)
+        assert (arg.r_vers is not None)
+        assert (rpc_msg.xid is not None)
+        entries = self.mapper.addrlist(arg.r_prog,arg.r_vers)
+        self._stats(rpc_msg).lookup(arg.r_prog, arg.r_vers, arg.r_netid or b'', len(entries) > 0)
+        # An XDR optional list, packed as for DUMP
+        p = PORTMAPPacker()
+        for entry in entries:
+            p.pack_bool(True)
+            p.pack_rpcb_entry(entry)
+        p.pack_bool(False)
+        return rpc_srv.rpc_srv.pack_success_data_msg(rpc_msg.xid,p.get_buffer())
+    
+    async def handle_rpcb_getstat(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        assert (rpc_msg.xid is not None)
+        p = PORTMAPPacker()
+        for stats in self.mapper.stats:
+            stats.pack(p)
+        return rpc_srv.rpc_srv.pack_success_data_msg(rpc_msg.xid,p.get_buffer())
+    
+    @rpc_srv.rpc_conn.callHandler(PORTMAPUnpacker, PORTMAPUnpacker.unpack_rpcb_string, PORTMAPPacker, PORTMAPPacker.pack_netbuf)
+    async def handle_rpcb_uaddr2taddr(self, rpc_msg: rpc_type.rpc_msg, arg: bytes) -> portmap_type.netbuf:
+        """Only IP addresses are converted. Others give an empty netbuf."""
+        taddr = portmapper.uaddr2taddr(arg)
+        return portmap_type.netbuf(maxlen=len(taddr), buf=taddr)
+    
+    @rpc_srv.rpc_conn.callHandler(PORTMAPUnpacker, PORTMAPUnpacker.unpack_netbuf, PORTMAPPacker, PORTMAPPacker.pack_rpcb_string)
+    async def handle_rpcb_taddr2uaddr(self, rpc_msg: rpc_type.rpc_msg, arg: portmap_type.netbuf) -> bytes:
+        assert (arg.buf is not None)
+        return portmapper.taddr2uaddr(arg.buf)
+    
+    async def handle_rpcb_remote_call(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        """CALLIT of version 3, and BCAST and INDIRECT of version 4, are
+        refused with PROC_UNAVAIL, as rpcbind does unless remote calls are
+        enabled. Forwarding calls lets a spoofed request be reflected to
+        another host, and only version 2 CALLIT, which VXI-11 clients
+        may use, does so."""
+        assert (rpc_msg.xid is not None)
+        return rpc_srv.rpc_srv.pack_reply_msg_unsupported(rpc_msg.xid,stat=rpc_const.PROC_UNAVAIL)
+    
+    async def handle_rpcb_dump(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        assert (rpc_msg.xid is not None)
+        return rpc_srv.rpc_srv.pack_success_data_msg(rpc_msg.xid,self.mapper.dump_rpcblist())
+    
+    @rpc_srv.rpc_conn.callHandler(None, None, PORTMAPPacker, PORTMAPPacker.pack_uint)
+    async def handle_rpcb_gettime(self, rpc_msg: rpc_type.rpc_msg, arg: None) -> int:
+        return int(time.time())
+    
     # (prog, vers, proc) => func(self,rpc_msg, buf, buf_ix)
-
+    
+    rpcb_dispatch_table = {
+            portmap_const.RPCBPROC_NULL: handle_null,
+            portmap_const.RPCBPROC_SET: handle_rpcb_set,
+            portmap_const.RPCBPROC_UNSET: handle_rpcb_unset,
+            portmap_const.RPCBPROC_GETADDR: handle_rpcb_getaddr,
+            portmap_const.RPCBPROC_DUMP: handle_rpcb_dump,
+            portmap_const.RPCBPROC_CALLIT: handle_rpcb_remote_call,
+            portmap_const.RPCBPROC_GETTIME: handle_rpcb_gettime,
+            portmap_const.RPCBPROC_UADDR2TADDR: handle_rpcb_uaddr2taddr,
+            portmap_const.RPCBPROC_TADDR2UADDR: handle_rpcb_taddr2uaddr,
+    }
+    
     call_dispatch_table = {
             (portmap_const.PMAP_PROG,portmap_const.PMAP_VERS): {
-                    portmap_const.PMAPPROC_GETPORT: handle_getPort
-            }
+                    portmap_const.PMAPPROC_NULL: handle_null,
+                    portmap_const.PMAPPROC_SET: handle_set,
+                    portmap_const.PMAPPROC_UNSET: handle_unset,
+                    portmap_const.PMAPPROC_GETPORT: handle_getPort,
+                    portmap_const.PMAPPROC_DUMP: handle_dump,
+                    portmap_const.PMAPPROC_CALLIT: handle_callit,
+            },
+            (portmap_const.RPCBPROG,portmap_const.RPCBVERS): rpcb_dispatch_table,
+            (portmap_const.RPCBPROG,portmap_const.RPCBVERS4): {
+                    **rpcb_dispatch_table,
+                    portmap_const.RPCBPROC_BCAST: handle_rpcb_remote_call,
+                    portmap_const.RPCBPROC_GETVERSADDR: handle_rpcb_getversaddr,
+                    portmap_const.RPCBPROC_INDIRECT: handle_rpcb_remote_call,
+                    portmap_const.RPCBPROC_GETADDRLIST: handle_rpcb_getaddrlist,
+                    portmap_const.RPCBPROC_GETSTAT: handle_rpcb_getstat,
+            },
     }
     
 class portmap_srv(rpc_srv.rpc_srv):
     """ 
     mapping member is a map from (prog,vers,prot) to uint
     """
-    def __init__(self,port: int, mapper: portmapper) -> None:
+    def __init__(self,port: int, mapper: portmapper,
+                 unix_path: Optional[str] = None, udp_port: Optional[int] = None) -> None:
+        """Lookups are answered over UDP as well, on udp_port, if given"""
         self.mapper = mapper
-        super().__init__(port)
+        super().__init__(port, unix_path=unix_path, udp_port=udp_port)
         
     def create_conn(self) -> portmap_conn:
         return portmap_conn(self.mapper)
@@ -33,44 +33,117 @@
 # Connect to TCPIP0::127.0.0.1::INSTR
 
 import os
+import random
 import sys
 import asyncio
 import struct
 from abc import ABC, abstractmethod
 
+from . import rpc_record
 from .xdr import rpc_const, rpc_type
 from .xdr.rpc_pack import RPCPacker, RPCUnpacker
-from typing import Optional, Tuple, Union
+from typing import Any, Dict, Optional, Tuple, Union
+
+def check_reply(msg: rpc_type.rpc_msg) -> None:
+    """Raise an Exception unless the reply msg reports success"""
+    if((msg.body.rbody.stat != rpc_const.MSG_ACCEPTED) or (msg.body.rbody.areply.reply_data.stat != rpc_const.SUCCESS)):
+        raise Exception(f"RPC call not accepted by the server: {msg}")
 
 class rpc_client():
+    """Client side of an RPC connection.
+    
+    Calls may be made concurrently. Each call is sent as soon as it is made,
+    and replies are matched up with their calls by xid, so a slow call
+    doesn't hold up the replies of calls made after it."""
     # Don't connect in the constructor, since it should be asynchronous!
     def __init__(self) -> None:
-        self._xid = 100
+        # Start at a random xid, so that the calls of different clients, or
+        # of a client run again, don't look like retransmissions of each other.
+        self._xid = random.randrange(0x10000)
         self._reader: Optional[asyncio.StreamReader]  = None
         self._writer: Optional[asyncio.StreamWriter] = None
+        self._write_lock: Optional[asyncio.Lock] = None
+        self._reply_task: Optional[asyncio.Future[None]] = None
+        # xid => future for the reply, for calls awaiting a reply
+        self._pending: Dict[int,asyncio.Future[Tuple[bytes,rpc_type.rpc_msg]]] = dict()
     
     async def connect(self, host: str, port: int) -> None:
         print(f"Opening RPC client connection to {host}:{port}")
         self._reader, self._writer = await asyncio.open_connection(
                 host, port)
+        self._start()
     
     async def connect_unix(self, path: Union[str, 'os.PathLike[str]']) -> None:
         print(f"Opening UNIX RPC connection to {path.__repr__()}")
         self._reader, self._writer = await asyncio.open_unix_connection(
             path=path)
+        self._start()
+    
+    async def connect_memory(self, srv: 'rpc_srv.rpc_srv') -> None:
+        """Connect to srv in the same process, without a socket"""
+        self._reader, self._writer = srv.connect_memory()
+        self._start()
+    
+    def _start(self) -> None:
+        self._write_lock = asyncio.Lock()
+        self._reply_task = asyncio.ensure_future(self._read_replies())
+    
+    def get_extra_info(self, name: str) -> Any:
+        """Transport information of the connection, see
+        asyncio.BaseTransport.get_extra_info()"""
+        assert (self._writer is not None)
+        return self._writer.get_extra_info(name)
         
-    async def close(self) -> None:
+    async def _read_replies(self) -> None:
         assert (self._reader is not None)
-        assert (self._writer is not None)
+        try:
+            while True:
+                data = await rpc_record.read_record(self._reader)
+                if(data is None):
+                    break
+                msg_up = RPCUnpacker(data)
+                msg = msg_up.unpack_rpc_msg()
+                fut = self._pending.pop(msg.xid, None)
+                if(fut is None):
+                    print(f"Dropping RPC reply with unexpected xid {msg.xid}")
+                elif(not fut.done()):
+                    fut.set_result((data[msg_up.get_position():], msg))
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            print(f"RPC connection lost: {e!r}")
+        finally:
+            self._fail_pending()
+    
+    def _fail_pending(self) -> None:
+        pending = self._pending
+        self._pending = dict()
+        for fut in pending.values():
+            if(not fut.done()):
+                fut.set_exception(ConnectionError("RPC connection closed before the reply arrived"))
+        
+    async def close(self) -> None:
+        if(self._writer is None):
+            # Closed already
+            return
+        if(self._reply_task is not None):
+            self._reply_task.cancel()
+            try:
+                await self._reply_task
+            except asyncio.CancelledError:
+                pass
+            self._reply_task = None
+        self._fail_pending()
         self._writer.close()
         if(sys.hexversion > 0x03070000):
-            await self._writer.wait_closed()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
         self._writer = None
         self._reader = None
         
-    async def call(self, prognum: int, vers: int, proc: int, data: bytes, read_reply: bool = True) -> Union[Tuple[None,None],Tuple[bytes,rpc_type.rpc_msg]]:
-        assert (self._reader is not None)
-        assert (self._writer is not None)
+    @staticmethod
+    def pack_call(xid: int, prognum: int, vers: int, proc: int) -> bytes:
+        """The RPC header of a call, to which the arguments are appended"""
         cbody = rpc_type.call_body(
                 rpcvers=2,
                 prog=prognum,
@@ -80,35 +153,44 @@ class rpc_client():
                 verf=rpc_type.opaque_auth(flavor=rpc_const.AUTH_NONE,body=b'')
                 )
         msg = rpc_type.rpc_msg(
-                xid=self._xid,
+                xid=xid,
                 body=rpc_type.rpc_msg_body(
                         rpc_const.CALL,
                         cbody=cbody))
-        self._xid = (self._xid + 1) % 0x10000
         
         p =  RPCPacker()
         p.pack_rpc_msg(msg)
-        b_call = p.get_buffer()
+        return p.get_buffer()
+    
+    async def call(self, prognum: int, vers: int, proc: int, data: bytes, read_reply: bool = True) -> Union[Tuple[None,None],Tuple[bytes,rpc_type.rpc_msg]]:
+        if(self._writer is None or self._reply_task is None or self._reply_task.done()):
+            raise ConnectionError("RPC connection is closed")
+        assert (self._write_lock is not None)
+        
+        # Don't reuse the xid of a call still waiting for its reply
+        while self._xid in self._pending:
+            self._xid = (self._xid + 1) % 0x10000
+        xid = self._xid
+        self._xid = (self._xid + 1) % 0x10000
+        
+        b_call = self.pack_call(xid, prognum, vers, proc)
         frag_len = len(b_call) + len(data)
-        b_len = struct.pack(">I",0x80000000 | frag_len)
-        self._writer.write(b_len + b_call + data)
-        await self._writer.drain()
+        b_len = struct.pack(">I",rpc_record.LAST_FRAGMENT | frag_len)
+        
+        fut: Optional[asyncio.Future[Tuple[bytes,rpc_type.rpc_msg]]] = None
         if(read_reply):
-            frag_hdr_data = await self._reader.read(4)
-            if(len(frag_hdr_data) != 4):
-                raise Exception("client closed connection???")
-            frag_len = struct.unpack(">I",frag_hdr_data)[0]
-            if((frag_len & 0x80000000) == 0):
-                raise Exception("Partial fragments not implemented")
-            frag_len = frag_len & 0x7FFFFFFF
-            data = await self._reader.read(frag_len)
-            if(len(data) != frag_len):
-                raise Exception("Data not as expected")
-            msg_up = RPCUnpacker(data)
-            msg = msg_up.unpack_rpc_msg()
-            #reply_data = await conn.handleMsg(msg,buf=data,buf_ix=msg_up.get_position())
-            
-            return (data[msg_up.get_position():], msg)
-        else:
-            return (None,None)
-    
+            # Registered before sending, as the reply may arrive before drain() returns
+            fut = asyncio.get_event_loop().create_future()
+            self._pending[xid] = fut
+        try:
+            async with self._write_lock:
+                self._writer.write(b_len + b_call)
+                # Written separately, to avoid copying large payloads
+                self._writer.write(data)
+                await self._writer.drain()
+            if(fut is None):
+                return (None,None)
+            return await fut
+        finally:
+            if(fut is not None and self._pending.get(xid) is fut):
+                del self._pending[xid]
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+# In-memory stream transport, for running RPC servers and clients in the
+# same process without sockets.
+#
+# open_connection() returns the client end of a connected pair of regular
+# asyncio streams, and hands the server end to a callback, just as
+# asyncio.start_server() does. Records are framed by rpc_record as on TCP,
+# so the server and client code is the same either way, but nothing goes
+# through the kernel. That keeps tests and profiles free of socket noise.
+
+import asyncio
+from typing import Any, Callable, Optional, Tuple
+
+class memory_transport(asyncio.Transport):
+    """One end of an in-memory connection. Data written is passed straight
+    to the protocol at the other end."""
+    def __init__(self, loop: asyncio.AbstractEventLoop, protocol: asyncio.Protocol, name: str) -> None:
+        super().__init__(extra={'peername': name, 'sockname': name})
+        self._loop = loop
+        self._protocol = protocol
+        self.peer: Optional['memory_transport'] = None
+        self._closing = False
+        self._eof = False
+        
+    def get_protocol(self) -> asyncio.BaseProtocol:
+        return self._protocol
+    
+    def set_protocol(self, protocol: asyncio.BaseProtocol) -> None:
+        self._protocol = protocol # type: ignore
+    
+    def is_closing(self) -> bool:
+        return self._closing
+    
+    def write(self, data: Any) -> None:
+        assert (self.peer is not None)
+        if(self._closing or self._eof or len(data) == 0):
+            return
+        if(self.peer._closing):
+            # Like a socket whose peer is gone, the data is lost
+            return
+        self.peer._protocol.data_received(bytes(data))
+    
+    def can_write_eof(self) -> bool:
+        return True
+    
+    def write_eof(self) -> None:
+        assert (self.peer is not None)
+        if(self._eof or self._closing):
+            return
+        self._eof = True
+        peer = self.peer
+        if(not peer._closing):
+            self._loop.call_soon(peer._protocol.eof_received)
+    
+    def close(self) -> None:
+        if(self._closing):
+            return
+        self.write_eof()
+        self._closing = True
+        self._loop.call_soon(self._protocol.connection_lost, None)
+    
+    def abort(self) -> None:
+        self.close()
+    
+    # Flow control: once the reading end has buffered too much, the writing
+    # end is paused, so that drain() waits.
+    def pause_reading(self) -> None:
+        assert (self.peer is not None)
+        if(not self.peer._closing):
+            self.peer._protocol.pause_writing()
+    
+    def resume_reading(self) -> None:
+        assert (self.peer is not None)
+        if(not self.peer._closing):
+            self.peer._protocol.resume_writing()
+    
+    def get_write_buffer_size(self) -> int:
+        return 0
+    
+    def set_write_buffer_limits(self, high: Optional[int] = None, low: Optional[int] = None) -> None:
+        pass
+
+def open_connection(client_connected_cb: Callable[[asyncio.StreamReader,asyncio.StreamWriter],Any],
+                    limit: int = 2**16, server_limit: Optional[int] = None) -> Tuple[asyncio.StreamReader,asyncio.StreamWriter]:
+    """Create a connection, calling client_connected_cb(reader, writer) with
+    the server end as asyncio.start_server() would. Returns the (reader,
+    writer) of the client end.
+    
+    limit and server_limit are the stream buffer limits of each end."""
+    loop = asyncio.get_event_loop()
+    srv_reader = asyncio.StreamReader(limit=server_limit if server_limit is not None else limit)
+    srv_protocol = asyncio.StreamReaderProtocol(srv_reader, client_connected_cb)
+    srv_transport = memory_transport(loop, srv_protocol, "memory-server")
+    
+    reader = asyncio.StreamReader(limit=limit)
+    protocol = asyncio.StreamReaderProtocol(reader)
+    transport = memory_transport(loop, protocol, "memory-client")
+    
+    srv_transport.peer = transport
+    transport.peer = srv_transport
+    protocol.connection_made(transport)
+    # This starts client_connected_cb
+    srv_protocol.connection_made(srv_transport)
+    writer = asyncio.StreamWriter(transport, protocol, reader, loop)
+    return (reader, writer)
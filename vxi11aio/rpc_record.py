@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+# ONC RPC record marking (RFC 5531, section 11) for stream transports.
+#
+# Each record is sent as one or more fragments, each preceded by a 4-byte
+# header holding the fragment length, with the top bit set on the last
+# fragment of the record.
+
+import asyncio
+import struct
+from typing import Optional
+
+LAST_FRAGMENT = 0x80000000
+
+class RecordTooLarge(Exception):
+    pass
+
+class marked_record(bytearray):
+    """A single-fragment record, with its 4-byte fragment header already in
+    front. Replies encoded in place are built like this, so they can be
+    sent with one write."""
+    def __init__(self, size: int) -> None:
+        """size is the length of the record, excluding the header"""
+        super().__init__(4 + size)
+        struct.pack_into(">I", self, 0, LAST_FRAGMENT | size)
+    
+    def payload(self) -> memoryview:
+        """The record without its header, as sent over datagram transports"""
+        return memoryview(self)[4:]
+
+async def read_record(reader: asyncio.StreamReader, max_size: Optional[int] = None) -> Optional[bytes]:
+    """Read one complete record, reassembling fragments as needed.
+    
+    Returns None if the stream ended at a record boundary. Raises
+    asyncio.IncompleteReadError if it ended mid-record, or RecordTooLarge
+    if the record would be larger than max_size bytes."""
+    try:
+        frag_hdr_data = await reader.readexactly(4)
+    except asyncio.IncompleteReadError as e:
+        if(len(e.partial) == 0):
+            return None
+        raise
+    frags = []
+    size = 0
+    while True:
+        frag_hdr = struct.unpack(">I",frag_hdr_data)[0]
+        frag_len = frag_hdr & 0x7FFFFFFF
+        size += frag_len
+        if(max_size is not None and size > max_size):
+            raise RecordTooLarge(f"RPC record of at least {size} bytes exceeds limit of {max_size}")
+        frag = await reader.readexactly(frag_len)
+        if((frag_hdr & LAST_FRAGMENT) != 0):
+            if(len(frags) == 0):
+                return frag
+            frags.append(frag)
+            return b''.join(frags)
+        frags.append(frag)
+        frag_hdr_data = await reader.readexactly(4)
+
+def write_record(writer: asyncio.StreamWriter, data: bytes) -> None:
+    """Queue data as a single-fragment record"""
+    if(isinstance(data, marked_record)):
+        writer.write(data)
+        return
+    writer.write(struct.pack(">I",LAST_FRAGMENT | len(data)))
+    writer.write(data)
@@ -33,13 +33,19 @@
 # Connect to TCPIP0::127.0.0.1::INSTR
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Awaitable, Callable, Coroutine, Optional, Type, Tuple, TypeVar, overload
+from typing import Any, Dict, Awaitable, FrozenSet, Callable, Coroutine, Hashable, List, Mapping, Optional, Type, Tuple, TypeVar, overload
+from collections import OrderedDict
+from types import MappingProxyType
 import asyncio
 import functools
+import os
+import stat
 import struct
 import sys
 import xdrlib
+import zlib
 
+from . import rpc_memory, rpc_record, rpc_udp
 from .xdr import rpc_const, rpc_type
 from .xdr.rpc_pack import RPCPacker, RPCUnpacker
 
@@ -49,12 +55,116 @@ callHandlerType = Callable[[Any,rpc_type.rpc_msg,bytes,int],Coroutine[Any,Any,Op
 unpackedCallHandlerVoidtype = Callable[[Any,rpc_type.rpc_msg,None],Coroutine[Any,Any,Any]]
 unpackedCallHandlertype = Callable[[Any,rpc_type.rpc_msg,rpcArgType],Coroutine[Any,Any,Any]]
 
+def _pack_success_reply_header() -> bytes:
+    """The header of a successful reply, without authentication, for xid 0.
+    The xid is its first field."""
+    reply = rpc_type.rpc_msg(
+        xid=0,
+        body=rpc_type.rpc_msg_body(
+                mtype=rpc_const.REPLY,
+                rbody=rpc_type.reply_body(
+                    stat=rpc_const.MSG_ACCEPTED,
+                    areply=rpc_type.accepted_reply(
+                            verf=rpc_type.opaque_auth(flavor=rpc_const.AUTH_NONE,body=b''),
+                            reply_data=rpc_type.rpc_reply_data(stat=rpc_const.SUCCESS,results=b'')
+                            )
+                    )
+                )
+        )
+    rpc_p = RPCPacker()
+    # The generated packing functions don't actually append the results.
+    rpc_p.pack_rpc_msg(reply)
+    return rpc_p.get_buffer()
+
+_success_reply_header = _pack_success_reply_header()
+
+# Procedure 0 of every program does nothing and returns nothing. Clients
+# call it to check that a program is being served.
+NULLPROC = 0
+
 class rpc_conn(ABC):
     def __init__(self) -> None:
         super().__init__()
     
+    # Print each call handled by a callHandler. Printing large payloads is
+    # slow, so this should be turned off when performance matters.
+    trace_calls = True
+    
+    # Check that enums in calls decoded by the generated server skeletons
+    # have values defined in the .x file. Can be turned off for trusted peers.
+    check_enum = True
+    
+    # (prog, vers, proc) of calls whose replies are only valid on the
+    # connection they were made on, such as handles to per-connection state.
+    # A retransmission on a new connection must execute these again, so
+    # their replies aren't kept in the duplicate request cache.
+    connection_procedures: FrozenSet[Tuple[int,int,int]] = frozenset()
+    
     # (prog, vers, proc) => bytes handler_func(self,rpc_msg, buf, buf_ix)
-    call_dispatch_table: Dict[Tuple[int,int],Dict[int,callHandlerType]] = {}
+    # Subclasses replace this. It is read-only here, so that a change can't
+    # leak into every class. Use register_handler() to change a single
+    # connection.
+    call_dispatch_table: Mapping[Tuple[int,int],Mapping[int,callHandlerType]] = MappingProxyType({})
+    
+    # Built when the class is created, from the generated server skeletons
+    # (xdr/*_svc.py) it derives from and call_dispatch_table:
+    # (prog, vers) => handlers, indexed by procedure. None if not implemented.
+    _dispatch: Dict[Tuple[int,int],List[Optional[callHandlerType]]] = {}
+    # prog => (lowest, highest) version implemented, for PROG_MISMATCH replies
+    _versions: Dict[int,Tuple[int,int]] = {}
+    
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        cls._build_dispatch()
+    
+    @classmethod
+    def _build_dispatch(cls) -> None:
+        """Precompute the dispatch arrays of the class. Procedures of a
+        skeleton are only dispatched if their handler is overridden. Entries
+        of call_dispatch_table take precedence."""
+        tables: Dict[Tuple[int,int],Dict[int,callHandlerType]] = {}
+        for base in reversed(cls.__mro__):
+            procedures = base.__dict__.get('rpc_procedures')
+            if(procedures is None):
+                continue
+            handlers = tables.setdefault(base.__dict__['rpc_program'], {})
+            for proc, (handler_name, dispatch_name) in procedures.items():
+                if(getattr(cls, handler_name) is not base.__dict__[handler_name]):
+                    handlers[proc] = getattr(cls, dispatch_name)
+        for key, progHandlers in cls.call_dispatch_table.items():
+            tables.setdefault(key, {}).update(progHandlers)
+        
+        cls._dispatch = {}
+        cls._versions = {}
+        for (prog, vers), progHandlers in tables.items():
+            if(len(progHandlers) == 0):
+                continue
+            array: List[Optional[callHandlerType]] = [None] * (max(progHandlers) + 1)
+            for proc, handler in progHandlers.items():
+                array[proc] = handler
+            cls._dispatch[(prog, vers)] = array
+            (low, high) = cls._versions.get(prog, (vers, vers))
+            cls._versions[prog] = (min(low, vers), max(high, vers))
+    
+    def cache_reply(self, prog: int, vers: int, proc: int) -> bool:
+        """Whether the reply to a call may be sent again to a retransmission
+        of the call, on another connection"""
+        return (prog, vers, proc) not in self.connection_procedures
+    
+    def register_handler(self, prog: int, vers: int, proc: int, handler: callHandlerType) -> None:
+        """Dispatch calls of procedure proc of program prog, version vers
+        to handler(self, rpc_msg, buf, buf_ix), on this connection only. The
+        class and its other instances are unaffected."""
+        if('_dispatch' not in self.__dict__):
+            # Copy the dispatch arrays of the class on the first change
+            self._dispatch = {key: list(handlers) for key, handlers in self._dispatch.items()}
+            self._versions = dict(self._versions)
+        handlers = self._dispatch.setdefault((prog, vers), [])
+        if(proc >= len(handlers)):
+            handlers.extend([None] * (proc + 1 - len(handlers)))
+        handlers[proc] = handler
+        (low, high) = self._versions.get(prog, (vers, vers))
+        self._versions[prog] = (min(low, vers), max(high, vers))
     
     # For void arguments:
     @overload
@@ -72,7 +182,10 @@ class rpc_conn(ABC):
     @staticmethod
     def callHandler(unpacker, unpack_func, packer, pack_func):
         """Decorator for RPC call handlers. This automates the packing and
-        unpacking of handelers."""
+        unpacking of handelers.
+        
+        Handlers for one-way calls, which get no reply, are not decorated,
+        and return None instead of a reply."""
         def decorator(func: unpackedCallHandlertype) -> callHandlerType:
             
             @functools.wraps(func)
@@ -81,12 +194,15 @@ class rpc_conn(ABC):
                     arg_up = unpacker(buf)
                     arg_up.set_position(buf_ix)
                     arg = unpack_func(arg_up)
-                    print(f"{func.__name__} >>> {arg}")
+                    if(self.trace_calls):
+                        print(f"{func.__name__} >>> {arg}")
                 else:
                     arg = None
-                    print(f"{func.__name__} >>> (void)")
+                    if(self.trace_calls):
+                        print(f"{func.__name__} >>> (void)")
                 rsp = await func(self, rpc_msg, arg)
-                print(f"{func.__name__} <<< {arg}")
+                if(self.trace_calls):
+                    print(f"{func.__name__} <<< {arg}")
                 p = packer()
                 pack_func(p,rsp)
                 assert(rpc_msg.xid is not None)
@@ -105,88 +221,309 @@ class rpc_conn(ABC):
         assert (cbody.prog is not None)
         assert (cbody.vers is not None)
         assert (cbody.proc is not None)
-        progHandlers = self.call_dispatch_table.get((cbody.prog,cbody.vers))
+        progHandlers = self._dispatch.get((cbody.prog,cbody.vers))
         if(progHandlers is None):
             print(f"RPC(prog={cbody.prog,cbody.vers}) not implemented")
+            versions = self._versions.get(cbody.prog)
+            if(versions is not None):
+                return rpc_srv.pack_reply_msg_prog_mismatch(rpc_msg.xid, low=versions[0], high=versions[1])
             return rpc_srv.pack_reply_msg_unsupported(rpc_msg.xid,stat=rpc_const.PROG_UNAVAIL)
         
-        handler = progHandlers.get(cbody.proc)
+        handler = progHandlers[cbody.proc] if cbody.proc < len(progHandlers) else None
         #print(f"dispatcher = {handler}")
         if(handler is None):
+            if(cbody.proc == NULLPROC):
+                return rpc_srv.success_reply_record(rpc_msg.xid, 0)[0]
             print(f"RPC(proc={cbody.proc}) not implemented")
             return rpc_srv.pack_reply_msg_unsupported(rpc_msg.xid,stat=rpc_const.PROC_UNAVAIL)
         return await handler(self,rpc_msg, buf, buf_ix)
+    
+    async def close(self) -> None:
+        """Called once the underlying connection has gone away, whether or
+        not the client shut things down cleanly. Subclasses release any
+        per-connection state here."""
+        pass
+
+class reply_cache():
+    """Duplicate request cache. Clients retransmit a call when its reply
+    seems to have been lost, and such a call must not be executed a second
+    time. The reply is sent again instead.
+    
+    Entries are kept by a key identifying the call, such as (peer address,
+    xid, prog, vers, proc), for ttl seconds, and at most max_entries of them.
+    The replies kept add up to at most max_bytes. A larger reply isn't
+    kept, so a retransmission of its call is executed again.
+    
+    A retransmission may arrive while the call is still being executed,
+    such as on a new connection after the old one was lost. wait() returns
+    its reply once the call is done."""
+    def __init__(self, max_entries: int = 256, ttl: float = 60.0,
+                 max_bytes: int = 2**24) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        # key => (time the call arrived, whether it is done, reply or None)
+        self._entries: 'OrderedDict[Hashable,Tuple[float,bool,Optional[bytes]]]' = OrderedDict()
+        self._bytes = 0 # In the replies kept
+        # key => future for the reply, for calls in progress that
+        # retransmissions are waiting for
+        self._waiters: 'Dict[Hashable,asyncio.Future[Optional[bytes]]]' = {}
+    
+    def _expire(self, now: float) -> None:
+        while(len(self._entries) > 0):
+            key, (t, _, _) = next(iter(self._entries.items()))
+            if(now - t < self.ttl and len(self._entries) < self.max_entries and
+               self._bytes <= self.max_bytes):
+                break
+            self.discard(key)
+    
+    def start(self, key: Hashable) -> bool:
+        """Record a new call. Returns False if key is a duplicate of a call
+        that was seen already."""
+        now = asyncio.get_event_loop().time()
+        self._expire(now)
+        if(key in self._entries):
+            return False
+        self._entries[key] = (now, False, None)
+        return True
+    
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """The reply to a duplicate call, or None if the original call is
+        still being executed or gets no reply"""
+        entry = self._entries.get(key)
+        if(entry is None):
+            return None
+        return entry[2]
+    
+    async def wait(self, key: Hashable) -> Optional[bytes]:
+        """The reply to a duplicate call, waiting for the original call to
+        be done if it is still being executed. None if it gets no reply, or
+        it failed or was forgotten in the meanwhile."""
+        entry = self._entries.get(key)
+        if(entry is None or entry[1]):
+            return self.get(key)
+        fut = self._waiters.get(key)
+        if(fut is None):
+            fut = asyncio.get_event_loop().create_future()
+            self._waiters[key] = fut
+        # Other retransmissions may be waiting as well
+        return await asyncio.shield(fut)
+    
+    def _wake(self, key: Hashable, reply: Optional[bytes]) -> None:
+        fut = self._waiters.pop(key, None)
+        if(fut is not None and not fut.done()):
+            fut.set_result(reply)
+    
+    def put(self, key: Hashable, reply: Optional[bytes]) -> None:
+        entry = self._entries.get(key)
+        if(entry is None):
+            return
+        self._wake(key, reply)
+        if(reply is not None and len(reply) > self.max_bytes):
+            self.discard(key)
+            return
+        self._entries[key] = (entry[0], True, reply)
+        if(reply is not None):
+            self._bytes += len(reply)
+            if(self._bytes > self.max_bytes):
+                self._expire(asyncio.get_event_loop().time())
+    
+    def discard(self, key: Hashable) -> None:
+        """Forget a call, such as one whose execution failed, so that it is
+        executed again if it is retransmitted"""
+        entry = self._entries.pop(key, None)
+        if(entry is not None and entry[2] is not None):
+            self._bytes -= len(entry[2])
+        self._wake(key, None)
 
 class rpc_srv(ABC):
-    def __init__(self, port: int) -> None:
+    def __init__(self, port: int, max_record_size: Optional[int] = None,
+                 unix_path: Optional[str] = None, udp_port: Optional[int] = None,
+                 cache_replies: bool = False) -> None:
+        """max_record_size limits the size of a received RPC record. Clients
+        sending anything larger are disconnected. None means no limit.
+        
+        If unix_path is given, the server also listens on a UNIX-domain
+        socket at that path, in addition to TCP. Local clients can skip the
+        TCP stack that way.
+        
+        If udp_port is given, calls are also accepted as UDP datagrams on
+        that port (0 for any). All datagrams share a single connection
+        object, so this suits stateless services.
+        
+        Calls over UDP always go through the duplicate request cache
+        (reply_cache). If cache_replies is set, so do calls over TCP and
+        UNIX sockets, so that a call a client retransmits after a timeout
+        or a reconnect isn't executed twice. Those are matched by the
+        peer's address, xid, program, version, procedure, and a checksum
+        of the call. The port is left out, as a client reconnects from
+        another one. Calls whose replies are only valid on their own
+        connection (see rpc_conn.connection_procedures) aren't cached."""
         self.port = port
-        self._server: Optional[asyncio.AbstractServer] = None
+        self.host = '127.0.0.1'
+        self.max_record_size = max_record_size
+        self.unix_path = unix_path
+        self.udp_port = udp_port
+        self.cache_replies = cache_replies
+        self.reply_cache = reply_cache()
+        self._servers: List[asyncio.AbstractServer] = []
+        self._udp_protocol: Optional[rpc_udp.rpc_datagram_protocol] = None
+        self._udp_conn: Optional[rpc_conn] = None
     
     @abstractmethod
     def create_conn(self) -> rpc_conn:
         pass
     
+    def stream_limit(self) -> int:
+        """Size of the stream read buffer. Large enough that a maximum sized
+        record doesn't have to pause and resume the socket many times."""
+        limit = 2**16 # asyncio default
+        if(self.max_record_size is not None):
+            limit = max(limit, min(self.max_record_size, 2**24))
+        return limit
+    
     async def HandleRPC(self,reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
         conn = self.create_conn()
-        
-        while True:
-            frag_hdr_data = await reader.read(4)
-            if(len(frag_hdr_data) != 4):
-                break
-            frag_len = struct.unpack(">I",frag_hdr_data)[0]
-            if((frag_len & 0x80000000) == 0):
-                raise Exception("Partial fragments not implemented")
-            frag_len = frag_len & 0x7FFFFFFF
-            data = await reader.read(frag_len)
-            if(len(data) != frag_len):
-                break
-            msg_up = RPCUnpacker(data)
-            msg = msg_up.unpack_rpc_msg()
-            #pprint(msg)
-            reply_data = await conn.handleMsg(msg,buf=data,buf_ix=msg_up.get_position())
-            #print(f"rdata={reply_data}")
-            if(reply_data is None):
-                raise Exception("cannot handle message")
-            writer.write(struct.pack(">I",0x80000000 | len(reply_data)))
-            writer.write(reply_data)
-        print(f"Closing socket")
-        writer.close()
-        if(sys.hexversion > 0x03070000):
-            await writer.wait_closed()
+        peer = writer.get_extra_info('peername')
+        # A retransmission after a reconnect comes from another port
+        host = peer[0] if isinstance(peer, tuple) else peer
+        try:
+            while True:
+                try:
+                    data = await rpc_record.read_record(reader, max_size=self.max_record_size)
+                except asyncio.IncompleteReadError:
+                    break
+                except rpc_record.RecordTooLarge as e:
+                    print(f"{e}, dropping connection")
+                    break
+                if(data is None):
+                    break
+                msg_up = RPCUnpacker(data)
+                msg = msg_up.unpack_rpc_msg()
+                #pprint(msg)
+                cbody = msg.body.cbody if msg.body is not None else None
+                if(self.cache_replies and cbody is not None and
+                   conn.cache_reply(cbody.prog, cbody.vers, cbody.proc)):
+                    key = (host, msg.xid, cbody.prog, cbody.vers, cbody.proc, zlib.crc32(data))
+                    reply_data = await self.handle_cached(conn, key, msg, data, msg_up.get_position())
+                else:
+                    reply_data = await conn.handleMsg(msg,buf=data,buf_ix=msg_up.get_position())
+                #print(f"rdata={reply_data}")
+                if(reply_data is None):
+                    # Replies and one-way calls aren't answered
+                    continue
+                rpc_record.write_record(writer, reply_data)
+                await writer.drain()
+        except ConnectionError as e:
+            print(f"Connection lost: {e!r}")
+        finally:
+            # Let the connection clean up even if the client vanished
+            # without tearing down its state first.
+            await conn.close()
+            print(f"Closing socket")
+            writer.close()
+            if(sys.hexversion > 0x03070000):
+                try:
+                    await writer.wait_closed()
+                except ConnectionError:
+                    pass
             
+    async def HandleDatagram(self, data: bytes, addr: Any) -> Optional[bytes]:
+        """Handle a call received over UDP from addr, returning the reply
+        to send back, if any"""
+        assert (self._udp_conn is not None)
+        msg_up = RPCUnpacker(data)
+        try:
+            msg = msg_up.unpack_rpc_msg()
+        except (EOFError, xdrlib.Error) as e:
+            # Not a valid RPC message. There's no connection to drop, so
+            # just ignore it.
+            print(f"Dropping bad datagram from {addr}: {e!r}")
+            return None
+        assert (msg.body is not None)
+        if(msg.body.mtype != rpc_const.CALL):
+            return None
+        cbody = msg.body.cbody
+        assert (cbody is not None)
+        key = (addr, msg.xid, cbody.prog, cbody.vers, cbody.proc)
+        reply_data = await self.handle_cached(self._udp_conn, key, msg, data, msg_up.get_position())
+        if(isinstance(reply_data, rpc_record.marked_record)):
+            # Datagrams have no record marking
+            return reply_data.payload()
+        return reply_data
+    
+    async def handle_cached(self, conn: rpc_conn, key: Hashable, msg: rpc_type.rpc_msg,
+                            data: bytes, buf_ix: int) -> Optional[bytes]:
+        """conn.handleMsg(), unless the call identified by key is a
+        duplicate. Then, the reply already sent is returned from the
+        cache, without executing the call again."""
+        if(not self.reply_cache.start(key)):
+            # A retransmission. If the call is still being executed, its
+            # reply is sent here once it is done, as the connection the call
+            # came in on may be gone.
+            print(f"Duplicate call xid={msg.xid} from {key[0]}")
+            return await self.reply_cache.wait(key)
+        try:
+            reply_data = await conn.handleMsg(msg, buf=data, buf_ix=buf_ix)
+        except BaseException:
+            self.reply_cache.discard(key)
+            raise
+        self.reply_cache.put(key, reply_data)
+        return reply_data
+    
+    @staticmethod
+    def success_reply_record(xid: int, size: int) -> Tuple[rpc_record.marked_record,int]:
+        """A record holding the header of a successful reply to call xid,
+        with room for size bytes of results after it. Returns the record and
+        the offset the results are to be encoded at."""
+        header = _success_reply_header
+        record = rpc_record.marked_record(len(header) + size)
+        offset = 4 + len(header)
+        record[4:offset] = header
+        struct.pack_into(">I", record, 4, xid)
+        return (record, offset)
+    
     @staticmethod
     def pack_success_data_msg(xid:int,data:bytes) -> bytes:
+        (record, offset) = rpc_srv.success_reply_record(xid, len(data))
+        record[offset:] = data
+        return record
+    
+    @staticmethod
+    def pack_reply_msg_unsupported(xid:int, stat:int) -> bytes:
+        """stat may be [rpc_const.PROG_UNAVAIL,rpc_const.PROC_UNAVAIL]"""
         reply = rpc_type.rpc_msg(
             xid=xid,
             body=rpc_type.rpc_msg_body(
                     mtype=rpc_const.REPLY,
-                    rbody=rpc_type.reply_body(
+                   rbody=rpc_type.reply_body(
                         stat=rpc_const.MSG_ACCEPTED,
                         areply=rpc_type.accepted_reply(
                                 verf=rpc_type.opaque_auth(flavor=rpc_const.AUTH_NONE,body=b''),
-                                reply_data=rpc_type.rpc_reply_data(stat=rpc_const.SUCCESS,results=b'')
+                                reply_data=rpc_type.rpc_reply_data(stat=stat)
                                 )
                         )
                     )
             )
         rpc_p = RPCPacker()
         rpc_p.pack_rpc_msg(reply)
-        # The generated packing functions don't actually append the data to be packed.
-        rpc_p.pack_fopaque(len(data),data)
-        #print(f"rep_data={reply}")
-        return rpc_p.get_buffer()             
+        return rpc_p.get_buffer()
+    
     @staticmethod
-    def pack_reply_msg_unsupported(xid:int, stat:int) -> bytes:
-        """stat may be [rpc_const.PROG_UNAVAIL,rpc_const.PROC_UNAVAIL]"""
+    def pack_reply_msg_prog_mismatch(xid:int, low:int, high:int) -> bytes:
+        """Reply to a call of a version of a program that isn't implemented.
+        low and high are the lowest and highest versions that are."""
         reply = rpc_type.rpc_msg(
             xid=xid,
             body=rpc_type.rpc_msg_body(
                     mtype=rpc_const.REPLY,
-                   rbody=rpc_type.reply_body(
+                    rbody=rpc_type.reply_body(
                         stat=rpc_const.MSG_ACCEPTED,
                         areply=rpc_type.accepted_reply(
                                 verf=rpc_type.opaque_auth(flavor=rpc_const.AUTH_NONE,body=b''),
-                                reply_data=rpc_type.rpc_reply_data(stat=stat)
+                                reply_data=rpc_type.rpc_reply_data(
+                                        stat=rpc_const.PROG_MISMATCH,
+                                        mismatch_info=rpc_type.rpc_mismatch_info(low=low, high=high))
                                 )
                         )
                     )
@@ -196,28 +533,173 @@ class rpc_srv(ABC):
         return rpc_p.get_buffer()
     
     async def open(self) -> None:
-        self._server = await asyncio.start_server(
-                self.HandleRPC, '127.0.0.1', self.port)
-        assert(self._server is not None)
-        if(self._server.sockets is None):
+        server = await asyncio.start_server(
+                self.HandleRPC, self.host, self.port, limit=self.stream_limit())
+        if(server.sockets is None):
             raise Exception("Server did not open socket")
-        addr = self._server.sockets[0].getsockname()
+        self._servers.append(server)
+        addr = server.sockets[0].getsockname()
         print(f'Serving {self.__class__.__name__} on TCP {addr}')
-        self.actual_port = self._server.sockets[0].getsockname()[1]
-        
+        self.actual_port = server.sockets[0].getsockname()[1]
+        if(self.unix_path is not None):
+            await self.open_unix(self.unix_path)
+        if(self.udp_port is not None):
+            await self.open_udp(self.udp_port)
+    
+    async def open_unix(self, path: str) -> None:
+        # A socket file left behind by a previous run would make the bind
+        # fail. Only sockets are removed, anything else is an error.
+        try:
+            if(stat.S_ISSOCK(os.stat(path).st_mode)):
+                os.unlink(path)
+        except FileNotFoundError:
+            pass
+        server = await asyncio.start_unix_server(
+                self.HandleRPC, path, limit=self.stream_limit())
+        self._servers.append(server)
+        print(f'Serving {self.__class__.__name__} on UNIX {path!r}')
+    
+    async def open_udp(self, port: int) -> None:
+        self._udp_conn = self.create_conn()
+        loop = asyncio.get_event_loop()
+        transport, protocol = await loop.create_datagram_endpoint(
+                lambda: rpc_udp.rpc_datagram_protocol(self.HandleDatagram),
+                local_addr=(self.host, port))
+        assert (isinstance(protocol, rpc_udp.rpc_datagram_protocol))
+        self._udp_protocol = protocol
+        addr = transport.get_extra_info('sockname')
+        print(f'Serving {self.__class__.__name__} on UDP {addr}')
+        self.actual_udp_port = addr[1]
+    
+    def connect_memory(self) -> Tuple[asyncio.StreamReader,asyncio.StreamWriter]:
+        """Open an in-memory connection to this server, see rpc_memory.
+        Returns the (reader, writer) of the client end. This works whether
+        or not the server is listening on a socket."""
+        return rpc_memory.open_connection(self.HandleRPC, server_limit=self.stream_limit())
+    
     async def main(self) -> None:
-        if(self._server is None):
+        if(len(self._servers) == 0):
             await self.open()
-        assert (self._server is not None)
-        async with self._server:
-            await self._server.serve_forever()
+        await asyncio.gather(*[s.serve_forever() for s in self._servers])
             
     async def close(self) -> None:
-        assert (self._server is not None)
+        assert (len(self._servers) > 0)
         print("Closing server")
-        self._server.close()
-        await self._server.wait_closed()
-        self._server = None
+        for s in self._servers:
+            s.close()
+        for s in self._servers:
+            await s.wait_closed()
+        self._servers = []
+        if(self._udp_protocol is not None):
+            await self._udp_protocol.close()
+            self._udp_protocol = None
+        if(self._udp_conn is not None):
+            await self._udp_conn.close()
+            self._udp_conn = None
+        if(self.unix_path is not None):
+            try:
+                os.unlink(self.unix_path)
+            except FileNotFoundError:
+                pass
     #def start(self):
     #    asyncio.run(self.main(), debug=True)
-        
\ No newline at end of file
+
+class rpc_host_conn(rpc_conn):
+    """A connection to an rpc_host. Each call is passed on to a connection
+    object of the program it is for, which is created by the first call to
+    that program on this connection."""
+    def __init__(self, host: 'rpc_host') -> None:
+        self.host = host
+        self._conns: List[Optional[rpc_conn]] = [None] * len(host._programs)
+        super().__init__()
+    
+    async def handleMsg(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> Optional[bytes]:
+        assert (rpc_msg.body is not None)
+        if(rpc_msg.body.mtype != rpc_const.CALL):
+            return None
+        assert(rpc_msg.xid is not None)
+        cbody = rpc_msg.body.cbody
+        assert (cbody is not None)
+        assert (cbody.prog is not None)
+        assert (cbody.vers is not None)
+        program = self.host._dispatch.get((cbody.prog,cbody.vers))
+        if(program is None):
+            print(f"RPC(prog={cbody.prog,cbody.vers}) not implemented")
+            versions = self.host._versions.get(cbody.prog)
+            if(versions is not None):
+                return rpc_srv.pack_reply_msg_prog_mismatch(rpc_msg.xid, low=versions[0], high=versions[1])
+            return rpc_srv.pack_reply_msg_unsupported(rpc_msg.xid,stat=rpc_const.PROG_UNAVAIL)
+        (ix, null_handled) = program
+        if(cbody.proc == NULLPROC and not null_handled):
+            # Pings don't need a connection object
+            return rpc_srv.success_reply_record(rpc_msg.xid, 0)[0]
+        conn = self._conns[ix]
+        if(conn is None):
+            conn = self.host._programs[ix]()
+            self._conns[ix] = conn
+        return await conn.handleMsg(rpc_msg, buf, buf_ix)
+    
+    def cache_reply(self, prog: int, vers: int, proc: int) -> bool:
+        program = self.host._dispatch.get((prog, vers))
+        if(program is None):
+            return True
+        return (prog, vers, proc) not in self.host._classes[program[0]].connection_procedures
+    
+    async def close(self) -> None:
+        for conn in self._conns:
+            if(conn is not None):
+                await conn.close()
+        self._conns = [None] * len(self._conns)
+
+class rpc_host(rpc_srv):
+    """Serves several RPC programs, and versions of them, on a single
+    listener, rather than a server (and port) for each of them. The programs
+    are registered before the server is opened:
+        
+        host = rpc_host(port=0)
+        host.register(vxi11_srv.vxi11_core_conn, core_srv.create_conn)
+        host.register(vxi11_srv.vxi11_abort_conn, async_srv.create_conn)
+    
+    Calls are dispatched by program and version to a connection object of
+    the class registered for them. Each client connection gets its own,
+    created when the client first calls that program. The dispatch table
+    belongs to the host, so hosts serving different programs don't
+    interfere."""
+    def __init__(self, port: int, max_record_size: Optional[int] = None,
+                 unix_path: Optional[str] = None, udp_port: Optional[int] = None,
+                 cache_replies: bool = False) -> None:
+        """The arguments are those of rpc_srv"""
+        # Functions creating a connection object, for each registration
+        self._programs: List[Callable[[],rpc_conn]] = []
+        # The connection class of each registration
+        self._classes: List[Type[rpc_conn]] = []
+        # (prog, vers) => (index into _programs, whether NULLPROC has a handler)
+        self._dispatch: Dict[Tuple[int,int],Tuple[int,bool]] = {}
+        # prog => (lowest, highest) version registered, for PROG_MISMATCH replies
+        self._versions: Dict[int,Tuple[int,int]] = {}
+        super().__init__(port, max_record_size=max_record_size, unix_path=unix_path,
+                         udp_port=udp_port, cache_replies=cache_replies)
+    
+    def register(self, conn_class: Type[rpc_conn],
+                 create_conn: Optional[Callable[[],rpc_conn]] = None) -> None:
+        """Serve the programs and versions implemented by conn_class.
+        create_conn returns a new connection object, conn_class() if not
+        given. Typically, it is the create_conn method of the server the
+        class belongs to.
+        
+        Raises ValueError if one of the program versions is served already."""
+        programs = conn_class._dispatch
+        for key in programs:
+            if(key in self._dispatch):
+                raise ValueError(f"RPC program {key} is registered already")
+        ix = len(self._programs)
+        self._programs.append(conn_class if create_conn is None else create_conn)
+        self._classes.append(conn_class)
+        for (prog, vers), handlers in programs.items():
+            null_handled = len(handlers) > NULLPROC and handlers[NULLPROC] is not None
+            self._dispatch[(prog, vers)] = (ix, null_handled)
+            (low, high) = self._versions.get(prog, (vers, vers))
+            self._versions[prog] = (min(low, vers), max(high, vers))
+    
+    def create_conn(self) -> rpc_host_conn:
+        return rpc_host_conn(self)
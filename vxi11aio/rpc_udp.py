@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+# ONC RPC over UDP (RFC 5531). Each datagram holds one whole RPC message,
+# without the record marking used on TCP.
+#
+# There is no connection, so the server side is an asyncio.DatagramProtocol
+# which hands each received call to rpc_srv.HandleDatagram(). Clients
+# retransmit calls when no reply arrives, so the server keeps the replies
+# it sent in a duplicate request cache (rpc_srv.reply_cache), and answers a
+# retransmitted call from the cache instead of executing it again.
+#
+# UDP suits small calls where setting up a TCP connection costs more than
+# the call itself, like portmapper lookups and SRQ notifications.
+
+import asyncio
+import random
+import traceback
+import xdrlib
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple, Union, cast
+
+from . import rpc_client
+from .xdr import rpc_type
+from .xdr.rpc_pack import RPCUnpacker
+
+# (data, peer address) => reply, or None to send nothing
+datagramHandlerType = Callable[[bytes,Any],Awaitable[Optional[bytes]]]
+
+class rpc_datagram_protocol(asyncio.DatagramProtocol):
+    """Server end of an RPC UDP endpoint. Calls are handled concurrently,
+    each in its own task."""
+    def __init__(self, handler: datagramHandlerType) -> None:
+        self.handler = handler
+        self.transport: Optional[asyncio.DatagramTransport] = None
+        self._tasks: Set['asyncio.Future[None]'] = set()
+        
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = cast(asyncio.DatagramTransport, transport)
+    
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        task = asyncio.ensure_future(self._handle(data, addr))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _handle(self, data: bytes, addr: Any) -> None:
+        try:
+            reply = await self.handler(data, addr)
+        except Exception:
+            # Not a bad datagram, which the handler drops, but a bug. Other
+            # calls carry on, and the client times out.
+            print(f"Handling datagram from {addr} failed:")
+            traceback.print_exc()
+            return
+        if(reply is not None and self.transport is not None and not self.transport.is_closing()):
+            self.transport.sendto(reply, addr)
+    
+    def error_received(self, exc: Exception) -> None:
+        print(f"UDP error: {exc!r}")
+    
+    async def close(self) -> None:
+        if(self.transport is not None):
+            self.transport.close()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+class _client_protocol(asyncio.DatagramProtocol):
+    def __init__(self, client: 'rpc_udp_client') -> None:
+        self.client = client
+    
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        self.client._reply_received(data)
+    
+    def error_received(self, exc: Exception) -> None:
+        # For example ICMP port unreachable. The call is retransmitted
+        # until it times out anyway.
+        print(f"UDP error: {exc!r}")
+
+class rpc_udp_client():
+    """Client side of RPC over UDP, with the same call() as
+    rpc_client.rpc_client.
+    
+    A call that gets no reply within timeout seconds is sent again, with the
+    same xid, up to retries times before asyncio.TimeoutError is raised.
+    Replies to one-way calls aren't waited for, so those are sent just once."""
+    def __init__(self, timeout: float = 1.0, retries: int = 3) -> None:
+        self.timeout = timeout
+        self.retries = retries
+        # Start at a random xid, so that calls from a new client on a reused
+        # port don't look like retransmissions of earlier calls.
+        self._xid = random.randrange(0x10000)
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._pending: Dict[int,asyncio.Future[Tuple[bytes,rpc_type.rpc_msg]]] = dict()
+    
+    async def connect(self, host: str, port: int) -> None:
+        print(f"Opening UDP RPC client to {host}:{port}")
+        loop = asyncio.get_event_loop()
+        transport, _ = await loop.create_datagram_endpoint(
+                lambda: _client_protocol(self), remote_addr=(host, port))
+        self._transport = transport
+    
+    def get_extra_info(self, name: str) -> Any:
+        assert (self._transport is not None)
+        return self._transport.get_extra_info(name)
+    
+    def _reply_received(self, data: bytes) -> None:
+        try:
+            msg_up = RPCUnpacker(data)
+            msg = msg_up.unpack_rpc_msg()
+        except (EOFError, xdrlib.Error) as e:
+            print(f"Dropping bad RPC reply: {e!r}")
+            return
+        fut = self._pending.pop(msg.xid, None)
+        if(fut is None):
+            # Usually the reply to a retransmitted call that was answered already
+            print(f"Dropping RPC reply with unexpected xid {msg.xid}")
+        elif(not fut.done()):
+            fut.set_result((data[msg_up.get_position():], msg))
+    
+    async def close(self) -> None:
+        assert (self._transport is not None)
+        self._transport.close()
+        self._transport = None
+        pending = self._pending
+        self._pending = dict()
+        for fut in pending.values():
+            if(not fut.done()):
+                fut.set_exception(ConnectionError("RPC client closed before the reply arrived"))
+    
+    async def call(self, prognum: int, vers: int, proc: int, data: bytes, read_reply: bool = True) -> Union[Tuple[None,None],Tuple[bytes,rpc_type.rpc_msg]]:
+        if(self._transport is None):
+            raise ConnectionError("RPC client is closed")
+        while self._xid in self._pending:
+            self._xid = (self._xid + 1) % 0x10000
+        xid = self._xid
+        self._xid = (self._xid + 1) % 0x10000
+        
+        b_msg = rpc_client.rpc_client.pack_call(xid, prognum, vers, proc) + data
+        if(not read_reply):
+            self._transport.sendto(b_msg)
+            return (None,None)
+        fut: asyncio.Future[Tuple[bytes,rpc_type.rpc_msg]] = asyncio.get_event_loop().create_future()
+        self._pending[xid] = fut
+        try:
+            for attempt in range(self.retries + 1):
+                if(self._transport is None):
+                    raise ConnectionError("RPC client is closed")
+                self._transport.sendto(b_msg)
+                try:
+                    return await asyncio.wait_for(asyncio.shield(fut), self.timeout)
+                except asyncio.TimeoutError:
+                    pass
+            raise asyncio.TimeoutError(f"No reply to RPC call {prognum}.{vers}.{proc} after {self.retries + 1} attempts")
+        finally:
+            if(self._pending.get(xid) is fut):
+                del self._pending[xid]
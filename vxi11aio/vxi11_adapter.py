@@ -46,10 +46,11 @@
 # waiting for the IO lock
 #
 # Then, an IO lock is acquired for the particular operation. Here, the
-# IO lock is global to the adapter.
+# IO lock is global to the adapter. By default the exclusive lock is too,
+# but a link's lock_scope may narrow both to a single device.
 
 import asyncio
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 from .vxi11_srv import vxi11_deviceFlags, vxi11_errorCodes, vxi11_core_conn
 
 class vxi11_link:
@@ -59,6 +60,15 @@ class vxi11_link:
         self.link_id = link_id
         self.conn = conn
         self.srq_handle = None # set to a bytes[40] when SRQ are enabled
+        # Holds the adapter_excl_lock, adapter_excl_lock_owner and
+        # adapter_io_lock which this link uses. Adapters for several devices
+        # can point this at a per-device object instead.
+        self.lock_scope: Any = adapter
+        self.last_activity = asyncio.get_event_loop().time()
+    
+    def touch(self) -> None:
+        """Mark the link as in use, so that it is not reaped as idle"""
+        self.last_activity = asyncio.get_event_loop().time()
         
     async def read(self, requestSize: int, io_timeout: int, lock_timeout: int, flags: vxi11_deviceFlags,
                    termChar: int) -> Tuple[vxi11_errorCodes, int, bytes]:
@@ -134,12 +144,28 @@ class vxi11_link:
         """
         return (vxi11_errorCodes.OPERATION_NOT_SUPPORTED,b'')  
     
+    async def enable_srq(self, handle: Optional[bytes]) -> vxi11_errorCodes:
+        """Enable SRQs, sent with handle, or disable them if handle is None
+        
+        Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, OPERATION_NOT_SUPPORTED
+        """
+        self.srq_handle = handle
+        return vxi11_errorCodes.NO_ERROR
+    
+    async def abort(self) -> vxi11_errorCodes:
+        """Abort an operation in progress on this link. Called from the
+        abort channel, while the operation may still be running.
+        
+        Errorcode may be NO_ERROR or INVALID_LINK_IDENTIFIER
+        """
+        return vxi11_errorCodes.NO_ERROR # We don't really do it, but this is kinda following the spec
+    
     async def destroy(self) -> vxi11_errorCodes:
         """If it got here, link must exist. NO_ERROR is only valid response"""
         # Unlock if necessary
-        if(self.adapter.adapter_excl_lock_owner is self):
-            self.adapter.adapter_excl_lock_owner = None
-            self.adapter.adapter_excl_lock.release()
+        if(self.lock_scope.adapter_excl_lock_owner is self):
+            self.lock_scope.adapter_excl_lock_owner = None
+            self.lock_scope.adapter_excl_lock.release()
         return vxi11_errorCodes.NO_ERROR
     
     async def device_lock(self, flags: vxi11_deviceFlags, lock_timeout: int) -> vxi11_errorCodes:
@@ -148,19 +174,19 @@ class vxi11_link:
         Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER,
         DEVICE_LOCKED_BY_ANOTHER_LINK, or ABORT
         """
-        if(self.adapter.adapter_excl_lock_owner is self):
+        if(self.lock_scope.adapter_excl_lock_owner is self):
             return (vxi11_errorCodes.DEVICE_LOCKED_OUT_BY_ANOTHER_LINK)
         
         if(flags.WAITLOCK): # requesting waiting
             try:
-                await asyncio.wait_for(self.adapter.adapter_excl_lock.acquire(), timeout=(lock_timeout+1)/1000.0)
+                await asyncio.wait_for(self.lock_scope.adapter_excl_lock.acquire(), timeout=(lock_timeout+1)/1000.0)
             except asyncio.TimeoutError:
                 return (vxi11_errorCodes.DEVICE_LOCKED_OUT_BY_ANOTHER_LINK) 
         else:
-            if(self.adapter.adapter_excl_lock_owner is not None and self.adapter.adapter_excl_lock_owner is not self):
+            if(self.lock_scope.adapter_excl_lock_owner is not None and self.lock_scope.adapter_excl_lock_owner is not self):
                 return (vxi11_errorCodes.DEVICE_LOCKED_OUT_BY_ANOTHER_LINK)
-            await self.adapter.adapter_excl_lock.acquire()
-        self.adapter.adapter_excl_lock_owner = self
+            await self.lock_scope.adapter_excl_lock.acquire()
+        self.lock_scope.adapter_excl_lock_owner = self
         return (vxi11_errorCodes.NO_ERROR) 
     
     async def device_unlock(self) -> vxi11_errorCodes:
@@ -168,9 +194,9 @@ class vxi11_link:
         
         Errorcode may be NO_ERROR, INVALID_LINK_IDENTIFIER, NO_LOCK_HELD_BY_THIS_LINK
         """
-        if(self.adapter.adapter_excl_lock_owner is self):
-            self.adapter.adapter_excl_lock.release()
-            self.adapter.adapter_excl_lock_owner = None
+        if(self.lock_scope.adapter_excl_lock_owner is self):
+            self.lock_scope.adapter_excl_lock.release()
+            self.lock_scope.adapter_excl_lock_owner = None
             return (vxi11_errorCodes.NO_ERROR)
         return (vxi11_errorCodes.NO_LOCK_HELD_BY_THIS_LINK)
     
@@ -181,41 +207,65 @@ class vxi11_link:
         operation does not prevent another link from acquiring the exclusive lock"""
         
         # Forst, check on the exclusive lock
+        if(not await self.wait_excl_lock(flags, lock_timeout=lock_timeout)):
+            return False
+            
+        # Wait for up to io_timeout to get the io_lock
+        try:
+            await asyncio.wait_for(self.lock_scope.adapter_io_lock.acquire(), timeout=(1+io_timeout)/1000.0)
+        except asyncio.TimeoutError:
+            return False
+        return True
+    
+    async def wait_excl_lock(self, flags: vxi11_deviceFlags, lock_timeout: int) -> bool:
+        """Returns true if no other link holds the exclusive lock, waiting
+        for it to be released if WAITLOCK is set. The lock is not taken."""
         if(flags.WAITLOCK): # requesting waiting
             # Does another link already hold the exclusive lock?
-            if((self.adapter.adapter_excl_lock_owner is not None) and (self.adapter.adapter_excl_lock_owner is not self)):
+            if((self.lock_scope.adapter_excl_lock_owner is not None) and (self.lock_scope.adapter_excl_lock_owner is not self)):
                 try:
                     # Take lock temporarily as a way to implement the timeout
-                    await asyncio.wait_for(self.adapter.adapter_excl_lock.acquire(), timeout=(1+lock_timeout)/1000.0)
-                    self.adapter.adapter_excl_lock.release()
+                    await asyncio.wait_for(self.lock_scope.adapter_excl_lock.acquire(), timeout=(1+lock_timeout)/1000.0)
+                    self.lock_scope.adapter_excl_lock.release()
                 except asyncio.TimeoutError:
                     return False
             
         else: # requesting no waiting
             # Does another link already hold the excl lock?
-            if(self.adapter.adapter_excl_lock_owner is not None and self.adapter.adapter_excl_lock_owner is not self):
+            if(self.lock_scope.adapter_excl_lock_owner is not None and self.lock_scope.adapter_excl_lock_owner is not self):
                 return False
-            
-        # Wait for up to io_timeout to get the io_lock
-        try:
-            await asyncio.wait_for(self.adapter.adapter_io_lock.acquire(), timeout=(1+io_timeout)/1000.0)
-        except asyncio.TimeoutError:
-            return False
         return True
         
     def release_io_lock(self) -> None:
         """Returns true if lock is acquired"""
-        self.adapter.adapter_io_lock.release()
+        self.lock_scope.adapter_io_lock.release()
+
+# The spec requires that maxRecvSize be at least 1024
+MIN_MAX_RECV_SIZE = 1024
+# Large enough that typical block transfers take a single device_write
+DEFAULT_MAX_RECV_SIZE = 4*1024*1024
 
 class vxi11_adapter:   
     adapter_io_lock: asyncio.Lock
     adapter_excl_lock: asyncio.Lock
     adapter_excl_lock_owner: Optional[vxi11_link]
     
-    def __init__(self) -> None:
+    def __init__(self, max_links: Optional[int] = None,
+                 max_recv_size: int = DEFAULT_MAX_RECV_SIZE) -> None:
+        """max_links limits the number of links open on this adapter, across
+        all connections. None means no limit.
+        
+        max_recv_size is the largest device_write, in bytes, which links
+        will accept. It is reported to clients as maxRecvSize."""
+        if(max_recv_size < MIN_MAX_RECV_SIZE):
+            raise ValueError(f"max_recv_size must be at least {MIN_MAX_RECV_SIZE}")
         self.adapter_io_lock = asyncio.Lock()
         self.adapter_excl_lock = asyncio.Lock()
         self.adapter_excl_lock_owner = None
+        self.max_links = max_links
+        self.max_recv_size = max_recv_size
+        # link_id => link, for all links open on this adapter
+        self.links: Dict[int,vxi11_link] = dict()
     
     async def create_link(self, clientId: int, lockDevice: bool,
                           lock_timeout: int, device: bytes, link_id: int,
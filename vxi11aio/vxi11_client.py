@@ -0,0 +1,365 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+# This implements a VXI-11 client, for talking to networked instruments (or
+# to this server).
+#
+# A vxi11_client holds the core channel connection to one server, plus the
+# abort channel and interrupt channel once they are needed. Links are
+# created with vxi11_client.create_link(), and the returned
+# vxi11_client_link has the same methods as an adapter's vxi11_link, so
+# that it can stand in for one.
+#
+# Calls on the core channel are pipelined: calls made concurrently, such as
+# from different links, are all sent right away rather than one at a time.
+# The server still handles them in order. The abort channel is a separate
+# connection, so an abort is not held up by the call it aborts.
+
+import asyncio
+import struct
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from . import rpc_client, portmap_client
+from .rpc_srv import rpc_conn, rpc_srv
+from .vxi11_srv import vxi11_errorCodes, vxi11_deviceFlags, vxi11_readReason
+from .xdr import rpc_type, vxi11_clnt, vxi11_const, vxi11_type
+from .xdr.vxi11_pack import VXI11Unpacker
+
+def error_code(error: int) -> vxi11_errorCodes:
+    """The error code a server replied with. Codes VXI-11 doesn't define
+    are reported as IO_ERROR."""
+    try:
+        return vxi11_errorCodes(error)
+    except ValueError:
+        print(f"Unknown VXI-11 error code {error}, reporting IO_ERROR")
+        return vxi11_errorCodes.IO_ERROR
+
+class vxi11_intr_conn(rpc_conn):
+    def __init__(self, srv: 'vxi11_intr_srv') -> None:
+        self.srv = srv
+        super().__init__()
+    
+    async def handle_device_intr_srq(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> Optional[bytes]:
+        """void device_intr_srq (Device_SrqParms) = 30;
+        
+        This is a one-way call, so nothing is sent back."""
+        up = VXI11Unpacker(buf)
+        up.set_position(buf_ix)
+        arg = up.unpack_Device_SrqParms()
+        assert(arg.handle is not None)
+        self.srv.srq_received(arg.handle)
+        return None
+    
+    call_dispatch_table = {
+            (vxi11_const.DEVICE_INTR,vxi11_const.DEVICE_INTR_VERSION): {
+                    vxi11_const.device_intr_srq: handle_device_intr_srq
+            }
+        }
+
+class vxi11_intr_srv(rpc_srv):
+    """Receives SRQs from a VXI-11 server, calling the callback registered
+    for the handle of each. With udp, SRQs are received as datagrams, on
+    actual_udp_port, as well as over TCP."""
+    def __init__(self, host: str, port: int = 0, udp: bool = False) -> None:
+        super().__init__(port, udp_port=(port if udp else None))
+        self.host = host
+        # handle => callback
+        self.handlers: Dict[bytes,Callable[[bytes],Any]] = dict()
+        
+    def create_conn(self) -> vxi11_intr_conn:
+        return vxi11_intr_conn(self)
+    
+    def srq_received(self, handle: bytes) -> None:
+        cb = self.handlers.get(handle)
+        if(cb is None):
+            print(f"Ignoring SRQ for unknown handle {handle!r}")
+            return
+        cb(handle)
+
+class vxi11_client_link():
+    def __init__(self, client: 'vxi11_client', lid: int, abortPort: int, maxRecvSize: int) -> None:
+        self.client = client
+        self.lid = lid
+        self.abortPort = abortPort
+        self.maxRecvSize = maxRecvSize
+        self.srq_handle: Optional[bytes] = None
+        
+    async def write(self, io_timeout: int, lock_timeout: int, flags: vxi11_deviceFlags,
+                    data: bytes) -> Tuple[vxi11_errorCodes,int]:
+        """Return (errorCode, size)
+        
+        Data larger than maxRecvSize is split over several device_write
+        calls, with END (if set) only on the last. These are not pipelined,
+        as the rest of the data must not reach the device after an error."""
+        size = 0
+        while True:
+            chunk = data[size:size+self.maxRecvSize]
+            last = (size + len(chunk)) >= len(data)
+            chunk_flags = flags if last else (flags & ~vxi11_deviceFlags.END)
+            arg = vxi11_type.Device_WriteParms(lid=self.lid, io_timeout=io_timeout, lock_timeout=lock_timeout,
+                                               flags=chunk_flags, data=chunk)
+            rsp = await self.client.core_stubs().device_write(arg)
+            size += rsp.size
+            if(rsp.error != vxi11_errorCodes.NO_ERROR):
+                return (error_code(rsp.error),size)
+            if(last):
+                return (vxi11_errorCodes.NO_ERROR,size)
+            if(rsp.size < len(chunk)):
+                return (vxi11_errorCodes.IO_ERROR,size)
+    
+    async def read(self, requestSize: int, io_timeout: int, lock_timeout: int, flags: vxi11_deviceFlags,
+                   termChar: int) -> Tuple[vxi11_errorCodes,int,bytes]:
+        """Return (errorCode, vxi11_readReason, data: bytes)
+        
+        Calls device_read until END or the term char is received, or
+        requestSize bytes have been read. On an error, the data received
+        before it is returned along with the error."""
+        chunks = []
+        received = 0
+        while True:
+            arg = vxi11_type.Device_ReadParms(lid=self.lid, requestSize=requestSize-received, io_timeout=io_timeout,
+                                              lock_timeout=lock_timeout, flags=flags, termChar=termChar)
+            rsp = await self.client.core_stubs().device_read(arg)
+            chunks.append(rsp.data)
+            received += len(rsp.data)
+            if(rsp.error != vxi11_errorCodes.NO_ERROR):
+                return (error_code(rsp.error),rsp.reason,b''.join(chunks))
+            if((rsp.reason & (vxi11_readReason.END | vxi11_readReason.CHR)) or received >= requestSize):
+                return (vxi11_errorCodes.NO_ERROR,rsp.reason,b''.join(chunks))
+    
+    async def _generic(self, stub: Callable[[vxi11_type.Device_GenericParms],Awaitable[vxi11_type.Device_Error]],
+                       flags: vxi11_deviceFlags, lock_timeout: int, io_timeout: int) -> vxi11_errorCodes:
+        arg = vxi11_type.Device_GenericParms(lid=self.lid, flags=flags, lock_timeout=lock_timeout, io_timeout=io_timeout)
+        rsp = await stub(arg)
+        return error_code(rsp.error)
+    
+    async def read_stb(self, flags: vxi11_deviceFlags, lock_timeout: int,
+                       io_timeout: int) -> Tuple[vxi11_errorCodes,int]:
+        """Return (errorCode, stb)"""
+        arg = vxi11_type.Device_GenericParms(lid=self.lid, flags=flags, lock_timeout=lock_timeout, io_timeout=io_timeout)
+        rsp = await self.client.core_stubs().device_readstb(arg)
+        return (error_code(rsp.error),rsp.stb)
+    
+    async def trigger(self, flags: vxi11_deviceFlags, lock_timeout: int,
+                      io_timeout: int) -> vxi11_errorCodes:
+        return await self._generic(self.client.core_stubs().device_trigger, flags, lock_timeout, io_timeout)
+    
+    async def clear(self, flags: vxi11_deviceFlags, lock_timeout: int,
+                    io_timeout: int) -> vxi11_errorCodes:
+        return await self._generic(self.client.core_stubs().device_clear, flags, lock_timeout, io_timeout)
+    
+    async def remote(self, flags: vxi11_deviceFlags, lock_timeout: int,
+                     io_timeout: int) -> vxi11_errorCodes:
+        return await self._generic(self.client.core_stubs().device_remote, flags, lock_timeout, io_timeout)
+    
+    async def local(self, flags: vxi11_deviceFlags, lock_timeout: int,
+                    io_timeout: int) -> vxi11_errorCodes:
+        return await self._generic(self.client.core_stubs().device_local, flags, lock_timeout, io_timeout)
+    
+    async def docmd(self, flags: vxi11_deviceFlags, io_timeout: int, lock_timeout: int,
+                    cmd: int, network_order: bool, datasize: int,
+                    data_in: bytes) -> Tuple[vxi11_errorCodes,bytes]:
+        """Return (errorCode,data_out)"""
+        arg = vxi11_type.Device_DocmdParms(lid=self.lid, flags=flags, io_timeout=io_timeout, lock_timeout=lock_timeout,
+                                           cmd=cmd, network_order=network_order, datasize=datasize, data_in=data_in)
+        rsp = await self.client.core_stubs().device_docmd(arg)
+        return (error_code(rsp.error),rsp.data_out)
+    
+    async def device_lock(self, flags: vxi11_deviceFlags, lock_timeout: int) -> vxi11_errorCodes:
+        arg = vxi11_type.Device_LockParms(lid=self.lid, flags=flags, lock_timeout=lock_timeout)
+        rsp = await self.client.core_stubs().device_lock(arg)
+        return error_code(rsp.error)
+    
+    async def device_unlock(self) -> vxi11_errorCodes:
+        rsp = await self.client.core_stubs().device_unlock(self.lid)
+        return error_code(rsp.error)
+    
+    async def enable_srq(self, callback: Optional[Callable[[bytes],Any]],
+                         handle: Optional[bytes] = None) -> vxi11_errorCodes:
+        """Call callback(handle) on each SRQ from this link's device, or
+        disable SRQs if callback is None. The interrupt channel is created
+        as needed. handle defaults to one unique to the link."""
+        if(callback is None):
+            arg = vxi11_type.Device_EnableSrqParms(lid=self.lid, enable=False, handle=b'')
+        else:
+            await self.client.create_intr_chan()
+            if(handle is None):
+                handle = b"lid%d" % (self.lid,)
+            arg = vxi11_type.Device_EnableSrqParms(lid=self.lid, enable=True, handle=handle)
+        rsp = await self.client.core_stubs().device_enable_srq(arg)
+        if(rsp.error == vxi11_errorCodes.NO_ERROR):
+            intr_srv = self.client.intr_srv
+            if(self.srq_handle is not None and intr_srv is not None):
+                intr_srv.handlers.pop(self.srq_handle, None)
+            self.srq_handle = handle if callback is not None else None
+            if(callback is not None and intr_srv is not None):
+                assert(handle is not None)
+                intr_srv.handlers[handle] = callback
+        return error_code(rsp.error)
+    
+    async def abort(self) -> vxi11_errorCodes:
+        """Abort the call in progress on this link, over the abort channel"""
+        cl = await self.client.abort_client(self.abortPort)
+        rsp = await vxi11_clnt.DEVICE_ASYNC_1_clnt(cl).device_abort(self.lid)
+        return error_code(rsp.error)
+    
+    async def destroy(self) -> vxi11_errorCodes:
+        if(self.srq_handle is not None and self.client.intr_srv is not None):
+            self.client.intr_srv.handlers.pop(self.srq_handle, None)
+            self.srq_handle = None
+        self.client.links.pop(self.lid, None)
+        rsp = await self.client.core_stubs().destroy_link(self.lid)
+        return error_code(rsp.error)
+        
+class vxi11_client():
+    def __init__(self, udp_intr: bool = False) -> None:
+        """With udp_intr, the server is asked to send SRQs over UDP"""
+        self.udp_intr = udp_intr
+        self.host: Optional[str] = None
+        self.core: Optional[rpc_client.rpc_client] = None
+        self.core_clnt: Optional[vxi11_clnt.DEVICE_CORE_1_clnt] = None
+        self.intr_srv: Optional[vxi11_intr_srv] = None
+        self.links: Dict[int,vxi11_client_link] = dict()
+        self._abort: Optional[rpc_client.rpc_client] = None
+        self._abort_lock: Optional[asyncio.Lock] = None
+        # Held while the interrupt channel is created
+        self._intr_lock: Optional[asyncio.Lock] = None
+        self._intr_task: Optional[asyncio.Task[Any]] = None
+        
+    async def connect(self, host: str, port: Optional[int] = None) -> None:
+        """Connect to the core channel. Without a port, it is looked up
+        with the portmapper on host."""
+        if(port is None):
+            pm = rpc_client.rpc_client()
+            await pm.connect(host, 111)
+            try:
+                port = await portmap_client.getport(pm, vxi11_const.DEVICE_CORE, vxi11_const.DEVICE_CORE_VERSION)
+            finally:
+                await pm.close()
+            if(port == 0):
+                raise ConnectionError(f"No VXI-11 core channel registered on {host}")
+        self.host = host
+        self._abort_lock = asyncio.Lock()
+        self._intr_lock = asyncio.Lock()
+        self.core = rpc_client.rpc_client()
+        await self.core.connect(host, port)
+        self.core_clnt = vxi11_clnt.DEVICE_CORE_1_clnt(self.core)
+    
+    async def connect_memory(self, srv: rpc_srv) -> None:
+        """Connect to the core channel of srv, in the same process, over an
+        in-memory connection. The abort and interrupt channels can't be
+        used this way."""
+        self._abort_lock = asyncio.Lock()
+        self._intr_lock = asyncio.Lock()
+        self.core = rpc_client.rpc_client()
+        await self.core.connect_memory(srv)
+        self.core_clnt = vxi11_clnt.DEVICE_CORE_1_clnt(self.core)
+    
+    async def close(self) -> None:
+        """Close all channels. Links which are still open are destroyed by
+        the server once the core channel is gone."""
+        self.links = dict()
+        if(self._intr_task is not None):
+            assert(self.intr_srv is not None)
+            await self.intr_srv.close()
+            self._intr_task.cancel()
+            try:
+                await self._intr_task
+            except asyncio.CancelledError:
+                pass
+            self._intr_task = None
+            self.intr_srv = None
+        if(self._abort is not None):
+            await self._abort.close()
+            self._abort = None
+        if(self.core is not None):
+            await self.core.close()
+            self.core = None
+            self.core_clnt = None
+    
+    def core_stubs(self) -> vxi11_clnt.DEVICE_CORE_1_clnt:
+        """The generated stubs making calls on the core channel"""
+        assert (self.core_clnt is not None)
+        return self.core_clnt
+        
+    async def create_link(self, device: bytes, lockDevice: bool = False, lock_timeout: int = 0,
+                          clientId: int = 0) -> Tuple[vxi11_errorCodes,Optional[vxi11_client_link]]:
+        """ Returns (errorcode,link)"""
+        arg = vxi11_type.Create_LinkParms(clientId=clientId, lockDevice=lockDevice,
+                                          lock_timeout=lock_timeout, device=device)
+        rsp = await self.core_stubs().create_link(arg)
+        if(rsp.error != vxi11_errorCodes.NO_ERROR):
+            return (error_code(rsp.error),None)
+        link = vxi11_client_link(self, lid=rsp.lid, abortPort=rsp.abortPort, maxRecvSize=rsp.maxRecvSize)
+        self.links[link.lid] = link
+        return (vxi11_errorCodes.NO_ERROR,link)
+    
+    async def abort_client(self, port: int) -> rpc_client.rpc_client:
+        """The connection to the abort channel, which is opened on first use"""
+        assert (self._abort_lock is not None)
+        async with self._abort_lock:
+            if(self._abort is None):
+                assert (self.host is not None)
+                cl = rpc_client.rpc_client()
+                await cl.connect(self.host, port)
+                self._abort = cl
+        return self._abort
+    
+    async def create_intr_chan(self) -> None:
+        """Start the interrupt server, and ask the server to connect to it,
+        unless that has been done already"""
+        assert (self._intr_lock is not None)
+        async with self._intr_lock:
+            if(self.intr_srv is None):
+                await self._create_intr_chan()
+    
+    async def _create_intr_chan(self) -> None:
+        assert (self.core is not None)
+        # Listen on the address the server reaches us at
+        local_addr = self.core.get_extra_info('sockname')[0]
+        srv = vxi11_intr_srv(host=local_addr, udp=self.udp_intr)
+        await srv.open()
+        self.intr_srv = srv
+        self._intr_task = asyncio.ensure_future(srv.main())
+        if(self.udp_intr):
+            hostPort = srv.actual_udp_port
+            progFamily = vxi11_const.DEVICE_UDP
+        else:
+            hostPort = srv.actual_port
+            progFamily = vxi11_const.DEVICE_TCP
+        arg = vxi11_type.Device_RemoteFunc(hostAddr=struct.unpack(">I", bytes(int(x) for x in local_addr.split(".")))[0],
+                                           hostPort=hostPort,
+                                           progNum=vxi11_const.DEVICE_INTR, progVers=vxi11_const.DEVICE_INTR_VERSION,
+                                           progFamily=progFamily)
+        rsp = await self.core_stubs().create_intr_chan(arg)
+        if(rsp.error not in [vxi11_errorCodes.NO_ERROR, vxi11_errorCodes.CHANNEL_ALREADY_ESTABLISHED]):
+            raise Exception(f"Unable to create interrupt channel: {error_code(rsp.error)!r}")
@@ -34,13 +34,13 @@
 
 import asyncio
 import enum
-from typing import Any, Dict, List, Optional
-from .rpc_srv import rpc_conn, rpc_srv
+from typing import Any, Dict, List, Optional, Union
+from .rpc_srv import rpc_srv
 
-from .xdr import vxi11_const, vxi11_type, rpc_type
-from .xdr.vxi11_pack import VXI11Packer, VXI11Unpacker
+from .xdr import vxi11_clnt, vxi11_const, vxi11_pack, vxi11_svc, vxi11_type, rpc_type
 
 from .rpc_client import rpc_client
+from .rpc_udp import rpc_udp_client
 
 class vxi11_errorCodes(enum.IntEnum):
     NO_ERROR = 0
@@ -73,16 +73,18 @@ class vxi11_intr_client(rpc_client):
     async def device_intr_srq(self, handle: bytes) -> None:
         """void device_intr_srq (Device_SrqParms) = 30;"""
         args = vxi11_type.Device_SrqParms(handle=handle)
-        p = VXI11Packer()
-        p.pack_Device_SrqParms(args)
-        rsp, msg = await self.call(vxi11_const.DEVICE_INTR, vers=vxi11_const.DEVICE_INTR_VERSION,
-                  proc=vxi11_const.device_intr_srq, data = p.get_buffer(), read_reply = False)
+        await vxi11_clnt.DEVICE_INTR_1_clnt(self).device_intr_srq(args, read_reply = False)
         print("SRQ sent!")
 
+class vxi11_intr_udp_client(rpc_udp_client):
+    # device_intr_srq is a one-way call, so it is sent as a single datagram,
+    # without retransmission. A lost SRQ is lost, as the spec allows.
+    device_intr_srq = vxi11_intr_client.device_intr_srq
+
 # Handles the connection, and queueing interupt requests
 class vxi11_intr_executor():
     def __init__(self) -> None:
-        self._intr_client: Optional[vxi11_intr_client] = None
+        self._intr_client: Optional[Union[vxi11_intr_client,vxi11_intr_udp_client]] = None
         self._intr_queue: asyncio.Queue[bytes] = asyncio.Queue()
         self._task: Optional[asyncio.Task[Any]] = None
         pass
@@ -91,8 +93,11 @@ class vxi11_intr_executor():
         if(self._intr_client is not None):
             self._intr_queue.put_nowait(handle)
     
-    async def connect(self, host: str, port: int) -> None:
-        self._intr_client = vxi11_intr_client()
+    async def connect(self, host: str, port: int, udp: bool = False) -> None:
+        if(udp):
+            self._intr_client = vxi11_intr_udp_client()
+        else:
+            self._intr_client = vxi11_intr_client()
         await self._intr_client.connect(host, port)
         
     async def disconnect(self) -> None:
@@ -127,53 +132,136 @@ class vxi11_intr_executor():
         self._task = None
         
     
-class vxi11_core_conn(rpc_conn):
+class vxi11_core_conn(vxi11_svc.DEVICE_CORE_1_svc):
+    # Links and the interrupt channel belong to the connection that created
+    # them, and are gone after a reconnect
+    connection_procedures = frozenset(
+            (vxi11_const.DEVICE_CORE, vxi11_const.DEVICE_CORE_VERSION, proc)
+            for proc in [vxi11_const.create_link, vxi11_const.create_intr_chan])
+    
     def __init__(self,srv: 'vxi11_core_srv') -> None:
         self.links: Dict[int,'vxi11_adapter.vxi11_link'] = dict()
         self.srv = srv
         self._intr_exec: Optional[vxi11_intr_executor] = None
+        self._reaper_task: Optional[asyncio.Task[Any]] = None
+        self._calls_in_progress = 0
+        self._current_link: Optional['vxi11_adapter.vxi11_link'] = None
         super().__init__()
+    
+    def _get_link(self, lid: int) -> Optional['vxi11_adapter.vxi11_link']:
+        """Look up a link owned by this connection, marking it as active"""
+        link = self.links.get(lid)
+        if(link is not None):
+            link.touch()
+            self._current_link = link
+        return link
+    
+    async def _destroy_link(self, lid: int) -> vxi11_errorCodes:
+        link = self.links[lid]
+        # Remove link prior to destroying it, to ensure another connection
+        # doesn't use the link in the meanwhile
+        del self.links[lid]
+        link.adapter.links.pop(lid, None)
+        try:
+            return await link.destroy()
+        finally:
+            # Even if destroying it failed, the link is gone, and mustn't
+            # keep the device locked
+            if(link.lock_scope.adapter_excl_lock_owner is link):
+                link.lock_scope.adapter_excl_lock_owner = None
+                link.lock_scope.adapter_excl_lock.release()
+    
+    async def handleMsg(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> Optional[bytes]:
+        self._calls_in_progress += 1
+        try:
+            return await super().handleMsg(rpc_msg, buf, buf_ix)
+        finally:
+            self._calls_in_progress -= 1
+            # A long running call shouldn't make its link look idle once it returns
+            if(self._current_link is not None):
+                self._current_link.touch()
+                self._current_link = None
+    
+    async def _reap_idle_links(self, idle_timeout: float) -> None:
+        loop = asyncio.get_event_loop()
+        while True:
+            await asyncio.sleep(idle_timeout / 2)
+            # Links are only used by calls on this connection, so none of
+            # them can be idle while a call is being handled.
+            if(self._calls_in_progress > 0):
+                continue
+            now = loop.time()
+            for lid, link in list(self.links.items()):
+                if((now - link.last_activity) > idle_timeout and lid in self.links):
+                    print(f"Reaping link {lid}, idle for {now - link.last_activity:.1f} s")
+                    await self._destroy_link(lid)
+    
+    async def close(self) -> None:
+        """Destroy all links still owned by this connection. This releases
+        any exclusive locks they hold and stops the interrupt channel."""
+        if(self._reaper_task is not None):
+            self._reaper_task.cancel()
+            try:
+                await self._reaper_task
+            except asyncio.CancelledError:
+                pass
+            self._reaper_task = None
+        for lid in list(self.links.keys()):
+            print(f"Destroying abandoned link {lid}")
+            try:
+                await self._destroy_link(lid)
+            except Exception as e:
+                # Carry on, so that the other links and the interrupt
+                # channel are cleaned up as well
+                print(f"Destroying link {lid} failed: {e!r}")
+        if(self._intr_exec is not None):
+            await self._intr_exec.stop()
+            self._intr_exec = None
         
-    @rpc_conn.callHandler(
-            VXI11Unpacker,VXI11Unpacker.unpack_Create_LinkParms,
-            VXI11Packer,VXI11Packer.pack_Create_LinkResp)
     async def handle_create_link(self,rpc_msg: rpc_type.rpc_msg, arg: vxi11_type.Create_LinkParms) -> vxi11_type.Create_LinkResp:
         """ Create_LinkResp    create_link        (Create_LinkParms)      = 10; """
-        lid = self.srv.next_link_id
-        self.srv.next_link_id = self.srv.next_link_id + 1
-        (err,link) = await self.srv.adapters[0].create_link(clientId = arg.clientId, lockDevice = arg.lockDevice,
-                             lock_timeout = arg.lock_timeout, device = arg.device, link_id = lid, conn = self)
-        self.links[lid] = link
+        adapter = self.srv.adapters[0]
+        lid = 0
+        if(self.srv.max_links_per_conn is not None and len(self.links) >= self.srv.max_links_per_conn):
+            err = vxi11_errorCodes.OUT_OF_RESOURCES
+        elif(adapter.max_links is not None and len(adapter.links) >= adapter.max_links):
+            err = vxi11_errorCodes.OUT_OF_RESOURCES
+        else:
+            lid = self.srv.next_link_id
+            self.srv.next_link_id = self.srv.next_link_id + 1
+            (err,link) = await adapter.create_link(clientId = arg.clientId, lockDevice = arg.lockDevice,
+                                 lock_timeout = arg.lock_timeout, device = arg.device, link_id = lid, conn = self)
+            if(err == vxi11_errorCodes.NO_ERROR and link is not None):
+                self.links[lid] = link
+                adapter.links[lid] = link
+                if(self.srv.link_idle_timeout is not None and self._reaper_task is None):
+                    self._reaper_task = asyncio.create_task(self._reap_idle_links(self.srv.link_idle_timeout))
         rsp = vxi11_type.Create_LinkResp(
                 error=err, lid=lid,
-                abortPort=self.srv.abort_port,maxRecvSize=1024) # min maxRecvSize is 1024 per spec
+                abortPort=self.srv.abort_port,maxRecvSize=adapter.max_recv_size)
         return rsp
     
-    @rpc_conn.callHandler(
-        VXI11Unpacker,VXI11Unpacker.unpack_Device_WriteParms,
-        VXI11Packer,VXI11Packer.pack_Device_WriteResp)
     async def handle_device_write(self, rpc_msg: rpc_type.rpc_msg,
-                                  arg: vxi11_type.Device_WriteParms) -> vxi11_type.Device_WriteResp:
+                                  arg: vxi11_pack.Device_WriteParms_view) -> vxi11_type.Device_WriteResp:
         """Device_WriteResp   device_write       (Device_WriteParms)     = 11; """
         assert(arg.lid is not None)
         assert(arg.flags is not None)
-        link = self.links[arg.lid]
-        if (link is not None):
+        link = self._get_link(arg.lid)
+        if (link is not None and len(arg.data) > link.adapter.max_recv_size):
+            (err, size) = (vxi11_errorCodes.PARAMETER_ERROR,0)
+        elif (link is not None):
             (err,size) = await link.write(io_timeout = arg.io_timeout,
-                lock_timeout = arg.lock_timeout, flags = vxi11_deviceFlags(arg.flags), data = arg.data)
+                lock_timeout = arg.lock_timeout, flags = vxi11_deviceFlags(arg.flags), data = bytes(arg.data))
         else:
             (err, size) = (vxi11_errorCodes.INVALID_LINK_IDENTIFIER,0)
         rsp = vxi11_type.Device_WriteResp(error=err, size=size)
         return rsp
         
-    @rpc_conn.callHandler(
-        VXI11Unpacker,VXI11Unpacker.unpack_Device_ReadParms,
-        VXI11Packer,VXI11Packer.pack_Device_ReadResp)
     async def handle_device_read(self, rpc_msg: rpc_type.rpc_msg, arg: vxi11_type.Device_ReadParms) -> vxi11_type.Device_ReadResp:
         """Device_ReadResp    device_read        (Device_ReadParms)      = 12; """
         assert(arg.lid is not None)
         assert(arg.flags is not None)
-        link = self.links.get(arg.lid)
+        link = self._get_link(arg.lid)
         if (link is not None):
             (err,reason,data) = await link.read(requestSize = arg.requestSize,
                 io_timeout = arg.io_timeout, lock_timeout = arg.lock_timeout,
@@ -183,15 +271,12 @@ class vxi11_core_conn(rpc_conn):
         rsp = vxi11_type.Device_ReadResp(error=err, reason=reason, data=data)
         return rsp
     
-    @rpc_conn.callHandler(
-        VXI11Unpacker,VXI11Unpacker.unpack_Device_GenericParms,
-        VXI11Packer,VXI11Packer.pack_Device_ReadStbResp)
     async def handle_device_readstb(self,rpc_msg: rpc_type.rpc_msg,
                                     arg: vxi11_type.Device_GenericParms) -> vxi11_type.Device_ReadStbResp:
         """Device_ReadStbResp device_readstb     (Device_GenericParms)   = 13;"""
         assert(arg.lid is not None)
         assert(arg.flags is not None)
-        link = self.links.get(arg.lid)
+        link = self._get_link(arg.lid)
         if (link is not None):
             (err,stb) = await link.read_stb(flags = vxi11_deviceFlags(arg.flags),lock_timeout = arg.lock_timeout,
                 io_timeout = arg.io_timeout)
@@ -200,14 +285,11 @@ class vxi11_core_conn(rpc_conn):
         rsp = vxi11_type.Device_ReadStbResp(error=err, stb=stb)#stb=struct.pack('>B',0x42))
         return rsp
     
-    @rpc_conn.callHandler(
-        VXI11Unpacker,VXI11Unpacker.unpack_Device_GenericParms,
-        VXI11Packer,VXI11Packer.pack_Device_Error)
     async def handle_device_trigger(self,rpc_msg: rpc_type.rpc_msg, arg: vxi11_type.Device_GenericParms) -> vxi11_type.Device_Error:
         """Device_Error       device_trigger     (Device_GenericParms)   = 14; """
         assert(arg.lid is not None)
         assert(arg.flags is not None)
-        link = self.links.get(arg.lid)
+        link = self._get_link(arg.lid)
         if (link is not None):
             err = await link.trigger(flags = vxi11_deviceFlags(arg.flags),lock_timeout = arg.lock_timeout,
                 io_timeout = arg.io_timeout)
@@ -216,14 +298,11 @@ class vxi11_core_conn(rpc_conn):
         rsp = vxi11_type.Device_Error(error=err)
         return rsp
     
-    @rpc_conn.callHandler(
-        VXI11Unpacker,VXI11Unpacker.unpack_Device_GenericParms,
-        VXI11Packer,VXI11Packer.pack_Device_Error)
     async def handle_device_clear(self,rpc_msg: rpc_type.rpc_msg, arg: vxi11_type.Device_GenericParms) -> vxi11_type.Device_Error:
         """Device_Error       device_clear       (Device_GenericParms)   = 15; """
         assert(arg.lid is not None)
         assert(arg.flags is not None)
-        link = self.links.get(arg.lid)
+        link = self._get_link(arg.lid)
         if (link is not None):
             err = await link.clear(flags = vxi11_deviceFlags(arg.flags),lock_timeout = arg.lock_timeout,
                 io_timeout = arg.io_timeout)
@@ -233,16 +312,13 @@ class vxi11_core_conn(rpc_conn):
         rsp = vxi11_type.Device_Error(error=err)
         return rsp
     
-    @rpc_conn.callHandler(
-        VXI11Unpacker,VXI11Unpacker.unpack_Device_GenericParms,
-        VXI11Packer,VXI11Packer.pack_Device_Error)
     async def handle_device_remote(self, rpc_msg: rpc_type.rpc_msg, arg: vxi11_type.Device_GenericParms) -> vxi11_type.Device_Error:
         """Device_Error       device_remote      (Device_GenericParms)   = 16; """
         assert(arg.lid is not None)
         assert(arg.flags is not None)
-        link = self.links.get(arg.lid)
+        link = self._get_link(arg.lid)
         if (link is not None):
-            err = await link.clear(flags = vxi11_deviceFlags(arg.flags),lock_timeout = arg.lock_timeout,
+            err = await link.remote(flags = vxi11_deviceFlags(arg.flags),lock_timeout = arg.lock_timeout,
                 io_timeout = arg.io_timeout)
         else:
             err = vxi11_errorCodes.INVALID_LINK_IDENTIFIER
@@ -250,14 +326,11 @@ class vxi11_core_conn(rpc_conn):
         rsp = vxi11_type.Device_Error(error=err)
         return rsp
     
-    @rpc_conn.callHandler(
-        VXI11Unpacker,VXI11Unpacker.unpack_Device_GenericParms,
-        VXI11Packer,VXI11Packer.pack_Device_Error)
     async def handle_device_local(self, rpc_msg: rpc_type.rpc_msg, arg: vxi11_type.Device_GenericParms) -> vxi11_type.Device_Error:
         """Device_Error       device_local       (Device_GenericParms)   = 17;"""
         assert(arg.lid is not None)
         assert(arg.flags is not None)
-        link = self.links.get(arg.lid)
+        link = self._get_link(arg.lid)
         if (link is not None):
             err = await link.local(flags = vxi11_deviceFlags(arg.flags),lock_timeout = arg.lock_timeout,
                 io_timeout = arg.io_timeout)
@@ -267,14 +340,11 @@ class vxi11_core_conn(rpc_conn):
         rsp = vxi11_type.Device_Error(error=err)
         return rsp
     
-    @rpc_conn.callHandler(
-        VXI11Unpacker,VXI11Unpacker.unpack_Device_LockParms,
-        VXI11Packer,VXI11Packer.pack_Device_Error)
     async def handle_device_lock(self, rpc_msg: rpc_type.rpc_msg, arg: vxi11_type.Device_LockParms) -> vxi11_type.Device_Error:
         """Device_Error       device_lock        (Device_LockParms)      = 18;"""
         assert(arg.lid is not None)
         assert(arg.flags is not None)
-        link = self.links.get(arg.lid)
+        link = self._get_link(arg.lid)
         if (link is not None):
             err = await link.device_lock(flags=vxi11_deviceFlags(arg.flags), lock_timeout=arg.lock_timeout)
         else:
@@ -283,12 +353,9 @@ class vxi11_core_conn(rpc_conn):
         rsp = vxi11_type.Device_Error(error=err)
         return rsp
     
-    @rpc_conn.callHandler(
-        VXI11Unpacker,VXI11Unpacker.unpack_Device_Link,
-        VXI11Packer,VXI11Packer.pack_Device_Error)
     async def handle_device_unlock(self,rpc_msg: rpc_type.rpc_msg, arg: int) -> vxi11_type.Device_Error:
         """Device_Error       device_unlock      (Device_Link)           = 19;"""
-        link = self.links.get(arg)
+        link = self._get_link(arg)
         if (link is not None):
             err = await link.device_unlock()
         else:
@@ -300,63 +367,43 @@ class vxi11_core_conn(rpc_conn):
         if(self._intr_exec is not None):
              self._intr_exec.send_irq(handle)
     
-    @rpc_conn.callHandler(
-        VXI11Unpacker,VXI11Unpacker.unpack_Device_EnableSrqParms,
-        VXI11Packer,VXI11Packer.pack_Device_Error)
     async def handle_device_enable_srq(self,rpc_msg: rpc_type.rpc_msg,
                                        arg: vxi11_type.Device_EnableSrqParms) -> vxi11_type.Device_Error:
         """Device_Error       device_enable_srq  (Device_EnableSrqParms) = 20;"""
         assert(arg.lid is not None)
-        link = self.links.get(arg.lid)
+        link = self._get_link(arg.lid)
         if (link is not None):
-            if(arg.enable):
-                link.srq_handle = arg.handle
-            else:
-                link.srq_handle = None
-            err = vxi11_errorCodes.NO_ERROR
+            err = await link.enable_srq(arg.handle if arg.enable else None)
         else:
             err = vxi11_errorCodes.INVALID_LINK_IDENTIFIER
         rsp = vxi11_type.Device_Error(error=err)
         return rsp
     
-    @rpc_conn.callHandler(
-        VXI11Unpacker,VXI11Unpacker.unpack_Device_DocmdParms,
-        VXI11Packer,VXI11Packer.pack_Device_DocmdResp)
     async def handle_device_docmd(self,rpc_msg: rpc_type.rpc_msg,
-                                  arg: vxi11_type.Device_DocmdParms)  -> vxi11_type.Device_DocmdResp:
+                                  arg: vxi11_pack.Device_DocmdParms_view)  -> vxi11_type.Device_DocmdResp:
         """Device_DocmdResp   device_docmd       (Device_DocmdParms)     = 22;"""
         assert(arg.lid is not None)
         assert(arg.flags is not None)
-        link = self.links.get(arg.lid)
+        link = self._get_link(arg.lid)
         if (link is not None):
             (err,data_out) = await link.docmd(flags = vxi11_deviceFlags(arg.flags),
                 io_timeout = arg.io_timeout, lock_timeout = arg.lock_timeout,
                 cmd = arg.cmd, network_order = arg.network_order, datasize=arg.datasize,
-                data_in = arg.data_in)
+                data_in = bytes(arg.data_in))
         else:
             (err,data_out) = (vxi11_errorCodes.INVALID_LINK_IDENTIFIER,b'')
         rsp = vxi11_type.Device_DocmdResp(error=err, data_out=data_out)
         return rsp
     
-    @rpc_conn.callHandler(
-        VXI11Unpacker,VXI11Unpacker.unpack_Device_Link,
-        VXI11Packer,VXI11Packer.pack_Device_Error)
     async def handle_destroy_link(self,rpc_msg: rpc_type.rpc_msg, arg: int) -> vxi11_type.Device_Error:
         """Device_Error       destroy_link       (Device_Link)           = 23; """
-        link = self.links.get(arg)
-        if (link is not None):
-            # Remove link prior to destroying it, to ensure another connection
-            # doesn't use the link in the meanwhile
-            del self.links[arg]
-            err = await link.destroy()
+        if (arg in self.links):
+            err = await self._destroy_link(arg)
         else:
             err = vxi11_errorCodes.INVALID_LINK_IDENTIFIER
         rsp = vxi11_type.Device_Error( error=err)
         return rsp
     
-    @rpc_conn.callHandler(
-        VXI11Unpacker,VXI11Unpacker.unpack_Device_RemoteFunc,
-        VXI11Packer,VXI11Packer.pack_Device_Error)
     async def handle_create_intr_chan(self, rpc_msg: rpc_type.rpc_msg,
                                       arg: vxi11_type.Device_RemoteFunc) -> vxi11_type.Device_Error:
         """Device_Error       create_intr_chan   (Device_RemoteFunc)     = 25;"""
@@ -364,23 +411,20 @@ class vxi11_core_conn(rpc_conn):
         assert(arg.hostPort is not None)
         if((arg.progNum != vxi11_const.DEVICE_INTR) or (arg.progVers != vxi11_const.DEVICE_INTR_VERSION)):
             err = vxi11_errorCodes.OPERATION_NOT_SUPPORTED
-        elif ((arg.progFamily != vxi11_const.DEVICE_TCP)):
-            err = vxi11_errorCodes.OPERATION_NOT_SUPPORTED # UDP support is optional
+        elif ((arg.progFamily not in [vxi11_const.DEVICE_TCP, vxi11_const.DEVICE_UDP])):
+            err = vxi11_errorCodes.OPERATION_NOT_SUPPORTED
         elif (self._intr_exec is not None):
             err = vxi11_errorCodes.CHANNEL_ALREADY_ESTABLISHED
         else:
             self._intr_exec = vxi11_intr_executor()
             addr = f"{(arg.hostAddr>>24)&0xff}.{(arg.hostAddr>>16)&0xff}.{(arg.hostAddr>>8)&0xff}.{(arg.hostAddr)&0xff}"
-            await self._intr_exec.connect(addr,arg.hostPort)
+            await self._intr_exec.connect(addr,arg.hostPort,udp=(arg.progFamily == vxi11_const.DEVICE_UDP))
             self._intr_exec.start()
             err = vxi11_errorCodes.NO_ERROR
         
         rsp = vxi11_type.Device_Error(error=err)
         return rsp
     
-    @rpc_conn.callHandler(
-        None,None,
-        VXI11Packer,VXI11Packer.pack_Device_Error)
     async def handle_destroy_intr_chan(self,rpc_msg: rpc_type.rpc_msg, arg: None) -> vxi11_type.Device_Error:
         """Device_Error       destroy_intr_chan  (void)                  = 26;"""
         print(f"destroy_intr_chan >>> (void)")
@@ -394,75 +438,79 @@ class vxi11_core_conn(rpc_conn):
         rsp = vxi11_type.Device_Error(error=err)
         return rsp
     
-    # (prog, vers, proc) => func(self,rpc_msg, buf, buf_ix)
-    
-    call_dispatch_table = {
-        (vxi11_const.DEVICE_CORE,vxi11_const.DEVICE_CORE_VERSION): {
-            vxi11_const.create_link: handle_create_link, # 10
-            vxi11_const.device_write: handle_device_write, # 11
-            vxi11_const.device_read: handle_device_read, # 12
-            vxi11_const.device_readstb: handle_device_readstb, # 13
-            vxi11_const.device_trigger: handle_device_trigger, # 14
-            vxi11_const.device_clear: handle_device_clear, # 15
-            vxi11_const.device_remote: handle_device_remote, # 16
-            vxi11_const.device_local: handle_device_local, # 17
-            vxi11_const.device_lock: handle_device_lock, # 18
-            vxi11_const.device_unlock: handle_device_unlock, # 19
-            vxi11_const.device_enable_srq: handle_device_enable_srq, # 20
-            vxi11_const.device_docmd: handle_device_docmd, # 22
-            vxi11_const.destroy_link: handle_destroy_link, # 23
-            vxi11_const.create_intr_chan: handle_create_intr_chan, # 25
-            vxi11_const.destroy_intr_chan: handle_destroy_intr_chan, # 26
-        }
-    }
-
-class vxi11_abort_conn(rpc_conn):
+class vxi11_abort_conn(vxi11_svc.DEVICE_ASYNC_1_svc):
     def __init__(self,srv: 'vxi11_async_srv') -> None:
         print("Opening abort connection")
-        self.links: Dict[int,Any] = dict()
         self.srv = srv
         super().__init__()
         
-    @rpc_conn.callHandler(
-        VXI11Unpacker,VXI11Unpacker.unpack_Device_Link,
-        VXI11Packer,VXI11Packer.pack_Device_Error)
     async def handle_device_abort(self,rpc_msg: rpc_type.rpc_msg, arg: int) -> vxi11_type.Device_Error:
         """Device_Error device_abort (Device_Link) = 1;"""
-        link = self.links.get(arg)
+        # Links are created on the core channel, on any connection
+        link = self.srv.core_srv.find_link(arg) if self.srv.core_srv is not None else None
         if (link is not None):
-            err = vxi11_errorCodes.NO_ERROR # We don't really do it, but this is kinda following the spec
+            err = await link.abort()
         else:
             err = vxi11_errorCodes.INVALID_LINK_IDENTIFIER
         
         rsp = vxi11_type.Device_Error(error=err)
         return rsp
     
-    call_dispatch_table = {
-            (vxi11_const.DEVICE_ASYNC,vxi11_const.DEVICE_ASYNC_VERSION): {
-                    vxi11_const.device_abort: handle_device_abort
-            }
-        }
-
 class vxi11_core_srv(rpc_srv):
     """ 
     mapping member is a map from (prog,vers,prot) to uint
     """
-    def __init__(self,port: int,adapters: List['vxi11_adapter']) -> None:
+    # Room for the RPC header (with up to 400 byte credentials and verifier)
+    # and the fixed part of Device_WriteParms
+    RECORD_OVERHEAD = 4096
+    
+    def __init__(self,port: int,adapters: List['vxi11_adapter'],
+                 link_idle_timeout: Optional[float] = None,
+                 max_links_per_conn: Optional[int] = None,
+                 unix_path: Optional[str] = None,
+                 cache_replies: bool = False) -> None:
+        """link_idle_timeout is the time in seconds after which a link that
+        has not been used is destroyed. max_links_per_conn limits the
+        number of links a single client connection may hold open. None
+        disables either limit. unix_path is an optional UNIX-domain socket
+        to listen on, as well as TCP. With cache_replies, a call the client
+        retransmits, such as a device_write, is answered again from the
+        duplicate request cache rather than executed twice."""
         self.adapters = adapters
         self.next_link_id = 0
         self.abort_port = None
+        self.link_idle_timeout = link_idle_timeout
+        self.max_links_per_conn = max_links_per_conn
         #self.intrQueue = asyncio.queue
-        super().__init__(port)
+        # Accept writes somewhat over maxRecvSize, so that clients get a
+        # PARAMETER_ERROR rather than being dropped. Beyond this, the client
+        # is clearly broken.
+        # vxi11_adapter imports this module, so it can't be imported before
+        from .vxi11_adapter import DEFAULT_MAX_RECV_SIZE
+        max_record_size = 2*max((a.max_recv_size for a in adapters),
+                                default=DEFAULT_MAX_RECV_SIZE) + self.RECORD_OVERHEAD
+        super().__init__(port, max_record_size=max_record_size, unix_path=unix_path,
+                         cache_replies=cache_replies)
     
     def create_conn(self) -> vxi11_core_conn:
         return vxi11_core_conn(self)
+    
+    def find_link(self, lid: int) -> Optional['vxi11_adapter.vxi11_link']:
+        for adapter in self.adapters:
+            link = adapter.links.get(lid)
+            if(link is not None):
+                return link
+        return None
 
 class vxi11_async_srv(rpc_srv):
     """ 
     mapping member is a map from (prog,vers,prot) to uint
     """
-    def __init__(self,port: int) -> None:
-        super().__init__(port)
+    def __init__(self,port: int, core_srv: Optional[vxi11_core_srv] = None,
+                 unix_path: Optional[str] = None) -> None:
+        """core_srv is the server whose links can be aborted"""
+        self.core_srv = core_srv
+        super().__init__(port, unix_path=unix_path)
     
     def create_conn(self) -> vxi11_abort_conn:
         return vxi11_abort_conn(self)
@@ -12,9 +12,11 @@ const IPPROTO_UDP = 17;     /* protocol number for UDP/IP */
 
 struct pmaplist {
 	mapping map;
-	pmaplist next;
+	pmaplist *next;
 };
 
+typedef pmaplist *pmaplist_ptr;
+
 struct call_args {
 	unsigned int prog;
 	unsigned int vers;
@@ -41,10 +43,149 @@ program PMAP_PROG {
 		unsigned int
 		PMAPPROC_GETPORT(mapping)   = 3;
 
-		pmaplist
+		pmaplist_ptr
 		PMAPPROC_DUMP(void)         = 4;
 
 		call_result
 		PMAPPROC_CALLIT(call_args)  = 5;
 	} = 2;
 } = 100000;
+
+/*
+ * rpcbind, versions 3 and 4 (RFC 1833). These use the same program number
+ * as the portmapper, with addresses given as netid and universal address
+ * strings, so services can be registered for transports other than
+ * TCP and UDP.
+ */
+typedef string rpcb_string<>;
+
+struct rpcb {
+	unsigned int r_prog;
+	unsigned int r_vers;
+	string r_netid<>;
+	string r_addr<>;
+	string r_owner<>;
+};
+
+struct rp__list {
+	rpcb rpcb_map;
+	rp__list *rpcb_next;
+};
+
+typedef rp__list *rpcblist_ptr;
+
+/* A transport specific address, such as a struct sockaddr_in */
+struct netbuf {
+	unsigned int maxlen;
+	opaque buf<>;
+};
+
+/*
+ * CALLIT is procedure 5 of version 3, and BCAST of version 4. These and
+ * INDIRECT aren't implemented, so only their numbers are given.
+ */
+const RPCBPROC_CALLIT = 5;
+
+/*
+ * Version 4 has the same procedures as version 3, and adds more.
+ */
+const RPCBVERS4 = 4;
+const RPCBPROC_BCAST = 5;
+const RPCBPROC_GETVERSADDR = 9;
+const RPCBPROC_INDIRECT = 10;
+const RPCBPROC_GETADDRLIST = 11;
+const RPCBPROC_GETSTAT = 12;
+
+/* Values of r_nc_semantics */
+const NC_TPI_CLTS = 1;
+const NC_TPI_COTS = 2;
+const NC_TPI_COTS_ORD = 3;
+const NC_TPI_RAW = 4;
+
+/* Result of GETADDRLIST */
+struct rpcb_entry {
+	string r_maddr<>;
+	string r_nc_netid<>;
+	unsigned int r_nc_semantics;
+	string r_nc_protofmly<>;
+	string r_nc_proto<>;
+};
+
+struct rpcb_entry_list {
+	rpcb_entry rpcb_entry_map;
+	rpcb_entry_list *rpcb_entry_next;
+};
+
+typedef rpcb_entry_list *rpcb_entry_list_ptr;
+
+/*
+ * Result of GETSTAT: the statistics of versions 2, 3 and 4, in that
+ * order, each with the number of calls of each procedure.
+ */
+const RPCBSTAT_HIGHPROC = 13;
+const RPCBVERS_STAT = 3;
+const RPCBVERS_4_STAT = 2;
+const RPCBVERS_3_STAT = 1;
+const RPCBVERS_2_STAT = 0;
+
+struct rpcbs_addrlist {
+	unsigned int prog;
+	unsigned int vers;
+	int success;
+	int failure;
+	string netid<>;
+	rpcbs_addrlist *next;
+};
+
+struct rpcbs_rmtcalllist {
+	unsigned int prog;
+	unsigned int vers;
+	unsigned int proc;
+	int success;
+	int failure;
+	int indirect;
+	string netid<>;
+	rpcbs_rmtcalllist *next;
+};
+
+typedef int rpcbs_proc[RPCBSTAT_HIGHPROC];
+typedef rpcbs_addrlist *rpcbs_addrlist_ptr;
+typedef rpcbs_rmtcalllist *rpcbs_rmtcalllist_ptr;
+
+struct rpcb_stat {
+	rpcbs_proc info;
+	int setinfo;
+	int unsetinfo;
+	rpcbs_addrlist_ptr addrinfo;
+	rpcbs_rmtcalllist_ptr rmtinfo;
+};
+
+typedef rpcb_stat rpcb_stat_byvers[RPCBVERS_STAT];
+
+program RPCBPROG {
+	version RPCBVERS {
+		void
+		RPCBPROC_NULL(void)         = 0;
+
+		bool
+		RPCBPROC_SET(rpcb)          = 1;
+
+		bool
+		RPCBPROC_UNSET(rpcb)        = 2;
+
+		rpcb_string
+		RPCBPROC_GETADDR(rpcb)      = 3;
+
+		rpcblist_ptr
+		RPCBPROC_DUMP(void)         = 4;
+
+		unsigned int
+		RPCBPROC_GETTIME(void)      = 6;
+
+		netbuf
+		RPCBPROC_UADDR2TADDR(rpcb_string) = 7;
+
+		rpcb_string
+		RPCBPROC_TADDR2UADDR(netbuf) = 8;
+	} = 3;
+} = 100000;
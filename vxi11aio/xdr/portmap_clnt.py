@@ -0,0 +1,150 @@
+# Generated by rpcgen.py from portmap.x, source hash f8929a99d2bb87be
+from typing import Any, List, Optional, Union
+from vxi11aio import rpc_client, rpc_udp
+from vxi11aio.xdr import portmap_const as const, portmap_type as types
+from vxi11aio.xdr.portmap_pack import PORTMAPPacker, PORTMAPUnpacker
+
+clientType = Union[rpc_client.rpc_client, rpc_udp.rpc_udp_client]
+
+class PMAP_PROG_2_clnt():
+    """Client stubs for program PMAP_PROG, version PMAP_VERS.
+    client is a connected rpc_client or rpc_udp_client. Calls which
+    are not accepted by the server raise an Exception."""
+    def __init__(self, client: clientType, vers: int = const.PMAP_VERS) -> None:
+        self.client = client
+        self.vers = vers
+        # Reused to encode the argument of each call
+        self._p = PORTMAPPacker()
+
+    async def PMAPPROC_NULL(self, read_reply: bool = True) -> None:
+        """void PMAPPROC_NULL (void) = 0;"""
+        rsp, msg = await self.client.call(const.PMAP_PROG, self.vers, const.PMAPPROC_NULL, b'', read_reply=read_reply)
+        if(msg is not None):
+            rpc_client.check_reply(msg)
+
+    async def PMAPPROC_SET(self, arg: types.mapping) -> bool:
+        """bool PMAPPROC_SET (mapping) = 1;"""
+        p = self._p
+        p.reset()
+        p.pack_mapping(arg)
+        rsp, msg = await self.client.call(const.PMAP_PROG, self.vers, const.PMAPPROC_SET, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return PORTMAPUnpacker(rsp).unpack_bool()
+
+    async def PMAPPROC_UNSET(self, arg: types.mapping) -> bool:
+        """bool PMAPPROC_UNSET (mapping) = 2;"""
+        p = self._p
+        p.reset()
+        p.pack_mapping(arg)
+        rsp, msg = await self.client.call(const.PMAP_PROG, self.vers, const.PMAPPROC_UNSET, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return PORTMAPUnpacker(rsp).unpack_bool()
+
+    async def PMAPPROC_GETPORT(self, arg: types.mapping) -> int:
+        """uint PMAPPROC_GETPORT (mapping) = 3;"""
+        p = self._p
+        p.reset()
+        p.pack_mapping(arg)
+        rsp, msg = await self.client.call(const.PMAP_PROG, self.vers, const.PMAPPROC_GETPORT, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return PORTMAPUnpacker(rsp).unpack_uint()
+
+    async def PMAPPROC_DUMP(self) -> types.pmaplist:
+        """pmaplist_ptr PMAPPROC_DUMP (void) = 4;"""
+        rsp, msg = await self.client.call(const.PMAP_PROG, self.vers, const.PMAPPROC_DUMP, b'')
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return PORTMAPUnpacker(rsp).unpack_pmaplist_ptr()
+
+    async def PMAPPROC_CALLIT(self, arg: types.call_args) -> types.call_result:
+        """call_result PMAPPROC_CALLIT (call_args) = 5;"""
+        p = self._p
+        p.reset()
+        p.pack_call_args(arg)
+        rsp, msg = await self.client.call(const.PMAP_PROG, self.vers, const.PMAPPROC_CALLIT, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return PORTMAPUnpacker(rsp).unpack_call_result()
+
+class RPCBPROG_3_clnt():
+    """Client stubs for program RPCBPROG, version RPCBVERS.
+    client is a connected rpc_client or rpc_udp_client. Calls which
+    are not accepted by the server raise an Exception."""
+    def __init__(self, client: clientType, vers: int = const.RPCBVERS) -> None:
+        self.client = client
+        self.vers = vers
+        # Reused to encode the argument of each call
+        self._p = PORTMAPPacker()
+
+    async def RPCBPROC_NULL(self, read_reply: bool = True) -> None:
+        """void RPCBPROC_NULL (void) = 0;"""
+        rsp, msg = await self.client.call(const.RPCBPROG, self.vers, const.RPCBPROC_NULL, b'', read_reply=read_reply)
+        if(msg is not None):
+            rpc_client.check_reply(msg)
+
+    async def RPCBPROC_SET(self, arg: types.rpcb) -> bool:
+        """bool RPCBPROC_SET (rpcb) = 1;"""
+        p = self._p
+        p.reset()
+        p.pack_rpcb(arg)
+        rsp, msg = await self.client.call(const.RPCBPROG, self.vers, const.RPCBPROC_SET, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return PORTMAPUnpacker(rsp).unpack_bool()
+
+    async def RPCBPROC_UNSET(self, arg: types.rpcb) -> bool:
+        """bool RPCBPROC_UNSET (rpcb) = 2;"""
+        p = self._p
+        p.reset()
+        p.pack_rpcb(arg)
+        rsp, msg = await self.client.call(const.RPCBPROG, self.vers, const.RPCBPROC_UNSET, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return PORTMAPUnpacker(rsp).unpack_bool()
+
+    async def RPCBPROC_GETADDR(self, arg: types.rpcb) -> bytes:
+        """rpcb_string RPCBPROC_GETADDR (rpcb) = 3;"""
+        p = self._p
+        p.reset()
+        p.pack_rpcb(arg)
+        rsp, msg = await self.client.call(const.RPCBPROG, self.vers, const.RPCBPROC_GETADDR, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return PORTMAPUnpacker(rsp).unpack_rpcb_string()
+
+    async def RPCBPROC_DUMP(self) -> types.rp__list:
+        """rpcblist_ptr RPCBPROC_DUMP (void) = 4;"""
+        rsp, msg = await self.client.call(const.RPCBPROG, self.vers, const.RPCBPROC_DUMP, b'')
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return PORTMAPUnpacker(rsp).unpack_rpcblist_ptr()
+
+    async def RPCBPROC_GETTIME(self) -> int:
+        """uint RPCBPROC_GETTIME (void) = 6;"""
+        rsp, msg = await self.client.call(const.RPCBPROG, self.vers, const.RPCBPROC_GETTIME, b'')
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return PORTMAPUnpacker(rsp).unpack_uint()
+
+    async def RPCBPROC_UADDR2TADDR(self, arg: bytes) -> types.netbuf:
+        """netbuf RPCBPROC_UADDR2TADDR (rpcb_string) = 7;"""
+        p = self._p
+        p.reset()
+        p.pack_rpcb_string(arg)
+        rsp, msg = await self.client.call(const.RPCBPROG, self.vers, const.RPCBPROC_UADDR2TADDR, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return PORTMAPUnpacker(rsp).unpack_netbuf()
+
+    async def RPCBPROC_TADDR2UADDR(self, arg: types.netbuf) -> bytes:
+        """rpcb_string RPCBPROC_TADDR2UADDR (netbuf) = 8;"""
+        p = self._p
+        p.reset()
+        p.pack_netbuf(arg)
+        rsp, msg = await self.client.call(const.RPCBPROG, self.vers, const.RPCBPROC_TADDR2UADDR, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return PORTMAPUnpacker(rsp).unpack_rpcb_string()
@@ -1,12 +1,38 @@
-# Generated by rpcgen.py from portmap.x on Sat Nov 16 15:25:09 2019
+# Generated by rpcgen.py from portmap.x, source hash f8929a99d2bb87be
 PMAPPROC_NULL = 0
 PMAPPROC_SET = 1
 PMAPPROC_UNSET = 2
 PMAPPROC_GETPORT = 3
 PMAPPROC_DUMP = 4
 PMAPPROC_CALLIT = 5
+RPCBPROC_NULL = 0
+RPCBPROC_SET = 1
+RPCBPROC_UNSET = 2
+RPCBPROC_GETADDR = 3
+RPCBPROC_DUMP = 4
+RPCBPROC_GETTIME = 6
+RPCBPROC_UADDR2TADDR = 7
+RPCBPROC_TADDR2UADDR = 8
 PMAP_PORT = 111
 IPPROTO_TCP = 6
 IPPROTO_UDP = 17
 PMAP_PROG = 100000
 PMAP_VERS = 2
+RPCBPROC_CALLIT = 5
+RPCBVERS4 = 4
+RPCBPROC_BCAST = 5
+RPCBPROC_GETVERSADDR = 9
+RPCBPROC_INDIRECT = 10
+RPCBPROC_GETADDRLIST = 11
+RPCBPROC_GETSTAT = 12
+NC_TPI_CLTS = 1
+NC_TPI_COTS = 2
+NC_TPI_COTS_ORD = 3
+NC_TPI_RAW = 4
+RPCBSTAT_HIGHPROC = 13
+RPCBVERS_STAT = 3
+RPCBVERS_4_STAT = 2
+RPCBVERS_3_STAT = 1
+RPCBVERS_2_STAT = 0
+RPCBPROG = 100000
+RPCBVERS = 3
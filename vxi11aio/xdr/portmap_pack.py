@@ -1,14 +1,15 @@
-# Generated by rpcgen.py from portmap.x on Sat Nov 16 15:25:09 2019
-import sys,os
-sys.path.append(os.path.dirname(__file__))
+# Generated by rpcgen.py from portmap.x, source hash f8929a99d2bb87be
 from typing import Any, List, Optional, Union
 from vxi11aio.xdr import portmap_const as const, portmap_type as types
+import struct
 import xdrlib
 from xdrlib import Error as XDRError
+from vxi11aio import xdr_into
 
 class nullclass(object):
     pass
 
+
 class PORTMAPPacker(xdrlib.Packer):
     def __init__(self, check_enum:bool=True, check_array:bool=True) -> None:
         xdrlib.Packer.__init__(self)
@@ -50,7 +51,16 @@ class PORTMAPPacker(xdrlib.Packer):
         self.pack_mapping(data.map)
         if data.next is None:
             raise TypeError('data.next == None')
-        self.pack_pmaplist(data.next)
+        if len(data.next) > 1 and self.check_array:
+            raise XDRError('array length too long for data.next')
+        self.pack_array(data.next, self.pack_pmaplist)
+
+    def pack_pmaplist_ptr(self, data: types.pmaplist) -> None:
+        if hasattr(self, 'filter_pmaplist_ptr'):
+            data = getattr(self, 'filter_pmaplist_ptr')(data)
+        if len(data) > 1 and self.check_array:
+            raise XDRError('array length too long for data')
+        self.pack_array(data, self.pack_pmaplist)
 
     def pack_call_args(self, data: types.call_args) -> None:
         if hasattr(self, 'filter_call_args'):
@@ -78,6 +88,720 @@ class PORTMAPPacker(xdrlib.Packer):
             raise TypeError('data.res == None')
         self.pack_opaque(data.res)
 
+    def pack_rpcb_string(self, data: bytes) -> None:
+        if hasattr(self, 'filter_rpcb_string'):
+            data = getattr(self, 'filter_rpcb_string')(data)
+        self.pack_string(data)
+
+    def pack_rpcb(self, data: types.rpcb) -> None:
+        if hasattr(self, 'filter_rpcb'):
+            data = getattr(self, 'filter_rpcb')(data)
+        if data.r_prog is None:
+            raise TypeError('data.r_prog == None')
+        self.pack_uint(data.r_prog)
+        if data.r_vers is None:
+            raise TypeError('data.r_vers == None')
+        self.pack_uint(data.r_vers)
+        if data.r_netid is None:
+            raise TypeError('data.r_netid == None')
+        self.pack_string(data.r_netid)
+        if data.r_addr is None:
+            raise TypeError('data.r_addr == None')
+        self.pack_string(data.r_addr)
+        if data.r_owner is None:
+            raise TypeError('data.r_owner == None')
+        self.pack_string(data.r_owner)
+
+    def pack_rp__list(self, data: types.rp__list) -> None:
+        if hasattr(self, 'filter_rp__list'):
+            data = getattr(self, 'filter_rp__list')(data)
+        if data.rpcb_map is None:
+            raise TypeError('data.rpcb_map == None')
+        self.pack_rpcb(data.rpcb_map)
+        if data.rpcb_next is None:
+            raise TypeError('data.rpcb_next == None')
+        if len(data.rpcb_next) > 1 and self.check_array:
+            raise XDRError('array length too long for data.rpcb_next')
+        self.pack_array(data.rpcb_next, self.pack_rp__list)
+
+    def pack_rpcblist_ptr(self, data: types.rp__list) -> None:
+        if hasattr(self, 'filter_rpcblist_ptr'):
+            data = getattr(self, 'filter_rpcblist_ptr')(data)
+        if len(data) > 1 and self.check_array:
+            raise XDRError('array length too long for data')
+        self.pack_array(data, self.pack_rp__list)
+
+    def pack_netbuf(self, data: types.netbuf) -> None:
+        if hasattr(self, 'filter_netbuf'):
+            data = getattr(self, 'filter_netbuf')(data)
+        if data.maxlen is None:
+            raise TypeError('data.maxlen == None')
+        self.pack_uint(data.maxlen)
+        if data.buf is None:
+            raise TypeError('data.buf == None')
+        self.pack_opaque(data.buf)
+
+    def pack_rpcb_entry(self, data: types.rpcb_entry) -> None:
+        if hasattr(self, 'filter_rpcb_entry'):
+            data = getattr(self, 'filter_rpcb_entry')(data)
+        if data.r_maddr is None:
+            raise TypeError('data.r_maddr == None')
+        self.pack_string(data.r_maddr)
+        if data.r_nc_netid is None:
+            raise TypeError('data.r_nc_netid == None')
+        self.pack_string(data.r_nc_netid)
+        if data.r_nc_semantics is None:
+            raise TypeError('data.r_nc_semantics == None')
+        self.pack_uint(data.r_nc_semantics)
+        if data.r_nc_protofmly is None:
+            raise TypeError('data.r_nc_protofmly == None')
+        self.pack_string(data.r_nc_protofmly)
+        if data.r_nc_proto is None:
+            raise TypeError('data.r_nc_proto == None')
+        self.pack_string(data.r_nc_proto)
+
+    def pack_rpcb_entry_list(self, data: types.rpcb_entry_list) -> None:
+        if hasattr(self, 'filter_rpcb_entry_list'):
+            data = getattr(self, 'filter_rpcb_entry_list')(data)
+        if data.rpcb_entry_map is None:
+            raise TypeError('data.rpcb_entry_map == None')
+        self.pack_rpcb_entry(data.rpcb_entry_map)
+        if data.rpcb_entry_next is None:
+            raise TypeError('data.rpcb_entry_next == None')
+        if len(data.rpcb_entry_next) > 1 and self.check_array:
+            raise XDRError('array length too long for data.rpcb_entry_next')
+        self.pack_array(data.rpcb_entry_next, self.pack_rpcb_entry_list)
+
+    def pack_rpcb_entry_list_ptr(self, data: types.rpcb_entry_list) -> None:
+        if hasattr(self, 'filter_rpcb_entry_list_ptr'):
+            data = getattr(self, 'filter_rpcb_entry_list_ptr')(data)
+        if len(data) > 1 and self.check_array:
+            raise XDRError('array length too long for data')
+        self.pack_array(data, self.pack_rpcb_entry_list)
+
+    def pack_rpcbs_addrlist(self, data: types.rpcbs_addrlist) -> None:
+        if hasattr(self, 'filter_rpcbs_addrlist'):
+            data = getattr(self, 'filter_rpcbs_addrlist')(data)
+        if data.prog is None:
+            raise TypeError('data.prog == None')
+        self.pack_uint(data.prog)
+        if data.vers is None:
+            raise TypeError('data.vers == None')
+        self.pack_uint(data.vers)
+        if data.success is None:
+            raise TypeError('data.success == None')
+        self.pack_int(data.success)
+        if data.failure is None:
+            raise TypeError('data.failure == None')
+        self.pack_int(data.failure)
+        if data.netid is None:
+            raise TypeError('data.netid == None')
+        self.pack_string(data.netid)
+        if data.next is None:
+            raise TypeError('data.next == None')
+        if len(data.next) > 1 and self.check_array:
+            raise XDRError('array length too long for data.next')
+        self.pack_array(data.next, self.pack_rpcbs_addrlist)
+
+    def pack_rpcbs_rmtcalllist(self, data: types.rpcbs_rmtcalllist) -> None:
+        if hasattr(self, 'filter_rpcbs_rmtcalllist'):
+            data = getattr(self, 'filter_rpcbs_rmtcalllist')(data)
+        if data.prog is None:
+            raise TypeError('data.prog == None')
+        self.pack_uint(data.prog)
+        if data.vers is None:
+            raise TypeError('data.vers == None')
+        self.pack_uint(data.vers)
+        if data.proc is None:
+            raise TypeError('data.proc == None')
+        self.pack_uint(data.proc)
+        if data.success is None:
+            raise TypeError('data.success == None')
+        self.pack_int(data.success)
+        if data.failure is None:
+            raise TypeError('data.failure == None')
+        self.pack_int(data.failure)
+        if data.indirect is None:
+            raise TypeError('data.indirect == None')
+        self.pack_int(data.indirect)
+        if data.netid is None:
+            raise TypeError('data.netid == None')
+        self.pack_string(data.netid)
+        if data.next is None:
+            raise TypeError('data.next == None')
+        if len(data.next) > 1 and self.check_array:
+            raise XDRError('array length too long for data.next')
+        self.pack_array(data.next, self.pack_rpcbs_rmtcalllist)
+
+    def pack_rpcbs_proc(self, data: List[int]) -> None:
+        if hasattr(self, 'filter_rpcbs_proc'):
+            data = getattr(self, 'filter_rpcbs_proc')(data)
+        self.pack_farray(const.RPCBSTAT_HIGHPROC, data, self.pack_int)
+
+    def pack_rpcbs_addrlist_ptr(self, data: types.rpcbs_addrlist) -> None:
+        if hasattr(self, 'filter_rpcbs_addrlist_ptr'):
+            data = getattr(self, 'filter_rpcbs_addrlist_ptr')(data)
+        if len(data) > 1 and self.check_array:
+            raise XDRError('array length too long for data')
+        self.pack_array(data, self.pack_rpcbs_addrlist)
+
+    def pack_rpcbs_rmtcalllist_ptr(self, data: types.rpcbs_rmtcalllist) -> None:
+        if hasattr(self, 'filter_rpcbs_rmtcalllist_ptr'):
+            data = getattr(self, 'filter_rpcbs_rmtcalllist_ptr')(data)
+        if len(data) > 1 and self.check_array:
+            raise XDRError('array length too long for data')
+        self.pack_array(data, self.pack_rpcbs_rmtcalllist)
+
+    def pack_rpcb_stat(self, data: types.rpcb_stat) -> None:
+        if hasattr(self, 'filter_rpcb_stat'):
+            data = getattr(self, 'filter_rpcb_stat')(data)
+        if data.info is None:
+            raise TypeError('data.info == None')
+        self.pack_rpcbs_proc(data.info)
+        if data.setinfo is None:
+            raise TypeError('data.setinfo == None')
+        self.pack_int(data.setinfo)
+        if data.unsetinfo is None:
+            raise TypeError('data.unsetinfo == None')
+        self.pack_int(data.unsetinfo)
+        if data.addrinfo is None:
+            raise TypeError('data.addrinfo == None')
+        self.pack_rpcbs_addrlist_ptr(data.addrinfo)
+        if data.rmtinfo is None:
+            raise TypeError('data.rmtinfo == None')
+        self.pack_rpcbs_rmtcalllist_ptr(data.rmtinfo)
+
+    def pack_rpcb_stat_byvers(self, data: types.rpcb_stat) -> None:
+        if hasattr(self, 'filter_rpcb_stat_byvers'):
+            data = getattr(self, 'filter_rpcb_stat_byvers')(data)
+        self.pack_farray(const.RPCBVERS_STAT, data, self.pack_rpcb_stat)
+
+class PORTMAPSizePacker(xdr_into.size_packer):
+    """Runs the same pack_* methods as PORTMAPPacker, adding up the encoded
+    size in size instead of encoding"""
+    pack_int = xdr_into.size_packer.pack_int
+    pack_uint = xdr_into.size_packer.pack_uint
+    pack_unsigned = xdr_into.size_packer.pack_uint
+    pack_hyper = xdr_into.size_packer.pack_hyper
+    pack_uhyper = xdr_into.size_packer.pack_uhyper
+    pack_float = xdr_into.size_packer.pack_float
+    pack_double = xdr_into.size_packer.pack_double
+    pack_quadruple = xdr_into.size_packer.pack_double
+    pack_bool = xdr_into.size_packer.pack_bool
+    pack_opaque = xdr_into.size_packer.pack_opaque
+    pack_string = xdr_into.size_packer.pack_string
+    def pack_mapping(self, data: types.mapping) -> None:
+        if hasattr(self, 'filter_mapping'):
+            data = getattr(self, 'filter_mapping')(data)
+        if data.prog is None:
+            raise TypeError('data.prog == None')
+        self.pack_uint(data.prog)
+        if data.vers is None:
+            raise TypeError('data.vers == None')
+        self.pack_uint(data.vers)
+        if data.prot is None:
+            raise TypeError('data.prot == None')
+        self.pack_uint(data.prot)
+        if data.port is None:
+            raise TypeError('data.port == None')
+        self.pack_uint(data.port)
+
+    def pack_pmaplist(self, data: types.pmaplist) -> None:
+        if hasattr(self, 'filter_pmaplist'):
+            data = getattr(self, 'filter_pmaplist')(data)
+        if data.map is None:
+            raise TypeError('data.map == None')
+        self.pack_mapping(data.map)
+        if data.next is None:
+            raise TypeError('data.next == None')
+        if len(data.next) > 1 and self.check_array:
+            raise XDRError('array length too long for data.next')
+        self.pack_array(data.next, self.pack_pmaplist)
+
+    def pack_pmaplist_ptr(self, data: types.pmaplist) -> None:
+        if hasattr(self, 'filter_pmaplist_ptr'):
+            data = getattr(self, 'filter_pmaplist_ptr')(data)
+        if len(data) > 1 and self.check_array:
+            raise XDRError('array length too long for data')
+        self.pack_array(data, self.pack_pmaplist)
+
+    def pack_call_args(self, data: types.call_args) -> None:
+        if hasattr(self, 'filter_call_args'):
+            data = getattr(self, 'filter_call_args')(data)
+        if data.prog is None:
+            raise TypeError('data.prog == None')
+        self.pack_uint(data.prog)
+        if data.vers is None:
+            raise TypeError('data.vers == None')
+        self.pack_uint(data.vers)
+        if data.proc is None:
+            raise TypeError('data.proc == None')
+        self.pack_uint(data.proc)
+        if data.args is None:
+            raise TypeError('data.args == None')
+        self.pack_opaque(data.args)
+
+    def pack_call_result(self, data: types.call_result) -> None:
+        if hasattr(self, 'filter_call_result'):
+            data = getattr(self, 'filter_call_result')(data)
+        if data.port is None:
+            raise TypeError('data.port == None')
+        self.pack_uint(data.port)
+        if data.res is None:
+            raise TypeError('data.res == None')
+        self.pack_opaque(data.res)
+
+    def pack_rpcb_string(self, data: bytes) -> None:
+        if hasattr(self, 'filter_rpcb_string'):
+            data = getattr(self, 'filter_rpcb_string')(data)
+        self.pack_string(data)
+
+    def pack_rpcb(self, data: types.rpcb) -> None:
+        if hasattr(self, 'filter_rpcb'):
+            data = getattr(self, 'filter_rpcb')(data)
+        if data.r_prog is None:
+            raise TypeError('data.r_prog == None')
+        self.pack_uint(data.r_prog)
+        if data.r_vers is None:
+            raise TypeError('data.r_vers == None')
+        self.pack_uint(data.r_vers)
+        if data.r_netid is None:
+            raise TypeError('data.r_netid == None')
+        self.pack_string(data.r_netid)
+        if data.r_addr is None:
+            raise TypeError('data.r_addr == None')
+        self.pack_string(data.r_addr)
+        if data.r_owner is None:
+            raise TypeError('data.r_owner == None')
+        self.pack_string(data.r_owner)
+
+    def pack_rp__list(self, data: types.rp__list) -> None:
+        if hasattr(self, 'filter_rp__list'):
+            data = getattr(self, 'filter_rp__list')(data)
+        if data.rpcb_map is None:
+            raise TypeError('data.rpcb_map == None')
+        self.pack_rpcb(data.rpcb_map)
+        if data.rpcb_next is None:
+            raise TypeError('data.rpcb_next == None')
+        if len(data.rpcb_next) > 1 and self.check_array:
+            raise XDRError('array length too long for data.rpcb_next')
+        self.pack_array(data.rpcb_next, self.pack_rp__list)
+
+    def pack_rpcblist_ptr(self, data: types.rp__list) -> None:
+        if hasattr(self, 'filter_rpcblist_ptr'):
+            data = getattr(self, 'filter_rpcblist_ptr')(data)
+        if len(data) > 1 and self.check_array:
+            raise XDRError('array length too long for data')
+        self.pack_array(data, self.pack_rp__list)
+
+    def pack_netbuf(self, data: types.netbuf) -> None:
+        if hasattr(self, 'filter_netbuf'):
+            data = getattr(self, 'filter_netbuf')(data)
+        if data.maxlen is None:
+            raise TypeError('data.maxlen == None')
+        self.pack_uint(data.maxlen)
+        if data.buf is None:
+            raise TypeError('data.buf == None')
+        self.pack_opaque(data.buf)
+
+    def pack_rpcb_entry(self, data: types.rpcb_entry) -> None:
+        if hasattr(self, 'filter_rpcb_entry'):
+            data = getattr(self, 'filter_rpcb_entry')(data)
+        if data.r_maddr is None:
+            raise TypeError('data.r_maddr == None')
+        self.pack_string(data.r_maddr)
+        if data.r_nc_netid is None:
+            raise TypeError('data.r_nc_netid == None')
+        self.pack_string(data.r_nc_netid)
+        if data.r_nc_semantics is None:
+            raise TypeError('data.r_nc_semantics == None')
+        self.pack_uint(data.r_nc_semantics)
+        if data.r_nc_protofmly is None:
+            raise TypeError('data.r_nc_protofmly == None')
+        self.pack_string(data.r_nc_protofmly)
+        if data.r_nc_proto is None:
+            raise TypeError('data.r_nc_proto == None')
+        self.pack_string(data.r_nc_proto)
+
+    def pack_rpcb_entry_list(self, data: types.rpcb_entry_list) -> None:
+        if hasattr(self, 'filter_rpcb_entry_list'):
+            data = getattr(self, 'filter_rpcb_entry_list')(data)
+        if data.rpcb_entry_map is None:
+            raise TypeError('data.rpcb_entry_map == None')
+        self.pack_rpcb_entry(data.rpcb_entry_map)
+        if data.rpcb_entry_next is None:
+            raise TypeError('data.rpcb_entry_next == None')
+        if len(data.rpcb_entry_next) > 1 and self.check_array:
+            raise XDRError('array length too long for data.rpcb_entry_next')
+        self.pack_array(data.rpcb_entry_next, self.pack_rpcb_entry_list)
+
+    def pack_rpcb_entry_list_ptr(self, data: types.rpcb_entry_list) -> None:
+        if hasattr(self, 'filter_rpcb_entry_list_ptr'):
+            data = getattr(self, 'filter_rpcb_entry_list_ptr')(data)
+        if len(data) > 1 and self.check_array:
+            raise XDRError('array length too long for data')
+        self.pack_array(data, self.pack_rpcb_entry_list)
+
+    def pack_rpcbs_addrlist(self, data: types.rpcbs_addrlist) -> None:
+        if hasattr(self, 'filter_rpcbs_addrlist'):
+            data = getattr(self, 'filter_rpcbs_addrlist')(data)
+        if data.prog is None:
+            raise TypeError('data.prog == None')
+        self.pack_uint(data.prog)
+        if data.vers is None:
+            raise TypeError('data.vers == None')
+        self.pack_uint(data.vers)
+        if data.success is None:
+            raise TypeError('data.success == None')
+        self.pack_int(data.success)
+        if data.failure is None:
+            raise TypeError('data.failure == None')
+        self.pack_int(data.failure)
+        if data.netid is None:
+            raise TypeError('data.netid == None')
+        self.pack_string(data.netid)
+        if data.next is None:
+            raise TypeError('data.next == None')
+        if len(data.next) > 1 and self.check_array:
+            raise XDRError('array length too long for data.next')
+        self.pack_array(data.next, self.pack_rpcbs_addrlist)
+
+    def pack_rpcbs_rmtcalllist(self, data: types.rpcbs_rmtcalllist) -> None:
+        if hasattr(self, 'filter_rpcbs_rmtcalllist'):
+            data = getattr(self, 'filter_rpcbs_rmtcalllist')(data)
+        if data.prog is None:
+            raise TypeError('data.prog == None')
+        self.pack_uint(data.prog)
+        if data.vers is None:
+            raise TypeError('data.vers == None')
+        self.pack_uint(data.vers)
+        if data.proc is None:
+            raise TypeError('data.proc == None')
+        self.pack_uint(data.proc)
+        if data.success is None:
+            raise TypeError('data.success == None')
+        self.pack_int(data.success)
+        if data.failure is None:
+            raise TypeError('data.failure == None')
+        self.pack_int(data.failure)
+        if data.indirect is None:
+            raise TypeError('data.indirect == None')
+        self.pack_int(data.indirect)
+        if data.netid is None:
+            raise TypeError('data.netid == None')
+        self.pack_string(data.netid)
+        if data.next is None:
+            raise TypeError('data.next == None')
+        if len(data.next) > 1 and self.check_array:
+            raise XDRError('array length too long for data.next')
+        self.pack_array(data.next, self.pack_rpcbs_rmtcalllist)
+
+    def pack_rpcbs_proc(self, data: List[int]) -> None:
+        if hasattr(self, 'filter_rpcbs_proc'):
+            data = getattr(self, 'filter_rpcbs_proc')(data)
+        self.pack_farray(const.RPCBSTAT_HIGHPROC, data, self.pack_int)
+
+    def pack_rpcbs_addrlist_ptr(self, data: types.rpcbs_addrlist) -> None:
+        if hasattr(self, 'filter_rpcbs_addrlist_ptr'):
+            data = getattr(self, 'filter_rpcbs_addrlist_ptr')(data)
+        if len(data) > 1 and self.check_array:
+            raise XDRError('array length too long for data')
+        self.pack_array(data, self.pack_rpcbs_addrlist)
+
+    def pack_rpcbs_rmtcalllist_ptr(self, data: types.rpcbs_rmtcalllist) -> None:
+        if hasattr(self, 'filter_rpcbs_rmtcalllist_ptr'):
+            data = getattr(self, 'filter_rpcbs_rmtcalllist_ptr')(data)
+        if len(data) > 1 and self.check_array:
+            raise XDRError('array length too long for data')
+        self.pack_array(data, self.pack_rpcbs_rmtcalllist)
+
+    def pack_rpcb_stat(self, data: types.rpcb_stat) -> None:
+        if hasattr(self, 'filter_rpcb_stat'):
+            data = getattr(self, 'filter_rpcb_stat')(data)
+        if data.info is None:
+            raise TypeError('data.info == None')
+        self.pack_rpcbs_proc(data.info)
+        if data.setinfo is None:
+            raise TypeError('data.setinfo == None')
+        self.pack_int(data.setinfo)
+        if data.unsetinfo is None:
+            raise TypeError('data.unsetinfo == None')
+        self.pack_int(data.unsetinfo)
+        if data.addrinfo is None:
+            raise TypeError('data.addrinfo == None')
+        self.pack_rpcbs_addrlist_ptr(data.addrinfo)
+        if data.rmtinfo is None:
+            raise TypeError('data.rmtinfo == None')
+        self.pack_rpcbs_rmtcalllist_ptr(data.rmtinfo)
+
+    def pack_rpcb_stat_byvers(self, data: types.rpcb_stat) -> None:
+        if hasattr(self, 'filter_rpcb_stat_byvers'):
+            data = getattr(self, 'filter_rpcb_stat_byvers')(data)
+        self.pack_farray(const.RPCBVERS_STAT, data, self.pack_rpcb_stat)
+
+class PORTMAPIntoPacker(xdr_into.into_packer):
+    """Runs the same pack_* methods as PORTMAPPacker, encoding into a
+    preallocated buffer, starting at offset"""
+    pack_int = xdr_into.into_packer.pack_int
+    pack_uint = xdr_into.into_packer.pack_uint
+    pack_unsigned = xdr_into.into_packer.pack_uint
+    pack_hyper = xdr_into.into_packer.pack_hyper
+    pack_uhyper = xdr_into.into_packer.pack_uhyper
+    pack_float = xdr_into.into_packer.pack_float
+    pack_double = xdr_into.into_packer.pack_double
+    pack_quadruple = xdr_into.into_packer.pack_double
+    pack_bool = xdr_into.into_packer.pack_bool
+    pack_opaque = xdr_into.into_packer.pack_opaque
+    pack_string = xdr_into.into_packer.pack_string
+    def pack_mapping(self, data: types.mapping) -> None:
+        if hasattr(self, 'filter_mapping'):
+            data = getattr(self, 'filter_mapping')(data)
+        if data.prog is None:
+            raise TypeError('data.prog == None')
+        self.pack_uint(data.prog)
+        if data.vers is None:
+            raise TypeError('data.vers == None')
+        self.pack_uint(data.vers)
+        if data.prot is None:
+            raise TypeError('data.prot == None')
+        self.pack_uint(data.prot)
+        if data.port is None:
+            raise TypeError('data.port == None')
+        self.pack_uint(data.port)
+
+    def pack_pmaplist(self, data: types.pmaplist) -> None:
+        if hasattr(self, 'filter_pmaplist'):
+            data = getattr(self, 'filter_pmaplist')(data)
+        if data.map is None:
+            raise TypeError('data.map == None')
+        self.pack_mapping(data.map)
+        if data.next is None:
+            raise TypeError('data.next == None')
+        if len(data.next) > 1 and self.check_array:
+            raise XDRError('array length too long for data.next')
+        self.pack_array(data.next, self.pack_pmaplist)
+
+    def pack_pmaplist_ptr(self, data: types.pmaplist) -> None:
+        if hasattr(self, 'filter_pmaplist_ptr'):
+            data = getattr(self, 'filter_pmaplist_ptr')(data)
+        if len(data) > 1 and self.check_array:
+            raise XDRError('array length too long for data')
+        self.pack_array(data, self.pack_pmaplist)
+
+    def pack_call_args(self, data: types.call_args) -> None:
+        if hasattr(self, 'filter_call_args'):
+            data = getattr(self, 'filter_call_args')(data)
+        if data.prog is None:
+            raise TypeError('data.prog == None')
+        self.pack_uint(data.prog)
+        if data.vers is None:
+            raise TypeError('data.vers == None')
+        self.pack_uint(data.vers)
+        if data.proc is None:
+            raise TypeError('data.proc == None')
+        self.pack_uint(data.proc)
+        if data.args is None:
+            raise TypeError('data.args == None')
+        self.pack_opaque(data.args)
+
+    def pack_call_result(self, data: types.call_result) -> None:
+        if hasattr(self, 'filter_call_result'):
+            data = getattr(self, 'filter_call_result')(data)
+        if data.port is None:
+            raise TypeError('data.port == None')
+        self.pack_uint(data.port)
+        if data.res is None:
+            raise TypeError('data.res == None')
+        self.pack_opaque(data.res)
+
+    def pack_rpcb_string(self, data: bytes) -> None:
+        if hasattr(self, 'filter_rpcb_string'):
+            data = getattr(self, 'filter_rpcb_string')(data)
+        self.pack_string(data)
+
+    def pack_rpcb(self, data: types.rpcb) -> None:
+        if hasattr(self, 'filter_rpcb'):
+            data = getattr(self, 'filter_rpcb')(data)
+        if data.r_prog is None:
+            raise TypeError('data.r_prog == None')
+        self.pack_uint(data.r_prog)
+        if data.r_vers is None:
+            raise TypeError('data.r_vers == None')
+        self.pack_uint(data.r_vers)
+        if data.r_netid is None:
+            raise TypeError('data.r_netid == None')
+        self.pack_string(data.r_netid)
+        if data.r_addr is None:
+            raise TypeError('data.r_addr == None')
+        self.pack_string(data.r_addr)
+        if data.r_owner is None:
+            raise TypeError('data.r_owner == None')
+        self.pack_string(data.r_owner)
+
+    def pack_rp__list(self, data: types.rp__list) -> None:
+        if hasattr(self, 'filter_rp__list'):
+            data = getattr(self, 'filter_rp__list')(data)
+        if data.rpcb_map is None:
+            raise TypeError('data.rpcb_map == None')
+        self.pack_rpcb(data.rpcb_map)
+        if data.rpcb_next is None:
+            raise TypeError('data.rpcb_next == None')
+        if len(data.rpcb_next) > 1 and self.check_array:
+            raise XDRError('array length too long for data.rpcb_next')
+        self.pack_array(data.rpcb_next, self.pack_rp__list)
+
+    def pack_rpcblist_ptr(self, data: types.rp__list) -> None:
+        if hasattr(self, 'filter_rpcblist_ptr'):
+            data = getattr(self, 'filter_rpcblist_ptr')(data)
+        if len(data) > 1 and self.check_array:
+            raise XDRError('array length too long for data')
+        self.pack_array(data, self.pack_rp__list)
+
+    def pack_netbuf(self, data: types.netbuf) -> None:
+        if hasattr(self, 'filter_netbuf'):
+            data = getattr(self, 'filter_netbuf')(data)
+        if data.maxlen is None:
+            raise TypeError('data.maxlen == None')
+        self.pack_uint(data.maxlen)
+        if data.buf is None:
+            raise TypeError('data.buf == None')
+        self.pack_opaque(data.buf)
+
+    def pack_rpcb_entry(self, data: types.rpcb_entry) -> None:
+        if hasattr(self, 'filter_rpcb_entry'):
+            data = getattr(self, 'filter_rpcb_entry')(data)
+        if data.r_maddr is None:
+            raise TypeError('data.r_maddr == None')
+        self.pack_string(data.r_maddr)
+        if data.r_nc_netid is None:
+            raise TypeError('data.r_nc_netid == None')
+        self.pack_string(data.r_nc_netid)
+        if data.r_nc_semantics is None:
+            raise TypeError('data.r_nc_semantics == None')
+        self.pack_uint(data.r_nc_semantics)
+        if data.r_nc_protofmly is None:
+            raise TypeError('data.r_nc_protofmly == None')
+        self.pack_string(data.r_nc_protofmly)
+        if data.r_nc_proto is None:
+            raise TypeError('data.r_nc_proto == None')
+        self.pack_string(data.r_nc_proto)
+
+    def pack_rpcb_entry_list(self, data: types.rpcb_entry_list) -> None:
+        if hasattr(self, 'filter_rpcb_entry_list'):
+            data = getattr(self, 'filter_rpcb_entry_list')(data)
+        if data.rpcb_entry_map is None:
+            raise TypeError('data.rpcb_entry_map == None')
+        self.pack_rpcb_entry(data.rpcb_entry_map)
+        if data.rpcb_entry_next is None:
+            raise TypeError('data.rpcb_entry_next == None')
+        if len(data.rpcb_entry_next) > 1 and self.check_array:
+            raise XDRError('array length too long for data.rpcb_entry_next')
+        self.pack_array(data.rpcb_entry_next, self.pack_rpcb_entry_list)
+
+    def pack_rpcb_entry_list_ptr(self, data: types.rpcb_entry_list) -> None:
+        if hasattr(self, 'filter_rpcb_entry_list_ptr'):
+            data = getattr(self, 'filter_rpcb_entry_list_ptr')(data)
+        if len(data) > 1 and self.check_array:
+            raise XDRError('array length too long for data')
+        self.pack_array(data, self.pack_rpcb_entry_list)
+
+    def pack_rpcbs_addrlist(self, data: types.rpcbs_addrlist) -> None:
+        if hasattr(self, 'filter_rpcbs_addrlist'):
+            data = getattr(self, 'filter_rpcbs_addrlist')(data)
+        if data.prog is None:
+            raise TypeError('data.prog == None')
+        self.pack_uint(data.prog)
+        if data.vers is None:
+            raise TypeError('data.vers == None')
+        self.pack_uint(data.vers)
+        if data.success is None:
+            raise TypeError('data.success == None')
+        self.pack_int(data.success)
+        if data.failure is None:
+            raise TypeError('data.failure == None')
+        self.pack_int(data.failure)
+        if data.netid is None:
+            raise TypeError('data.netid == None')
+        self.pack_string(data.netid)
+        if data.next is None:
+            raise TypeError('data.next == None')
+        if len(data.next) > 1 and self.check_array:
+            raise XDRError('array length too long for data.next')
+        self.pack_array(data.next, self.pack_rpcbs_addrlist)
+
+    def pack_rpcbs_rmtcalllist(self, data: types.rpcbs_rmtcalllist) -> None:
+        if hasattr(self, 'filter_rpcbs_rmtcalllist'):
+            data = getattr(self, 'filter_rpcbs_rmtcalllist')(data)
+        if data.prog is None:
+            raise TypeError('data.prog == None')
+        self.pack_uint(data.prog)
+        if data.vers is None:
+            raise TypeError('data.vers == None')
+        self.pack_uint(data.vers)
+        if data.proc is None:
+            raise TypeError('data.proc == None')
+        self.pack_uint(data.proc)
+        if data.success is None:
+            raise TypeError('data.success == None')
+        self.pack_int(data.success)
+        if data.failure is None:
+            raise TypeError('data.failure == None')
+        self.pack_int(data.failure)
+        if data.indirect is None:
+            raise TypeError('data.indirect == None')
+        self.pack_int(data.indirect)
+        if data.netid is None:
+            raise TypeError('data.netid == None')
+        self.pack_string(data.netid)
+        if data.next is None:
+            raise TypeError('data.next == None')
+        if len(data.next) > 1 and self.check_array:
+            raise XDRError('array length too long for data.next')
+        self.pack_array(data.next, self.pack_rpcbs_rmtcalllist)
+
+    def pack_rpcbs_proc(self, data: List[int]) -> None:
+        if hasattr(self, 'filter_rpcbs_proc'):
+            data = getattr(self, 'filter_rpcbs_proc')(data)
+        self.pack_farray(const.RPCBSTAT_HIGHPROC, data, self.pack_int)
+
+    def pack_rpcbs_addrlist_ptr(self, data: types.rpcbs_addrlist) -> None:
+        if hasattr(self, 'filter_rpcbs_addrlist_ptr'):
+            data = getattr(self, 'filter_rpcbs_addrlist_ptr')(data)
+        if len(data) > 1 and self.check_array:
+            raise XDRError('array length too long for data')
+        self.pack_array(data, self.pack_rpcbs_addrlist)
+
+    def pack_rpcbs_rmtcalllist_ptr(self, data: types.rpcbs_rmtcalllist) -> None:
+        if hasattr(self, 'filter_rpcbs_rmtcalllist_ptr'):
+            data = getattr(self, 'filter_rpcbs_rmtcalllist_ptr')(data)
+        if len(data) > 1 and self.check_array:
+            raise XDRError('array length too long for data')
+        self.pack_array(data, self.pack_rpcbs_rmtcalllist)
+
+    def pack_rpcb_stat(self, data: types.rpcb_stat) -> None:
+        if hasattr(self, 'filter_rpcb_stat'):
+            data = getattr(self, 'filter_rpcb_stat')(data)
+        if data.info is None:
+            raise TypeError('data.info == None')
+        self.pack_rpcbs_proc(data.info)
+        if data.setinfo is None:
+            raise TypeError('data.setinfo == None')
+        self.pack_int(data.setinfo)
+        if data.unsetinfo is None:
+            raise TypeError('data.unsetinfo == None')
+        self.pack_int(data.unsetinfo)
+        if data.addrinfo is None:
+            raise TypeError('data.addrinfo == None')
+        self.pack_rpcbs_addrlist_ptr(data.addrinfo)
+        if data.rmtinfo is None:
+            raise TypeError('data.rmtinfo == None')
+        self.pack_rpcbs_rmtcalllist_ptr(data.rmtinfo)
+
+    def pack_rpcb_stat_byvers(self, data: types.rpcb_stat) -> None:
+        if hasattr(self, 'filter_rpcb_stat_byvers'):
+            data = getattr(self, 'filter_rpcb_stat_byvers')(data)
+        self.pack_farray(const.RPCBVERS_STAT, data, self.pack_rpcb_stat)
+
 class PORTMAPUnpacker(xdrlib.Unpacker):
     def __init__(self, data:bytes, check_enum:bool=True, check_array:bool=True) -> None:
         xdrlib.Unpacker.__init__(self, data)
@@ -108,11 +832,21 @@ class PORTMAPUnpacker(xdrlib.Unpacker):
     def unpack_pmaplist(self) -> types.pmaplist:
         data = types.pmaplist()
         data.map = self.unpack_mapping()
-        data.next = self.unpack_pmaplist()
+        data.next = self.unpack_array(self.unpack_pmaplist)
+        if len(data.next) > 1 and self.check_array:
+            raise XDRError('array length too long for data.next')
         if hasattr(self, 'filter_pmaplist'):
             data = getattr(self, 'filter_pmaplist')(data)
         return data
 
+    def unpack_pmaplist_ptr(self):
+        data = self.unpack_array(self.unpack_pmaplist)
+        if len(data) > 1 and self.check_array:
+            raise XDRError('array length too long for data')
+        if hasattr(self, 'filter_pmaplist_ptr'):
+            data = getattr(self, 'filter_pmaplist_ptr')(data)
+        return data
+
     def unpack_call_args(self) -> types.call_args:
         data = types.call_args()
         data.prog = self.unpack_uint()
@@ -131,3 +865,144 @@ class PORTMAPUnpacker(xdrlib.Unpacker):
             data = getattr(self, 'filter_call_result')(data)
         return data
 
+    def unpack_rpcb_string(self):
+        data = self.unpack_string()
+        if hasattr(self, 'filter_rpcb_string'):
+            data = getattr(self, 'filter_rpcb_string')(data)
+        return data
+
+    def unpack_rpcb(self) -> types.rpcb:
+        data = types.rpcb()
+        data.r_prog = self.unpack_uint()
+        data.r_vers = self.unpack_uint()
+        data.r_netid = self.unpack_string()
+        data.r_addr = self.unpack_string()
+        data.r_owner = self.unpack_string()
+        if hasattr(self, 'filter_rpcb'):
+            data = getattr(self, 'filter_rpcb')(data)
+        return data
+
+    def unpack_rp__list(self) -> types.rp__list:
+        data = types.rp__list()
+        data.rpcb_map = self.unpack_rpcb()
+        data.rpcb_next = self.unpack_array(self.unpack_rp__list)
+        if len(data.rpcb_next) > 1 and self.check_array:
+            raise XDRError('array length too long for data.rpcb_next')
+        if hasattr(self, 'filter_rp__list'):
+            data = getattr(self, 'filter_rp__list')(data)
+        return data
+
+    def unpack_rpcblist_ptr(self):
+        data = self.unpack_array(self.unpack_rp__list)
+        if len(data) > 1 and self.check_array:
+            raise XDRError('array length too long for data')
+        if hasattr(self, 'filter_rpcblist_ptr'):
+            data = getattr(self, 'filter_rpcblist_ptr')(data)
+        return data
+
+    def unpack_netbuf(self) -> types.netbuf:
+        data = types.netbuf()
+        data.maxlen = self.unpack_uint()
+        data.buf = self.unpack_opaque()
+        if hasattr(self, 'filter_netbuf'):
+            data = getattr(self, 'filter_netbuf')(data)
+        return data
+
+    def unpack_rpcb_entry(self) -> types.rpcb_entry:
+        data = types.rpcb_entry()
+        data.r_maddr = self.unpack_string()
+        data.r_nc_netid = self.unpack_string()
+        data.r_nc_semantics = self.unpack_uint()
+        data.r_nc_protofmly = self.unpack_string()
+        data.r_nc_proto = self.unpack_string()
+        if hasattr(self, 'filter_rpcb_entry'):
+            data = getattr(self, 'filter_rpcb_entry')(data)
+        return data
+
+    def unpack_rpcb_entry_list(self) -> types.rpcb_entry_list:
+        data = types.rpcb_entry_list()
+        data.rpcb_entry_map = self.unpack_rpcb_entry()
+        data.rpcb_entry_next = self.unpack_array(self.unpack_rpcb_entry_list)
+        if len(data.rpcb_entry_next) > 1 and self.check_array:
+            raise XDRError('array length too long for data.rpcb_entry_next')
+        if hasattr(self, 'filter_rpcb_entry_list'):
+            data = getattr(self, 'filter_rpcb_entry_list')(data)
+        return data
+
+    def unpack_rpcb_entry_list_ptr(self):
+        data = self.unpack_array(self.unpack_rpcb_entry_list)
+        if len(data) > 1 and self.check_array:
+            raise XDRError('array length too long for data')
+        if hasattr(self, 'filter_rpcb_entry_list_ptr'):
+            data = getattr(self, 'filter_rpcb_entry_list_ptr')(data)
+        return data
+
+    def unpack_rpcbs_addrlist(self) -> types.rpcbs_addrlist:
+        data = types.rpcbs_addrlist()
+        data.prog = self.unpack_uint()
+        data.vers = self.unpack_uint()
+        data.success = self.unpack_int()
+        data.failure = self.unpack_int()
+        data.netid = self.unpack_string()
+        data.next = self.unpack_array(self.unpack_rpcbs_addrlist)
+        if len(data.next) > 1 and self.check_array:
+            raise XDRError('array length too long for data.next')
+        if hasattr(self, 'filter_rpcbs_addrlist'):
+            data = getattr(self, 'filter_rpcbs_addrlist')(data)
+        return data
+
+    def unpack_rpcbs_rmtcalllist(self) -> types.rpcbs_rmtcalllist:
+        data = types.rpcbs_rmtcalllist()
+        data.prog = self.unpack_uint()
+        data.vers = self.unpack_uint()
+        data.proc = self.unpack_uint()
+        data.success = self.unpack_int()
+        data.failure = self.unpack_int()
+        data.indirect = self.unpack_int()
+        data.netid = self.unpack_string()
+        data.next = self.unpack_array(self.unpack_rpcbs_rmtcalllist)
+        if len(data.next) > 1 and self.check_array:
+            raise XDRError('array length too long for data.next')
+        if hasattr(self, 'filter_rpcbs_rmtcalllist'):
+            data = getattr(self, 'filter_rpcbs_rmtcalllist')(data)
+        return data
+
+    def unpack_rpcbs_proc(self):
+        data = self.unpack_farray(const.RPCBSTAT_HIGHPROC, self.unpack_int)
+        if hasattr(self, 'filter_rpcbs_proc'):
+            data = getattr(self, 'filter_rpcbs_proc')(data)
+        return data
+
+    def unpack_rpcbs_addrlist_ptr(self):
+        data = self.unpack_array(self.unpack_rpcbs_addrlist)
+        if len(data) > 1 and self.check_array:
+            raise XDRError('array length too long for data')
+        if hasattr(self, 'filter_rpcbs_addrlist_ptr'):
+            data = getattr(self, 'filter_rpcbs_addrlist_ptr')(data)
+        return data
+
+    def unpack_rpcbs_rmtcalllist_ptr(self):
+        data = self.unpack_array(self.unpack_rpcbs_rmtcalllist)
+        if len(data) > 1 and self.check_array:
+            raise XDRError('array length too long for data')
+        if hasattr(self, 'filter_rpcbs_rmtcalllist_ptr'):
+            data = getattr(self, 'filter_rpcbs_rmtcalllist_ptr')(data)
+        return data
+
+    def unpack_rpcb_stat(self) -> types.rpcb_stat:
+        data = types.rpcb_stat()
+        data.info = self.unpack_rpcbs_proc()
+        data.setinfo = self.unpack_int()
+        data.unsetinfo = self.unpack_int()
+        data.addrinfo = self.unpack_rpcbs_addrlist_ptr()
+        data.rmtinfo = self.unpack_rpcbs_rmtcalllist_ptr()
+        if hasattr(self, 'filter_rpcb_stat'):
+            data = getattr(self, 'filter_rpcb_stat')(data)
+        return data
+
+    def unpack_rpcb_stat_byvers(self):
+        data = self.unpack_farray(const.RPCBVERS_STAT, self.unpack_rpcb_stat)
+        if hasattr(self, 'filter_rpcb_stat_byvers'):
+            data = getattr(self, 'filter_rpcb_stat_byvers')(data)
+        return data
+
@@ -0,0 +1,303 @@
+# Generated by rpcgen.py from portmap.x, source hash f8929a99d2bb87be
+from typing import Any, List, Optional, Union
+from vxi11aio.rpc_srv import rpc_conn, rpc_srv
+from vxi11aio.xdr import rpc_type, portmap_const as const, portmap_type as types
+from vxi11aio.xdr.portmap_pack import PORTMAPIntoPacker, PORTMAPSizePacker, PORTMAPUnpacker
+
+class PMAP_PROG_2_svc(rpc_conn):
+    """Server skeleton for program PMAP_PROG, version PMAP_VERS.
+    Subclasses override the handlers of the procedures they implement.
+    Calls to any other procedure are answered with PROC_UNAVAIL."""
+
+    rpc_program = (const.PMAP_PROG, const.PMAP_VERS)
+
+    # procedure => (handler, function decoding and dispatching the call)
+    rpc_procedures = {
+        const.PMAPPROC_NULL: ('handle_PMAPPROC_NULL', '_dispatch_PMAPPROC_NULL'), # 0
+        const.PMAPPROC_SET: ('handle_PMAPPROC_SET', '_dispatch_PMAPPROC_SET'), # 1
+        const.PMAPPROC_UNSET: ('handle_PMAPPROC_UNSET', '_dispatch_PMAPPROC_UNSET'), # 2
+        const.PMAPPROC_GETPORT: ('handle_PMAPPROC_GETPORT', '_dispatch_PMAPPROC_GETPORT'), # 3
+        const.PMAPPROC_DUMP: ('handle_PMAPPROC_DUMP', '_dispatch_PMAPPROC_DUMP'), # 4
+        const.PMAPPROC_CALLIT: ('handle_PMAPPROC_CALLIT', '_dispatch_PMAPPROC_CALLIT'), # 5
+    }
+
+    async def handle_PMAPPROC_NULL(self, rpc_msg: rpc_type.rpc_msg, arg: None) -> None:
+        """void PMAPPROC_NULL (void) = 0;"""
+        raise NotImplementedError
+
+    async def _dispatch_PMAPPROC_NULL(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        arg = None
+        if(self.trace_calls):
+            print(f"handle_PMAPPROC_NULL >>> (void)")
+        rsp = await self.handle_PMAPPROC_NULL(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_PMAPPROC_NULL <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        return rpc_srv.success_reply_record(rpc_msg.xid, 0)[0]
+
+    async def handle_PMAPPROC_SET(self, rpc_msg: rpc_type.rpc_msg, arg: types.mapping) -> bool:
+        """bool PMAPPROC_SET (mapping) = 1;"""
+        raise NotImplementedError
+
+    async def _dispatch_PMAPPROC_SET(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = PORTMAPUnpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_mapping()
+        if(self.trace_calls):
+            print(f"handle_PMAPPROC_SET >>> {arg}")
+        rsp = await self.handle_PMAPPROC_SET(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_PMAPPROC_SET <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = PORTMAPSizePacker()
+        s.pack_bool(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        PORTMAPIntoPacker(record, offset).pack_bool(rsp)
+        return record
+
+    async def handle_PMAPPROC_UNSET(self, rpc_msg: rpc_type.rpc_msg, arg: types.mapping) -> bool:
+        """bool PMAPPROC_UNSET (mapping) = 2;"""
+        raise NotImplementedError
+
+    async def _dispatch_PMAPPROC_UNSET(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = PORTMAPUnpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_mapping()
+        if(self.trace_calls):
+            print(f"handle_PMAPPROC_UNSET >>> {arg}")
+        rsp = await self.handle_PMAPPROC_UNSET(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_PMAPPROC_UNSET <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = PORTMAPSizePacker()
+        s.pack_bool(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        PORTMAPIntoPacker(record, offset).pack_bool(rsp)
+        return record
+
+    async def handle_PMAPPROC_GETPORT(self, rpc_msg: rpc_type.rpc_msg, arg: types.mapping) -> int:
+        """uint PMAPPROC_GETPORT (mapping) = 3;"""
+        raise NotImplementedError
+
+    async def _dispatch_PMAPPROC_GETPORT(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = PORTMAPUnpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_mapping()
+        if(self.trace_calls):
+            print(f"handle_PMAPPROC_GETPORT >>> {arg}")
+        rsp = await self.handle_PMAPPROC_GETPORT(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_PMAPPROC_GETPORT <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = PORTMAPSizePacker()
+        s.pack_uint(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        PORTMAPIntoPacker(record, offset).pack_uint(rsp)
+        return record
+
+    async def handle_PMAPPROC_DUMP(self, rpc_msg: rpc_type.rpc_msg, arg: None) -> types.pmaplist:
+        """pmaplist_ptr PMAPPROC_DUMP (void) = 4;"""
+        raise NotImplementedError
+
+    async def _dispatch_PMAPPROC_DUMP(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        arg = None
+        if(self.trace_calls):
+            print(f"handle_PMAPPROC_DUMP >>> (void)")
+        rsp = await self.handle_PMAPPROC_DUMP(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_PMAPPROC_DUMP <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = PORTMAPSizePacker()
+        s.pack_pmaplist_ptr(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        PORTMAPIntoPacker(record, offset).pack_pmaplist_ptr(rsp)
+        return record
+
+    async def handle_PMAPPROC_CALLIT(self, rpc_msg: rpc_type.rpc_msg, arg: types.call_args) -> types.call_result:
+        """call_result PMAPPROC_CALLIT (call_args) = 5;"""
+        raise NotImplementedError
+
+    async def _dispatch_PMAPPROC_CALLIT(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = PORTMAPUnpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_call_args()
+        if(self.trace_calls):
+            print(f"handle_PMAPPROC_CALLIT >>> {arg}")
+        rsp = await self.handle_PMAPPROC_CALLIT(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_PMAPPROC_CALLIT <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = PORTMAPSizePacker()
+        s.pack_call_result(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        PORTMAPIntoPacker(record, offset).pack_call_result(rsp)
+        return record
+
+class RPCBPROG_3_svc(rpc_conn):
+    """Server skeleton for program RPCBPROG, version RPCBVERS.
+    Subclasses override the handlers of the procedures they implement.
+    Calls to any other procedure are answered with PROC_UNAVAIL."""
+
+    rpc_program = (const.RPCBPROG, const.RPCBVERS)
+
+    # procedure => (handler, function decoding and dispatching the call)
+    rpc_procedures = {
+        const.RPCBPROC_NULL: ('handle_RPCBPROC_NULL', '_dispatch_RPCBPROC_NULL'), # 0
+        const.RPCBPROC_SET: ('handle_RPCBPROC_SET', '_dispatch_RPCBPROC_SET'), # 1
+        const.RPCBPROC_UNSET: ('handle_RPCBPROC_UNSET', '_dispatch_RPCBPROC_UNSET'), # 2
+        const.RPCBPROC_GETADDR: ('handle_RPCBPROC_GETADDR', '_dispatch_RPCBPROC_GETADDR'), # 3
+        const.RPCBPROC_DUMP: ('handle_RPCBPROC_DUMP', '_dispatch_RPCBPROC_DUMP'), # 4
+        const.RPCBPROC_GETTIME: ('handle_RPCBPROC_GETTIME', '_dispatch_RPCBPROC_GETTIME'), # 6
+        const.RPCBPROC_UADDR2TADDR: ('handle_RPCBPROC_UADDR2TADDR', '_dispatch_RPCBPROC_UADDR2TADDR'), # 7
+        const.RPCBPROC_TADDR2UADDR: ('handle_RPCBPROC_TADDR2UADDR', '_dispatch_RPCBPROC_TADDR2UADDR'), # 8
+    }
+
+    async def handle_RPCBPROC_NULL(self, rpc_msg: rpc_type.rpc_msg, arg: None) -> None:
+        """void RPCBPROC_NULL (void) = 0;"""
+        raise NotImplementedError
+
+    async def _dispatch_RPCBPROC_NULL(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        arg = None
+        if(self.trace_calls):
+            print(f"handle_RPCBPROC_NULL >>> (void)")
+        rsp = await self.handle_RPCBPROC_NULL(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_RPCBPROC_NULL <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        return rpc_srv.success_reply_record(rpc_msg.xid, 0)[0]
+
+    async def handle_RPCBPROC_SET(self, rpc_msg: rpc_type.rpc_msg, arg: types.rpcb) -> bool:
+        """bool RPCBPROC_SET (rpcb) = 1;"""
+        raise NotImplementedError
+
+    async def _dispatch_RPCBPROC_SET(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = PORTMAPUnpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_rpcb()
+        if(self.trace_calls):
+            print(f"handle_RPCBPROC_SET >>> {arg}")
+        rsp = await self.handle_RPCBPROC_SET(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_RPCBPROC_SET <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = PORTMAPSizePacker()
+        s.pack_bool(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        PORTMAPIntoPacker(record, offset).pack_bool(rsp)
+        return record
+
+    async def handle_RPCBPROC_UNSET(self, rpc_msg: rpc_type.rpc_msg, arg: types.rpcb) -> bool:
+        """bool RPCBPROC_UNSET (rpcb) = 2;"""
+        raise NotImplementedError
+
+    async def _dispatch_RPCBPROC_UNSET(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = PORTMAPUnpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_rpcb()
+        if(self.trace_calls):
+            print(f"handle_RPCBPROC_UNSET >>> {arg}")
+        rsp = await self.handle_RPCBPROC_UNSET(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_RPCBPROC_UNSET <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = PORTMAPSizePacker()
+        s.pack_bool(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        PORTMAPIntoPacker(record, offset).pack_bool(rsp)
+        return record
+
+    async def handle_RPCBPROC_GETADDR(self, rpc_msg: rpc_type.rpc_msg, arg: types.rpcb) -> bytes:
+        """rpcb_string RPCBPROC_GETADDR (rpcb) = 3;"""
+        raise NotImplementedError
+
+    async def _dispatch_RPCBPROC_GETADDR(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = PORTMAPUnpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_rpcb()
+        if(self.trace_calls):
+            print(f"handle_RPCBPROC_GETADDR >>> {arg}")
+        rsp = await self.handle_RPCBPROC_GETADDR(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_RPCBPROC_GETADDR <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = PORTMAPSizePacker()
+        s.pack_rpcb_string(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        PORTMAPIntoPacker(record, offset).pack_rpcb_string(rsp)
+        return record
+
+    async def handle_RPCBPROC_DUMP(self, rpc_msg: rpc_type.rpc_msg, arg: None) -> types.rp__list:
+        """rpcblist_ptr RPCBPROC_DUMP (void) = 4;"""
+        raise NotImplementedError
+
+    async def _dispatch_RPCBPROC_DUMP(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        arg = None
+        if(self.trace_calls):
+            print(f"handle_RPCBPROC_DUMP >>> (void)")
+        rsp = await self.handle_RPCBPROC_DUMP(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_RPCBPROC_DUMP <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = PORTMAPSizePacker()
+        s.pack_rpcblist_ptr(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        PORTMAPIntoPacker(record, offset).pack_rpcblist_ptr(rsp)
+        return record
+
+    async def handle_RPCBPROC_GETTIME(self, rpc_msg: rpc_type.rpc_msg, arg: None) -> int:
+        """uint RPCBPROC_GETTIME (void) = 6;"""
+        raise NotImplementedError
+
+    async def _dispatch_RPCBPROC_GETTIME(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        arg = None
+        if(self.trace_calls):
+            print(f"handle_RPCBPROC_GETTIME >>> (void)")
+        rsp = await self.handle_RPCBPROC_GETTIME(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_RPCBPROC_GETTIME <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = PORTMAPSizePacker()
+        s.pack_uint(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        PORTMAPIntoPacker(record, offset).pack_uint(rsp)
+        return record
+
+    async def handle_RPCBPROC_UADDR2TADDR(self, rpc_msg: rpc_type.rpc_msg, arg: bytes) -> types.netbuf:
+        """netbuf RPCBPROC_UADDR2TADDR (rpcb_string) = 7;"""
+        raise NotImplementedError
+
+    async def _dispatch_RPCBPROC_UADDR2TADDR(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = PORTMAPUnpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_rpcb_string()
+        if(self.trace_calls):
+            print(f"handle_RPCBPROC_UADDR2TADDR >>> {arg}")
+        rsp = await self.handle_RPCBPROC_UADDR2TADDR(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_RPCBPROC_UADDR2TADDR <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = PORTMAPSizePacker()
+        s.pack_netbuf(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        PORTMAPIntoPacker(record, offset).pack_netbuf(rsp)
+        return record
+
+    async def handle_RPCBPROC_TADDR2UADDR(self, rpc_msg: rpc_type.rpc_msg, arg: types.netbuf) -> bytes:
+        """rpcb_string RPCBPROC_TADDR2UADDR (netbuf) = 8;"""
+        raise NotImplementedError
+
+    async def _dispatch_RPCBPROC_TADDR2UADDR(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = PORTMAPUnpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_netbuf()
+        if(self.trace_calls):
+            print(f"handle_RPCBPROC_TADDR2UADDR >>> {arg}")
+        rsp = await self.handle_RPCBPROC_TADDR2UADDR(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_RPCBPROC_TADDR2UADDR <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = PORTMAPSizePacker()
+        s.pack_rpcb_string(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        PORTMAPIntoPacker(record, offset).pack_rpcb_string(rsp)
+        return record
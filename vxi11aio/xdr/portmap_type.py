@@ -1,6 +1,4 @@
-# Generated by rpcgen.py from portmap.x on Sat Nov 16 15:25:09 2019
-import sys,os
-sys.path.append(os.path.dirname(__file__))
+# Generated by rpcgen.py from portmap.x, source hash f8929a99d2bb87be
 from typing import Any, List, Optional, Union
 from vxi11aio.xdr import portmap_const as const
 class mapping:
@@ -34,12 +32,15 @@ class pmaplist:
     # XDR definition:
     # struct pmaplist {
     #     mapping map;
-    #     pmaplist next;
+    #     pmaplist next<1>;
     # };
     def __init__(self, map:Optional['mapping']=None, next:Optional['pmaplist']=None) -> None:
         self.map = map
         self.next = next
 
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.map, attr)
+
     def __repr__(self) -> str:
         out: List[str] = []
         if self.map is not None:
@@ -95,3 +96,237 @@ class call_result:
         return 'call_result(%s)' % ', '.join(out)
     __str__ = __repr__
 
+class rpcb:
+    # XDR definition:
+    # struct rpcb {
+    #     uint r_prog;
+    #     uint r_vers;
+    #     string r_netid<>;
+    #     string r_addr<>;
+    #     string r_owner<>;
+    # };
+    def __init__(self, r_prog:Optional[int]=None, r_vers:Optional[int]=None, r_netid:Optional[bytes]=None, r_addr:Optional[bytes]=None, r_owner:Optional[bytes]=None) -> None:
+        self.r_prog = r_prog
+        self.r_vers = r_vers
+        self.r_netid = r_netid
+        self.r_addr = r_addr
+        self.r_owner = r_owner
+
+    def __repr__(self) -> str:
+        out: List[str] = []
+        if self.r_prog is not None:
+            out += ['r_prog=%s' % repr(self.r_prog)]
+        if self.r_vers is not None:
+            out += ['r_vers=%s' % repr(self.r_vers)]
+        if self.r_netid is not None:
+            out += ['r_netid=%s' % repr(self.r_netid)]
+        if self.r_addr is not None:
+            out += ['r_addr=%s' % repr(self.r_addr)]
+        if self.r_owner is not None:
+            out += ['r_owner=%s' % repr(self.r_owner)]
+        return 'rpcb(%s)' % ', '.join(out)
+    __str__ = __repr__
+
+class rp__list:
+    # XDR definition:
+    # struct rp__list {
+    #     rpcb rpcb_map;
+    #     rp__list rpcb_next<1>;
+    # };
+    def __init__(self, rpcb_map:Optional['rpcb']=None, rpcb_next:Optional['rp__list']=None) -> None:
+        self.rpcb_map = rpcb_map
+        self.rpcb_next = rpcb_next
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.rpcb_map, attr)
+
+    def __repr__(self) -> str:
+        out: List[str] = []
+        if self.rpcb_map is not None:
+            out += ['rpcb_map=%s' % repr(self.rpcb_map)]
+        if self.rpcb_next is not None:
+            out += ['rpcb_next=%s' % repr(self.rpcb_next)]
+        return 'rp__list(%s)' % ', '.join(out)
+    __str__ = __repr__
+
+class netbuf:
+    # XDR definition:
+    # struct netbuf {
+    #     uint maxlen;
+    #     opaque buf<>;
+    # };
+    def __init__(self, maxlen:Optional[int]=None, buf:Optional[bytes]=None) -> None:
+        self.maxlen = maxlen
+        self.buf = buf
+
+    def __repr__(self) -> str:
+        out: List[str] = []
+        if self.maxlen is not None:
+            out += ['maxlen=%s' % repr(self.maxlen)]
+        if self.buf is not None:
+            out += ['buf=%s' % repr(self.buf)]
+        return 'netbuf(%s)' % ', '.join(out)
+    __str__ = __repr__
+
+class rpcb_entry:
+    # XDR definition:
+    # struct rpcb_entry {
+    #     string r_maddr<>;
+    #     string r_nc_netid<>;
+    #     uint r_nc_semantics;
+    #     string r_nc_protofmly<>;
+    #     string r_nc_proto<>;
+    # };
+    def __init__(self, r_maddr:Optional[bytes]=None, r_nc_netid:Optional[bytes]=None, r_nc_semantics:Optional[int]=None, r_nc_protofmly:Optional[bytes]=None, r_nc_proto:Optional[bytes]=None) -> None:
+        self.r_maddr = r_maddr
+        self.r_nc_netid = r_nc_netid
+        self.r_nc_semantics = r_nc_semantics
+        self.r_nc_protofmly = r_nc_protofmly
+        self.r_nc_proto = r_nc_proto
+
+    def __repr__(self) -> str:
+        out: List[str] = []
+        if self.r_maddr is not None:
+            out += ['r_maddr=%s' % repr(self.r_maddr)]
+        if self.r_nc_netid is not None:
+            out += ['r_nc_netid=%s' % repr(self.r_nc_netid)]
+        if self.r_nc_semantics is not None:
+            out += ['r_nc_semantics=%s' % repr(self.r_nc_semantics)]
+        if self.r_nc_protofmly is not None:
+            out += ['r_nc_protofmly=%s' % repr(self.r_nc_protofmly)]
+        if self.r_nc_proto is not None:
+            out += ['r_nc_proto=%s' % repr(self.r_nc_proto)]
+        return 'rpcb_entry(%s)' % ', '.join(out)
+    __str__ = __repr__
+
+class rpcb_entry_list:
+    # XDR definition:
+    # struct rpcb_entry_list {
+    #     rpcb_entry rpcb_entry_map;
+    #     rpcb_entry_list rpcb_entry_next<1>;
+    # };
+    def __init__(self, rpcb_entry_map:Optional['rpcb_entry']=None, rpcb_entry_next:Optional['rpcb_entry_list']=None) -> None:
+        self.rpcb_entry_map = rpcb_entry_map
+        self.rpcb_entry_next = rpcb_entry_next
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self.rpcb_entry_map, attr)
+
+    def __repr__(self) -> str:
+        out: List[str] = []
+        if self.rpcb_entry_map is not None:
+            out += ['rpcb_entry_map=%s' % repr(self.rpcb_entry_map)]
+        if self.rpcb_entry_next is not None:
+            out += ['rpcb_entry_next=%s' % repr(self.rpcb_entry_next)]
+        return 'rpcb_entry_list(%s)' % ', '.join(out)
+    __str__ = __repr__
+
+class rpcbs_addrlist:
+    # XDR definition:
+    # struct rpcbs_addrlist {
+    #     uint prog;
+    #     uint vers;
+    #     int success;
+    #     int failure;
+    #     string netid<>;
+    #     rpcbs_addrlist next<1>;
+    # };
+    def __init__(self, prog:Optional[int]=None, vers:Optional[int]=None, success:Optional[int]=None, failure:Optional[int]=None, netid:Optional[bytes]=None, next:Optional['rpcbs_addrlist']=None) -> None:
+        self.prog = prog
+        self.vers = vers
+        self.success = success
+        self.failure = failure
+        self.netid = netid
+        self.next = next
+
+    def __repr__(self) -> str:
+        out: List[str] = []
+        if self.prog is not None:
+            out += ['prog=%s' % repr(self.prog)]
+        if self.vers is not None:
+            out += ['vers=%s' % repr(self.vers)]
+        if self.success is not None:
+            out += ['success=%s' % repr(self.success)]
+        if self.failure is not None:
+            out += ['failure=%s' % repr(self.failure)]
+        if self.netid is not None:
+            out += ['netid=%s' % repr(self.netid)]
+        if self.next is not None:
+            out += ['next=%s' % repr(self.next)]
+        return 'rpcbs_addrlist(%s)' % ', '.join(out)
+    __str__ = __repr__
+
+class rpcbs_rmtcalllist:
+    # XDR definition:
+    # struct rpcbs_rmtcalllist {
+    #     uint prog;
+    #     uint vers;
+    #     uint proc;
+    #     int success;
+    #     int failure;
+    #     int indirect;
+    #     string netid<>;
+    #     rpcbs_rmtcalllist next<1>;
+    # };
+    def __init__(self, prog:Optional[int]=None, vers:Optional[int]=None, proc:Optional[int]=None, success:Optional[int]=None, failure:Optional[int]=None, indirect:Optional[int]=None, netid:Optional[bytes]=None, next:Optional['rpcbs_rmtcalllist']=None) -> None:
+        self.prog = prog
+        self.vers = vers
+        self.proc = proc
+        self.success = success
+        self.failure = failure
+        self.indirect = indirect
+        self.netid = netid
+        self.next = next
+
+    def __repr__(self) -> str:
+        out: List[str] = []
+        if self.prog is not None:
+            out += ['prog=%s' % repr(self.prog)]
+        if self.vers is not None:
+            out += ['vers=%s' % repr(self.vers)]
+        if self.proc is not None:
+            out += ['proc=%s' % repr(self.proc)]
+        if self.success is not None:
+            out += ['success=%s' % repr(self.success)]
+        if self.failure is not None:
+            out += ['failure=%s' % repr(self.failure)]
+        if self.indirect is not None:
+            out += ['indirect=%s' % repr(self.indirect)]
+        if self.netid is not None:
+            out += ['netid=%s' % repr(self.netid)]
+        if self.next is not None:
+            out += ['next=%s' % repr(self.next)]
+        return 'rpcbs_rmtcalllist(%s)' % ', '.join(out)
+    __str__ = __repr__
+
+class rpcb_stat:
+    # XDR definition:
+    # struct rpcb_stat {
+    #     rpcbs_proc info;
+    #     int setinfo;
+    #     int unsetinfo;
+    #     rpcbs_addrlist_ptr addrinfo;
+    #     rpcbs_rmtcalllist_ptr rmtinfo;
+    # };
+    def __init__(self, info:Optional[List[int]]=None, setinfo:Optional[int]=None, unsetinfo:Optional[int]=None, addrinfo:Optional['rpcbs_addrlist']=None, rmtinfo:Optional['rpcbs_rmtcalllist']=None) -> None:
+        self.info = info
+        self.setinfo = setinfo
+        self.unsetinfo = unsetinfo
+        self.addrinfo = addrinfo
+        self.rmtinfo = rmtinfo
+
+    def __repr__(self) -> str:
+        out: List[str] = []
+        if self.info is not None:
+            out += ['info=%s' % repr(self.info)]
+        if self.setinfo is not None:
+            out += ['setinfo=%s' % repr(self.setinfo)]
+        if self.unsetinfo is not None:
+            out += ['unsetinfo=%s' % repr(self.unsetinfo)]
+        if self.addrinfo is not None:
+            out += ['addrinfo=%s' % repr(self.addrinfo)]
+        if self.rmtinfo is not None:
+            out += ['rmtinfo=%s' % repr(self.rmtinfo)]
+        return 'rpcb_stat(%s)' % ', '.join(out)
+    __str__ = __repr__
+
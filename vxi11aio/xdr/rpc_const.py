@@ -1,4 +1,4 @@
-# Generated by rpcgen.py from rpc.x on Sat Nov 16 16:09:51 2019
+# Generated by rpcgen.py from rpc.x, source hash d5921717f56b39bb
 AUTH_NONE = 0
 AUTH_SYS = 1
 AUTH_SHORT = 2
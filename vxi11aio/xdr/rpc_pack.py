@@ -1,14 +1,21 @@
-# Generated by rpcgen.py from rpc.x on Sat Nov 16 16:09:51 2019
-import sys,os
-sys.path.append(os.path.dirname(__file__))
+# Generated by rpcgen.py from rpc.x, source hash d5921717f56b39bb
 from typing import Any, List, Optional, Union
 from vxi11aio.xdr import rpc_const as const, rpc_type as types
+import struct
 import xdrlib
 from xdrlib import Error as XDRError
+from vxi11aio import xdr_into
 
 class nullclass(object):
     pass
 
+accept_stat_values = frozenset([const.SUCCESS, const.PROG_UNAVAIL, const.PROG_MISMATCH, const.PROC_UNAVAIL, const.GARBAGE_ARGS, const.SYSTEM_ERR])
+auth_flavor_values = frozenset([const.AUTH_NONE, const.AUTH_SYS, const.AUTH_SHORT, const.AUTH_DH, const.RPCSEC_GSS])
+auth_stat_values = frozenset([const.AUTH_OK, const.AUTH_BADCRED, const.AUTH_REJECTEDCRED, const.AUTH_BADVERF, const.AUTH_REJECTEDVERF, const.AUTH_TOOWEAK, const.AUTH_INVALIDRESP, const.AUTH_FAILED, const.AUTH_KERB_GENERIC, const.AUTH_TIMEEXPIRE, const.AUTH_TKT_FILE, const.AUTH_DECODE, const.AUTH_NET_ADDR, const.RPCSEC_GSS_CREDPROBLEM, const.RPCSEC_GSS_CTXPROBLEM])
+msg_type_values = frozenset([const.CALL, const.REPLY])
+reject_stat_values = frozenset([const.RPC_MISMATCH, const.AUTH_ERROR])
+reply_stat_values = frozenset([const.MSG_ACCEPTED, const.MSG_DENIED])
+
 class RPCPacker(xdrlib.Packer):
     def __init__(self, check_enum:bool=True, check_array:bool=True) -> None:
         xdrlib.Packer.__init__(self)
@@ -29,7 +36,246 @@ class RPCPacker(xdrlib.Packer):
     def pack_auth_flavor(self, data: int) -> None:
         if hasattr(self, 'filter_auth_flavor'):
             data = getattr(self, 'filter_auth_flavor')(data)
-        if self.check_enum and data not in [const.AUTH_NONE, const.AUTH_SYS, const.AUTH_SHORT, const.AUTH_DH, const.RPCSEC_GSS]:
+        if self.check_enum and data not in auth_flavor_values:
+            raise XDRError('value=%s not in enum auth_flavor' % data)
+        self.pack_int(data)
+
+    def pack_opaque_auth(self, data: types.opaque_auth) -> None:
+        if hasattr(self, 'filter_opaque_auth'):
+            data = getattr(self, 'filter_opaque_auth')(data)
+        if data.flavor is None:
+            raise TypeError('data.flavor == None')
+        self.pack_auth_flavor(data.flavor)
+        if data.body is None:
+            raise TypeError('data.body == None')
+        if len(data.body) > 400 and self.check_array:
+            raise XDRError('array length too long for data.body')
+        self.pack_opaque(data.body)
+
+    def pack_msg_type(self, data: int) -> None:
+        if hasattr(self, 'filter_msg_type'):
+            data = getattr(self, 'filter_msg_type')(data)
+        if self.check_enum and data not in msg_type_values:
+            raise XDRError('value=%s not in enum msg_type' % data)
+        self.pack_int(data)
+
+    def pack_reply_stat(self, data: int) -> None:
+        if hasattr(self, 'filter_reply_stat'):
+            data = getattr(self, 'filter_reply_stat')(data)
+        if self.check_enum and data not in reply_stat_values:
+            raise XDRError('value=%s not in enum reply_stat' % data)
+        self.pack_int(data)
+
+    def pack_accept_stat(self, data: int) -> None:
+        if hasattr(self, 'filter_accept_stat'):
+            data = getattr(self, 'filter_accept_stat')(data)
+        if self.check_enum and data not in accept_stat_values:
+            raise XDRError('value=%s not in enum accept_stat' % data)
+        self.pack_int(data)
+
+    def pack_reject_stat(self, data: int) -> None:
+        if hasattr(self, 'filter_reject_stat'):
+            data = getattr(self, 'filter_reject_stat')(data)
+        if self.check_enum and data not in reject_stat_values:
+            raise XDRError('value=%s not in enum reject_stat' % data)
+        self.pack_int(data)
+
+    def pack_auth_stat(self, data: int) -> None:
+        if hasattr(self, 'filter_auth_stat'):
+            data = getattr(self, 'filter_auth_stat')(data)
+        if self.check_enum and data not in auth_stat_values:
+            raise XDRError('value=%s not in enum auth_stat' % data)
+        self.pack_int(data)
+
+    def pack_rpc_msg(self, data: types.rpc_msg) -> None:
+        if hasattr(self, 'filter_rpc_msg'):
+            data = getattr(self, 'filter_rpc_msg')(data)
+        if data.xid is None:
+            raise TypeError('data.xid == None')
+        self.pack_uint(data.xid)
+        if data.body is None:
+            raise TypeError('data.body == None')
+        self.pack_rpc_msg_body(data.body)
+
+    def pack_rpc_msg_body(self, data: types.rpc_msg_body) -> None:
+        if hasattr(self, 'filter_rpc_msg_body'):
+            data = getattr(self, 'filter_rpc_msg_body')(data)
+        if data.mtype is None:
+            raise TypeError('data.mtype == None')
+        self.pack_msg_type(data.mtype)
+        arm = self._pack_rpc_msg_body_arms.get(data.mtype)
+        if arm is not None:
+            arm(self, data)
+        else:
+            raise XDRError('bad switch=%s' % data.mtype)
+
+    def _pack_rpc_msg_body_arm0(self, data: types.rpc_msg_body) -> None:
+        if data.cbody is None:
+            raise TypeError('data.cbody == None')
+        self.pack_call_body(data.cbody)
+
+    def _pack_rpc_msg_body_arm1(self, data: types.rpc_msg_body) -> None:
+        if data.rbody is None:
+            raise TypeError('data.rbody == None')
+        self.pack_reply_body(data.rbody)
+
+    _pack_rpc_msg_body_arms = {const.CALL : _pack_rpc_msg_body_arm0, const.REPLY : _pack_rpc_msg_body_arm1}
+
+    def pack_call_body(self, data: types.call_body) -> None:
+        if hasattr(self, 'filter_call_body'):
+            data = getattr(self, 'filter_call_body')(data)
+        if data.rpcvers is None:
+            raise TypeError('data.rpcvers == None')
+        self.pack_uint(data.rpcvers)
+        if data.prog is None:
+            raise TypeError('data.prog == None')
+        self.pack_uint(data.prog)
+        if data.vers is None:
+            raise TypeError('data.vers == None')
+        self.pack_uint(data.vers)
+        if data.proc is None:
+            raise TypeError('data.proc == None')
+        self.pack_uint(data.proc)
+        if data.cred is None:
+            raise TypeError('data.cred == None')
+        self.pack_opaque_auth(data.cred)
+        if data.verf is None:
+            raise TypeError('data.verf == None')
+        self.pack_opaque_auth(data.verf)
+
+    def pack_reply_body(self, data: types.reply_body) -> None:
+        if hasattr(self, 'filter_reply_body'):
+            data = getattr(self, 'filter_reply_body')(data)
+        if data.stat is None:
+            raise TypeError('data.stat == None')
+        self.pack_reply_stat(data.stat)
+        arm = self._pack_reply_body_arms.get(data.stat)
+        if arm is not None:
+            arm(self, data)
+        else:
+            raise XDRError('bad switch=%s' % data.stat)
+
+    def _pack_reply_body_arm0(self, data: types.reply_body) -> None:
+        if data.areply is None:
+            raise TypeError('data.areply == None')
+        self.pack_accepted_reply(data.areply)
+
+    def _pack_reply_body_arm1(self, data: types.reply_body) -> None:
+        if data.rreply is None:
+            raise TypeError('data.rreply == None')
+        self.pack_rejected_reply(data.rreply)
+
+    _pack_reply_body_arms = {const.MSG_ACCEPTED : _pack_reply_body_arm0, const.MSG_DENIED : _pack_reply_body_arm1}
+
+    def pack_rpc_mismatch_info(self, data: types.rpc_mismatch_info) -> None:
+        if hasattr(self, 'filter_rpc_mismatch_info'):
+            data = getattr(self, 'filter_rpc_mismatch_info')(data)
+        if data.low is None:
+            raise TypeError('data.low == None')
+        self.pack_uint(data.low)
+        if data.high is None:
+            raise TypeError('data.high == None')
+        self.pack_uint(data.high)
+
+    def pack_rpc_reply_data(self, data: types.rpc_reply_data) -> None:
+        if hasattr(self, 'filter_rpc_reply_data'):
+            data = getattr(self, 'filter_rpc_reply_data')(data)
+        if data.stat is None:
+            raise TypeError('data.stat == None')
+        self.pack_accept_stat(data.stat)
+        arm = self._pack_rpc_reply_data_arms.get(data.stat)
+        if arm is not None:
+            arm(self, data)
+        else:
+            pass
+
+    def _pack_rpc_reply_data_arm0(self, data: types.rpc_reply_data) -> None:
+        if data.results is None:
+            raise TypeError('data.results == None')
+        self.pack_fopaque(0, data.results)
+
+    def _pack_rpc_reply_data_arm1(self, data: types.rpc_reply_data) -> None:
+        if data.mismatch_info is None:
+            raise TypeError('data.mismatch_info == None')
+        self.pack_rpc_mismatch_info(data.mismatch_info)
+
+    _pack_rpc_reply_data_arms = {const.SUCCESS : _pack_rpc_reply_data_arm0, const.PROG_MISMATCH : _pack_rpc_reply_data_arm1}
+
+    def pack_accepted_reply(self, data: types.accepted_reply) -> None:
+        if hasattr(self, 'filter_accepted_reply'):
+            data = getattr(self, 'filter_accepted_reply')(data)
+        if data.verf is None:
+            raise TypeError('data.verf == None')
+        self.pack_opaque_auth(data.verf)
+        if data.reply_data is None:
+            raise TypeError('data.reply_data == None')
+        self.pack_rpc_reply_data(data.reply_data)
+
+    def pack_rejected_reply(self, data: types.rejected_reply) -> None:
+        if hasattr(self, 'filter_rejected_reply'):
+            data = getattr(self, 'filter_rejected_reply')(data)
+        if data.stat is None:
+            raise TypeError('data.stat == None')
+        self.pack_reject_stat(data.stat)
+        arm = self._pack_rejected_reply_arms.get(data.stat)
+        if arm is not None:
+            arm(self, data)
+        else:
+            raise XDRError('bad switch=%s' % data.stat)
+
+    def _pack_rejected_reply_arm0(self, data: types.rejected_reply) -> None:
+        if data.mismatch_info is None:
+            raise TypeError('data.mismatch_info == None')
+        self.pack_rpc_mismatch_info(data.mismatch_info)
+
+    def _pack_rejected_reply_arm1(self, data: types.rejected_reply) -> None:
+        if data.astat is None:
+            raise TypeError('data.astat == None')
+        self.pack_auth_stat(data.astat)
+
+    _pack_rejected_reply_arms = {const.RPC_MISMATCH : _pack_rejected_reply_arm0, const.AUTH_ERROR : _pack_rejected_reply_arm1}
+
+    def pack_authsys_parms(self, data: types.authsys_parms) -> None:
+        if hasattr(self, 'filter_authsys_parms'):
+            data = getattr(self, 'filter_authsys_parms')(data)
+        if data.stamp is None:
+            raise TypeError('data.stamp == None')
+        self.pack_uint(data.stamp)
+        if data.machinename is None:
+            raise TypeError('data.machinename == None')
+        if len(data.machinename) > 255 and self.check_array:
+            raise XDRError('array length too long for data.machinename')
+        self.pack_string(data.machinename)
+        if data.uid is None:
+            raise TypeError('data.uid == None')
+        self.pack_uint(data.uid)
+        if data.gid is None:
+            raise TypeError('data.gid == None')
+        self.pack_uint(data.gid)
+        if data.gids is None:
+            raise TypeError('data.gids == None')
+        if len(data.gids) > 16 and self.check_array:
+            raise XDRError('array length too long for data.gids')
+        self.pack_array(data.gids, self.pack_uint)
+
+class RPCSizePacker(xdr_into.size_packer):
+    """Runs the same pack_* methods as RPCPacker, adding up the encoded
+    size in size instead of encoding"""
+    pack_int = xdr_into.size_packer.pack_int
+    pack_uint = xdr_into.size_packer.pack_uint
+    pack_unsigned = xdr_into.size_packer.pack_uint
+    pack_hyper = xdr_into.size_packer.pack_hyper
+    pack_uhyper = xdr_into.size_packer.pack_uhyper
+    pack_float = xdr_into.size_packer.pack_float
+    pack_double = xdr_into.size_packer.pack_double
+    pack_quadruple = xdr_into.size_packer.pack_double
+    pack_bool = xdr_into.size_packer.pack_bool
+    pack_opaque = xdr_into.size_packer.pack_opaque
+    pack_string = xdr_into.size_packer.pack_string
+    def pack_auth_flavor(self, data: int) -> None:
+        if hasattr(self, 'filter_auth_flavor'):
+            data = getattr(self, 'filter_auth_flavor')(data)
+        if self.check_enum and data not in auth_flavor_values:
             raise XDRError('value=%s not in enum auth_flavor' % data)
         self.pack_int(data)
 
@@ -48,35 +294,35 @@ class RPCPacker(xdrlib.Packer):
     def pack_msg_type(self, data: int) -> None:
         if hasattr(self, 'filter_msg_type'):
             data = getattr(self, 'filter_msg_type')(data)
-        if self.check_enum and data not in [const.CALL, const.REPLY]:
+        if self.check_enum and data not in msg_type_values:
             raise XDRError('value=%s not in enum msg_type' % data)
         self.pack_int(data)
 
     def pack_reply_stat(self, data: int) -> None:
         if hasattr(self, 'filter_reply_stat'):
             data = getattr(self, 'filter_reply_stat')(data)
-        if self.check_enum and data not in [const.MSG_ACCEPTED, const.MSG_DENIED]:
+        if self.check_enum and data not in reply_stat_values:
             raise XDRError('value=%s not in enum reply_stat' % data)
         self.pack_int(data)
 
     def pack_accept_stat(self, data: int) -> None:
         if hasattr(self, 'filter_accept_stat'):
             data = getattr(self, 'filter_accept_stat')(data)
-        if self.check_enum and data not in [const.SUCCESS, const.PROG_UNAVAIL, const.PROG_MISMATCH, const.PROC_UNAVAIL, const.GARBAGE_ARGS, const.SYSTEM_ERR]:
+        if self.check_enum and data not in accept_stat_values:
             raise XDRError('value=%s not in enum accept_stat' % data)
         self.pack_int(data)
 
     def pack_reject_stat(self, data: int) -> None:
         if hasattr(self, 'filter_reject_stat'):
             data = getattr(self, 'filter_reject_stat')(data)
-        if self.check_enum and data not in [const.RPC_MISMATCH, const.AUTH_ERROR]:
+        if self.check_enum and data not in reject_stat_values:
             raise XDRError('value=%s not in enum reject_stat' % data)
         self.pack_int(data)
 
     def pack_auth_stat(self, data: int) -> None:
         if hasattr(self, 'filter_auth_stat'):
             data = getattr(self, 'filter_auth_stat')(data)
-        if self.check_enum and data not in [const.AUTH_OK, const.AUTH_BADCRED, const.AUTH_REJECTEDCRED, const.AUTH_BADVERF, const.AUTH_REJECTEDVERF, const.AUTH_TOOWEAK, const.AUTH_INVALIDRESP, const.AUTH_FAILED, const.AUTH_KERB_GENERIC, const.AUTH_TIMEEXPIRE, const.AUTH_TKT_FILE, const.AUTH_DECODE, const.AUTH_NET_ADDR, const.RPCSEC_GSS_CREDPROBLEM, const.RPCSEC_GSS_CTXPROBLEM]:
+        if self.check_enum and data not in auth_stat_values:
             raise XDRError('value=%s not in enum auth_stat' % data)
         self.pack_int(data)
 
@@ -96,17 +342,24 @@ class RPCPacker(xdrlib.Packer):
         if data.mtype is None:
             raise TypeError('data.mtype == None')
         self.pack_msg_type(data.mtype)
-        if data.mtype == const.CALL:
-            if data.cbody is None:
-                raise TypeError('data.cbody == None')
-            self.pack_call_body(data.cbody)
-        elif data.mtype == const.REPLY:
-            if data.rbody is None:
-                raise TypeError('data.rbody == None')
-            self.pack_reply_body(data.rbody)
+        arm = self._pack_rpc_msg_body_arms.get(data.mtype)
+        if arm is not None:
+            arm(self, data)
         else:
             raise XDRError('bad switch=%s' % data.mtype)
 
+    def _pack_rpc_msg_body_arm0(self, data: types.rpc_msg_body) -> None:
+        if data.cbody is None:
+            raise TypeError('data.cbody == None')
+        self.pack_call_body(data.cbody)
+
+    def _pack_rpc_msg_body_arm1(self, data: types.rpc_msg_body) -> None:
+        if data.rbody is None:
+            raise TypeError('data.rbody == None')
+        self.pack_reply_body(data.rbody)
+
+    _pack_rpc_msg_body_arms = {const.CALL : _pack_rpc_msg_body_arm0, const.REPLY : _pack_rpc_msg_body_arm1}
+
     def pack_call_body(self, data: types.call_body) -> None:
         if hasattr(self, 'filter_call_body'):
             data = getattr(self, 'filter_call_body')(data)
@@ -135,17 +388,24 @@ class RPCPacker(xdrlib.Packer):
         if data.stat is None:
             raise TypeError('data.stat == None')
         self.pack_reply_stat(data.stat)
-        if data.stat == const.MSG_ACCEPTED:
-            if data.areply is None:
-                raise TypeError('data.areply == None')
-            self.pack_accepted_reply(data.areply)
-        elif data.stat == const.MSG_DENIED:
-            if data.rreply is None:
-                raise TypeError('data.rreply == None')
-            self.pack_rejected_reply(data.rreply)
+        arm = self._pack_reply_body_arms.get(data.stat)
+        if arm is not None:
+            arm(self, data)
         else:
             raise XDRError('bad switch=%s' % data.stat)
 
+    def _pack_reply_body_arm0(self, data: types.reply_body) -> None:
+        if data.areply is None:
+            raise TypeError('data.areply == None')
+        self.pack_accepted_reply(data.areply)
+
+    def _pack_reply_body_arm1(self, data: types.reply_body) -> None:
+        if data.rreply is None:
+            raise TypeError('data.rreply == None')
+        self.pack_rejected_reply(data.rreply)
+
+    _pack_reply_body_arms = {const.MSG_ACCEPTED : _pack_reply_body_arm0, const.MSG_DENIED : _pack_reply_body_arm1}
+
     def pack_rpc_mismatch_info(self, data: types.rpc_mismatch_info) -> None:
         if hasattr(self, 'filter_rpc_mismatch_info'):
             data = getattr(self, 'filter_rpc_mismatch_info')(data)
@@ -162,17 +422,24 @@ class RPCPacker(xdrlib.Packer):
         if data.stat is None:
             raise TypeError('data.stat == None')
         self.pack_accept_stat(data.stat)
-        if data.stat == const.SUCCESS:
-            if data.results is None:
-                raise TypeError('data.results == None')
-            self.pack_fopaque(0, data.results)
-        elif data.stat == const.PROG_MISMATCH:
-            if data.mismatch_info is None:
-                raise TypeError('data.mismatch_info == None')
-            self.pack_rpc_mismatch_info(data.mismatch_info)
+        arm = self._pack_rpc_reply_data_arms.get(data.stat)
+        if arm is not None:
+            arm(self, data)
         else:
             pass
 
+    def _pack_rpc_reply_data_arm0(self, data: types.rpc_reply_data) -> None:
+        if data.results is None:
+            raise TypeError('data.results == None')
+        self.pack_fopaque(0, data.results)
+
+    def _pack_rpc_reply_data_arm1(self, data: types.rpc_reply_data) -> None:
+        if data.mismatch_info is None:
+            raise TypeError('data.mismatch_info == None')
+        self.pack_rpc_mismatch_info(data.mismatch_info)
+
+    _pack_rpc_reply_data_arms = {const.SUCCESS : _pack_rpc_reply_data_arm0, const.PROG_MISMATCH : _pack_rpc_reply_data_arm1}
+
     def pack_accepted_reply(self, data: types.accepted_reply) -> None:
         if hasattr(self, 'filter_accepted_reply'):
             data = getattr(self, 'filter_accepted_reply')(data)
@@ -189,17 +456,263 @@ class RPCPacker(xdrlib.Packer):
         if data.stat is None:
             raise TypeError('data.stat == None')
         self.pack_reject_stat(data.stat)
-        if data.stat == const.RPC_MISMATCH:
-            if data.mismatch_info is None:
-                raise TypeError('data.mismatch_info == None')
-            self.pack_rpc_mismatch_info(data.mismatch_info)
-        elif data.stat == const.AUTH_ERROR:
-            if data.astat is None:
-                raise TypeError('data.astat == None')
-            self.pack_auth_stat(data.astat)
+        arm = self._pack_rejected_reply_arms.get(data.stat)
+        if arm is not None:
+            arm(self, data)
         else:
             raise XDRError('bad switch=%s' % data.stat)
 
+    def _pack_rejected_reply_arm0(self, data: types.rejected_reply) -> None:
+        if data.mismatch_info is None:
+            raise TypeError('data.mismatch_info == None')
+        self.pack_rpc_mismatch_info(data.mismatch_info)
+
+    def _pack_rejected_reply_arm1(self, data: types.rejected_reply) -> None:
+        if data.astat is None:
+            raise TypeError('data.astat == None')
+        self.pack_auth_stat(data.astat)
+
+    _pack_rejected_reply_arms = {const.RPC_MISMATCH : _pack_rejected_reply_arm0, const.AUTH_ERROR : _pack_rejected_reply_arm1}
+
+    def pack_authsys_parms(self, data: types.authsys_parms) -> None:
+        if hasattr(self, 'filter_authsys_parms'):
+            data = getattr(self, 'filter_authsys_parms')(data)
+        if data.stamp is None:
+            raise TypeError('data.stamp == None')
+        self.pack_uint(data.stamp)
+        if data.machinename is None:
+            raise TypeError('data.machinename == None')
+        if len(data.machinename) > 255 and self.check_array:
+            raise XDRError('array length too long for data.machinename')
+        self.pack_string(data.machinename)
+        if data.uid is None:
+            raise TypeError('data.uid == None')
+        self.pack_uint(data.uid)
+        if data.gid is None:
+            raise TypeError('data.gid == None')
+        self.pack_uint(data.gid)
+        if data.gids is None:
+            raise TypeError('data.gids == None')
+        if len(data.gids) > 16 and self.check_array:
+            raise XDRError('array length too long for data.gids')
+        self.pack_array(data.gids, self.pack_uint)
+
+class RPCIntoPacker(xdr_into.into_packer):
+    """Runs the same pack_* methods as RPCPacker, encoding into a
+    preallocated buffer, starting at offset"""
+    pack_int = xdr_into.into_packer.pack_int
+    pack_uint = xdr_into.into_packer.pack_uint
+    pack_unsigned = xdr_into.into_packer.pack_uint
+    pack_hyper = xdr_into.into_packer.pack_hyper
+    pack_uhyper = xdr_into.into_packer.pack_uhyper
+    pack_float = xdr_into.into_packer.pack_float
+    pack_double = xdr_into.into_packer.pack_double
+    pack_quadruple = xdr_into.into_packer.pack_double
+    pack_bool = xdr_into.into_packer.pack_bool
+    pack_opaque = xdr_into.into_packer.pack_opaque
+    pack_string = xdr_into.into_packer.pack_string
+    def pack_auth_flavor(self, data: int) -> None:
+        if hasattr(self, 'filter_auth_flavor'):
+            data = getattr(self, 'filter_auth_flavor')(data)
+        if self.check_enum and data not in auth_flavor_values:
+            raise XDRError('value=%s not in enum auth_flavor' % data)
+        self.pack_int(data)
+
+    def pack_opaque_auth(self, data: types.opaque_auth) -> None:
+        if hasattr(self, 'filter_opaque_auth'):
+            data = getattr(self, 'filter_opaque_auth')(data)
+        if data.flavor is None:
+            raise TypeError('data.flavor == None')
+        self.pack_auth_flavor(data.flavor)
+        if data.body is None:
+            raise TypeError('data.body == None')
+        if len(data.body) > 400 and self.check_array:
+            raise XDRError('array length too long for data.body')
+        self.pack_opaque(data.body)
+
+    def pack_msg_type(self, data: int) -> None:
+        if hasattr(self, 'filter_msg_type'):
+            data = getattr(self, 'filter_msg_type')(data)
+        if self.check_enum and data not in msg_type_values:
+            raise XDRError('value=%s not in enum msg_type' % data)
+        self.pack_int(data)
+
+    def pack_reply_stat(self, data: int) -> None:
+        if hasattr(self, 'filter_reply_stat'):
+            data = getattr(self, 'filter_reply_stat')(data)
+        if self.check_enum and data not in reply_stat_values:
+            raise XDRError('value=%s not in enum reply_stat' % data)
+        self.pack_int(data)
+
+    def pack_accept_stat(self, data: int) -> None:
+        if hasattr(self, 'filter_accept_stat'):
+            data = getattr(self, 'filter_accept_stat')(data)
+        if self.check_enum and data not in accept_stat_values:
+            raise XDRError('value=%s not in enum accept_stat' % data)
+        self.pack_int(data)
+
+    def pack_reject_stat(self, data: int) -> None:
+        if hasattr(self, 'filter_reject_stat'):
+            data = getattr(self, 'filter_reject_stat')(data)
+        if self.check_enum and data not in reject_stat_values:
+            raise XDRError('value=%s not in enum reject_stat' % data)
+        self.pack_int(data)
+
+    def pack_auth_stat(self, data: int) -> None:
+        if hasattr(self, 'filter_auth_stat'):
+            data = getattr(self, 'filter_auth_stat')(data)
+        if self.check_enum and data not in auth_stat_values:
+            raise XDRError('value=%s not in enum auth_stat' % data)
+        self.pack_int(data)
+
+    def pack_rpc_msg(self, data: types.rpc_msg) -> None:
+        if hasattr(self, 'filter_rpc_msg'):
+            data = getattr(self, 'filter_rpc_msg')(data)
+        if data.xid is None:
+            raise TypeError('data.xid == None')
+        self.pack_uint(data.xid)
+        if data.body is None:
+            raise TypeError('data.body == None')
+        self.pack_rpc_msg_body(data.body)
+
+    def pack_rpc_msg_body(self, data: types.rpc_msg_body) -> None:
+        if hasattr(self, 'filter_rpc_msg_body'):
+            data = getattr(self, 'filter_rpc_msg_body')(data)
+        if data.mtype is None:
+            raise TypeError('data.mtype == None')
+        self.pack_msg_type(data.mtype)
+        arm = self._pack_rpc_msg_body_arms.get(data.mtype)
+        if arm is not None:
+            arm(self, data)
+        else:
+            raise XDRError('bad switch=%s' % data.mtype)
+
+    def _pack_rpc_msg_body_arm0(self, data: types.rpc_msg_body) -> None:
+        if data.cbody is None:
+            raise TypeError('data.cbody == None')
+        self.pack_call_body(data.cbody)
+
+    def _pack_rpc_msg_body_arm1(self, data: types.rpc_msg_body) -> None:
+        if data.rbody is None:
+            raise TypeError('data.rbody == None')
+        self.pack_reply_body(data.rbody)
+
+    _pack_rpc_msg_body_arms = {const.CALL : _pack_rpc_msg_body_arm0, const.REPLY : _pack_rpc_msg_body_arm1}
+
+    def pack_call_body(self, data: types.call_body) -> None:
+        if hasattr(self, 'filter_call_body'):
+            data = getattr(self, 'filter_call_body')(data)
+        if data.rpcvers is None:
+            raise TypeError('data.rpcvers == None')
+        self.pack_uint(data.rpcvers)
+        if data.prog is None:
+            raise TypeError('data.prog == None')
+        self.pack_uint(data.prog)
+        if data.vers is None:
+            raise TypeError('data.vers == None')
+        self.pack_uint(data.vers)
+        if data.proc is None:
+            raise TypeError('data.proc == None')
+        self.pack_uint(data.proc)
+        if data.cred is None:
+            raise TypeError('data.cred == None')
+        self.pack_opaque_auth(data.cred)
+        if data.verf is None:
+            raise TypeError('data.verf == None')
+        self.pack_opaque_auth(data.verf)
+
+    def pack_reply_body(self, data: types.reply_body) -> None:
+        if hasattr(self, 'filter_reply_body'):
+            data = getattr(self, 'filter_reply_body')(data)
+        if data.stat is None:
+            raise TypeError('data.stat == None')
+        self.pack_reply_stat(data.stat)
+        arm = self._pack_reply_body_arms.get(data.stat)
+        if arm is not None:
+            arm(self, data)
+        else:
+            raise XDRError('bad switch=%s' % data.stat)
+
+    def _pack_reply_body_arm0(self, data: types.reply_body) -> None:
+        if data.areply is None:
+            raise TypeError('data.areply == None')
+        self.pack_accepted_reply(data.areply)
+
+    def _pack_reply_body_arm1(self, data: types.reply_body) -> None:
+        if data.rreply is None:
+            raise TypeError('data.rreply == None')
+        self.pack_rejected_reply(data.rreply)
+
+    _pack_reply_body_arms = {const.MSG_ACCEPTED : _pack_reply_body_arm0, const.MSG_DENIED : _pack_reply_body_arm1}
+
+    def pack_rpc_mismatch_info(self, data: types.rpc_mismatch_info) -> None:
+        if hasattr(self, 'filter_rpc_mismatch_info'):
+            data = getattr(self, 'filter_rpc_mismatch_info')(data)
+        if data.low is None:
+            raise TypeError('data.low == None')
+        self.pack_uint(data.low)
+        if data.high is None:
+            raise TypeError('data.high == None')
+        self.pack_uint(data.high)
+
+    def pack_rpc_reply_data(self, data: types.rpc_reply_data) -> None:
+        if hasattr(self, 'filter_rpc_reply_data'):
+            data = getattr(self, 'filter_rpc_reply_data')(data)
+        if data.stat is None:
+            raise TypeError('data.stat == None')
+        self.pack_accept_stat(data.stat)
+        arm = self._pack_rpc_reply_data_arms.get(data.stat)
+        if arm is not None:
+            arm(self, data)
+        else:
+            pass
+
+    def _pack_rpc_reply_data_arm0(self, data: types.rpc_reply_data) -> None:
+        if data.results is None:
+            raise TypeError('data.results == None')
+        self.pack_fopaque(0, data.results)
+
+    def _pack_rpc_reply_data_arm1(self, data: types.rpc_reply_data) -> None:
+        if data.mismatch_info is None:
+            raise TypeError('data.mismatch_info == None')
+        self.pack_rpc_mismatch_info(data.mismatch_info)
+
+    _pack_rpc_reply_data_arms = {const.SUCCESS : _pack_rpc_reply_data_arm0, const.PROG_MISMATCH : _pack_rpc_reply_data_arm1}
+
+    def pack_accepted_reply(self, data: types.accepted_reply) -> None:
+        if hasattr(self, 'filter_accepted_reply'):
+            data = getattr(self, 'filter_accepted_reply')(data)
+        if data.verf is None:
+            raise TypeError('data.verf == None')
+        self.pack_opaque_auth(data.verf)
+        if data.reply_data is None:
+            raise TypeError('data.reply_data == None')
+        self.pack_rpc_reply_data(data.reply_data)
+
+    def pack_rejected_reply(self, data: types.rejected_reply) -> None:
+        if hasattr(self, 'filter_rejected_reply'):
+            data = getattr(self, 'filter_rejected_reply')(data)
+        if data.stat is None:
+            raise TypeError('data.stat == None')
+        self.pack_reject_stat(data.stat)
+        arm = self._pack_rejected_reply_arms.get(data.stat)
+        if arm is not None:
+            arm(self, data)
+        else:
+            raise XDRError('bad switch=%s' % data.stat)
+
+    def _pack_rejected_reply_arm0(self, data: types.rejected_reply) -> None:
+        if data.mismatch_info is None:
+            raise TypeError('data.mismatch_info == None')
+        self.pack_rpc_mismatch_info(data.mismatch_info)
+
+    def _pack_rejected_reply_arm1(self, data: types.rejected_reply) -> None:
+        if data.astat is None:
+            raise TypeError('data.astat == None')
+        self.pack_auth_stat(data.astat)
+
+    _pack_rejected_reply_arms = {const.RPC_MISMATCH : _pack_rejected_reply_arm0, const.AUTH_ERROR : _pack_rejected_reply_arm1}
+
     def pack_authsys_parms(self, data: types.authsys_parms) -> None:
         if hasattr(self, 'filter_authsys_parms'):
             data = getattr(self, 'filter_authsys_parms')(data)
@@ -242,7 +755,7 @@ class RPCUnpacker(xdrlib.Unpacker):
     unpack_string = xdrlib.Unpacker.unpack_string
     def unpack_auth_flavor(self) -> int:
         data = self.unpack_int()
-        if self.check_enum and data not in [const.AUTH_NONE, const.AUTH_SYS, const.AUTH_SHORT, const.AUTH_DH, const.RPCSEC_GSS]:
+        if self.check_enum and data not in auth_flavor_values:
             raise XDRError('value=%s not in enum auth_flavor' % data)
         if hasattr(self, 'filter_auth_flavor'):
             data = getattr(self, 'filter_auth_flavor')(data)
@@ -260,7 +773,7 @@ class RPCUnpacker(xdrlib.Unpacker):
 
     def unpack_msg_type(self) -> int:
         data = self.unpack_int()
-        if self.check_enum and data not in [const.CALL, const.REPLY]:
+        if self.check_enum and data not in msg_type_values:
             raise XDRError('value=%s not in enum msg_type' % data)
         if hasattr(self, 'filter_msg_type'):
             data = getattr(self, 'filter_msg_type')(data)
@@ -268,7 +781,7 @@ class RPCUnpacker(xdrlib.Unpacker):
 
     def unpack_reply_stat(self) -> int:
         data = self.unpack_int()
-        if self.check_enum and data not in [const.MSG_ACCEPTED, const.MSG_DENIED]:
+        if self.check_enum and data not in reply_stat_values:
             raise XDRError('value=%s not in enum reply_stat' % data)
         if hasattr(self, 'filter_reply_stat'):
             data = getattr(self, 'filter_reply_stat')(data)
@@ -276,7 +789,7 @@ class RPCUnpacker(xdrlib.Unpacker):
 
     def unpack_accept_stat(self) -> int:
         data = self.unpack_int()
-        if self.check_enum and data not in [const.SUCCESS, const.PROG_UNAVAIL, const.PROG_MISMATCH, const.PROC_UNAVAIL, const.GARBAGE_ARGS, const.SYSTEM_ERR]:
+        if self.check_enum and data not in accept_stat_values:
             raise XDRError('value=%s not in enum accept_stat' % data)
         if hasattr(self, 'filter_accept_stat'):
             data = getattr(self, 'filter_accept_stat')(data)
@@ -284,7 +797,7 @@ class RPCUnpacker(xdrlib.Unpacker):
 
     def unpack_reject_stat(self) -> int:
         data = self.unpack_int()
-        if self.check_enum and data not in [const.RPC_MISMATCH, const.AUTH_ERROR]:
+        if self.check_enum and data not in reject_stat_values:
             raise XDRError('value=%s not in enum reject_stat' % data)
         if hasattr(self, 'filter_reject_stat'):
             data = getattr(self, 'filter_reject_stat')(data)
@@ -292,7 +805,7 @@ class RPCUnpacker(xdrlib.Unpacker):
 
     def unpack_auth_stat(self) -> int:
         data = self.unpack_int()
-        if self.check_enum and data not in [const.AUTH_OK, const.AUTH_BADCRED, const.AUTH_REJECTEDCRED, const.AUTH_BADVERF, const.AUTH_REJECTEDVERF, const.AUTH_TOOWEAK, const.AUTH_INVALIDRESP, const.AUTH_FAILED, const.AUTH_KERB_GENERIC, const.AUTH_TIMEEXPIRE, const.AUTH_TKT_FILE, const.AUTH_DECODE, const.AUTH_NET_ADDR, const.RPCSEC_GSS_CREDPROBLEM, const.RPCSEC_GSS_CTXPROBLEM]:
+        if self.check_enum and data not in auth_stat_values:
             raise XDRError('value=%s not in enum auth_stat' % data)
         if hasattr(self, 'filter_auth_stat'):
             data = getattr(self, 'filter_auth_stat')(data)
@@ -309,16 +822,23 @@ class RPCUnpacker(xdrlib.Unpacker):
     def unpack_rpc_msg_body(self) -> types.rpc_msg_body:
         data = types.rpc_msg_body()
         data.mtype = self.unpack_msg_type()
-        if data.mtype == const.CALL:
-            data.cbody = self.unpack_call_body()
-        elif data.mtype == const.REPLY:
-            data.rbody = self.unpack_reply_body()
+        arm = self._unpack_rpc_msg_body_arms.get(data.mtype)
+        if arm is not None:
+            arm(self, data)
         else:
             raise XDRError('bad switch=%s' % data.mtype)
         if hasattr(self, 'filter_rpc_msg_body'):
             data = getattr(self, 'filter_rpc_msg_body')(data)
         return data
 
+    def _unpack_rpc_msg_body_arm0(self, data: types.rpc_msg_body) -> None:
+        data.cbody = self.unpack_call_body()
+
+    def _unpack_rpc_msg_body_arm1(self, data: types.rpc_msg_body) -> None:
+        data.rbody = self.unpack_reply_body()
+
+    _unpack_rpc_msg_body_arms = {const.CALL : _unpack_rpc_msg_body_arm0, const.REPLY : _unpack_rpc_msg_body_arm1}
+
     def unpack_call_body(self) -> types.call_body:
         data = types.call_body()
         data.rpcvers = self.unpack_uint()
@@ -334,16 +854,23 @@ class RPCUnpacker(xdrlib.Unpacker):
     def unpack_reply_body(self) -> types.reply_body:
         data = types.reply_body()
         data.stat = self.unpack_reply_stat()
-        if data.stat == const.MSG_ACCEPTED:
-            data.areply = self.unpack_accepted_reply()
-        elif data.stat == const.MSG_DENIED:
-            data.rreply = self.unpack_rejected_reply()
+        arm = self._unpack_reply_body_arms.get(data.stat)
+        if arm is not None:
+            arm(self, data)
         else:
             raise XDRError('bad switch=%s' % data.stat)
         if hasattr(self, 'filter_reply_body'):
             data = getattr(self, 'filter_reply_body')(data)
         return data
 
+    def _unpack_reply_body_arm0(self, data: types.reply_body) -> None:
+        data.areply = self.unpack_accepted_reply()
+
+    def _unpack_reply_body_arm1(self, data: types.reply_body) -> None:
+        data.rreply = self.unpack_rejected_reply()
+
+    _unpack_reply_body_arms = {const.MSG_ACCEPTED : _unpack_reply_body_arm0, const.MSG_DENIED : _unpack_reply_body_arm1}
+
     def unpack_rpc_mismatch_info(self) -> types.rpc_mismatch_info:
         data = types.rpc_mismatch_info()
         data.low = self.unpack_uint()
@@ -355,16 +882,23 @@ class RPCUnpacker(xdrlib.Unpacker):
     def unpack_rpc_reply_data(self) -> types.rpc_reply_data:
         data = types.rpc_reply_data()
         data.stat = self.unpack_accept_stat()
-        if data.stat == const.SUCCESS:
-            data.results = self.unpack_fopaque(0)
-        elif data.stat == const.PROG_MISMATCH:
-            data.mismatch_info = self.unpack_rpc_mismatch_info()
+        arm = self._unpack_rpc_reply_data_arms.get(data.stat)
+        if arm is not None:
+            arm(self, data)
         else:
             pass
         if hasattr(self, 'filter_rpc_reply_data'):
             data = getattr(self, 'filter_rpc_reply_data')(data)
         return data
 
+    def _unpack_rpc_reply_data_arm0(self, data: types.rpc_reply_data) -> None:
+        data.results = self.unpack_fopaque(0)
+
+    def _unpack_rpc_reply_data_arm1(self, data: types.rpc_reply_data) -> None:
+        data.mismatch_info = self.unpack_rpc_mismatch_info()
+
+    _unpack_rpc_reply_data_arms = {const.SUCCESS : _unpack_rpc_reply_data_arm0, const.PROG_MISMATCH : _unpack_rpc_reply_data_arm1}
+
     def unpack_accepted_reply(self) -> types.accepted_reply:
         data = types.accepted_reply()
         data.verf = self.unpack_opaque_auth()
@@ -376,16 +910,23 @@ class RPCUnpacker(xdrlib.Unpacker):
     def unpack_rejected_reply(self) -> types.rejected_reply:
         data = types.rejected_reply()
         data.stat = self.unpack_reject_stat()
-        if data.stat == const.RPC_MISMATCH:
-            data.mismatch_info = self.unpack_rpc_mismatch_info()
-        elif data.stat == const.AUTH_ERROR:
-            data.astat = self.unpack_auth_stat()
+        arm = self._unpack_rejected_reply_arms.get(data.stat)
+        if arm is not None:
+            arm(self, data)
         else:
             raise XDRError('bad switch=%s' % data.stat)
         if hasattr(self, 'filter_rejected_reply'):
             data = getattr(self, 'filter_rejected_reply')(data)
         return data
 
+    def _unpack_rejected_reply_arm0(self, data: types.rejected_reply) -> None:
+        data.mismatch_info = self.unpack_rpc_mismatch_info()
+
+    def _unpack_rejected_reply_arm1(self, data: types.rejected_reply) -> None:
+        data.astat = self.unpack_auth_stat()
+
+    _unpack_rejected_reply_arms = {const.RPC_MISMATCH : _unpack_rejected_reply_arm0, const.AUTH_ERROR : _unpack_rejected_reply_arm1}
+
     def unpack_authsys_parms(self) -> types.authsys_parms:
         data = types.authsys_parms()
         data.stamp = self.unpack_uint()
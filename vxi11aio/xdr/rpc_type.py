@@ -1,6 +1,4 @@
-# Generated by rpcgen.py from rpc.x on Sat Nov 16 16:09:51 2019
-import sys,os
-sys.path.append(os.path.dirname(__file__))
+# Generated by rpcgen.py from rpc.x, source hash d5921717f56b39bb
 from typing import Any, List, Optional, Union
 from vxi11aio.xdr import rpc_const as const
 class opaque_auth:
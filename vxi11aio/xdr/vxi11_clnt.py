@@ -0,0 +1,203 @@
+# Generated by rpcgen.py from vxi11.x, source hash d21908d4fae31781
+from typing import Any, List, Optional, Union
+from vxi11aio import rpc_client, rpc_udp
+from vxi11aio.xdr import vxi11_const as const, vxi11_type as types
+from vxi11aio.xdr.vxi11_pack import VXI11Packer, VXI11Unpacker
+
+clientType = Union[rpc_client.rpc_client, rpc_udp.rpc_udp_client]
+
+class DEVICE_ASYNC_1_clnt():
+    """Client stubs for program DEVICE_ASYNC, version DEVICE_ASYNC_VERSION.
+    client is a connected rpc_client or rpc_udp_client. Calls which
+    are not accepted by the server raise an Exception."""
+    def __init__(self, client: clientType, vers: int = const.DEVICE_ASYNC_VERSION) -> None:
+        self.client = client
+        self.vers = vers
+        # Reused to encode the argument of each call
+        self._p = VXI11Packer()
+
+    async def device_abort(self, arg: int) -> types.Device_Error:
+        """Device_Error device_abort (Device_Link) = 1;"""
+        p = self._p
+        p.reset()
+        p.pack_Device_Link(arg)
+        rsp, msg = await self.client.call(const.DEVICE_ASYNC, self.vers, const.device_abort, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return VXI11Unpacker(rsp).unpack_Device_Error()
+
+class DEVICE_CORE_1_clnt():
+    """Client stubs for program DEVICE_CORE, version DEVICE_CORE_VERSION.
+    client is a connected rpc_client or rpc_udp_client. Calls which
+    are not accepted by the server raise an Exception."""
+    def __init__(self, client: clientType, vers: int = const.DEVICE_CORE_VERSION) -> None:
+        self.client = client
+        self.vers = vers
+        # Reused to encode the argument of each call
+        self._p = VXI11Packer()
+
+    async def create_link(self, arg: types.Create_LinkParms) -> types.Create_LinkResp:
+        """Create_LinkResp create_link (Create_LinkParms) = 10;"""
+        p = self._p
+        p.reset()
+        p.pack_Create_LinkParms(arg)
+        rsp, msg = await self.client.call(const.DEVICE_CORE, self.vers, const.create_link, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return VXI11Unpacker(rsp).unpack_Create_LinkResp()
+
+    async def device_write(self, arg: types.Device_WriteParms) -> types.Device_WriteResp:
+        """Device_WriteResp device_write (Device_WriteParms) = 11;"""
+        p = self._p
+        p.reset()
+        p.pack_Device_WriteParms(arg)
+        rsp, msg = await self.client.call(const.DEVICE_CORE, self.vers, const.device_write, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return VXI11Unpacker(rsp).unpack_Device_WriteResp()
+
+    async def device_read(self, arg: types.Device_ReadParms) -> types.Device_ReadResp:
+        """Device_ReadResp device_read (Device_ReadParms) = 12;"""
+        p = self._p
+        p.reset()
+        p.pack_Device_ReadParms(arg)
+        rsp, msg = await self.client.call(const.DEVICE_CORE, self.vers, const.device_read, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return VXI11Unpacker(rsp).unpack_Device_ReadResp()
+
+    async def device_readstb(self, arg: types.Device_GenericParms) -> types.Device_ReadStbResp:
+        """Device_ReadStbResp device_readstb (Device_GenericParms) = 13;"""
+        p = self._p
+        p.reset()
+        p.pack_Device_GenericParms(arg)
+        rsp, msg = await self.client.call(const.DEVICE_CORE, self.vers, const.device_readstb, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return VXI11Unpacker(rsp).unpack_Device_ReadStbResp()
+
+    async def device_trigger(self, arg: types.Device_GenericParms) -> types.Device_Error:
+        """Device_Error device_trigger (Device_GenericParms) = 14;"""
+        p = self._p
+        p.reset()
+        p.pack_Device_GenericParms(arg)
+        rsp, msg = await self.client.call(const.DEVICE_CORE, self.vers, const.device_trigger, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return VXI11Unpacker(rsp).unpack_Device_Error()
+
+    async def device_clear(self, arg: types.Device_GenericParms) -> types.Device_Error:
+        """Device_Error device_clear (Device_GenericParms) = 15;"""
+        p = self._p
+        p.reset()
+        p.pack_Device_GenericParms(arg)
+        rsp, msg = await self.client.call(const.DEVICE_CORE, self.vers, const.device_clear, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return VXI11Unpacker(rsp).unpack_Device_Error()
+
+    async def device_remote(self, arg: types.Device_GenericParms) -> types.Device_Error:
+        """Device_Error device_remote (Device_GenericParms) = 16;"""
+        p = self._p
+        p.reset()
+        p.pack_Device_GenericParms(arg)
+        rsp, msg = await self.client.call(const.DEVICE_CORE, self.vers, const.device_remote, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return VXI11Unpacker(rsp).unpack_Device_Error()
+
+    async def device_local(self, arg: types.Device_GenericParms) -> types.Device_Error:
+        """Device_Error device_local (Device_GenericParms) = 17;"""
+        p = self._p
+        p.reset()
+        p.pack_Device_GenericParms(arg)
+        rsp, msg = await self.client.call(const.DEVICE_CORE, self.vers, const.device_local, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return VXI11Unpacker(rsp).unpack_Device_Error()
+
+    async def device_lock(self, arg: types.Device_LockParms) -> types.Device_Error:
+        """Device_Error device_lock (Device_LockParms) = 18;"""
+        p = self._p
+        p.reset()
+        p.pack_Device_LockParms(arg)
+        rsp, msg = await self.client.call(const.DEVICE_CORE, self.vers, const.device_lock, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return VXI11Unpacker(rsp).unpack_Device_Error()
+
+    async def device_unlock(self, arg: int) -> types.Device_Error:
+        """Device_Error device_unlock (Device_Link) = 19;"""
+        p = self._p
+        p.reset()
+        p.pack_Device_Link(arg)
+        rsp, msg = await self.client.call(const.DEVICE_CORE, self.vers, const.device_unlock, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return VXI11Unpacker(rsp).unpack_Device_Error()
+
+    async def device_enable_srq(self, arg: types.Device_EnableSrqParms) -> types.Device_Error:
+        """Device_Error device_enable_srq (Device_EnableSrqParms) = 20;"""
+        p = self._p
+        p.reset()
+        p.pack_Device_EnableSrqParms(arg)
+        rsp, msg = await self.client.call(const.DEVICE_CORE, self.vers, const.device_enable_srq, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return VXI11Unpacker(rsp).unpack_Device_Error()
+
+    async def device_docmd(self, arg: types.Device_DocmdParms) -> types.Device_DocmdResp:
+        """Device_DocmdResp device_docmd (Device_DocmdParms) = 22;"""
+        p = self._p
+        p.reset()
+        p.pack_Device_DocmdParms(arg)
+        rsp, msg = await self.client.call(const.DEVICE_CORE, self.vers, const.device_docmd, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return VXI11Unpacker(rsp).unpack_Device_DocmdResp()
+
+    async def destroy_link(self, arg: int) -> types.Device_Error:
+        """Device_Error destroy_link (Device_Link) = 23;"""
+        p = self._p
+        p.reset()
+        p.pack_Device_Link(arg)
+        rsp, msg = await self.client.call(const.DEVICE_CORE, self.vers, const.destroy_link, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return VXI11Unpacker(rsp).unpack_Device_Error()
+
+    async def create_intr_chan(self, arg: types.Device_RemoteFunc) -> types.Device_Error:
+        """Device_Error create_intr_chan (Device_RemoteFunc) = 25;"""
+        p = self._p
+        p.reset()
+        p.pack_Device_RemoteFunc(arg)
+        rsp, msg = await self.client.call(const.DEVICE_CORE, self.vers, const.create_intr_chan, p.get_buffer())
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return VXI11Unpacker(rsp).unpack_Device_Error()
+
+    async def destroy_intr_chan(self) -> types.Device_Error:
+        """Device_Error destroy_intr_chan (void) = 26;"""
+        rsp, msg = await self.client.call(const.DEVICE_CORE, self.vers, const.destroy_intr_chan, b'')
+        rpc_client.check_reply(msg)
+        assert(rsp is not None)
+        return VXI11Unpacker(rsp).unpack_Device_Error()
+
+class DEVICE_INTR_1_clnt():
+    """Client stubs for program DEVICE_INTR, version DEVICE_INTR_VERSION.
+    client is a connected rpc_client or rpc_udp_client. Calls which
+    are not accepted by the server raise an Exception."""
+    def __init__(self, client: clientType, vers: int = const.DEVICE_INTR_VERSION) -> None:
+        self.client = client
+        self.vers = vers
+        # Reused to encode the argument of each call
+        self._p = VXI11Packer()
+
+    async def device_intr_srq(self, arg: types.Device_SrqParms, read_reply: bool = True) -> None:
+        """void device_intr_srq (Device_SrqParms) = 30;"""
+        p = self._p
+        p.reset()
+        p.pack_Device_SrqParms(arg)
+        rsp, msg = await self.client.call(const.DEVICE_INTR, self.vers, const.device_intr_srq, p.get_buffer(), read_reply=read_reply)
+        if(msg is not None):
+            rpc_client.check_reply(msg)
@@ -1,4 +1,4 @@
-# Generated by rpcgen.py from vxi11.x on Sat Nov 16 15:27:03 2019
+# Generated by rpcgen.py from vxi11.x, source hash d21908d4fae31781
 device_abort = 1
 create_link = 10
 device_write = 11
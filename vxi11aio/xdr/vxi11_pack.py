@@ -1,14 +1,16 @@
-# Generated by rpcgen.py from vxi11.x on Sat Nov 16 15:27:03 2019
-import sys,os
-sys.path.append(os.path.dirname(__file__))
+# Generated by rpcgen.py from vxi11.x, source hash d21908d4fae31781
 from typing import Any, List, Optional, Union
 from vxi11aio.xdr import vxi11_const as const, vxi11_type as types
+import struct
 import xdrlib
 from xdrlib import Error as XDRError
+from vxi11aio import xdr_into
 
 class nullclass(object):
     pass
 
+Device_AddrFamily_values = frozenset([const.DEVICE_TCP, const.DEVICE_UDP])
+
 class VXI11Packer(xdrlib.Packer):
     def __init__(self, check_enum:bool=True, check_array:bool=True) -> None:
         xdrlib.Packer.__init__(self)
@@ -31,7 +33,503 @@ class VXI11Packer(xdrlib.Packer):
     def pack_Device_AddrFamily(self, data: int) -> None:
         if hasattr(self, 'filter_Device_AddrFamily'):
             data = getattr(self, 'filter_Device_AddrFamily')(data)
-        if self.check_enum and data not in [const.DEVICE_TCP, const.DEVICE_UDP]:
+        if self.check_enum and data not in Device_AddrFamily_values:
+            raise XDRError('value=%s not in enum Device_AddrFamily' % data)
+        self.pack_int(data)
+
+    pack_Device_Flags = pack_int
+
+    pack_Device_ErrorCode = pack_int
+
+    def pack_Device_Error(self, data: types.Device_Error) -> None:
+        if hasattr(self, 'filter_Device_Error'):
+            data = getattr(self, 'filter_Device_Error')(data)
+        if data.error is None:
+            raise TypeError('data.error == None')
+        self.pack_Device_ErrorCode(data.error)
+
+    def pack_Create_LinkParms(self, data: types.Create_LinkParms) -> None:
+        if hasattr(self, 'filter_Create_LinkParms'):
+            data = getattr(self, 'filter_Create_LinkParms')(data)
+        if data.clientId is None:
+            raise TypeError('data.clientId == None')
+        self.pack_int(data.clientId)
+        if data.lockDevice is None:
+            raise TypeError('data.lockDevice == None')
+        self.pack_bool(data.lockDevice)
+        if data.lock_timeout is None:
+            raise TypeError('data.lock_timeout == None')
+        self.pack_uint(data.lock_timeout)
+        if data.device is None:
+            raise TypeError('data.device == None')
+        self.pack_string(data.device)
+
+    def pack_Create_LinkResp(self, data: types.Create_LinkResp) -> None:
+        if hasattr(self, 'filter_Create_LinkResp'):
+            data = getattr(self, 'filter_Create_LinkResp')(data)
+        if data.error is None:
+            raise TypeError('data.error == None')
+        self.pack_Device_ErrorCode(data.error)
+        if data.lid is None:
+            raise TypeError('data.lid == None')
+        self.pack_Device_Link(data.lid)
+        if data.abortPort is None:
+            raise TypeError('data.abortPort == None')
+        self.pack_uint(data.abortPort)
+        if data.maxRecvSize is None:
+            raise TypeError('data.maxRecvSize == None')
+        self.pack_uint(data.maxRecvSize)
+
+    def pack_Device_WriteParms(self, data: types.Device_WriteParms) -> None:
+        if hasattr(self, 'filter_Device_WriteParms'):
+            data = getattr(self, 'filter_Device_WriteParms')(data)
+        if data.lid is None:
+            raise TypeError('data.lid == None')
+        self.pack_Device_Link(data.lid)
+        if data.io_timeout is None:
+            raise TypeError('data.io_timeout == None')
+        self.pack_uint(data.io_timeout)
+        if data.lock_timeout is None:
+            raise TypeError('data.lock_timeout == None')
+        self.pack_uint(data.lock_timeout)
+        if data.flags is None:
+            raise TypeError('data.flags == None')
+        self.pack_Device_Flags(data.flags)
+        if data.data is None:
+            raise TypeError('data.data == None')
+        self.pack_opaque(data.data)
+
+    def pack_Device_WriteResp(self, data: types.Device_WriteResp) -> None:
+        if hasattr(self, 'filter_Device_WriteResp'):
+            data = getattr(self, 'filter_Device_WriteResp')(data)
+        if data.error is None:
+            raise TypeError('data.error == None')
+        self.pack_Device_ErrorCode(data.error)
+        if data.size is None:
+            raise TypeError('data.size == None')
+        self.pack_uint(data.size)
+
+    def pack_Device_ReadParms(self, data: types.Device_ReadParms) -> None:
+        if hasattr(self, 'filter_Device_ReadParms'):
+            data = getattr(self, 'filter_Device_ReadParms')(data)
+        if data.lid is None:
+            raise TypeError('data.lid == None')
+        self.pack_Device_Link(data.lid)
+        if data.requestSize is None:
+            raise TypeError('data.requestSize == None')
+        self.pack_uint(data.requestSize)
+        if data.io_timeout is None:
+            raise TypeError('data.io_timeout == None')
+        self.pack_uint(data.io_timeout)
+        if data.lock_timeout is None:
+            raise TypeError('data.lock_timeout == None')
+        self.pack_uint(data.lock_timeout)
+        if data.flags is None:
+            raise TypeError('data.flags == None')
+        self.pack_Device_Flags(data.flags)
+        if data.termChar is None:
+            raise TypeError('data.termChar == None')
+        self.pack_uint(data.termChar)
+
+    def pack_Device_ReadResp(self, data: types.Device_ReadResp) -> None:
+        if hasattr(self, 'filter_Device_ReadResp'):
+            data = getattr(self, 'filter_Device_ReadResp')(data)
+        if data.error is None:
+            raise TypeError('data.error == None')
+        self.pack_Device_ErrorCode(data.error)
+        if data.reason is None:
+            raise TypeError('data.reason == None')
+        self.pack_int(data.reason)
+        if data.data is None:
+            raise TypeError('data.data == None')
+        self.pack_opaque(data.data)
+
+    def pack_Device_ReadStbResp(self, data: types.Device_ReadStbResp) -> None:
+        if hasattr(self, 'filter_Device_ReadStbResp'):
+            data = getattr(self, 'filter_Device_ReadStbResp')(data)
+        if data.error is None:
+            raise TypeError('data.error == None')
+        self.pack_Device_ErrorCode(data.error)
+        if data.stb is None:
+            raise TypeError('data.stb == None')
+        self.pack_uint(data.stb)
+
+    def pack_Device_GenericParms(self, data: types.Device_GenericParms) -> None:
+        if hasattr(self, 'filter_Device_GenericParms'):
+            data = getattr(self, 'filter_Device_GenericParms')(data)
+        if data.lid is None:
+            raise TypeError('data.lid == None')
+        self.pack_Device_Link(data.lid)
+        if data.flags is None:
+            raise TypeError('data.flags == None')
+        self.pack_Device_Flags(data.flags)
+        if data.lock_timeout is None:
+            raise TypeError('data.lock_timeout == None')
+        self.pack_uint(data.lock_timeout)
+        if data.io_timeout is None:
+            raise TypeError('data.io_timeout == None')
+        self.pack_uint(data.io_timeout)
+
+    def pack_Device_RemoteFunc(self, data: types.Device_RemoteFunc) -> None:
+        if hasattr(self, 'filter_Device_RemoteFunc'):
+            data = getattr(self, 'filter_Device_RemoteFunc')(data)
+        if data.hostAddr is None:
+            raise TypeError('data.hostAddr == None')
+        self.pack_uint(data.hostAddr)
+        if data.hostPort is None:
+            raise TypeError('data.hostPort == None')
+        self.pack_uint(data.hostPort)
+        if data.progNum is None:
+            raise TypeError('data.progNum == None')
+        self.pack_uint(data.progNum)
+        if data.progVers is None:
+            raise TypeError('data.progVers == None')
+        self.pack_uint(data.progVers)
+        if data.progFamily is None:
+            raise TypeError('data.progFamily == None')
+        self.pack_Device_AddrFamily(data.progFamily)
+
+    def pack_Device_EnableSrqParms(self, data: types.Device_EnableSrqParms) -> None:
+        if hasattr(self, 'filter_Device_EnableSrqParms'):
+            data = getattr(self, 'filter_Device_EnableSrqParms')(data)
+        if data.lid is None:
+            raise TypeError('data.lid == None')
+        self.pack_Device_Link(data.lid)
+        if data.enable is None:
+            raise TypeError('data.enable == None')
+        self.pack_bool(data.enable)
+        if data.handle is None:
+            raise TypeError('data.handle == None')
+        if len(data.handle) > 40 and self.check_array:
+            raise XDRError('array length too long for data.handle')
+        self.pack_opaque(data.handle)
+
+    def pack_Device_LockParms(self, data: types.Device_LockParms) -> None:
+        if hasattr(self, 'filter_Device_LockParms'):
+            data = getattr(self, 'filter_Device_LockParms')(data)
+        if data.lid is None:
+            raise TypeError('data.lid == None')
+        self.pack_Device_Link(data.lid)
+        if data.flags is None:
+            raise TypeError('data.flags == None')
+        self.pack_Device_Flags(data.flags)
+        if data.lock_timeout is None:
+            raise TypeError('data.lock_timeout == None')
+        self.pack_uint(data.lock_timeout)
+
+    def pack_Device_DocmdParms(self, data: types.Device_DocmdParms) -> None:
+        if hasattr(self, 'filter_Device_DocmdParms'):
+            data = getattr(self, 'filter_Device_DocmdParms')(data)
+        if data.lid is None:
+            raise TypeError('data.lid == None')
+        self.pack_Device_Link(data.lid)
+        if data.flags is None:
+            raise TypeError('data.flags == None')
+        self.pack_Device_Flags(data.flags)
+        if data.io_timeout is None:
+            raise TypeError('data.io_timeout == None')
+        self.pack_uint(data.io_timeout)
+        if data.lock_timeout is None:
+            raise TypeError('data.lock_timeout == None')
+        self.pack_uint(data.lock_timeout)
+        if data.cmd is None:
+            raise TypeError('data.cmd == None')
+        self.pack_int(data.cmd)
+        if data.network_order is None:
+            raise TypeError('data.network_order == None')
+        self.pack_bool(data.network_order)
+        if data.datasize is None:
+            raise TypeError('data.datasize == None')
+        self.pack_int(data.datasize)
+        if data.data_in is None:
+            raise TypeError('data.data_in == None')
+        self.pack_opaque(data.data_in)
+
+    def pack_Device_DocmdResp(self, data: types.Device_DocmdResp) -> None:
+        if hasattr(self, 'filter_Device_DocmdResp'):
+            data = getattr(self, 'filter_Device_DocmdResp')(data)
+        if data.error is None:
+            raise TypeError('data.error == None')
+        self.pack_Device_ErrorCode(data.error)
+        if data.data_out is None:
+            raise TypeError('data.data_out == None')
+        self.pack_opaque(data.data_out)
+
+    def pack_Device_SrqParms(self, data: types.Device_SrqParms) -> None:
+        if hasattr(self, 'filter_Device_SrqParms'):
+            data = getattr(self, 'filter_Device_SrqParms')(data)
+        if data.handle is None:
+            raise TypeError('data.handle == None')
+        self.pack_opaque(data.handle)
+
+class VXI11SizePacker(xdr_into.size_packer):
+    """Runs the same pack_* methods as VXI11Packer, adding up the encoded
+    size in size instead of encoding"""
+    pack_int = xdr_into.size_packer.pack_int
+    pack_uint = xdr_into.size_packer.pack_uint
+    pack_unsigned = xdr_into.size_packer.pack_uint
+    pack_hyper = xdr_into.size_packer.pack_hyper
+    pack_uhyper = xdr_into.size_packer.pack_uhyper
+    pack_float = xdr_into.size_packer.pack_float
+    pack_double = xdr_into.size_packer.pack_double
+    pack_quadruple = xdr_into.size_packer.pack_double
+    pack_bool = xdr_into.size_packer.pack_bool
+    pack_opaque = xdr_into.size_packer.pack_opaque
+    pack_string = xdr_into.size_packer.pack_string
+    pack_Device_Link = pack_int
+
+    def pack_Device_AddrFamily(self, data: int) -> None:
+        if hasattr(self, 'filter_Device_AddrFamily'):
+            data = getattr(self, 'filter_Device_AddrFamily')(data)
+        if self.check_enum and data not in Device_AddrFamily_values:
+            raise XDRError('value=%s not in enum Device_AddrFamily' % data)
+        self.pack_int(data)
+
+    pack_Device_Flags = pack_int
+
+    pack_Device_ErrorCode = pack_int
+
+    def pack_Device_Error(self, data: types.Device_Error) -> None:
+        if hasattr(self, 'filter_Device_Error'):
+            data = getattr(self, 'filter_Device_Error')(data)
+        if data.error is None:
+            raise TypeError('data.error == None')
+        self.pack_Device_ErrorCode(data.error)
+
+    def pack_Create_LinkParms(self, data: types.Create_LinkParms) -> None:
+        if hasattr(self, 'filter_Create_LinkParms'):
+            data = getattr(self, 'filter_Create_LinkParms')(data)
+        if data.clientId is None:
+            raise TypeError('data.clientId == None')
+        self.pack_int(data.clientId)
+        if data.lockDevice is None:
+            raise TypeError('data.lockDevice == None')
+        self.pack_bool(data.lockDevice)
+        if data.lock_timeout is None:
+            raise TypeError('data.lock_timeout == None')
+        self.pack_uint(data.lock_timeout)
+        if data.device is None:
+            raise TypeError('data.device == None')
+        self.pack_string(data.device)
+
+    def pack_Create_LinkResp(self, data: types.Create_LinkResp) -> None:
+        if hasattr(self, 'filter_Create_LinkResp'):
+            data = getattr(self, 'filter_Create_LinkResp')(data)
+        if data.error is None:
+            raise TypeError('data.error == None')
+        self.pack_Device_ErrorCode(data.error)
+        if data.lid is None:
+            raise TypeError('data.lid == None')
+        self.pack_Device_Link(data.lid)
+        if data.abortPort is None:
+            raise TypeError('data.abortPort == None')
+        self.pack_uint(data.abortPort)
+        if data.maxRecvSize is None:
+            raise TypeError('data.maxRecvSize == None')
+        self.pack_uint(data.maxRecvSize)
+
+    def pack_Device_WriteParms(self, data: types.Device_WriteParms) -> None:
+        if hasattr(self, 'filter_Device_WriteParms'):
+            data = getattr(self, 'filter_Device_WriteParms')(data)
+        if data.lid is None:
+            raise TypeError('data.lid == None')
+        self.pack_Device_Link(data.lid)
+        if data.io_timeout is None:
+            raise TypeError('data.io_timeout == None')
+        self.pack_uint(data.io_timeout)
+        if data.lock_timeout is None:
+            raise TypeError('data.lock_timeout == None')
+        self.pack_uint(data.lock_timeout)
+        if data.flags is None:
+            raise TypeError('data.flags == None')
+        self.pack_Device_Flags(data.flags)
+        if data.data is None:
+            raise TypeError('data.data == None')
+        self.pack_opaque(data.data)
+
+    def pack_Device_WriteResp(self, data: types.Device_WriteResp) -> None:
+        if hasattr(self, 'filter_Device_WriteResp'):
+            data = getattr(self, 'filter_Device_WriteResp')(data)
+        if data.error is None:
+            raise TypeError('data.error == None')
+        self.pack_Device_ErrorCode(data.error)
+        if data.size is None:
+            raise TypeError('data.size == None')
+        self.pack_uint(data.size)
+
+    def pack_Device_ReadParms(self, data: types.Device_ReadParms) -> None:
+        if hasattr(self, 'filter_Device_ReadParms'):
+            data = getattr(self, 'filter_Device_ReadParms')(data)
+        if data.lid is None:
+            raise TypeError('data.lid == None')
+        self.pack_Device_Link(data.lid)
+        if data.requestSize is None:
+            raise TypeError('data.requestSize == None')
+        self.pack_uint(data.requestSize)
+        if data.io_timeout is None:
+            raise TypeError('data.io_timeout == None')
+        self.pack_uint(data.io_timeout)
+        if data.lock_timeout is None:
+            raise TypeError('data.lock_timeout == None')
+        self.pack_uint(data.lock_timeout)
+        if data.flags is None:
+            raise TypeError('data.flags == None')
+        self.pack_Device_Flags(data.flags)
+        if data.termChar is None:
+            raise TypeError('data.termChar == None')
+        self.pack_uint(data.termChar)
+
+    def pack_Device_ReadResp(self, data: types.Device_ReadResp) -> None:
+        if hasattr(self, 'filter_Device_ReadResp'):
+            data = getattr(self, 'filter_Device_ReadResp')(data)
+        if data.error is None:
+            raise TypeError('data.error == None')
+        self.pack_Device_ErrorCode(data.error)
+        if data.reason is None:
+            raise TypeError('data.reason == None')
+        self.pack_int(data.reason)
+        if data.data is None:
+            raise TypeError('data.data == None')
+        self.pack_opaque(data.data)
+
+    def pack_Device_ReadStbResp(self, data: types.Device_ReadStbResp) -> None:
+        if hasattr(self, 'filter_Device_ReadStbResp'):
+            data = getattr(self, 'filter_Device_ReadStbResp')(data)
+        if data.error is None:
+            raise TypeError('data.error == None')
+        self.pack_Device_ErrorCode(data.error)
+        if data.stb is None:
+            raise TypeError('data.stb == None')
+        self.pack_uint(data.stb)
+
+    def pack_Device_GenericParms(self, data: types.Device_GenericParms) -> None:
+        if hasattr(self, 'filter_Device_GenericParms'):
+            data = getattr(self, 'filter_Device_GenericParms')(data)
+        if data.lid is None:
+            raise TypeError('data.lid == None')
+        self.pack_Device_Link(data.lid)
+        if data.flags is None:
+            raise TypeError('data.flags == None')
+        self.pack_Device_Flags(data.flags)
+        if data.lock_timeout is None:
+            raise TypeError('data.lock_timeout == None')
+        self.pack_uint(data.lock_timeout)
+        if data.io_timeout is None:
+            raise TypeError('data.io_timeout == None')
+        self.pack_uint(data.io_timeout)
+
+    def pack_Device_RemoteFunc(self, data: types.Device_RemoteFunc) -> None:
+        if hasattr(self, 'filter_Device_RemoteFunc'):
+            data = getattr(self, 'filter_Device_RemoteFunc')(data)
+        if data.hostAddr is None:
+            raise TypeError('data.hostAddr == None')
+        self.pack_uint(data.hostAddr)
+        if data.hostPort is None:
+            raise TypeError('data.hostPort == None')
+        self.pack_uint(data.hostPort)
+        if data.progNum is None:
+            raise TypeError('data.progNum == None')
+        self.pack_uint(data.progNum)
+        if data.progVers is None:
+            raise TypeError('data.progVers == None')
+        self.pack_uint(data.progVers)
+        if data.progFamily is None:
+            raise TypeError('data.progFamily == None')
+        self.pack_Device_AddrFamily(data.progFamily)
+
+    def pack_Device_EnableSrqParms(self, data: types.Device_EnableSrqParms) -> None:
+        if hasattr(self, 'filter_Device_EnableSrqParms'):
+            data = getattr(self, 'filter_Device_EnableSrqParms')(data)
+        if data.lid is None:
+            raise TypeError('data.lid == None')
+        self.pack_Device_Link(data.lid)
+        if data.enable is None:
+            raise TypeError('data.enable == None')
+        self.pack_bool(data.enable)
+        if data.handle is None:
+            raise TypeError('data.handle == None')
+        if len(data.handle) > 40 and self.check_array:
+            raise XDRError('array length too long for data.handle')
+        self.pack_opaque(data.handle)
+
+    def pack_Device_LockParms(self, data: types.Device_LockParms) -> None:
+        if hasattr(self, 'filter_Device_LockParms'):
+            data = getattr(self, 'filter_Device_LockParms')(data)
+        if data.lid is None:
+            raise TypeError('data.lid == None')
+        self.pack_Device_Link(data.lid)
+        if data.flags is None:
+            raise TypeError('data.flags == None')
+        self.pack_Device_Flags(data.flags)
+        if data.lock_timeout is None:
+            raise TypeError('data.lock_timeout == None')
+        self.pack_uint(data.lock_timeout)
+
+    def pack_Device_DocmdParms(self, data: types.Device_DocmdParms) -> None:
+        if hasattr(self, 'filter_Device_DocmdParms'):
+            data = getattr(self, 'filter_Device_DocmdParms')(data)
+        if data.lid is None:
+            raise TypeError('data.lid == None')
+        self.pack_Device_Link(data.lid)
+        if data.flags is None:
+            raise TypeError('data.flags == None')
+        self.pack_Device_Flags(data.flags)
+        if data.io_timeout is None:
+            raise TypeError('data.io_timeout == None')
+        self.pack_uint(data.io_timeout)
+        if data.lock_timeout is None:
+            raise TypeError('data.lock_timeout == None')
+        self.pack_uint(data.lock_timeout)
+        if data.cmd is None:
+            raise TypeError('data.cmd == None')
+        self.pack_int(data.cmd)
+        if data.network_order is None:
+            raise TypeError('data.network_order == None')
+        self.pack_bool(data.network_order)
+        if data.datasize is None:
+            raise TypeError('data.datasize == None')
+        self.pack_int(data.datasize)
+        if data.data_in is None:
+            raise TypeError('data.data_in == None')
+        self.pack_opaque(data.data_in)
+
+    def pack_Device_DocmdResp(self, data: types.Device_DocmdResp) -> None:
+        if hasattr(self, 'filter_Device_DocmdResp'):
+            data = getattr(self, 'filter_Device_DocmdResp')(data)
+        if data.error is None:
+            raise TypeError('data.error == None')
+        self.pack_Device_ErrorCode(data.error)
+        if data.data_out is None:
+            raise TypeError('data.data_out == None')
+        self.pack_opaque(data.data_out)
+
+    def pack_Device_SrqParms(self, data: types.Device_SrqParms) -> None:
+        if hasattr(self, 'filter_Device_SrqParms'):
+            data = getattr(self, 'filter_Device_SrqParms')(data)
+        if data.handle is None:
+            raise TypeError('data.handle == None')
+        self.pack_opaque(data.handle)
+
+class VXI11IntoPacker(xdr_into.into_packer):
+    """Runs the same pack_* methods as VXI11Packer, encoding into a
+    preallocated buffer, starting at offset"""
+    pack_int = xdr_into.into_packer.pack_int
+    pack_uint = xdr_into.into_packer.pack_uint
+    pack_unsigned = xdr_into.into_packer.pack_uint
+    pack_hyper = xdr_into.into_packer.pack_hyper
+    pack_uhyper = xdr_into.into_packer.pack_uhyper
+    pack_float = xdr_into.into_packer.pack_float
+    pack_double = xdr_into.into_packer.pack_double
+    pack_quadruple = xdr_into.into_packer.pack_double
+    pack_bool = xdr_into.into_packer.pack_bool
+    pack_opaque = xdr_into.into_packer.pack_opaque
+    pack_string = xdr_into.into_packer.pack_string
+    pack_Device_Link = pack_int
+
+    def pack_Device_AddrFamily(self, data: int) -> None:
+        if hasattr(self, 'filter_Device_AddrFamily'):
+            data = getattr(self, 'filter_Device_AddrFamily')(data)
+        if self.check_enum and data not in Device_AddrFamily_values:
             raise XDRError('value=%s not in enum Device_AddrFamily' % data)
         self.pack_int(data)
 
@@ -281,7 +779,7 @@ class VXI11Unpacker(xdrlib.Unpacker):
 
     def unpack_Device_AddrFamily(self) -> int:
         data = self.unpack_int()
-        if self.check_enum and data not in [const.DEVICE_TCP, const.DEVICE_UDP]:
+        if self.check_enum and data not in Device_AddrFamily_values:
             raise XDRError('value=%s not in enum Device_AddrFamily' % data)
         if hasattr(self, 'filter_Device_AddrFamily'):
             data = getattr(self, 'filter_Device_AddrFamily')(data)
@@ -436,3 +934,91 @@ class VXI11Unpacker(xdrlib.Unpacker):
             data = getattr(self, 'filter_Device_SrqParms')(data)
         return data
 
+class Device_WriteParms_view(object):
+    """Device_WriteParms, decoded field by field as they are accessed, from its
+    encoding in buf at offset. Opaque and string fields are memoryviews
+    into buf rather than copies."""
+    def __init__(self, buf: bytes, offset: int = 0) -> None:
+        self._buf = memoryview(buf)
+        self._offset = offset
+        # Only lengths are decoded here, to locate the fields and check
+        # that they are all in buf
+        (self._data_start, self._data_stop, self._data_end) = \
+                xdr_into.locate_opaque(self._buf, self._offset + 16, None)
+        self.end = self._data_end
+        if(self.end > len(self._buf)):
+            raise EOFError
+
+    @property
+    def lid(self) -> int:
+        return struct.unpack_from('>l', self._buf, self._offset)[0]
+
+    @property
+    def io_timeout(self) -> int:
+        return struct.unpack_from('>L', self._buf, self._offset + 4)[0]
+
+    @property
+    def lock_timeout(self) -> int:
+        return struct.unpack_from('>L', self._buf, self._offset + 8)[0]
+
+    @property
+    def flags(self) -> int:
+        return struct.unpack_from('>l', self._buf, self._offset + 12)[0]
+
+    @property
+    def data(self) -> memoryview:
+        return self._buf[self._data_start:self._data_stop]
+
+    def __repr__(self) -> str:
+        return 'Device_WriteParms_view(lid=%r, io_timeout=%r, lock_timeout=%r, flags=%r, data=%r)' % (self.lid, self.io_timeout, self.lock_timeout, self.flags, bytes(self.data),)
+
+class Device_DocmdParms_view(object):
+    """Device_DocmdParms, decoded field by field as they are accessed, from its
+    encoding in buf at offset. Opaque and string fields are memoryviews
+    into buf rather than copies."""
+    def __init__(self, buf: bytes, offset: int = 0) -> None:
+        self._buf = memoryview(buf)
+        self._offset = offset
+        # Only lengths are decoded here, to locate the fields and check
+        # that they are all in buf
+        (self._data_in_start, self._data_in_stop, self._data_in_end) = \
+                xdr_into.locate_opaque(self._buf, self._offset + 28, None)
+        self.end = self._data_in_end
+        if(self.end > len(self._buf)):
+            raise EOFError
+
+    @property
+    def lid(self) -> int:
+        return struct.unpack_from('>l', self._buf, self._offset)[0]
+
+    @property
+    def flags(self) -> int:
+        return struct.unpack_from('>l', self._buf, self._offset + 4)[0]
+
+    @property
+    def io_timeout(self) -> int:
+        return struct.unpack_from('>L', self._buf, self._offset + 8)[0]
+
+    @property
+    def lock_timeout(self) -> int:
+        return struct.unpack_from('>L', self._buf, self._offset + 12)[0]
+
+    @property
+    def cmd(self) -> int:
+        return struct.unpack_from('>l', self._buf, self._offset + 16)[0]
+
+    @property
+    def network_order(self) -> bool:
+        return bool(struct.unpack_from('>l', self._buf, self._offset + 20)[0])
+
+    @property
+    def datasize(self) -> int:
+        return struct.unpack_from('>l', self._buf, self._offset + 24)[0]
+
+    @property
+    def data_in(self) -> memoryview:
+        return self._buf[self._data_in_start:self._data_in_stop]
+
+    def __repr__(self) -> str:
+        return 'Device_DocmdParms_view(lid=%r, flags=%r, io_timeout=%r, lock_timeout=%r, cmd=%r, network_order=%r, datasize=%r, data_in=%r)' % (self.lid, self.flags, self.io_timeout, self.lock_timeout, self.cmd, self.network_order, self.datasize, bytes(self.data_in),)
+
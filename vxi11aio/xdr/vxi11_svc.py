@@ -0,0 +1,387 @@
+# Generated by rpcgen.py from vxi11.x, source hash d21908d4fae31781
+from typing import Any, List, Optional, Union
+from vxi11aio.rpc_srv import rpc_conn, rpc_srv
+from vxi11aio.xdr import rpc_type, vxi11_const as const, vxi11_type as types
+from vxi11aio.xdr.vxi11_pack import VXI11IntoPacker, VXI11SizePacker, VXI11Unpacker
+
+from vxi11aio.xdr.vxi11_pack import Device_WriteParms_view, Device_DocmdParms_view
+
+class DEVICE_ASYNC_1_svc(rpc_conn):
+    """Server skeleton for program DEVICE_ASYNC, version DEVICE_ASYNC_VERSION.
+    Subclasses override the handlers of the procedures they implement.
+    Calls to any other procedure are answered with PROC_UNAVAIL."""
+
+    rpc_program = (const.DEVICE_ASYNC, const.DEVICE_ASYNC_VERSION)
+
+    # procedure => (handler, function decoding and dispatching the call)
+    rpc_procedures = {
+        const.device_abort: ('handle_device_abort', '_dispatch_device_abort'), # 1
+    }
+
+    async def handle_device_abort(self, rpc_msg: rpc_type.rpc_msg, arg: int) -> types.Device_Error:
+        """Device_Error device_abort (Device_Link) = 1;"""
+        raise NotImplementedError
+
+    async def _dispatch_device_abort(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = VXI11Unpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_Device_Link()
+        if(self.trace_calls):
+            print(f"handle_device_abort >>> {arg}")
+        rsp = await self.handle_device_abort(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_device_abort <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = VXI11SizePacker()
+        s.pack_Device_Error(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        VXI11IntoPacker(record, offset).pack_Device_Error(rsp)
+        return record
+
+class DEVICE_CORE_1_svc(rpc_conn):
+    """Server skeleton for program DEVICE_CORE, version DEVICE_CORE_VERSION.
+    Subclasses override the handlers of the procedures they implement.
+    Calls to any other procedure are answered with PROC_UNAVAIL."""
+
+    rpc_program = (const.DEVICE_CORE, const.DEVICE_CORE_VERSION)
+
+    # procedure => (handler, function decoding and dispatching the call)
+    rpc_procedures = {
+        const.create_link: ('handle_create_link', '_dispatch_create_link'), # 10
+        const.device_write: ('handle_device_write', '_dispatch_device_write'), # 11
+        const.device_read: ('handle_device_read', '_dispatch_device_read'), # 12
+        const.device_readstb: ('handle_device_readstb', '_dispatch_device_readstb'), # 13
+        const.device_trigger: ('handle_device_trigger', '_dispatch_device_trigger'), # 14
+        const.device_clear: ('handle_device_clear', '_dispatch_device_clear'), # 15
+        const.device_remote: ('handle_device_remote', '_dispatch_device_remote'), # 16
+        const.device_local: ('handle_device_local', '_dispatch_device_local'), # 17
+        const.device_lock: ('handle_device_lock', '_dispatch_device_lock'), # 18
+        const.device_unlock: ('handle_device_unlock', '_dispatch_device_unlock'), # 19
+        const.device_enable_srq: ('handle_device_enable_srq', '_dispatch_device_enable_srq'), # 20
+        const.device_docmd: ('handle_device_docmd', '_dispatch_device_docmd'), # 22
+        const.destroy_link: ('handle_destroy_link', '_dispatch_destroy_link'), # 23
+        const.create_intr_chan: ('handle_create_intr_chan', '_dispatch_create_intr_chan'), # 25
+        const.destroy_intr_chan: ('handle_destroy_intr_chan', '_dispatch_destroy_intr_chan'), # 26
+    }
+
+    async def handle_create_link(self, rpc_msg: rpc_type.rpc_msg, arg: types.Create_LinkParms) -> types.Create_LinkResp:
+        """Create_LinkResp create_link (Create_LinkParms) = 10;"""
+        raise NotImplementedError
+
+    async def _dispatch_create_link(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = VXI11Unpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_Create_LinkParms()
+        if(self.trace_calls):
+            print(f"handle_create_link >>> {arg}")
+        rsp = await self.handle_create_link(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_create_link <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = VXI11SizePacker()
+        s.pack_Create_LinkResp(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        VXI11IntoPacker(record, offset).pack_Create_LinkResp(rsp)
+        return record
+
+    async def handle_device_write(self, rpc_msg: rpc_type.rpc_msg, arg: Device_WriteParms_view) -> types.Device_WriteResp:
+        """Device_WriteResp device_write (Device_WriteParms) = 11;"""
+        raise NotImplementedError
+
+    async def _dispatch_device_write(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        arg = Device_WriteParms_view(buf, buf_ix)
+        if(self.trace_calls):
+            print(f"handle_device_write >>> {arg}")
+        rsp = await self.handle_device_write(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_device_write <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = VXI11SizePacker()
+        s.pack_Device_WriteResp(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        VXI11IntoPacker(record, offset).pack_Device_WriteResp(rsp)
+        return record
+
+    async def handle_device_read(self, rpc_msg: rpc_type.rpc_msg, arg: types.Device_ReadParms) -> types.Device_ReadResp:
+        """Device_ReadResp device_read (Device_ReadParms) = 12;"""
+        raise NotImplementedError
+
+    async def _dispatch_device_read(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = VXI11Unpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_Device_ReadParms()
+        if(self.trace_calls):
+            print(f"handle_device_read >>> {arg}")
+        rsp = await self.handle_device_read(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_device_read <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = VXI11SizePacker()
+        s.pack_Device_ReadResp(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        VXI11IntoPacker(record, offset).pack_Device_ReadResp(rsp)
+        return record
+
+    async def handle_device_readstb(self, rpc_msg: rpc_type.rpc_msg, arg: types.Device_GenericParms) -> types.Device_ReadStbResp:
+        """Device_ReadStbResp device_readstb (Device_GenericParms) = 13;"""
+        raise NotImplementedError
+
+    async def _dispatch_device_readstb(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = VXI11Unpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_Device_GenericParms()
+        if(self.trace_calls):
+            print(f"handle_device_readstb >>> {arg}")
+        rsp = await self.handle_device_readstb(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_device_readstb <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = VXI11SizePacker()
+        s.pack_Device_ReadStbResp(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        VXI11IntoPacker(record, offset).pack_Device_ReadStbResp(rsp)
+        return record
+
+    async def handle_device_trigger(self, rpc_msg: rpc_type.rpc_msg, arg: types.Device_GenericParms) -> types.Device_Error:
+        """Device_Error device_trigger (Device_GenericParms) = 14;"""
+        raise NotImplementedError
+
+    async def _dispatch_device_trigger(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = VXI11Unpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_Device_GenericParms()
+        if(self.trace_calls):
+            print(f"handle_device_trigger >>> {arg}")
+        rsp = await self.handle_device_trigger(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_device_trigger <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = VXI11SizePacker()
+        s.pack_Device_Error(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        VXI11IntoPacker(record, offset).pack_Device_Error(rsp)
+        return record
+
+    async def handle_device_clear(self, rpc_msg: rpc_type.rpc_msg, arg: types.Device_GenericParms) -> types.Device_Error:
+        """Device_Error device_clear (Device_GenericParms) = 15;"""
+        raise NotImplementedError
+
+    async def _dispatch_device_clear(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = VXI11Unpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_Device_GenericParms()
+        if(self.trace_calls):
+            print(f"handle_device_clear >>> {arg}")
+        rsp = await self.handle_device_clear(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_device_clear <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = VXI11SizePacker()
+        s.pack_Device_Error(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        VXI11IntoPacker(record, offset).pack_Device_Error(rsp)
+        return record
+
+    async def handle_device_remote(self, rpc_msg: rpc_type.rpc_msg, arg: types.Device_GenericParms) -> types.Device_Error:
+        """Device_Error device_remote (Device_GenericParms) = 16;"""
+        raise NotImplementedError
+
+    async def _dispatch_device_remote(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = VXI11Unpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_Device_GenericParms()
+        if(self.trace_calls):
+            print(f"handle_device_remote >>> {arg}")
+        rsp = await self.handle_device_remote(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_device_remote <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = VXI11SizePacker()
+        s.pack_Device_Error(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        VXI11IntoPacker(record, offset).pack_Device_Error(rsp)
+        return record
+
+    async def handle_device_local(self, rpc_msg: rpc_type.rpc_msg, arg: types.Device_GenericParms) -> types.Device_Error:
+        """Device_Error device_local (Device_GenericParms) = 17;"""
+        raise NotImplementedError
+
+    async def _dispatch_device_local(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = VXI11Unpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_Device_GenericParms()
+        if(self.trace_calls):
+            print(f"handle_device_local >>> {arg}")
+        rsp = await self.handle_device_local(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_device_local <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = VXI11SizePacker()
+        s.pack_Device_Error(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        VXI11IntoPacker(record, offset).pack_Device_Error(rsp)
+        return record
+
+    async def handle_device_lock(self, rpc_msg: rpc_type.rpc_msg, arg: types.Device_LockParms) -> types.Device_Error:
+        """Device_Error device_lock (Device_LockParms) = 18;"""
+        raise NotImplementedError
+
+    async def _dispatch_device_lock(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = VXI11Unpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_Device_LockParms()
+        if(self.trace_calls):
+            print(f"handle_device_lock >>> {arg}")
+        rsp = await self.handle_device_lock(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_device_lock <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = VXI11SizePacker()
+        s.pack_Device_Error(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        VXI11IntoPacker(record, offset).pack_Device_Error(rsp)
+        return record
+
+    async def handle_device_unlock(self, rpc_msg: rpc_type.rpc_msg, arg: int) -> types.Device_Error:
+        """Device_Error device_unlock (Device_Link) = 19;"""
+        raise NotImplementedError
+
+    async def _dispatch_device_unlock(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = VXI11Unpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_Device_Link()
+        if(self.trace_calls):
+            print(f"handle_device_unlock >>> {arg}")
+        rsp = await self.handle_device_unlock(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_device_unlock <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = VXI11SizePacker()
+        s.pack_Device_Error(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        VXI11IntoPacker(record, offset).pack_Device_Error(rsp)
+        return record
+
+    async def handle_device_enable_srq(self, rpc_msg: rpc_type.rpc_msg, arg: types.Device_EnableSrqParms) -> types.Device_Error:
+        """Device_Error device_enable_srq (Device_EnableSrqParms) = 20;"""
+        raise NotImplementedError
+
+    async def _dispatch_device_enable_srq(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = VXI11Unpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_Device_EnableSrqParms()
+        if(self.trace_calls):
+            print(f"handle_device_enable_srq >>> {arg}")
+        rsp = await self.handle_device_enable_srq(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_device_enable_srq <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = VXI11SizePacker()
+        s.pack_Device_Error(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        VXI11IntoPacker(record, offset).pack_Device_Error(rsp)
+        return record
+
+    async def handle_device_docmd(self, rpc_msg: rpc_type.rpc_msg, arg: Device_DocmdParms_view) -> types.Device_DocmdResp:
+        """Device_DocmdResp device_docmd (Device_DocmdParms) = 22;"""
+        raise NotImplementedError
+
+    async def _dispatch_device_docmd(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        arg = Device_DocmdParms_view(buf, buf_ix)
+        if(self.trace_calls):
+            print(f"handle_device_docmd >>> {arg}")
+        rsp = await self.handle_device_docmd(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_device_docmd <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = VXI11SizePacker()
+        s.pack_Device_DocmdResp(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        VXI11IntoPacker(record, offset).pack_Device_DocmdResp(rsp)
+        return record
+
+    async def handle_destroy_link(self, rpc_msg: rpc_type.rpc_msg, arg: int) -> types.Device_Error:
+        """Device_Error destroy_link (Device_Link) = 23;"""
+        raise NotImplementedError
+
+    async def _dispatch_destroy_link(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = VXI11Unpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_Device_Link()
+        if(self.trace_calls):
+            print(f"handle_destroy_link >>> {arg}")
+        rsp = await self.handle_destroy_link(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_destroy_link <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = VXI11SizePacker()
+        s.pack_Device_Error(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        VXI11IntoPacker(record, offset).pack_Device_Error(rsp)
+        return record
+
+    async def handle_create_intr_chan(self, rpc_msg: rpc_type.rpc_msg, arg: types.Device_RemoteFunc) -> types.Device_Error:
+        """Device_Error create_intr_chan (Device_RemoteFunc) = 25;"""
+        raise NotImplementedError
+
+    async def _dispatch_create_intr_chan(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = VXI11Unpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_Device_RemoteFunc()
+        if(self.trace_calls):
+            print(f"handle_create_intr_chan >>> {arg}")
+        rsp = await self.handle_create_intr_chan(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_create_intr_chan <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = VXI11SizePacker()
+        s.pack_Device_Error(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        VXI11IntoPacker(record, offset).pack_Device_Error(rsp)
+        return record
+
+    async def handle_destroy_intr_chan(self, rpc_msg: rpc_type.rpc_msg, arg: None) -> types.Device_Error:
+        """Device_Error destroy_intr_chan (void) = 26;"""
+        raise NotImplementedError
+
+    async def _dispatch_destroy_intr_chan(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        arg = None
+        if(self.trace_calls):
+            print(f"handle_destroy_intr_chan >>> (void)")
+        rsp = await self.handle_destroy_intr_chan(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_destroy_intr_chan <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        s = VXI11SizePacker()
+        s.pack_Device_Error(rsp)
+        (record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)
+        VXI11IntoPacker(record, offset).pack_Device_Error(rsp)
+        return record
+
+class DEVICE_INTR_1_svc(rpc_conn):
+    """Server skeleton for program DEVICE_INTR, version DEVICE_INTR_VERSION.
+    Subclasses override the handlers of the procedures they implement.
+    Calls to any other procedure are answered with PROC_UNAVAIL."""
+
+    rpc_program = (const.DEVICE_INTR, const.DEVICE_INTR_VERSION)
+
+    # procedure => (handler, function decoding and dispatching the call)
+    rpc_procedures = {
+        const.device_intr_srq: ('handle_device_intr_srq', '_dispatch_device_intr_srq'), # 30
+    }
+
+    async def handle_device_intr_srq(self, rpc_msg: rpc_type.rpc_msg, arg: types.Device_SrqParms) -> None:
+        """void device_intr_srq (Device_SrqParms) = 30;"""
+        raise NotImplementedError
+
+    async def _dispatch_device_intr_srq(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:
+        up = VXI11Unpacker(buf, check_enum = self.check_enum)
+        up.set_position(buf_ix)
+        arg = up.unpack_Device_SrqParms()
+        if(self.trace_calls):
+            print(f"handle_device_intr_srq >>> {arg}")
+        rsp = await self.handle_device_intr_srq(rpc_msg, arg)
+        if(self.trace_calls):
+            print(f"handle_device_intr_srq <<< {rsp}")
+        assert(rpc_msg.xid is not None)
+        return rpc_srv.success_reply_record(rpc_msg.xid, 0)[0]
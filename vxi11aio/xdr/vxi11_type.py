@@ -1,6 +1,4 @@
-# Generated by rpcgen.py from vxi11.x on Sat Nov 16 15:27:03 2019
-import sys,os
-sys.path.append(os.path.dirname(__file__))
+# Generated by rpcgen.py from vxi11.x, source hash d21908d4fae31781
 from typing import Any, List, Optional, Union
 from vxi11aio.xdr import vxi11_const as const
 class Device_Error:
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+# Stand-ins for xdrlib.Packer, used by the generated <name>SizePacker and
+# <name>IntoPacker classes. These run the same generated pack_* methods as
+# the Packers, but only add up the encoded size, or write straight into a
+# preallocated buffer. A reply can then be sized first and encoded once, in
+# place, rather than growing a BytesIO and copying it out.
+# locate_opaque() is used by the generated <struct>_view classes.
+
+import struct
+import xdrlib
+from typing import Any, Callable, List, Optional, Tuple, Union
+
+def _padded(n: int) -> int:
+    return ((n+3)//4)*4
+
+def locate_opaque(buf: memoryview, pos: int, maxlen: Optional[int]) -> Tuple[int, int, int]:
+    """Finds the variable length opaque (or string) encoded at pos in buf,
+    without copying it. Returns (start, stop, end), where buf[start:stop] is
+    the data, and end is the position after its padding."""
+    if(pos + 4 > len(buf)):
+        raise EOFError
+    n = struct.unpack_from('>L', buf, pos)[0]
+    if(maxlen is not None and n > maxlen):
+        raise xdrlib.Error('opaque is too long (%d > %d)' % (n, maxlen))
+    start = pos + 4
+    end = start + _padded(n)
+    if(end > len(buf)):
+        raise EOFError
+    return (start, start + n, end)
+
+class size_packer():
+    """Adds up the encoded size of what is packed, in size"""
+    def __init__(self, check_enum: bool = True, check_array: bool = True) -> None:
+        self.check_enum = check_enum
+        self.check_array = check_array
+        self.size = 0
+    
+    def pack_uint(self, x: int) -> None:
+        self.size += 4
+    
+    pack_int = pack_uint
+    pack_enum = pack_uint
+    pack_bool = pack_uint
+    pack_float = pack_uint
+    
+    def pack_uhyper(self, x: int) -> None:
+        self.size += 8
+    
+    pack_hyper = pack_uhyper
+    pack_double = pack_uhyper
+    
+    def pack_fstring(self, n: int, s: bytes) -> None:
+        if n < 0:
+            raise ValueError('fstring size must be nonnegative')
+        self.size += _padded(n)
+    
+    pack_fopaque = pack_fstring
+    
+    def pack_string(self, s: bytes) -> None:
+        self.size += 4 + _padded(len(s))
+    
+    pack_opaque = pack_string
+    pack_bytes = pack_string
+    
+    def pack_list(self, list: List[Any], pack_item: Callable[[Any],None]) -> None:
+        for item in list:
+            self.size += 4
+            pack_item(item)
+        self.size += 4
+    
+    def pack_farray(self, n: int, list: List[Any], pack_item: Callable[[Any],None]) -> None:
+        if len(list) != n:
+            raise ValueError('wrong array size')
+        for item in list:
+            pack_item(item)
+    
+    def pack_array(self, list: List[Any], pack_item: Callable[[Any],None]) -> None:
+        self.size += 4
+        self.pack_farray(len(list), list, pack_item)
+
+class into_packer():
+    """Writes what is packed into buf, which must be large enough, starting
+    at offset. offset is advanced past what was written."""
+    def __init__(self, buf: Union[bytearray, memoryview], offset: int = 0,
+                 check_enum: bool = True, check_array: bool = True) -> None:
+        self.check_enum = check_enum
+        self.check_array = check_array
+        self.buf = buf
+        self.offset = offset
+    
+    def _pack(self, fmt: str, size: int, x: Any) -> None:
+        try:
+            struct.pack_into(fmt, self.buf, self.offset, x)
+        except struct.error as e:
+            raise xdrlib.ConversionError(e.args[0]) from None
+        self.offset += size
+    
+    def pack_uint(self, x: int) -> None:
+        self._pack('>L', 4, x)
+    
+    def pack_int(self, x: int) -> None:
+        self._pack('>l', 4, x)
+    
+    pack_enum = pack_int
+    
+    def pack_bool(self, x: bool) -> None:
+        self._pack('>L', 4, 1 if x else 0)
+    
+    def pack_uhyper(self, x: int) -> None:
+        self._pack('>Q', 8, x)
+    
+    def pack_hyper(self, x: int) -> None:
+        self._pack('>q', 8, x)
+    
+    def pack_float(self, x: float) -> None:
+        self._pack('>f', 4, x)
+    
+    def pack_double(self, x: float) -> None:
+        self._pack('>d', 8, x)
+    
+    def pack_fstring(self, n: int, s: bytes) -> None:
+        if n < 0:
+            raise ValueError('fstring size must be nonnegative')
+        data = s[:n]
+        start = self.offset
+        end = start + len(data)
+        padded = start + _padded(n)
+        if(padded > len(self.buf)):
+            raise xdrlib.ConversionError('buffer too small')
+        self.buf[start:end] = data
+        # The buffer may be reused, so the padding is zeroed explicitly
+        self.buf[end:padded] = bytes(padded - end)
+        self.offset = padded
+    
+    pack_fopaque = pack_fstring
+    
+    def pack_string(self, s: bytes) -> None:
+        n = len(s)
+        self.pack_uint(n)
+        self.pack_fstring(n, s)
+    
+    pack_opaque = pack_string
+    pack_bytes = pack_string
+    
+    def pack_list(self, list: List[Any], pack_item: Callable[[Any],None]) -> None:
+        for item in list:
+            self.pack_uint(1)
+            pack_item(item)
+        self.pack_uint(0)
+    
+    def pack_farray(self, n: int, list: List[Any], pack_item: Callable[[Any],None]) -> None:
+        if len(list) != n:
+            raise ValueError('wrong array size')
+        for item in list:
+            pack_item(item)
+    
+    def pack_array(self, list: List[Any], pack_item: Callable[[Any],None]) -> None:
+        n = len(list)
+        self.pack_uint(n)
+        self.pack_farray(n, list, pack_item)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+# Copyright 2019 Nathan J. Conrad
+
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+
+# 1. Redistributions of source code must retain the above copyright notice,
+# this list of conditions and the following disclaimer.
+
+# 2. Redistributions in binary form must reproduce the above copyright notice,
+# this list of conditions and the following disclaimer in the documentation
+# and/or other materials provided with the distribution.
+
+# 3. Neither the name of the copyright holder nor the names of its contributors
+# may be used to endorse or promote products derived from this software without
+# specific prior written permission.
+
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+# Bulk packing of arrays of numbers, used by code generated with
+# xdrgen.py --numpy. With NumPy, an array is converted in one call, to or
+# from a big-endian dtype, rather than with one Python call per element.
+# Without it, these fall back to the packer's own pack_farray/pack_array.
+
+import xdrlib
+from typing import Any, Callable
+from vxi11aio import xdr_into
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def pack_farray(packer: Any, n: int, data: Any, dtype: str,
+                pack_item: Callable[[Any],None]) -> None:
+    """Packs the n numbers in data (a sequence or ndarray) with packer, which
+    is an xdrlib.Packer, or an xdr_into size_packer or into_packer"""
+    if numpy is None:
+        packer.pack_farray(n, data, pack_item)
+        return
+    if len(data) != n:
+        raise ValueError('wrong array size')
+    dt = numpy.dtype(dtype)
+    if isinstance(packer, xdr_into.size_packer):
+        packer.size += n*dt.itemsize
+        return
+    try:
+        buf = numpy.asarray(data, dtype=dt).tobytes()
+    except (OverflowError, TypeError, ValueError) as e:
+        raise xdrlib.ConversionError(str(e)) from None
+    packer.pack_fopaque(len(buf), buf)
+
+def pack_array(packer: Any, data: Any, dtype: str,
+               pack_item: Callable[[Any],None]) -> None:
+    n = len(data)
+    packer.pack_uint(n)
+    pack_farray(packer, n, data, dtype, pack_item)
+
+def unpack_farray(unpacker: xdrlib.Unpacker, n: int, dtype: str,
+                  unpack_item: Callable[[],Any]) -> Any:
+    """Unpacks n numbers. With NumPy, this is a read-only ndarray of dtype,
+    over the unpacked bytes. Otherwise, it is a list."""
+    if numpy is None:
+        return unpacker.unpack_farray(n, unpack_item)
+    dt = numpy.dtype(dtype)
+    return numpy.frombuffer(unpacker.unpack_fopaque(n*dt.itemsize), dt)
+
+def unpack_array(unpacker: xdrlib.Unpacker, dtype: str,
+                 unpack_item: Callable[[],Any]) -> Any:
+    n = unpacker.unpack_uint()
+    return unpack_farray(unpacker, n, dtype, unpack_item)
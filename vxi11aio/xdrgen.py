@@ -219,7 +219,7 @@ try:
     import cStringIO.StringIO as StringIO
 except:
     from io import StringIO
-import time
+import hashlib
 import os
 # Allow to be run stright from package
 if  __name__ == "__main__":
@@ -307,7 +307,7 @@ def t_error(t):
     t.lexer.skip(1)
 
 # Build the lexer
-lex.lex(debug=0)
+lexer = lex.lex(debug=0)
 
 
 ##########################################################################
@@ -596,13 +596,13 @@ def p_error(t):
 
 def p_program_def(t):
     '''program_def : PROGRAM ID LBRACE version_def version_def_list RBRACE EQUALS constant SEMI'''
-    print("Ignoring program %s = %s" % (t[2], t[8]))
     global name_dict
     id = t[2]
     value = t[8]
     lineno = t.lineno(1)
     if id_unique(id, 'program', lineno):
         name_dict[id] = const_info(id, value, lineno)
+        program_list.append(program_info(id, value, [t[4]] + t[5], lineno))
 
 def p_version_def(t):
     '''version_def :  VERSION ID LBRACE procedure_def procedure_def_list RBRACE EQUALS constant SEMI'''
@@ -612,10 +612,15 @@ def p_version_def(t):
     lineno = t.lineno(1)
     if id_unique(id, 'version', lineno):
         name_dict[id] = const_info(id, value, lineno)
+    t[0] = version_info(id, value, [t[4]] + t[5], lineno)
 
 def p_version_def_list(t):
     '''version_def_list : version_def version_def_list
                         | empty'''
+    if len(t) == 3:
+        t[0] = [t[1]] + t[2]
+    else:
+        t[0] = []
 
 def p_procedure_def(t):
     '''procedure_def : proc_return ID LPAREN proc_firstarg  type_specifier_list RPAREN EQUALS constant SEMI'''
@@ -625,18 +630,26 @@ def p_procedure_def(t):
     lineno = t.lineno(1)
     if id_unique(id, 'procedure', lineno):
         name_dict[id] = const_info(id, value, lineno)
+    t[0] = procedure_info(id, value, t[1], t[4], lineno)
 
 def p_procedure_def_list(t):
     '''procedure_def_list : procedure_def procedure_def_list
                           | empty'''
+    if len(t) == 3:
+        t[0] = [t[1]] + t[2]
+    else:
+        t[0] = []
 
 def p_proc_return(t):
     '''proc_return : type_specifier
                    | VOID'''
+    # type_info, or 'void'
+    t[0] = t[1]
 
 def p_proc_firstarg(t):
     '''proc_firstarg : type_specifier
                      | VOID'''
+    t[0] = t[1]
 
 def p_type_specifier_list(t):
     '''type_specifier_list : COMMA type_specifier type_specifier_list
@@ -890,22 +903,30 @@ class Info(object):
             subheader = array = varindent = ''
         return prefix+varindent, newdata, subheader, array
 
+    def enum_values(self):
+        """Name of the module level frozenset of the values of this enum,
+        which is added to enum_sets to be generated"""
+        if isinstance(self, enum_info):
+            name = "%s_values" % self.id
+        else:
+            name = "_%s_%s_values" % (self.id, self.lineno)
+        enum_sets[name] = ["const.%s" % l.id for l in self.body]
+        return name
+
     def packenum(self, prefix, data='data'):
         prefix, data, subheader, array = self._array_pack(prefix, data)
-        varlist = ["const.%s" % l.id for l in self.body]
-        check = "%sif self.check_enum and %s not in [%s]:\n" \
+        check = "%sif self.check_enum and %s not in %s:\n" \
                 "%s%sraise XDRError('value=%%s not in enum %s' %% %s)\n" % \
-                (prefix, data, ', '.join(varlist),
+                (prefix, data, self.enum_values(),
                  prefix, indent, self.id, data)
         pack = check + "%sself.pack_int(%s)\n" % (prefix, data)
         return subheader + pack + array
 
     def unpackenum(self, prefix, data='data'):
         prefix, data, subheader, array = self._array_unpack(prefix, data)
-        varlist = ["const.%s" % l.id for l in self.body]
-        check = "%sif self.check_enum and %s not in [%s]:\n" \
+        check = "%sif self.check_enum and %s not in %s:\n" \
                 "%s%sraise XDRError('value=%%s not in enum %s' %% %s)\n" % \
-                (prefix, data, ', '.join(varlist),
+                (prefix, data, self.enum_values(),
                  prefix, indent, self.id, data)
         unpack = "%s%s = self.unpack_int()\n" % (prefix, data)
         return subheader + unpack + check + array
@@ -925,10 +946,50 @@ class Info(object):
                  ''.join( [l.unpackout(prefix, data) for l in self.body] )
         return subheader + unpack + array
 
+    def union_arms(self, action):
+        """For named unions, the methods which pack or unpack (action) each
+        arm, and the dict from case value to arm they are dispatched with"""
+        out = ''
+        arms = []
+        for i, l in enumerate(self.body[1:-1]):
+            name = "_%s_%s_arm%d" % (action, self.id, i)
+            out += "%sdef %s(self, data: types.%s) -> None:\n" % \
+                   (indent, name, self.id)
+            if action == 'pack':
+                out += ''.join([d.packout(indent2, 'data') for d in l.declarations])
+            else:
+                out += ''.join([d.unpackout(indent2, 'data') for d in l.declarations])
+            out += '\n'
+            arms += ["%s : %s" % (self.fullname(c), name) for c in l.cases]
+        out += "%s_%s_%s_arms = {%s}\n" % (indent, action, self.id, ', '.join(arms))
+        return out
+
+    def union_dispatch(self, action, prefix, data):
+        """Calls the arm for the switch value, or else the default arm"""
+        switch = self.body[0].declarations[0]
+        out = "%sarm = self._%s_%s_arms.get(%s.%s)\n" \
+              "%sif arm is not None:\n" \
+              "%s%sarm(self, %s)\n" \
+              "%selse:\n" % \
+              (prefix, action, self.id, data, switch.id,
+               prefix, prefix, indent, data, prefix)
+        default = self.body[-1].declarations
+        if default == []:
+            out += "%s%sraise XDRError('bad switch=%%s' %% %s.%s)\n" % \
+                   (prefix, indent, data, switch.id)
+        elif action == 'pack':
+            out += default[0].packout(prefix + indent, data)
+        else:
+            out += ''.join([d.unpackout(prefix + indent, data) for d in default])
+        return out
+
     def packunion(self, prefix, data='data'):
         prefix, data, subheader, array = self._array_pack(prefix, data)
         switch = self.body[0].declarations[0]
         pack = switch.packout(prefix, data)
+        if isinstance(self, union_info):
+            pack += self.union_dispatch('pack', prefix, data)
+            return subheader + pack + array
         first = ''
         for l in self.body[1:-1]:
             cases = ' or '.join(["%s.%s == %s" %
@@ -957,6 +1018,9 @@ class Info(object):
         unpack = "%s%s = %s()\n" % (prefix, data, classname)
         switch = self.body[0].declarations[0]
         unpack += switch.unpackout(prefix, data)
+        if isinstance(self, union_info):
+            unpack += self.union_dispatch('unpack', prefix, data)
+            return subheader + unpack + array
         first = ''
         for l in self.body[1:-1]:
             cases = ' or '.join(["%s.%s == %s" %
@@ -1145,6 +1209,77 @@ class struct_info(Info):
         return header + self.unpackstruct(indent2) + \
                self._get_unpack_footer()
 
+    def view_output(self):
+        """A class decoding each field of the struct when it is accessed,
+        from the encoded struct in a buffer. Returns None, after reporting
+        an error, if the struct has fields the view can't handle."""
+        global error_occurred
+        fields = []
+        for l in self.body:
+            kind = view_kind(l)
+            if kind is None:
+                error_occurred = True
+                print("ERROR - can't make a view of %s, field %s is not a "
+                      "number, opaque or string" % (self.id, l.id))
+                return None
+            fields.append((l, kind))
+        classname = "%s_view" % self.id
+        out = "class %s(object):\n" % classname
+        out += '%s"""%s, decoded field by field as they are accessed, from its\n' \
+               '%sencoding in buf at offset. Opaque and string fields are memoryviews\n' \
+               '%sinto buf rather than copies."""\n' % (indent, self.id, indent, indent)
+        init = "%sdef __init__(self, buf: bytes, offset: int = 0) -> None:\n" % indent
+        init += "%sself._buf = memoryview(buf)\n" % indent2
+        init += "%sself._offset = offset\n" % indent2
+        init += "%s# Only lengths are decoded here, to locate the fields and check\n" \
+                "%s# that they are all in buf\n" % (indent2, indent2)
+        props = ''
+        # Offsets are (base, constant), base being the end of the last
+        # variable length field
+        base = "self._offset"
+        pos = 0
+        for l, (kind, arg) in fields:
+            where = "%s + %s" % (base, pos) if pos else base
+            props += "%s@property\n" % indent
+            if kind == 'number':
+                fmt, size = view_formats[arg]
+                props += "%sdef %s(self) -> %s:\n" % (indent, l.id, view_hints[arg])
+                value = "struct.unpack_from('%s', self._buf, %s)[0]" % (fmt, where)
+                if arg == 'bool':
+                    value = "bool(%s)" % value
+                props += "%sreturn %s\n\n" % (indent2, value)
+                pos += size
+            elif kind == 'fixed':
+                props += "%sdef %s(self) -> memoryview:\n" % (indent, l.id)
+                props += "%sstart = %s\n" % (indent2, where)
+                props += "%sreturn self._buf[start:start + %s]\n\n" % (indent2, l.fullname(arg))
+                pos += ((const_value(arg) + 3)//4)*4
+            else:
+                maxlen = "None" if arg is None else l.fullname(arg)
+                init += "%s(self._%s_start, self._%s_stop, self._%s_end) = \\\n" \
+                        "%s%sxdr_into.locate_opaque(self._buf, %s, %s)\n" % \
+                        (indent2, l.id, l.id, l.id, indent2, indent2, where, maxlen)
+                props += "%sdef %s(self) -> memoryview:\n" % (indent, l.id)
+                props += "%sreturn self._buf[self._%s_start:self._%s_stop]\n\n" % \
+                         (indent2, l.id, l.id)
+                base = "self._%s_end" % l.id
+                pos = 0
+        end = "%s + %s" % (base, pos) if pos else base
+        init += "%sself.end = %s\n" % (indent2, end)
+        init += "%sif(self.end > len(self._buf)):\n" % indent2
+        init += "%sraise EOFError\n\n" % (indent*3)
+        values = []
+        for l, (kind, arg) in fields:
+            if kind == 'number':
+                values.append("self.%s" % l.id)
+            else:
+                values.append("bytes(self.%s)" % l.id)
+        repr = "%sdef __repr__(self) -> str:\n" % indent
+        repr += "%sreturn '%s(%s)' %% (%s,)\n" % \
+                (indent2, classname, ', '.join(["%s=%%r" % l.id for l, k in fields]),
+                 ', '.join(values))
+        return out + init + props + repr
+
 class union_info(Info):
     """The result of 'TYPEDEF UNION <union_body> ID <array> SEMI' or
     'UNION ID <union_body> SEMI'
@@ -1219,12 +1354,13 @@ class union_info(Info):
 
     def pack_output(self):
         header = self._get_pack_header()
-        return header + self.packunion(indent2)
+        return header + self.packunion(indent2) + '\n' + \
+               self.union_arms('pack')
 
     def unpack_output(self):
         header = "%sdef unpack_%s(self) -> types.%s:\n" % (indent, self.id, self.id)
         return header + self.unpackunion(indent2) + \
-               self._get_unpack_footer()
+               self._get_unpack_footer() + '\n' + self.union_arms('unpack')
 
 class type_info(Info):
     def __init__(self, type, lineno=None, body=None):
@@ -1355,9 +1491,13 @@ class type_info(Info):
             fixnum = "%s, " % self.fullname(self.len)
         else:
             fixchar = fixnum = ''
+        dtype = array_dtype(self)
         if self.type == 'string' or self.type == 'opaque':
             type = self.type
             packer = ''
+        elif dtype is not None:
+            return limit + "%sxdr_numpy.pack_%sarray(self, %s%s, '%s', self.pack_%s)\n" % \
+                   (prefix, fixchar, fixnum, data, dtype, self.type)
         else:
             type = 'array'
             packer = ", self.pack_%s" % self.type
@@ -1380,9 +1520,15 @@ class type_info(Info):
         else:
             fixchar = ''
             fixnum = []
+        dtype = array_dtype(self)
         if self.type == 'string' or self.type == 'opaque':
             type = self.type
             packer = []
+        elif dtype is not None:
+            pack = "%s%s = xdr_numpy.unpack_%sarray(%s)\n" % \
+                   (prefix, data, fixchar,
+                    ', '.join(['self'] + fixnum + ["'%s'" % dtype, "self.unpack_%s" % self.type]))
+            return pack + limit
         else:
             type = 'array'
             packer = ["self.unpack_%s" % self.type]
@@ -1393,12 +1539,250 @@ class type_info(Info):
 
 
 
+# Numbers as decoded by views: type => (struct format, size)
+view_formats = {"int" : (">l", 4),
+                "uint" : (">L", 4),
+                "unsigned" : (">L", 4),
+                "hyper" : (">q", 8),
+                "uhyper" : (">Q", 8),
+                "float" : (">f", 4),
+                "double" : (">d", 8),
+                "quadruple" : (">d", 8),
+                "bool" : (">l", 4)}
+view_hints = {"float" : "float", "double" : "float", "quadruple" : "float",
+              "bool" : "bool"}
+for t in view_formats:
+    view_hints.setdefault(t, "int")
+
+def view_kind(decl):
+    """How a view decodes a struct field: ('number', type), ('fixed', len)
+    for fixed length opaques, ('var', maxlen) for variable length opaques
+    and strings, or None if it can't"""
+    t = decl
+    while True:
+        if t.type in ['opaque', 'string']:
+            if t.array and t.fixed:
+                return ('fixed', t.len)
+            if t.array:
+                return ('var', t.len)
+            return None
+        if t.array:
+            return None
+        if t.type in view_formats:
+            return ('number', t.type)
+        if t.type == 'enum':
+            return ('number', 'int')
+        info = name_dict.get(t.type)
+        if isinstance(info, enum_info):
+            return ('number', 'int')
+        if not isinstance(info, type_info) or info is t:
+            return None
+        t = info
+
+# Numbers as packed in bulk by xdr_numpy: type => big-endian dtype
+numpy_dtypes = {"int" : ">i4",
+                "uint" : ">u4",
+                "unsigned" : ">u4",
+                "hyper" : ">i8",
+                "uhyper" : ">u8",
+                "float" : ">f4",
+                "double" : ">f8",
+                "quadruple" : ">f8"}
+
+def array_dtype(decl):
+    """The big-endian dtype xdr_numpy packs the elements of array decl as, or
+    None if it is not an array of numbers or isn't packed with xdr_numpy"""
+    if not use_numpy:
+        return None
+    t = decl.type
+    while t not in numpy_dtypes:
+        info = name_dict.get(t)
+        if not isinstance(info, type_info) or info.array or info.type == t:
+            return None
+        t = info.type
+    return numpy_dtypes[t]
+
+def const_value(value):
+    """Integer value of a constant, or of the name of one"""
+    while value in name_dict:
+        value = name_dict[value].value
+    return int(value, 0) if not value.startswith('0') or value.startswith('0x') \
+        else int(value, 8)
+
+class procedure_info(object):
+    """The result of 'proc_return ID LPAREN proc_firstarg ... RPAREN
+    EQUALS constant SEMI'. ret and arg are type_info, or 'void'"""
+    def __init__(self, id, value, ret, arg, lineno=None):
+        self.id = id
+        self.value = value
+        self.ret = ret
+        self.arg = arg
+        self.lineno = lineno
+
+    def __repr__(self):
+        return "procedure %s=%s at line %s" % (self.id, self.value, self.lineno)
+
+    @staticmethod
+    def _type_name(t):
+        return 'void' if t == 'void' else t.type
+
+    @staticmethod
+    def _hint(t, view=False):
+        if view and t != 'void' and t.type in view_types:
+            return "%s_view" % t.type
+        return 'None' if t == 'void' else t.getTypeHintStr()
+
+    def xdrout(self):
+        return "%s %s (%s) = %s;" % (self._type_name(self.ret), self.id,
+                                    self._type_name(self.arg), self.value)
+
+    def svc_output(self, name_base):
+        """The handler stub, and the function decoding the argument,
+        calling the handler and encoding its result"""
+        handler = "handle_%s" % self.id
+        out = "%sasync def %s(self, rpc_msg: rpc_type.rpc_msg, arg: %s) -> %s:\n" % \
+              (indent, handler, self._hint(self.arg, view=True), self._hint(self.ret))
+        out += '%s"""%s"""\n' % (indent2, self.xdrout())
+        out += "%sraise NotImplementedError\n\n" % indent2
+        out += "%sasync def _dispatch_%s(self, rpc_msg: rpc_type.rpc_msg, buf: bytes, buf_ix: int) -> bytes:\n" % \
+               (indent, self.id)
+        if self.arg == 'void':
+            out += "%sarg = None\n" % indent2
+            out += "%sif(self.trace_calls):\n" % indent2
+            out += '%sprint(f"%s >>> (void)")\n' % (indent*3, handler)
+        elif self.arg.type in view_types:
+            # Fields are only decoded as the handler uses them
+            out += "%sarg = %s_view(buf, buf_ix)\n" % (indent2, self.arg.type)
+            out += "%sif(self.trace_calls):\n" % indent2
+            out += '%sprint(f"%s >>> {arg}")\n' % (indent*3, handler)
+        else:
+            out += "%sup = %sUnpacker(buf, check_enum = self.check_enum)\n" % (indent2, name_base.upper())
+            out += "%sup.set_position(buf_ix)\n" % indent2
+            out += "%sarg = up.unpack_%s()\n" % (indent2, self.arg.type)
+            out += "%sif(self.trace_calls):\n" % indent2
+            out += '%sprint(f"%s >>> {arg}")\n' % (indent*3, handler)
+        out += "%srsp = await self.%s(rpc_msg, arg)\n" % (indent2, handler)
+        out += "%sif(self.trace_calls):\n" % indent2
+        out += '%sprint(f"%s <<< {rsp}")\n' % (indent*3, handler)
+        out += "%sassert(rpc_msg.xid is not None)\n" % indent2
+        if self.ret == 'void':
+            out += "%sreturn rpc_srv.success_reply_record(rpc_msg.xid, 0)[0]\n" % indent2
+        else:
+            # Sized first, so the whole reply is encoded in place, once
+            out += "%ss = %sSizePacker()\n" % (indent2, name_base.upper())
+            out += "%ss.pack_%s(rsp)\n" % (indent2, self.ret.type)
+            out += "%s(record, offset) = rpc_srv.success_reply_record(rpc_msg.xid, s.size)\n" % indent2
+            out += "%s%sIntoPacker(record, offset).pack_%s(rsp)\n" % (indent2, name_base.upper(), self.ret.type)
+            out += "%sreturn record\n" % indent2
+        return out
+
+    def clnt_output(self, program, name_base):
+        """The client stub, which encodes the argument, makes the call and
+        decodes the result"""
+        name = name_base.upper()
+        params = "self"
+        if self.arg != 'void':
+            params += ", arg: %s" % self._hint(self.arg)
+        if self.ret == 'void':
+            # One-way calls, which get no reply, are sent without a read
+            params += ", read_reply: bool = True"
+        out = "%sasync def %s(%s) -> %s:\n" % (indent, self.id, params, self._hint(self.ret))
+        out += '%s"""%s"""\n' % (indent2, self.xdrout())
+        if self.arg == 'void':
+            data = "b''"
+        else:
+            out += "%sp = self._p\n" % indent2
+            out += "%sp.reset()\n" % indent2
+            out += "%sp.pack_%s(arg)\n" % (indent2, self.arg.type)
+            data = "p.get_buffer()"
+        call = "self.client.call(const.%s, self.vers, const.%s, %s" % (program.id, self.id, data)
+        if self.ret == 'void':
+            out += "%srsp, msg = await %s, read_reply=read_reply)\n" % (indent2, call)
+            out += "%sif(msg is not None):\n" % indent2
+            out += "%srpc_client.check_reply(msg)\n" % (indent*3)
+        else:
+            out += "%srsp, msg = await %s)\n" % (indent2, call)
+            out += "%srpc_client.check_reply(msg)\n" % indent2
+            out += "%sassert(rsp is not None)\n" % indent2
+            out += "%sreturn %sUnpacker(rsp).unpack_%s()\n" % (indent2, name, self.ret.type)
+        return out
+
+class version_info(object):
+    """The result of 'VERSION ID LBRACE procedure_def procedure_def_list
+    RBRACE EQUALS constant SEMI'"""
+    def __init__(self, id, value, procedures, lineno=None):
+        self.id = id
+        self.value = value
+        self.procedures = procedures
+        self.lineno = lineno
+
+    def __repr__(self):
+        return "version %s=%s at line %s" % (self.id, self.value, self.lineno)
+
+    def svc_output(self, program, name_base):
+        """Server skeleton class for this version of program"""
+        classname = "%s_%s_svc" % (program.id, const_value(self.value))
+        out = "class %s(rpc_conn):\n" % classname
+        out += '%s"""Server skeleton for program %s, version %s.\n' \
+               '%sSubclasses override the handlers of the procedures they implement.\n' \
+               '%sCalls to any other procedure are answered with PROC_UNAVAIL."""\n\n' % \
+               (indent, program.id, self.id, indent, indent)
+        out += "%srpc_program = (const.%s, const.%s)\n\n" % (indent, program.id, self.id)
+        out += "%s# procedure => (handler, function decoding and dispatching the call)\n" % indent
+        out += "%srpc_procedures = {\n" % indent
+        for proc in self.procedures:
+            out += "%sconst.%s: ('handle_%s', '_dispatch_%s'), # %s\n" % \
+                   (indent2, proc.id, proc.id, proc.id, proc.value)
+        out += "%s}\n\n" % indent
+        out += "\n".join([proc.svc_output(name_base) for proc in self.procedures])
+        return out
+
+    def clnt_output(self, program, name_base):
+        """Client stub class for this version of program"""
+        classname = "%s_%s_clnt" % (program.id, const_value(self.value))
+        out = "class %s():\n" % classname
+        out += '%s"""Client stubs for program %s, version %s.\n' \
+               '%sclient is a connected rpc_client or rpc_udp_client. Calls which\n' \
+               '%sare not accepted by the server raise an Exception."""\n' % \
+               (indent, program.id, self.id, indent, indent)
+        out += "%sdef __init__(self, client: clientType, vers: int = const.%s) -> None:\n" % \
+               (indent, self.id)
+        out += "%sself.client = client\n" % indent2
+        out += "%sself.vers = vers\n" % indent2
+        out += "%s# Reused to encode the argument of each call\n" % indent2
+        out += "%sself._p = %sPacker()\n\n" % (indent2, name_base.upper())
+        out += "\n".join([proc.clnt_output(program, name_base) for proc in self.procedures])
+        return out
+
+class program_info(object):
+    """The result of 'PROGRAM ID LBRACE version_def version_def_list
+    RBRACE EQUALS constant SEMI'"""
+    def __init__(self, id, value, versions, lineno=None):
+        self.id = id
+        self.value = value
+        self.versions = versions
+        self.lineno = lineno
+
+    def __repr__(self):
+        return "program %s=%s at line %s" % (self.id, self.value, self.lineno)
+
+    def svc_output(self, name_base):
+        return "\n".join([v.svc_output(self, name_base) for v in self.versions])
+
+    def clnt_output(self, name_base):
+        return "\n".join([v.clnt_output(self, name_base) for v in self.versions])
+
+
 ##########################################################################
 #                                                                        #
 #                          Main Loop                                     #
 #                                                                        #
 ##########################################################################
 name_dict = { } # list of global names seen, to avoid conflict
+program_list = [ ] # program_info of the RPC programs defined
+view_types = [ ] # structs to generate views for, which servers decode with
+use_numpy = False # Option which packs arrays of numbers with xdr_numpy
+enum_sets = { } # name => values, of the frozensets enums are checked against
 
 use_filters = True  # Option which causes hooks to be generated which
                     # allows easy subclassing to, for example,
@@ -1407,18 +1791,36 @@ allow_attr_passthrough = True # Option which allows substructure attrs to
                               # be referenced directly, in cases where there
                               # is a unique substructure to search.
 pack_header = """\
-import sys,os
-sys.path.append(os.path.dirname(__file__))
 from typing import Any, List, Optional, Union
 from vxi11aio.xdr import %s as const, %s as types
+import struct
 import xdrlib
 from xdrlib import Error as XDRError
+from vxi11aio import %s
 
 class nullclass(object):
     pass
 
 """
 
+svc_header = """\
+from typing import Any, List, Optional, Union
+from vxi11aio.rpc_srv import rpc_conn, rpc_srv
+from vxi11aio.xdr import rpc_type, %s as const, %s as types
+from vxi11aio.xdr.%s import %sIntoPacker, %sSizePacker, %sUnpacker
+
+"""
+
+clnt_header = """\
+from typing import Any, List, Optional, Union
+from vxi11aio import rpc_client, rpc_udp
+from vxi11aio.xdr import %s as const, %s as types
+from vxi11aio.xdr.%s import %sPacker, %sUnpacker
+
+clientType = Union[rpc_client.rpc_client, rpc_udp.rpc_udp_client]
+
+"""
+
 pack_init = """\
 class %sPacker(xdrlib.Packer):
 %sdef __init__(self, check_enum:bool=True, check_array:bool=True) -> None:
@@ -1428,6 +1830,18 @@ class %sPacker(xdrlib.Packer):
 
 """ % ("%s", indent, indent2, indent2, indent2)
 
+size_init = """\
+class %sSizePacker(xdr_into.size_packer):
+%s\"\"\"Runs the same pack_* methods as %sPacker, adding up the encoded
+%ssize in size instead of encoding\"\"\"
+""" % ("%s", indent, "%s", indent)
+
+into_init = """\
+class %sIntoPacker(xdr_into.into_packer):
+%s\"\"\"Runs the same pack_* methods as %sPacker, encoding into a
+%spreallocated buffer, starting at offset\"\"\"
+""" % ("%s", indent, "%s", indent)
+
 unpack_init = """\
 class %sUnpacker(xdrlib.Unpacker):
 %sdef __init__(self, data:bytes, check_enum:bool=True, check_array:bool=True) -> None:
@@ -1454,13 +1868,65 @@ known_basics = {"int" : "pack_int",
 packer_start = ''.join(["%spack_%s = xdrlib.Packer.%s\n" % (indent, k, v)
                         for k, v in known_basics.items()])
 
+size_start = ''.join(["%spack_%s = xdr_into.size_packer.%s\n" % (indent, k, v)
+                      for k, v in known_basics.items()])
+
+into_start = ''.join(["%spack_%s = xdr_into.into_packer.%s\n" % (indent, k, v)
+                      for k, v in known_basics.items()])
+
 unpacker_start = ''.join(["%sunpack_%s = xdrlib.Unpacker.un%s\n" % (indent, k, v)
                           for k, v in known_basics.items()])
 
-def run(infile, filters=True, pass_attrs=True, debug=False):
-    global use_filters, allow_attr_passthrough
+# The parser tables are cached here, and rebuilt by PLY when the grammar
+# changes
+table_file = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          "__pycache__", "xdrgen_parsetab.pickle")
+parser = None # Built on first use
+
+def get_parser():
+    global parser
+    if parser is None:
+        import ply.yacc as yacc
+        os.makedirs(os.path.dirname(table_file), exist_ok=True)
+        parser = yacc.yacc(debug=False, picklefile=table_file)
+    return parser
+
+def source_hash(data, options):
+    """Hash of the .x file contents (data), the generator and options, which
+    the outputs are a function of"""
+    h = hashlib.sha256()
+    with open(os.path.abspath(__file__), "rb") as f:
+        h.update(f.read())
+    h.update(data.encode())
+    h.update(repr(options).encode())
+    return h.hexdigest()[:16]
+
+def up_to_date(comment_string, required, optional):
+    """Whether the outputs were generated from the same source hash. The
+    required outputs must exist, and the optional ones may not."""
+    for path in required + optional:
+        try:
+            with open(path) as f:
+                if f.readline() != comment_string:
+                    return False
+        except FileNotFoundError:
+            if path in required:
+                return False
+    return True
+
+def run(infile, filters=True, pass_attrs=True, debug=False, views=(),
+        numpy=False, outdir=None, force=False):
+    """views names structs to also generate lazily decoding views for.
+    Server skeletons decode procedure arguments of these types as views.
+    numpy packs arrays of numbers in bulk, with NumPy if it is installed.
+    The outputs are written to outdir (default is the current directory),
+    unless they were generated from the same input and generator, and
+    force isn't set."""
+    global use_filters, allow_attr_passthrough, view_types, use_numpy
     use_filters = filters
     allow_attr_passthrough = pass_attrs
+    view_types = list(views)
+    use_numpy = numpy
     print("Input file is", infile)
 
     # Create output file names (without .py)
@@ -1469,38 +1935,52 @@ def run(infile, filters=True, pass_attrs=True, debug=False):
     constants_file = name_base + "_const"
     types_file = name_base + "_type"
     packer_file = name_base + "_pack"
+    svc_file = name_base + "_svc"
+    clnt_file = name_base + "_clnt"
+    def path(name):
+        return os.path.join(outdir or "", name + ".py")
     print("Will use output files %s.py, %s.py, and %s.py" % \
           (constants_file, types_file, packer_file))
 
-    # Parse the input data with yacc
-    global name_dict
-    name_dict = {}
     f = open(infile)
     data = f.read()
     f.close()
-    import ply.yacc as yacc
-    yacc.yacc()
-    yacc.parse(data, debug=debug)
+    comment_string = "# Generated by rpcgen.py from %s, source hash %s\n" % \
+                     (os.path.basename(infile),
+                      source_hash(data, (filters, pass_attrs, view_types, use_numpy)))
+    if not force and up_to_date(comment_string,
+                                [path(constants_file), path(types_file), path(packer_file)],
+                                [path(svc_file), path(clnt_file)]):
+        print("Output files are up to date")
+        return 0
+
+    # Parse the input data with yacc
+    global name_dict, program_list, enum_sets, error_occurred
+    name_dict = {}
+    program_list = []
+    enum_sets = {}
+    error_occurred = False
+    lexer.lineno = 1
+    get_parser().parse(data, lexer=lexer, debug=debug)
 
     if error_occurred:
         print
         print("Error occurred, did not write output files")
         return 1
 
-    comment_string = "# Generated by rpcgen.py from %s on %s\n" % \
-                     (infile, time.asctime())
-    const_fd = open(constants_file + ".py", "w")
+    const_fd = open(path(constants_file), "w")
     const_fd.write(comment_string)
-    type_fd = open(types_file + ".py", "w")
+    type_fd = open(path(types_file), "w")
     type_fd.write(comment_string)
-    type_fd.write("import sys,os\nsys.path.append(os.path.dirname(__file__))\nfrom typing import Any, List, Optional, Union\nfrom vxi11aio.xdr import %s as const\n" % constants_file)
-    pack_fd = open(packer_file + ".py", "w")
+    type_fd.write("from typing import Any, List, Optional, Union\nfrom vxi11aio.xdr import %s as const\n" % constants_file)
+    pack_fd = open(path(packer_file), "w")
     pack_fd.write(comment_string)
-    pack_fd.write(pack_header % (constants_file, types_file))
-    pack_fd.write(pack_init % name_base.upper())
-    pack_fd.write(packer_start)
+    pack_fd.write(pack_header % (constants_file, types_file,
+                                 "xdr_into, xdr_numpy" if use_numpy else "xdr_into"))
 
     type_list = sorted(name_dict.values())
+    pack_outputs = []
+    unpack_outputs = [value.unpack_output() for value in type_list]
     for value in type_list:
         #print(value)
         output = value.const_output()
@@ -1513,31 +1993,77 @@ def run(infile, filters=True, pass_attrs=True, debug=False):
             type_fd.write(output)
         output = value.pack_output()
         if output is not None:
-            #pack_fd.write("# **** %s %s %s****\n" % (value.id, value.lineno, value.sortno))
+            pack_outputs.append(output)
+    # Checked against when check_enum is set
+    for id, values in sorted(enum_sets.items()):
+        pack_fd.write("%s = frozenset([%s])\n" % (id, ', '.join(values)))
+    pack_fd.write('\n')
+    # The packing code, on xdrlib, and on the sizing and in place primitives
+    name = name_base.upper()
+    for init, start in [(pack_init % name, packer_start),
+                        (size_init % (name, name), size_start),
+                        (into_init % (name, name), into_start)]:
+        pack_fd.write(init)
+        pack_fd.write(start)
+        for output in pack_outputs:
             pack_fd.write(output)
             pack_fd.write('\n')
     pack_fd.write(unpack_init % name_base.upper())
     pack_fd.write(unpacker_start)
-    for value in type_list:
-        output = value.unpack_output()
+    for output in unpack_outputs:
         if output is not None:
             pack_fd.write(output)
             pack_fd.write('\n')
+    for id in view_types:
+        if not isinstance(name_dict.get(id), struct_info):
+            print("ERROR - no struct %s to make a view of" % id)
+            output = None
+        else:
+            output = name_dict[id].view_output()
+        if output is None:
+            pack_fd.close()
+            print("Error occurred, output files are incomplete")
+            return 1
+        pack_fd.write(output)
+        pack_fd.write('\n')
 
     const_fd.close()
     type_fd.close()
     pack_fd.close()
-    return
+
+    # Server skeletons and client stubs, for files defining RPC programs
+    if len(program_list) > 0:
+        print("Writing server skeletons to %s.py" % svc_file)
+        svc_fd = open(path(svc_file), "w")
+        svc_fd.write(comment_string)
+        svc_fd.write(svc_header % (constants_file, types_file, packer_file,
+                                   name_base.upper(), name_base.upper(), name_base.upper()))
+        if len(view_types) > 0:
+            svc_fd.write("from vxi11aio.xdr.%s import %s\n\n" % \
+                         (packer_file, ', '.join(["%s_view" % id for id in view_types])))
+        svc_fd.write("\n".join([p.svc_output(name_base) for p in program_list]))
+        svc_fd.close()
+        print("Writing client stubs to %s.py" % clnt_file)
+        clnt_fd = open(path(clnt_file), "w")
+        clnt_fd.write(comment_string)
+        clnt_fd.write(clnt_header % (constants_file, types_file, packer_file,
+                                     name_base.upper(), name_base.upper()))
+        clnt_fd.write("\n".join([p.clnt_output(name_base) for p in program_list]))
+        clnt_fd.close()
+    return 0
 
 #
 # Section: main
 #
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: %s <filename>" % sys.argv[0])
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    views = [a[len("--view="):] for a in sys.argv[1:] if a.startswith("--view=")]
+    if len(args) < 1:
+        print("Usage: %s [--force] [--numpy] [--view=<struct>]... <filename>" % sys.argv[0])
         sys.exit(1)
 
-    run(sys.argv[1])
+    sys.exit(run(args[0], views=views, numpy="--numpy" in sys.argv[1:],
+                 force="--force" in sys.argv[1:]))
 
 # Local variables:
 # py-indent-offset: 4